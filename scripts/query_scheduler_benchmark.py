@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""Drain a large queued backlog through the real query Controller.
+
+The benchmark enqueues queries across many chat sessions and Workspaces
+through ``QueryPool.add_query`` and lets ``Controller.consumer`` schedule them
+with the production session semaphores. Pipelines complete immediately, so
+the measured time is dominated by admission, selection, and cleanup cost.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import time
+from dataclasses import asdict, dataclass
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from langbot.pkg.api.http.context import ExecutionContext
+
+# Match the production import order; importing a leaf manager first exposes a
+# historical annotation cycle that the application graph resolves.
+from langbot.pkg.core import app as _core_app  # noqa: F401
+from langbot.pkg.pipeline.controller import Controller
+from langbot.pkg.pipeline.pool import QueryPool
+from langbot.pkg.provider.session.sessionmgr import SessionManager
+from langbot_plugin.api.entities.builtin.provider.session import LauncherTypes
+
+
+@dataclass(frozen=True, slots=True)
+class BenchmarkScale:
+    queries: int
+    sessions: int
+    workspaces: int
+    pipeline_concurrency: int
+
+
+SCALES = {
+    'quick': BenchmarkScale(queries=10_000, sessions=1_000, workspaces=10, pipeline_concurrency=64),
+    'audit': BenchmarkScale(queries=50_000, sessions=1_000, workspaces=10, pipeline_concurrency=256),
+}
+
+
+class _BenchmarkQuery:
+    """Small stand-in for SDK Query construction."""
+
+    def __init__(self, **values):
+        self.__dict__.update(values)
+
+
+class _BenchmarkLogger:
+    def debug(self, *_args, **_kwargs) -> None:
+        return None
+
+    def info(self, *_args, **_kwargs) -> None:
+        return None
+
+    def warning(self, *_args, **_kwargs) -> None:
+        return None
+
+    def error(self, *_args, **_kwargs) -> None:
+        return None
+
+
+def _execution_context(workspace_index: int) -> ExecutionContext:
+    return ExecutionContext(
+        instance_uuid='query-scheduler-benchmark',
+        workspace_uuid=f'workspace-{workspace_index}',
+        placement_generation=1,
+    )
+
+
+async def _run(args: argparse.Namespace) -> dict:
+    scale = SCALES[args.scale]
+    sessions_per_workspace = -(-scale.sessions // scale.workspaces)
+    queries_per_workspace = -(-scale.queries // scale.workspaces)
+    query_pool = QueryPool(
+        max_queries=scale.queries,
+        max_queries_per_workspace=queries_per_workspace,
+    )
+    completed = 0
+    drained = asyncio.Event()
+    process_tasks: set[asyncio.Task] = set()
+
+    async def run_pipeline(_query) -> None:
+        nonlocal completed
+        await asyncio.sleep(0)
+        completed += 1
+        if completed == scale.queries:
+            drained.set()
+
+    async def get_execution_binding(workspace_uuid, *, expected_generation):
+        return SimpleNamespace(
+            instance_uuid='query-scheduler-benchmark',
+            workspace_uuid=workspace_uuid,
+            placement_generation=expected_generation,
+        )
+
+    async def get_pipeline_by_uuid(_context, _pipeline_uuid):
+        return pipeline
+
+    def create_task(coro, **_kwargs):
+        task = asyncio.create_task(coro)
+        process_tasks.add(task)
+        task.add_done_callback(process_tasks.discard)
+        return task
+
+    pipeline = SimpleNamespace(run=run_pipeline)
+    app = SimpleNamespace(
+        logger=_BenchmarkLogger(),
+        query_pool=query_pool,
+        persistence_mgr=None,
+        instance_config=SimpleNamespace(
+            data={
+                'concurrency': {
+                    'pipeline': scale.pipeline_concurrency,
+                    'session': 1,
+                },
+                'system': {
+                    'session_retention': {
+                        'max_entries': scale.sessions,
+                        'max_entries_per_workspace': sessions_per_workspace,
+                    },
+                },
+            }
+        ),
+        workspace_service=SimpleNamespace(get_execution_binding=get_execution_binding),
+        pipeline_mgr=SimpleNamespace(get_pipeline_by_uuid=get_pipeline_by_uuid),
+        task_mgr=SimpleNamespace(create_task=create_task),
+    )
+    app.sess_mgr = SessionManager(app)
+    controller = Controller(app)
+
+    enqueue_started_at = time.perf_counter()
+    with patch('langbot.pkg.pipeline.pool.pipeline_query.Query', side_effect=_BenchmarkQuery):
+        for index in range(scale.queries):
+            session_index = index % scale.sessions
+            await query_pool.add_query(
+                bot_uuid='benchmark-bot',
+                launcher_type=LauncherTypes.GROUP,
+                launcher_id=f'group-{session_index}',
+                sender_id=f'sender-{index}',
+                message_event=SimpleNamespace(),
+                message_chain=SimpleNamespace(),
+                adapter=None,
+                pipeline_uuid='benchmark-pipeline',
+                execution_context=_execution_context(session_index % scale.workspaces),
+            )
+    enqueue_seconds = time.perf_counter() - enqueue_started_at
+    if query_pool.queued_query_count != scale.queries:
+        raise AssertionError('Benchmark backlog was truncated by pool capacity')
+
+    drain_started_at = time.perf_counter()
+    consumer_task = asyncio.create_task(controller.consumer())
+    try:
+        await asyncio.wait_for(drained.wait(), timeout=args.timeout)
+    finally:
+        consumer_task.cancel()
+        try:
+            await consumer_task
+        except asyncio.CancelledError:
+            pass
+        await asyncio.gather(*process_tasks)
+    drain_seconds = time.perf_counter() - drain_started_at
+
+    if query_pool.queued_query_count or query_pool.cached_queries:
+        raise AssertionError('Benchmark backlog was not fully drained')
+
+    return {
+        'component': 'query-scheduler',
+        'scale': args.scale,
+        'work': asdict(scale),
+        'enqueue_seconds': round(enqueue_seconds, 4),
+        'drain_seconds': round(drain_seconds, 4),
+        'queries_per_second': round(scale.queries / drain_seconds, 1),
+        'passed': True,
+    }
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--scale', choices=tuple(SCALES), default='quick')
+    parser.add_argument('--timeout', type=float, default=300.0, help='Maximum drain time in seconds')
+    parser.add_argument('--json', action='store_true', help='Print compact JSON')
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = _parse_args()
+    result = asyncio.run(_run(args))
+    if args.json:
+        print(json.dumps(result, sort_keys=True))
+    else:
+        print(json.dumps(result, indent=2, sort_keys=True))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""Compare chat-path SQLite throughput of the default and tuned profiles.
+
+Each simulated message runs the monitoring writes of the standard chat path
+through ``PersistenceManager.execute_async`` inside a Workspace scope: the
+message insert, a read of the session's recent messages and the final status
+update. Concurrent chats write while a dashboard task keeps reading
+aggregates, which is where the default profile stalls on SQLite's lock.
+Chats that fail, typically with "database is locked", are counted per profile.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import datetime
+import json
+import logging
+import tempfile
+import time
+import uuid
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from types import SimpleNamespace
+
+import sqlalchemy
+
+# Match the production import order; importing a leaf manager first exposes a
+# historical annotation cycle that the application graph resolves.
+from langbot.pkg.core import app as _core_app  # noqa: F401
+from langbot.pkg.entity.persistence import monitoring as persistence_monitoring
+from langbot.pkg.persistence.mgr import PersistenceManager
+from langbot.pkg.utils import constants
+from langbot.pkg.workspace.service import WorkspaceService
+
+
+INSTANCE_UUID = 'sqlite-write-benchmark'
+
+
+@dataclass(frozen=True, slots=True)
+class BenchmarkScale:
+    messages: int
+    chats: int
+    dashboard_interval_seconds: float
+
+
+SCALES = {
+    'quick': BenchmarkScale(messages=2_000, chats=32, dashboard_interval_seconds=0.01),
+    'audit': BenchmarkScale(messages=20_000, chats=128, dashboard_interval_seconds=0.005),
+}
+
+
+def _application(database_path: Path, profile: str) -> SimpleNamespace:
+    logger = logging.getLogger('sqlite-write-benchmark')
+    logger.setLevel(logging.WARNING)
+    return SimpleNamespace(
+        logger=logger,
+        instance_config=SimpleNamespace(
+            data={'database': {'use': 'sqlite', 'sqlite': {'path': str(database_path), 'profile': profile}}}
+        ),
+    )
+
+
+async def _chat(persistence: PersistenceManager, workspace_uuid: str, chat_index: int, messages: int) -> None:
+    message_table = persistence_monitoring.MonitoringMessage.__table__
+    session_id = f'person_{chat_index}'
+    for _ in range(messages):
+        message_id = str(uuid.uuid4())
+        async with persistence.tenant_scope(workspace_uuid):
+            await persistence.execute_async(
+                sqlalchemy.insert(message_table).values(
+                    id=message_id,
+                    workspace_uuid=workspace_uuid,
+                    timestamp=datetime.datetime.now(),
+                    bot_id='bot',
+                    bot_name='Bot',
+                    pipeline_id='pipeline',
+                    pipeline_name='Pipeline',
+                    message_content='hello',
+                    session_id=session_id,
+                    status='pending',
+                    level='info',
+                    role='user',
+                )
+            )
+            await persistence.execute_async(
+                sqlalchemy.select(message_table.c.id)
+                .where(message_table.c.workspace_uuid == workspace_uuid, message_table.c.session_id == session_id)
+                .order_by(message_table.c.timestamp.desc())
+                .limit(10)
+            )
+            await persistence.execute_async(
+                sqlalchemy.update(message_table).where(message_table.c.id == message_id).values(status='success')
+            )
+
+
+async def _dashboard(persistence: PersistenceManager, workspace_uuid: str, interval: float) -> int:
+    message_table = persistence_monitoring.MonitoringMessage.__table__
+    reads = 0
+    while True:
+        async with persistence.tenant_scope(workspace_uuid):
+            await persistence.execute_async(
+                sqlalchemy.select(message_table.c.status, sqlalchemy.func.count())
+                .where(message_table.c.workspace_uuid == workspace_uuid)
+                .group_by(message_table.c.status)
+            )
+        reads += 1
+        await asyncio.sleep(interval)
+
+
+async def _run_profile(profile: str, scale: BenchmarkScale, directory: Path) -> dict:
+    application = _application(directory / f'{profile}.db', profile)
+    persistence = PersistenceManager(application)
+    application.persistence_mgr = persistence
+    await persistence.initialize()
+    try:
+        workspace = await WorkspaceService(application, instance_uuid=INSTANCE_UUID).ensure_singleton_workspace()
+        messages_per_chat = -(-scale.messages // scale.chats)
+        dashboard = asyncio.create_task(_dashboard(persistence, workspace.uuid, scale.dashboard_interval_seconds))
+        started_at = time.perf_counter()
+        results = await asyncio.gather(
+            *(_chat(persistence, workspace.uuid, index, messages_per_chat) for index in range(scale.chats)),
+            return_exceptions=True,
+        )
+        elapsed = time.perf_counter() - started_at
+        dashboard.cancel()
+        try:
+            await dashboard
+        except asyncio.CancelledError:
+            pass
+        failed_chats = sum(isinstance(result, BaseException) for result in results)
+        messages = messages_per_chat * scale.chats
+        return {
+            'profile': profile,
+            'messages': messages,
+            'failed_chats': failed_chats,
+            'seconds': round(elapsed, 4),
+            'messages_per_second': round(messages / elapsed, 1),
+            'database': persistence.get_resource_stats(),
+        }
+    finally:
+        await persistence.shutdown()
+
+
+async def _run(args: argparse.Namespace) -> dict:
+    constants.instance_id = INSTANCE_UUID
+    scale = SCALES[args.scale]
+    with tempfile.TemporaryDirectory(prefix='langbot-sqlite-benchmark-') as directory:
+        default = await _run_profile('default', scale, Path(directory))
+        tuned = await _run_profile('tuned', scale, Path(directory))
+    return {
+        'component': 'sqlite-profile',
+        'scale': args.scale,
+        'work': asdict(scale),
+        'default': default,
+        'tuned': tuned,
+        'speedup': round(tuned['messages_per_second'] / default['messages_per_second'], 2),
+        'passed': not tuned['failed_chats'],
+    }
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--scale', choices=tuple(SCALES), default='quick')
+    parser.add_argument('--json', action='store_true', help='Print compact JSON')
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = _parse_args()
+    result = asyncio.run(_run(args))
+    if args.json:
+        print(json.dumps(result, sort_keys=True))
+    else:
+        print(json.dumps(result, indent=2, sort_keys=True))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""Compare the embedded NumPy vector backend with the Chroma default.
+
+Both backends ingest the same clustered synthetic vectors through the
+``VectorDatabase`` interface and answer the same queries. The report covers
+backend import time (measured in a fresh interpreter), ingestion throughput,
+query latency percentiles, and recall@k against an exact NumPy top-k.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from types import SimpleNamespace
+
+import numpy as np
+
+
+@dataclass(frozen=True, slots=True)
+class BenchmarkScale:
+    vectors: int
+    dimension: int
+    queries: int
+    batch_size: int
+    k: int
+
+
+SCALES = {
+    'quick': BenchmarkScale(vectors=20_000, dimension=384, queries=200, batch_size=500, k=10),
+    'audit': BenchmarkScale(vectors=200_000, dimension=768, queries=500, batch_size=1_000, k=10),
+}
+
+_BACKEND_MODULES = {
+    'numpy': 'langbot.pkg.vector.vdbs.numpy_mmap',
+    'chroma': 'langbot.pkg.vector.vdbs.chroma',
+}
+
+
+class _BenchmarkLogger:
+    def info(self, *_args, **_kwargs) -> None:
+        return None
+
+    def warning(self, *_args, **_kwargs) -> None:
+        return None
+
+
+def _import_seconds(module: str) -> float:
+    # Import the application graph first so only the backend's own cost is measured.
+    code = (
+        'import time\n'
+        'from langbot.pkg.core import app\n'
+        'started = time.perf_counter()\n'
+        f'import {module}\n'
+        'print(time.perf_counter() - started)\n'
+    )
+    output = subprocess.run([sys.executable, '-c', code], check=True, capture_output=True, text=True).stdout
+    return float(output.strip().splitlines()[-1])
+
+
+def _create_backend(name: str, path: str, application: SimpleNamespace):
+    # Match the production import order; see query_scheduler_benchmark.py.
+    from langbot.pkg.core import app as _core_app  # noqa: F401
+
+    if name == 'numpy':
+        from langbot.pkg.vector.vdbs.numpy_mmap import NumpyVectorDatabase
+
+        return NumpyVectorDatabase(application, base_path=path)
+    from langbot.pkg.vector.vdbs.chroma import ChromaVectorDatabase
+
+    return ChromaVectorDatabase(application, base_path=path)
+
+
+async def _run_backend(name: str, scale: BenchmarkScale, vectors: np.ndarray, queries: np.ndarray, expected) -> dict:
+    application = SimpleNamespace(logger=_BenchmarkLogger(), instance_config=SimpleNamespace(data={'vdb': {}}))
+    with tempfile.TemporaryDirectory(prefix=f'langbot-{name}-') as path:
+        backend = _create_backend(name, path, application)
+        # Chroma defaults to L2; configure cosine explicitly so distances and recall compare like for like.
+        if name == 'chroma':
+            backend._collections['bench'] = backend.client.get_or_create_collection(
+                name='bench', metadata={'hnsw:space': 'cosine'}
+            )
+
+        ingest_started_at = time.perf_counter()
+        for start in range(0, scale.vectors, scale.batch_size):
+            stop = min(start + scale.batch_size, scale.vectors)
+            await backend.add_embeddings(
+                'bench',
+                ids=[str(i) for i in range(start, stop)],
+                embeddings_list=vectors[start:stop].tolist(),
+                metadatas=[{'file_id': f'file-{i % 100}'} for i in range(start, stop)],
+            )
+        ingest_seconds = time.perf_counter() - ingest_started_at
+
+        latencies = []
+        hits = 0
+        for query, exact_ids in zip(queries, expected):
+            started_at = time.perf_counter()
+            results = await backend.search('bench', query.tolist(), k=scale.k)
+            latencies.append(time.perf_counter() - started_at)
+            hits += len(exact_ids & set(results['ids'][0]))
+
+        delete_started_at = time.perf_counter()
+        deleted = await backend.delete_by_filter('bench', {'file_id': 'file-0'})
+        delete_seconds = time.perf_counter() - delete_started_at
+        await backend.close()
+
+    latencies_ms = np.array(latencies) * 1000
+    return {
+        'import_seconds': round(_import_seconds(_BACKEND_MODULES[name]), 4),
+        'ingest_seconds': round(ingest_seconds, 4),
+        'vectors_per_second': round(scale.vectors / ingest_seconds, 1),
+        'query_p50_ms': round(float(np.percentile(latencies_ms, 50)), 3),
+        'query_p95_ms': round(float(np.percentile(latencies_ms, 95)), 3),
+        f'recall_at_{scale.k}': round(hits / (scale.queries * scale.k), 4),
+        'delete_by_filter_seconds': round(delete_seconds, 4),
+        'deleted': deleted,
+    }
+
+
+def _clustered(rng: np.random.Generator, topics: np.ndarray, count: int) -> np.ndarray:
+    labels = rng.integers(len(topics), size=count)
+    noise = rng.normal(scale=0.5, size=(count, topics.shape[1])).astype(np.float32)
+    return topics[labels] + noise
+
+
+async def _run(args: argparse.Namespace) -> dict:
+    scale = SCALES[args.scale]
+    rng = np.random.default_rng(args.seed)
+    # Real embeddings cluster by topic; isotropic noise would be a worst case for any ANN index.
+    topics = rng.normal(size=(args.topics, scale.dimension)).astype(np.float32)
+    vectors = _clustered(rng, topics, scale.vectors)
+    queries = _clustered(rng, topics, scale.queries)
+    normalized = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    expected = []
+    for query in queries:
+        scores = normalized @ (query / np.linalg.norm(query))
+        expected.append(set(np.argpartition(-scores, scale.k - 1)[: scale.k].astype(str)))
+
+    backends = {}
+    for name in args.backends:
+        backends[name] = await _run_backend(name, scale, vectors, queries, expected)
+
+    return {
+        'component': 'vector-backend',
+        'scale': args.scale,
+        'work': asdict(scale),
+        'backends': backends,
+        'passed': True,
+    }
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--scale', choices=tuple(SCALES), default='quick')
+    parser.add_argument('--backends', nargs='+', choices=tuple(_BACKEND_MODULES), default=list(_BACKEND_MODULES))
+    parser.add_argument('--topics', type=int, default=256, help='Number of synthetic embedding clusters')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', action='store_true', help='Print compact JSON')
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = _parse_args()
+    result = asyncio.run(_run(args))
+    if args.json:
+        print(json.dumps(result, sort_keys=True))
+    else:
+        print(json.dumps(result, indent=2, sort_keys=True))
+
+
+if __name__ == '__main__':
+    main()
@@ -35,6 +35,12 @@ def _build_parser() -> argparse.ArgumentParser:
         default=False,
     )
     parser.add_argument('--debug', action='store_true', help='Debug mode / 调试模式', default=False)
+    parser.add_argument(
+        '--profile-startup',
+        action='store_true',
+        help='Log startup time and memory per stage and import / 输出启动各阶段与导入的耗时和内存',
+        default=False,
+    )
     subparsers = parser.add_subparsers(dest='command')
     migrate_parser = subparsers.add_parser('migrate', help='Run an operator-only database migration')
     migrate_parser.add_argument(
@@ -105,7 +111,13 @@ async def main_entry(loop: asyncio.AbstractEventLoop):
         await run_cloud_release_migration_from_config(loop)
         return
 
-    from langbot.pkg.core import boot
+    from langbot.pkg.core.bootutils import startup_profile
+
+    if args.profile_startup or startup_profile.enabled_by_environment():
+        startup_profile.enable()
+
+    with startup_profile.measure('import', 'langbot.pkg.core.boot'):
+        from langbot.pkg.core import boot
 
     await boot.main(loop)
 
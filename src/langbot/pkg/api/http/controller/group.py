@@ -1,8 +1,12 @@
 from __future__ import annotations
 
 import abc
+import dataclasses
+import datetime
+import time
 import typing
 import enum
+import jwt
 import quart
 import traceback
 import inspect
@@ -25,6 +29,7 @@ from ..authz import (
     require_permission,
 )
 from ..context import PrincipalContext, PrincipalType, RequestContext, WorkspaceContext
+from ..principal_cache import CachedPrincipal, PrincipalCache
 from ....cloud.support_admin import SupportAdminSessionError
 
 if typing.TYPE_CHECKING:
@@ -139,8 +144,9 @@ class RouterGroup(abc.ABC):
                             self._require_support_admin_route_allowed(rule, f, permission)
                             user_email = None
                         else:
-                            account, user_email = await self._authenticate_account(token)
-                            request_context = await self._resolve_account_context(account, auth_type)
+                            account, user_email, request_context = await self._resolve_account_principal(
+                                token, auth_type
+                            )
                         if permission is not None:
                             if request_context is None:
                                 raise AuthorizationError('Workspace authorization is unavailable')
@@ -199,8 +205,9 @@ class RouterGroup(abc.ABC):
                             )
 
                         try:
-                            account, user_email = await self._authenticate_account(token)
-                            request_context = await self._resolve_account_context(account, auth_type)
+                            account, user_email, request_context = await self._resolve_account_principal(
+                                token, auth_type
+                            )
                             if permission is not None:
                                 if request_context is None:
                                     raise AuthorizationError('Workspace authorization is unavailable')
@@ -416,7 +423,107 @@ class RouterGroup(abc.ABC):
         quart.g.workspace_membership = access.membership
         return request_context
 
+    def _principal_cache(self) -> PrincipalCache | None:
+        cache = getattr(self.ap, 'principal_cache', None)
+        return cache if isinstance(cache, PrincipalCache) and cache.enabled else None
+
+    def _principal_is_current(self, request_context: RequestContext) -> bool:
+        """Reject a cached principal once this process has seen another entitlement revision."""
+
+        deployment = getattr(self.ap, 'deployment', None)
+        if deployment is None or not getattr(deployment, 'multi_workspace_enabled', False):
+            return True
+        current_revision = getattr(getattr(self.ap, 'entitlement_resolver', None), 'current_revision', None)
+        if not callable(current_revision):
+            return False
+        try:
+            return current_revision(request_context.workspace_uuid) == request_context.entitlement_revision
+        except Exception:
+            return False
+
+    def _reuse_principal(self, cached: CachedPrincipal, auth_type: AuthType) -> RequestContext:
+        request_context = dataclasses.replace(
+            cached.request_context,
+            request_id=self.request_id(),
+            auth_type=auth_type.value,
+        )
+        quart.g.request_context = request_context
+        return request_context
+
+    @staticmethod
+    def _token_lifetime_seconds(token: str) -> float:
+        """Remaining lifetime of an already verified JWT; 0 when it cannot be read."""
+
+        try:
+            expires_at = jwt.decode(token, options={'verify_signature': False}).get('exp')
+        except jwt.PyJWTError:
+            return 0.0
+        if isinstance(expires_at, bool) or not isinstance(expires_at, (int, float)):
+            return 0.0
+        return expires_at - time.time()
+
+    async def _resolve_account_principal(
+        self,
+        token: str,
+        auth_type: AuthType,
+    ) -> tuple[typing.Any, str, RequestContext | None]:
+        cache = self._principal_cache()
+        if cache is None:
+            account, user_email = await self._authenticate_account(token)
+            return account, user_email, await self._resolve_account_context(account, auth_type)
+
+        key = cache.key('account', token, quart.request.headers.get('X-Workspace-Id'))
+        cached = cache.get(key, is_current=self._principal_is_current)
+        if cached is not None:
+            request_context = self._reuse_principal(cached, auth_type)
+            quart.g.workspace_membership = cached.membership
+            return cached.account, cached.user_email, request_context
+
+        epoch = cache.epoch
+        account, user_email = await self._authenticate_account(token)
+        request_context = await self._resolve_account_context(account, auth_type)
+        if request_context is not None:
+            cache.put(
+                key,
+                CachedPrincipal(
+                    request_context=request_context,
+                    account=account,
+                    user_email=user_email,
+                    membership=getattr(quart.g, 'workspace_membership', None),
+                ),
+                epoch=epoch,
+                valid_for_seconds=self._token_lifetime_seconds(token),
+            )
+        return account, user_email, request_context
+
     async def _authenticate_api_key(self, api_key: str, auth_type: AuthType) -> RequestContext:
+        cache = self._principal_cache()
+        if cache is None:
+            request_context, _ = await self._resolve_api_key_context(api_key, auth_type)
+            return request_context
+
+        key = cache.key('api_key', api_key)
+        cached = cache.get(key, is_current=self._principal_is_current)
+        if cached is not None:
+            return self._reuse_principal(cached, auth_type)
+
+        epoch = cache.epoch
+        request_context, expires_at = await self._resolve_api_key_context(api_key, auth_type)
+        valid_for_seconds = None
+        if expires_at is not None:
+            valid_for_seconds = (expires_at - datetime.datetime.now(datetime.UTC).replace(tzinfo=None)).total_seconds()
+        cache.put(
+            key, CachedPrincipal(request_context=request_context), epoch=epoch, valid_for_seconds=valid_for_seconds
+        )
+        return request_context
+
+    async def _resolve_api_key_context(
+        self,
+        api_key: str,
+        auth_type: AuthType,
+    ) -> tuple[RequestContext, datetime.datetime | None]:
+        """Authenticate an API key; also returns the key's expiry when it has one."""
+
         authenticator = getattr(self.ap.apikey_service, 'authenticate_api_key', None)
         if callable(authenticator):
             authenticated = authenticator(api_key)
@@ -445,7 +552,7 @@ class RouterGroup(abc.ABC):
                         entitlement_revision=entitlement_revision,
                     )
                     quart.g.request_context = request_context
-                    return request_context
+                    return request_context, getattr(identity, 'expires_at', None)
 
         if not await self.ap.apikey_service.verify_api_key(api_key):
             raise ValueError('Invalid API key')
@@ -470,7 +577,7 @@ class RouterGroup(abc.ABC):
             ),
         )
         quart.g.request_context = request_context
-        return request_context
+        return request_context, None
 
     async def _resolve_entitlement_revision(self, instance_uuid: str, workspace_uuid: str) -> int:
         deployment = getattr(self.ap, 'deployment', None)
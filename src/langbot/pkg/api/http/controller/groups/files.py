@@ -2,15 +2,20 @@ from __future__ import annotations
 
 import quart
 import mimetypes
+import typing
 import uuid
 import asyncio
 
 import quart.datastructures
 
+from .....storage import provider as storage_provider
 from ...authz import Permission
 from ...context import RequestContext
 from .. import group
 
+if typing.TYPE_CHECKING:
+    from .....storage import mgr as storage_mgr
+
 
 def _storage_owner(context: RequestContext) -> str:
     if context.principal.account_uuid:
@@ -20,6 +25,46 @@ def _storage_owner(context: RequestContext) -> str:
     return f'principal:{context.principal.principal_type.value}'
 
 
+async def _iter_upload_chunks(file: quart.datastructures.FileStorage) -> typing.AsyncIterator[bytes]:
+    """Read an uploaded file in bounded chunks so it is never held in memory whole."""
+
+    while True:
+        chunk = await asyncio.to_thread(file.stream.read, storage_provider.DEFAULT_STREAM_CHUNK_BYTES)
+        if not chunk:
+            return
+        yield chunk
+
+
+async def _object_response(stream: storage_mgr.StorageObjectStream, mime_type: str) -> quart.Response:
+    """Serve a stored object without buffering it.
+
+    Local files go through ``send_file``; other providers are streamed in
+    chunks with single-range support.
+    """
+
+    local_path = stream.local_path()
+    if local_path is not None:
+        return await quart.send_file(local_path, mimetype=mime_type, conditional=True)
+
+    offset, length, status = 0, stream.size, 200
+    headers = {'Accept-Ranges': 'bytes'}
+    byte_range = quart.request.range
+    if byte_range is not None and byte_range.units == 'bytes' and len(byte_range.ranges) == 1:
+        range_bounds = byte_range.range_for_length(stream.size)
+        if range_bounds is None:
+            return quart.Response(status=416, headers={'Content-Range': f'bytes */{stream.size}'})
+        offset, end = range_bounds
+        length, status = end - offset, 206
+        headers['Content-Range'] = f'bytes {offset}-{end - 1}/{stream.size}'
+    headers['Content-Length'] = str(length)
+    return quart.Response(
+        stream.iter_chunks(offset=offset, length=length),
+        status=status,
+        mimetype=mime_type,
+        headers=headers,
+    )
+
+
 @group.group_class('files', '/api/v1/files')
 class FilesRouterGroup(group.RouterGroup):
     async def initialize(self) -> None:
@@ -30,22 +75,22 @@ class FilesRouterGroup(group.RouterGroup):
             permission=Permission.RESOURCE_VIEW,
         )
         async def _(image_key: str, request_context: RequestContext) -> quart.Response:
-            image_bytes = await self.ap.storage_mgr.resolve_public_object(
+            image = await self.ap.storage_mgr.open_public_object(
                 image_key,
                 expected_owner_type='upload_image',
             )
-            if image_bytes is None:
-                image_bytes = await self.ap.storage_mgr.resolve_public_object(
+            if image is None:
+                image = await self.ap.storage_mgr.open_public_object(
                     image_key,
                     expected_owner_type='bot_log',
                 )
-            if image_bytes is None:
+            if image is None:
                 return quart.Response(status=404)
             mime_type = mimetypes.guess_type(image_key)[0]
             if mime_type is None:
                 mime_type = 'image/jpeg'
 
-            return quart.Response(image_bytes, mimetype=mime_type)
+            return await _object_response(image, mime_type)
 
         @self.route(
             '/images',
@@ -69,12 +114,6 @@ class FilesRouterGroup(group.RouterGroup):
             file = files['file']
             assert isinstance(file, quart.datastructures.FileStorage)
 
-            file_bytes = await asyncio.to_thread(file.stream.read)
-
-            # Double-check actual file size after reading
-            if len(file_bytes) > group.MAX_FILE_SIZE:
-                return self.fail(400, 'Image size exceeds 10MB limit.')
-
             # Validate image file extension
             allowed_extensions = {'jpg', 'jpeg', 'png', 'gif', 'webp'}
             if '.' in file.filename:
@@ -92,14 +131,18 @@ class FilesRouterGroup(group.RouterGroup):
 
             logical_key = f'{uuid.uuid4()}.{extension}'
 
-            # save file to storage
-            file_key = await self.ap.storage_mgr.save_scoped(
-                request_context,
-                owner_type='upload_image',
-                owner=_storage_owner(request_context),
-                key=logical_key,
-                value=file_bytes,
-            )
+            # Stream the file to storage; the size limit is enforced while writing.
+            try:
+                file_key = await self.ap.storage_mgr.save_scoped_stream(
+                    request_context,
+                    owner_type='upload_image',
+                    owner=_storage_owner(request_context),
+                    key=logical_key,
+                    chunks=_iter_upload_chunks(file),
+                    max_bytes=group.MAX_FILE_SIZE,
+                )
+            except storage_provider.StorageObjectTooLargeError:
+                return self.fail(400, 'Image size exceeds 10MB limit.')
             return self.success(
                 data={
                     'file_key': file_key,
@@ -128,12 +171,6 @@ class FilesRouterGroup(group.RouterGroup):
             file = files['file']
             assert isinstance(file, quart.datastructures.FileStorage)
 
-            file_bytes = await asyncio.to_thread(file.stream.read)
-
-            # Double-check actual file size after reading
-            if len(file_bytes) > group.MAX_FILE_SIZE:
-                return self.fail(400, 'File size exceeds 10MB limit. Please split large files into smaller parts.')
-
             # Split filename and extension properly
             if '.' in file.filename:
                 file_name, extension = file.filename.rsplit('.', 1)
@@ -149,14 +186,18 @@ class FilesRouterGroup(group.RouterGroup):
             if extension:
                 logical_key += '.' + extension
 
-            # save file to storage
-            file_key = await self.ap.storage_mgr.save_scoped(
-                request_context,
-                owner_type='upload_document',
-                owner=_storage_owner(request_context),
-                key=logical_key,
-                value=file_bytes,
-            )
+            # Stream the file to storage; the size limit is enforced while writing.
+            try:
+                file_key = await self.ap.storage_mgr.save_scoped_stream(
+                    request_context,
+                    owner_type='upload_document',
+                    owner=_storage_owner(request_context),
+                    key=logical_key,
+                    chunks=_iter_upload_chunks(file),
+                    max_bytes=group.MAX_FILE_SIZE,
+                )
+            except storage_provider.StorageObjectTooLargeError:
+                return self.fail(400, 'File size exceeds 10MB limit. Please split large files into smaller parts.')
             return self.success(
                 data={
                     'file_id': file_key,
@@ -1,6 +1,9 @@
 from __future__ import annotations
 
 import datetime
+import json
+import typing
+import zlib
 import quart
 
 from ...authz import Permission
@@ -23,6 +26,55 @@ def parse_iso_datetime(datetime_str: str | None) -> datetime.datetime | None:
     return dt
 
 
+_EXPORT_FORMATS = ('csv', 'ndjson')
+# Rows are encoded into chunks of roughly this size before they are handed to
+# the HTTP response, so a large export is neither buffered nor written row by row.
+_EXPORT_CHUNK_BYTES = 64 * 1024
+
+
+async def _encode_export(
+    rows: typing.AsyncIterator[dict],
+    headers: list[str],
+    export_format: str,
+    escape_csv_field: typing.Callable[[object], str],
+    *,
+    use_gzip: bool = False,
+) -> typing.AsyncIterator[bytes]:
+    """Encode streamed export rows into optionally gzip-compressed chunks."""
+
+    compressor = zlib.compressobj(wbits=zlib.MAX_WBITS | 16) if use_gzip else None
+    pending: list[str] = []
+    pending_size = 0
+
+    def encode(text: str) -> bytes:
+        data = text.encode('utf-8')
+        return compressor.compress(data) if compressor is not None else data
+
+    if export_format == 'csv':
+        # UTF-8 BOM for Excel compatibility
+        pending.append('\ufeff' + ','.join(headers) + '\n')
+
+    async for row in rows:
+        if export_format == 'csv':
+            line = ','.join(escape_csv_field(row.get(header, '')) for header in headers) + '\n'
+        else:
+            line = json.dumps({header: row.get(header) for header in headers}, ensure_ascii=False, default=str) + '\n'
+        pending.append(line)
+        pending_size += len(line)
+        if pending_size >= _EXPORT_CHUNK_BYTES:
+            chunk = encode(''.join(pending))
+            pending.clear()
+            pending_size = 0
+            if chunk:
+                yield chunk
+
+    chunk = encode(''.join(pending))
+    if compressor is not None:
+        chunk += compressor.flush()
+    if chunk:
+        yield chunk
+
+
 @group.group_class('monitoring', '/api/v1/monitoring')
 class MonitoringRouterGroup(group.RouterGroup):
     async def initialize(self) -> None:
@@ -414,7 +466,7 @@ class MonitoringRouterGroup(group.RouterGroup):
 
         @self.route('/export', methods=['GET'], permission=Permission.DATA_EXPORT)
         async def export_data(request_context: RequestContext) -> tuple[str, int]:
-            """Export monitoring data as CSV"""
+            """Stream monitoring data as CSV or NDJSON"""
             # Parse query parameters
             export_type = quart.request.args.get('type', 'messages')
             bot_ids = quart.request.args.getlist('botId')
@@ -422,6 +474,9 @@ class MonitoringRouterGroup(group.RouterGroup):
             start_time_str = quart.request.args.get('startTime')
             end_time_str = quart.request.args.get('endTime')
             limit = int(quart.request.args.get('limit', 100000))
+            export_format = quart.request.args.get('format', 'csv')
+            if export_format not in _EXPORT_FORMATS:
+                return self.http_status(400, -1, f'Invalid export format: {export_format}')
 
             # Parse datetime
             start_time = parse_iso_datetime(start_time_str)
@@ -429,7 +484,7 @@ class MonitoringRouterGroup(group.RouterGroup):
 
             # Get data based on export type
             if export_type == 'messages':
-                data = await self.ap.monitoring_service.export_messages(
+                rows = self.ap.monitoring_service.iter_export_messages(
                     request_context,
                     bot_ids=bot_ids if bot_ids else None,
                     pipeline_ids=pipeline_ids if pipeline_ids else None,
@@ -454,7 +509,7 @@ class MonitoringRouterGroup(group.RouterGroup):
                     'user_id',
                 ]
             elif export_type == 'llm-calls':
-                data = await self.ap.monitoring_service.export_llm_calls(
+                rows = self.ap.monitoring_service.iter_export_llm_calls(
                     request_context,
                     bot_ids=bot_ids if bot_ids else None,
                     pipeline_ids=pipeline_ids if pipeline_ids else None,
@@ -481,7 +536,7 @@ class MonitoringRouterGroup(group.RouterGroup):
                     'error_message',
                 ]
             elif export_type == 'embedding-calls':
-                data = await self.ap.monitoring_service.export_embedding_calls(
+                rows = self.ap.monitoring_service.iter_export_embedding_calls(
                     request_context,
                     start_time=start_time,
                     end_time=end_time,
@@ -504,7 +559,7 @@ class MonitoringRouterGroup(group.RouterGroup):
                     'call_type',
                 ]
             elif export_type == 'errors':
-                data = await self.ap.monitoring_service.export_errors(
+                rows = self.ap.monitoring_service.iter_export_errors(
                     request_context,
                     bot_ids=bot_ids if bot_ids else None,
                     pipeline_ids=pipeline_ids if pipeline_ids else None,
@@ -526,7 +581,7 @@ class MonitoringRouterGroup(group.RouterGroup):
                     'stack_trace',
                 ]
             elif export_type == 'sessions':
-                data = await self.ap.monitoring_service.export_sessions(
+                rows = self.ap.monitoring_service.iter_export_sessions(
                     request_context,
                     bot_ids=bot_ids if bot_ids else None,
                     pipeline_ids=pipeline_ids if pipeline_ids else None,
@@ -548,7 +603,7 @@ class MonitoringRouterGroup(group.RouterGroup):
                     'user_id',
                 ]
             elif export_type == 'feedback':
-                data = await self.ap.monitoring_service.export_feedback(
+                rows = self.ap.monitoring_service.iter_export_feedback(
                     request_context,
                     bot_ids=bot_ids if bot_ids else None,
                     pipeline_ids=pipeline_ids if pipeline_ids else None,
@@ -574,32 +629,27 @@ class MonitoringRouterGroup(group.RouterGroup):
                     'platform',
                 ]
             else:
-                return self.error(message=f'Invalid export type: {export_type}', code=400)
-
-            # Generate CSV content with UTF-8 BOM for Excel compatibility
-            import io
-
-            output = io.StringIO()
-            # Write UTF-8 BOM for Excel
-            output.write('\ufeff')
-            # Write header
-            output.write(','.join(headers) + '\n')
-
-            # Escape and write each row
-            for row in data:
-                escaped_values = []
-                for header in headers:
-                    value = row.get(header, '')
-                    escaped_values.append(self.ap.monitoring_service._escape_csv_field(value))
-                output.write(','.join(escaped_values) + '\n')
-
-            csv_content = output.getvalue()
-
-            # Return as file download
-            response = await quart.make_response(csv_content)
-            response.headers['Content-Type'] = 'text/csv; charset=utf-8'
+                return self.http_status(400, -1, f'Invalid export type: {export_type}')
+
+            use_gzip = 'gzip' in quart.request.headers.get('Accept-Encoding', '').lower()
+            response = quart.Response(
+                _encode_export(
+                    rows,
+                    headers,
+                    export_format,
+                    self.ap.monitoring_service._escape_csv_field,
+                    use_gzip=use_gzip,
+                ),
+                mimetype='text/csv' if export_format == 'csv' else 'application/x-ndjson',
+            )
+            if export_format == 'csv':
+                response.headers['Content-Type'] = 'text/csv; charset=utf-8'
+            if use_gzip:
+                response.headers['Content-Encoding'] = 'gzip'
+            response.headers['Vary'] = 'Accept-Encoding'
             response.headers['Content-Disposition'] = (
-                f'attachment; filename="monitoring-{export_type}-{int(datetime.datetime.now().timestamp())}.csv"'
+                f'attachment; filename="monitoring-{export_type}-{int(datetime.datetime.now().timestamp())}'
+                f'.{export_format}"'
             )
 
             return response, 200
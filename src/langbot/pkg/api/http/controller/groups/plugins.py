@@ -1,7 +1,6 @@
 from __future__ import annotations
 
 import asyncio
-import base64
 import collections.abc
 import copy
 import quart
@@ -569,8 +568,7 @@ class PluginsRouterGroup(group.RouterGroup):
         ) -> quart.Response:
             await self._require_authenticated_plugin_runtime_context(request_context)
             icon_data = await self.ap.plugin_connector.get_plugin_icon(author, plugin_name)
-            icon_bytes = await asyncio.to_thread(base64.b64decode, icon_data['plugin_icon_base64'])
-            return quart.Response(icon_bytes, mimetype=icon_data['mime_type'])
+            return quart.Response(icon_data['plugin_icon'], mimetype=icon_data['mime_type'])
 
         @self.route(
             '/<author>/<plugin_name>/authenticated-assets/<path:filepath>',
@@ -589,10 +587,9 @@ class PluginsRouterGroup(group.RouterGroup):
             if asset_path is None:
                 return quart.Response('Asset not found', status=404)
             asset_data = await self.ap.plugin_connector.get_plugin_assets(author, plugin_name, asset_path)
-            if not asset_data.get('asset_base64'):
+            if not asset_data.get('asset'):
                 return quart.Response('Asset not found', status=404)
-            asset_bytes = await asyncio.to_thread(base64.b64decode, asset_data['asset_base64'])
-            return quart.Response(asset_bytes, mimetype=asset_data['mime_type'])
+            return quart.Response(asset_data['asset'], mimetype=asset_data['mime_type'])
 
         @self.route(
             '/<author>/<plugin_name>/icon',
@@ -602,12 +599,7 @@ class PluginsRouterGroup(group.RouterGroup):
         async def _(author: str, plugin_name: str) -> quart.Response:
             await self._require_public_plugin_runtime_context()
             icon_data = await self.ap.plugin_connector.get_plugin_icon(author, plugin_name)
-            icon_base64 = icon_data['plugin_icon_base64']
-            mime_type = icon_data['mime_type']
-
-            icon_data = await asyncio.to_thread(base64.b64decode, icon_base64)
-
-            return quart.Response(icon_data, mimetype=mime_type)
+            return quart.Response(icon_data['plugin_icon'], mimetype=icon_data['mime_type'])
 
         @self.route(
             '/<author>/<plugin_name>/assets/<path:filepath>',
@@ -621,14 +613,10 @@ class PluginsRouterGroup(group.RouterGroup):
                 return quart.Response('Asset not found', status=404)
 
             asset_data = await self.ap.plugin_connector.get_plugin_assets(author, plugin_name, asset_path)
-            if not asset_data.get('asset_base64'):
+            if not asset_data.get('asset'):
                 return quart.Response('Asset not found', status=404)
-            asset_bytes = await asyncio.to_thread(
-                base64.b64decode,
-                asset_data['asset_base64'],
-            )
             mime_type = asset_data['mime_type']
-            resp = quart.Response(asset_bytes, mimetype=mime_type)
+            resp = quart.Response(asset_data['asset'], mimetype=mime_type)
             # CSP for HTML pages served to sandboxed iframes (opaque origin).
             # 'self' doesn't work in sandboxed iframes — use actual server origin.
             if mime_type and mime_type.startswith('text/html'):
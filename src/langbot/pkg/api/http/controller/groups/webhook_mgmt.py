@@ -25,6 +25,7 @@ class WebhookManagementRouterGroup(group.RouterGroup):
             url = json_data.get('url', '')
             description = json_data.get('description', '')
             enabled = json_data.get('enabled', True)
+            can_skip_pipeline = json_data.get('can_skip_pipeline', False)
 
             if not name:
                 return self.http_status(400, -1, 'Name is required')
@@ -38,6 +39,7 @@ class WebhookManagementRouterGroup(group.RouterGroup):
                     url,
                     description,
                     enabled,
+                    can_skip_pipeline,
                 )
             except ValueError as exc:
                 return self.http_status(400, -1, str(exc))
@@ -69,6 +71,7 @@ class WebhookManagementRouterGroup(group.RouterGroup):
                     json_data.get('url'),
                     json_data.get('description'),
                     json_data.get('enabled'),
+                    json_data.get('can_skip_pipeline'),
                 )
                 if not updated:
                     return self.http_status(404, -1, 'Webhook not found')
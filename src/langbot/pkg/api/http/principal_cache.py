@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import collections
+import dataclasses
+import hashlib
+import math
+import time
+import typing
+
+from .context import PrincipalType, RequestContext
+
+
+DEFAULT_TTL_SECONDS = 5.0
+DEFAULT_MAX_ENTRIES = 4096
+
+PrincipalCacheKey = tuple[str, str, str | None]
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class CachedPrincipal:
+    """Authentication results reused across requests presenting the same credential."""
+
+    request_context: RequestContext
+    account: typing.Any = None
+    user_email: str | None = None
+    membership: typing.Any = None
+
+
+class PrincipalCache:
+    """Short-lived cache of resolved HTTP principals.
+
+    Entries are keyed by a hash of the credential and the requested Workspace
+    selector, never by the credential itself. Membership, API-key and directory
+    changes drop the affected entries; ``ttl_seconds`` bounds how long a change
+    made by another replica can go unnoticed.
+    """
+
+    def __init__(
+        self,
+        *,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: collections.OrderedDict[PrincipalCacheKey, tuple[CachedPrincipal, float]] = (
+            collections.OrderedDict()
+        )
+        self._epoch = 0
+        self._hits = 0
+        self._misses = 0
+        self._stale = 0
+        self._invalidations = 0
+
+    @classmethod
+    def from_config(cls, config: dict[str, typing.Any]) -> PrincipalCache:
+        """Build from the ``api.principal_cache`` section."""
+
+        ttl_seconds = config.get('ttl_seconds', DEFAULT_TTL_SECONDS)
+        if (
+            isinstance(ttl_seconds, bool)
+            or not isinstance(ttl_seconds, (int, float))
+            or not math.isfinite(ttl_seconds)
+            or ttl_seconds < 0
+        ):
+            ttl_seconds = DEFAULT_TTL_SECONDS
+        max_entries = config.get('max_entries', DEFAULT_MAX_ENTRIES)
+        if isinstance(max_entries, bool) or not isinstance(max_entries, int) or max_entries < 1:
+            max_entries = DEFAULT_MAX_ENTRIES
+        return cls(ttl_seconds=float(ttl_seconds), max_entries=max_entries)
+
+    @staticmethod
+    def key(credential_kind: str, credential: str, workspace_selector: str | None = None) -> PrincipalCacheKey:
+        digest = hashlib.sha256(credential.encode('utf-8')).hexdigest()
+        return credential_kind, digest, workspace_selector or None
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0
+
+    @property
+    def epoch(self) -> int:
+        """Changes on every invalidation; pass the value read before resolving to ``put``."""
+
+        return self._epoch
+
+    def get(
+        self,
+        key: PrincipalCacheKey,
+        *,
+        is_current: typing.Callable[[RequestContext], bool] | None = None,
+    ) -> CachedPrincipal | None:
+        """Return a live entry, or ``None`` when the credential must be resolved again.
+
+        ``is_current`` rejects entries whose revisions no longer match what the
+        process has seen since, for example a newer entitlement revision.
+        """
+
+        if not self.enabled:
+            return None
+        cached = self._entries.get(key)
+        if cached is None:
+            self._misses += 1
+            return None
+        principal, expires_at = cached
+        if time.monotonic() >= expires_at or (is_current is not None and not is_current(principal.request_context)):
+            del self._entries[key]
+            self._stale += 1
+            self._misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self._hits += 1
+        return principal
+
+    def put(
+        self,
+        key: PrincipalCacheKey,
+        principal: CachedPrincipal,
+        *,
+        epoch: int,
+        valid_for_seconds: float | None = None,
+    ) -> None:
+        """Store a resolved principal unless an invalidation ran while it was resolved.
+
+        ``valid_for_seconds`` caps the entry at the credential's own remaining
+        lifetime, such as a token or API-key expiry.
+        """
+
+        if not self.enabled or epoch != self._epoch:
+            return
+        ttl = self.ttl_seconds if valid_for_seconds is None else min(self.ttl_seconds, valid_for_seconds)
+        if ttl <= 0:
+            return
+        self._entries[key] = (principal, time.monotonic() + ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(
+        self,
+        workspace_uuids: typing.Iterable[str] | None = None,
+        *,
+        principal_type: PrincipalType | None = None,
+    ) -> None:
+        """Drop entries of ``workspace_uuids`` (all Workspaces for ``None``) and ``principal_type``."""
+
+        self._epoch += 1
+        self._invalidations += 1
+        if workspace_uuids is None and principal_type is None:
+            self._entries.clear()
+            return
+        stale_workspaces = None if workspace_uuids is None else set(workspace_uuids)
+        for key in [
+            key
+            for key, (principal, _) in self._entries.items()
+            if (stale_workspaces is None or principal.request_context.workspace_uuid in stale_workspaces)
+            and (principal_type is None or principal.request_context.principal.principal_type == principal_type)
+        ]:
+            del self._entries[key]
+
+    def snapshot(self) -> dict[str, object]:
+        lookups = self._hits + self._misses
+        return {
+            'entries': len(self._entries),
+            'hits': self._hits,
+            'misses': self._misses,
+            'stale': self._stale,
+            'invalidations': self._invalidations,
+            'hit_rate': round(self._hits / lookups, 4) if lookups else 0.0,
+        }
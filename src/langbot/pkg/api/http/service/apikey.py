@@ -12,6 +12,7 @@ import sqlalchemy
 from ....entity.persistence import apikey
 from ....workspace.errors import WorkspaceNotFoundError
 from ..authz import Permission, PermissionDeniedError
+from ..context import PrincipalType
 from .tenant import TenantContext, require_workspace_uuid, scope_statement
 
 if typing.TYPE_CHECKING:
@@ -27,6 +28,7 @@ class ApiKeyIdentity:
     placement_generation: int
     api_key_uuid: str
     permissions: frozenset[str]
+    expires_at: datetime.datetime | None = None
 
 
 class ApiKeyService:
@@ -254,6 +256,7 @@ class ApiKeyService:
             placement_generation=binding.placement_generation,
             api_key_uuid=scoped_key.uuid,
             permissions=permissions,
+            expires_at=scoped_key.expires_at,
         )
 
     async def verify_api_key(self, secret: str) -> bool:
@@ -274,6 +277,10 @@ class ApiKeyService:
         )
         if getattr(result, 'rowcount', 0) == 0:
             raise WorkspaceNotFoundError('API key not found')
+        # A revoked key must stop authenticating on this replica right away.
+        invalidate = getattr(getattr(self.ap, 'principal_cache', None), 'invalidate', None)
+        if callable(invalidate):
+            invalidate([require_workspace_uuid(context)], principal_type=PrincipalType.API_KEY)
 
     async def update_api_key(
         self,
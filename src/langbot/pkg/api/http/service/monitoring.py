@@ -4,6 +4,8 @@ import uuid
 import datetime
 import functools
 import json
+import types
+import typing
 import sqlalchemy
 from sqlalchemy.dialects import postgresql as postgresql_dialect
 from sqlalchemy.dialects import sqlite as sqlite_dialect
@@ -12,16 +14,22 @@ from ....core import app
 from ....entity.persistence import monitoring as persistence_monitoring
 from ..authz import WorkspaceRequiredError
 from ..context import ExecutionContext
+from .monitoring_buffer import MonitoringWriteBuffer
+from .monitoring_rollup import SOURCE_EMBEDDING_CALL, SOURCE_LLM_CALL, SOURCE_MESSAGE, MonitoringRollups
 from .tenant import TenantContext, require_workspace_uuid
 
 
 _DEFAULT_MONITORING_PAGE_ROWS = 1000
 _DEFAULT_MONITORING_EXPORT_ROWS = 10000
+_DEFAULT_MONITORING_STREAM_EXPORT_ROWS = 100000
+_DEFAULT_MONITORING_EXPORT_PAGE_ROWS = 1000
 _DEFAULT_MONITORING_DETAIL_ROWS = 2000
 _DEFAULT_MONITORING_TIMESERIES_BUCKETS = 1000
 _DEFAULT_MONITORING_MAX_OFFSET = 1000000
 _HARD_MAX_MONITORING_PAGE_ROWS = 5000
 _HARD_MAX_MONITORING_EXPORT_ROWS = 50000
+_HARD_MAX_MONITORING_STREAM_EXPORT_ROWS = 1000000
+_HARD_MAX_MONITORING_EXPORT_PAGE_ROWS = 5000
 _HARD_MAX_MONITORING_DETAIL_ROWS = 10000
 _HARD_MAX_MONITORING_TIMESERIES_BUCKETS = 10000
 _HARD_MAX_MONITORING_OFFSET = 10000000
@@ -49,8 +57,69 @@ class MonitoringService:
 
     ap: app.Application
 
+    write_buffer: MonitoringWriteBuffer | None
+    """Write-behind queue for record_* INSERTs; None writes synchronously."""
+
+    rollups: MonitoringRollups
+    """Hourly pre-aggregates backing overview and token statistics."""
+
     def __init__(self, ap: app.Application) -> None:
         self.ap = ap
+        self.write_buffer = None
+        self.rollups = MonitoringRollups(ap)
+
+    def _write_buffer_config(self) -> dict:
+        config = (
+            getattr(getattr(self.ap, 'instance_config', None), 'data', {}).get('monitoring', {}).get('write_buffer')
+        )
+        return config if isinstance(config, dict) else {}
+
+    def enable_write_buffer(self) -> MonitoringWriteBuffer | None:
+        """Create the write-behind queue configured under ``monitoring.write_buffer``.
+
+        The caller owns the returned buffer's ``run()`` loop. Returns None when
+        the buffer is disabled, in which case every record is written inline.
+        """
+
+        if self.write_buffer is not None:
+            return self.write_buffer
+        config = self._write_buffer_config()
+        if not config.get('enabled', True):
+            return None
+        try:
+            max_pending_rows = int(config.get('max_pending_rows', 10000))
+            flush_rows = int(config.get('flush_rows', 500))
+            flush_interval_seconds = float(config.get('flush_interval_seconds', 1.0))
+        except (TypeError, ValueError):
+            max_pending_rows, flush_rows, flush_interval_seconds = 10000, 500, 1.0
+        self.write_buffer = MonitoringWriteBuffer(
+            self.ap,
+            max_pending_rows=max(max_pending_rows, 1),
+            flush_rows=max(flush_rows, 1),
+            flush_interval_seconds=flush_interval_seconds if flush_interval_seconds > 0 else 1.0,
+        )
+        return self.write_buffer
+
+    async def shutdown(self) -> None:
+        """Flush queued monitoring rows before persistence is closed."""
+
+        write_buffer = self.write_buffer
+        if write_buffer is None:
+            return
+        await write_buffer.close()
+        self.write_buffer = None
+
+    @_workspace_transaction
+    async def _execute_in_workspace(self, context: ExecutionContext, statement) -> None:
+        await self.ap.persistence_mgr.execute_async(statement)
+
+    async def _write_record(self, context: ExecutionContext, model, data: dict) -> None:
+        """Queue a record behind the write buffer or insert it inline."""
+
+        if self.write_buffer is not None:
+            self.write_buffer.enqueue(model, data['workspace_uuid'], data)
+            return
+        await self._execute_in_workspace(context, sqlalchemy.insert(model).values(data))
 
     def _configured_query_limit(self, name: str, default: int, hard_max: int) -> int:
         config = (
@@ -102,6 +171,20 @@ class MonitoringService:
             normalized = _DEFAULT_MONITORING_EXPORT_ROWS
         return min(max(normalized, 1), export_cap)
 
+    def normalize_stream_export_limit(self, limit: int) -> int:
+        """Clamp streamed exports, which hold at most one page of rows."""
+
+        export_cap = self._configured_query_limit(
+            'stream_export_rows',
+            _DEFAULT_MONITORING_STREAM_EXPORT_ROWS,
+            _HARD_MAX_MONITORING_STREAM_EXPORT_ROWS,
+        )
+        try:
+            normalized = int(limit)
+        except (TypeError, ValueError):
+            normalized = _DEFAULT_MONITORING_STREAM_EXPORT_ROWS
+        return min(max(normalized, 1), export_cap)
+
     def _detail_limit(self) -> int:
         return self._configured_query_limit(
             'detail_rows',
@@ -249,6 +332,13 @@ class MonitoringService:
                     batch_size=batch_size,
                     max_batches=max_batches_per_table,
                 )
+            # Rollups follow the same retention, at whole-hour granularity.
+            tenant_uow = getattr(self.ap.persistence_mgr, 'tenant_uow', None)
+            if callable(tenant_uow):
+                async with tenant_uow(workspace_uuid):
+                    deleted_counts['monitoring_hourly_rollups'] = await self.rollups.prune(workspace_uuid, cutoff)
+            else:
+                deleted_counts['monitoring_hourly_rollups'] = await self.rollups.prune(workspace_uuid, cutoff)
             return deleted_counts
 
         tenant_scope = getattr(self.ap.persistence_mgr, 'tenant_scope', None)
@@ -313,6 +403,20 @@ class MonitoringService:
 
         return deleted_total
 
+    # ========== Rollup Methods ==========
+
+    @_workspace_transaction
+    async def compact_rollups(self, context: ExecutionContext) -> int:
+        """Fold settled hours of one Workspace into hourly rollups.
+
+        Returns:
+            The number of rollup rows written.
+        """
+        workspace_uuid = self._require_write_context(context)
+        if not self.rollups.enabled:
+            return 0
+        return await self.rollups.compact(workspace_uuid)
+
     async def _release_sqlite_space(self) -> None:
         database_type = self.ap.instance_config.data.get('database', {}).get('use', 'sqlite')
         if database_type != 'sqlite':
@@ -341,6 +445,7 @@ class MonitoringService:
 
         return f'{text[:max_length]}... [truncated {len(text) - max_length} chars]'
 
+    @_workspace_transaction
     async def _get_message_for_tool_context(
         self,
         context: ExecutionContext,
@@ -402,7 +507,6 @@ class MonitoringService:
 
     # ========== Recording Methods ==========
 
-    @_workspace_transaction
     async def record_message(
         self,
         context: ExecutionContext,
@@ -442,15 +546,19 @@ class MonitoringService:
             'runner_name': runner_name,
             'variables': variables,
             'role': role,
+            # Filled in by update_message_status; present from the start so a
+            # buffered row keeps the same keys as its neighbours.
+            'db_statements': None,
+            'db_time_ms': None,
+            'tool_rounds': None,
+            'tool_wall_ms': None,
+            'tool_time_ms': None,
         }
 
-        await self.ap.persistence_mgr.execute_async(
-            sqlalchemy.insert(persistence_monitoring.MonitoringMessage).values(message_data)
-        )
+        await self._write_record(context, persistence_monitoring.MonitoringMessage, message_data)
 
         return message_id
 
-    @_workspace_transaction
     async def record_llm_call(
         self,
         context: ExecutionContext,
@@ -491,13 +599,10 @@ class MonitoringService:
             'message_id': message_id,
         }
 
-        await self.ap.persistence_mgr.execute_async(
-            sqlalchemy.insert(persistence_monitoring.MonitoringLLMCall).values(call_data)
-        )
+        await self._write_record(context, persistence_monitoring.MonitoringLLMCall, call_data)
 
         return call_id
 
-    @_workspace_transaction
     async def record_tool_call(
         self,
         context: ExecutionContext,
@@ -517,11 +622,17 @@ class MonitoringService:
     ) -> str:
         """Record a tool call."""
         workspace_uuid = self._require_write_context(context)
-        context_message = await self._get_message_for_tool_context(
-            context,
-            message_id=message_id,
-            session_id=session_id,
-        )
+        context_message = None
+        if self.write_buffer is not None:
+            pending_message = self.write_buffer.get_pending_message(workspace_uuid, message_id)
+            if pending_message is not None:
+                context_message = types.SimpleNamespace(**pending_message)
+        if context_message is None:
+            context_message = await self._get_message_for_tool_context(
+                context,
+                message_id=message_id,
+                session_id=session_id,
+            )
         if context_message:
             bot_id = bot_id or context_message.bot_id
             bot_name = bot_name or context_message.bot_name
@@ -550,13 +661,10 @@ class MonitoringService:
             'error_message': self._serialize_tool_payload(error_message),
         }
 
-        await self.ap.persistence_mgr.execute_async(
-            sqlalchemy.insert(persistence_monitoring.MonitoringToolCall).values(call_data)
-        )
+        await self._write_record(context, persistence_monitoring.MonitoringToolCall, call_data)
 
         return call_id
 
-    @_workspace_transaction
     async def record_embedding_call(
         self,
         context: ExecutionContext,
@@ -594,9 +702,7 @@ class MonitoringService:
             'call_type': call_type,
         }
 
-        await self.ap.persistence_mgr.execute_async(
-            sqlalchemy.insert(persistence_monitoring.MonitoringEmbeddingCall).values(call_data)
-        )
+        await self._write_record(context, persistence_monitoring.MonitoringEmbeddingCall, call_data)
 
         return call_id
 
@@ -711,7 +817,6 @@ class MonitoringService:
 
         return error_id
 
-    @_workspace_transaction
     async def update_message_status(
         self,
         context: ExecutionContext,
@@ -719,22 +824,43 @@ class MonitoringService:
         status: str,
         level: str | None = None,
         variables: str | None = None,
+        db_statements: int | None = None,
+        db_time_ms: int | None = None,
+        tool_rounds: int | None = None,
+        tool_wall_ms: int | None = None,
+        tool_time_ms: int | None = None,
     ) -> None:
-        """Update message status and optionally variables"""
+        """Update message status and optionally variables, SQL cost and tool call round timings"""
         workspace_uuid = self._require_write_context(context)
         update_values = {'status': status}
         if level is not None:
             update_values['level'] = level
         if variables is not None:
             update_values['variables'] = variables
-
-        await self.ap.persistence_mgr.execute_async(
+        if db_statements is not None:
+            update_values['db_statements'] = db_statements
+        if db_time_ms is not None:
+            update_values['db_time_ms'] = db_time_ms
+        if tool_rounds is not None:
+            update_values['tool_rounds'] = tool_rounds
+        if tool_wall_ms is not None:
+            update_values['tool_wall_ms'] = tool_wall_ms
+        if tool_time_ms is not None:
+            update_values['tool_time_ms'] = tool_time_ms
+
+        if self.write_buffer is not None:
+            if self.write_buffer.update_pending_message(workspace_uuid, message_id, update_values):
+                return
+            await self.write_buffer.wait_for_message(workspace_uuid, message_id)
+
+        await self._execute_in_workspace(
+            context,
             sqlalchemy.update(persistence_monitoring.MonitoringMessage)
             .where(
                 persistence_monitoring.MonitoringMessage.workspace_uuid == workspace_uuid,
                 persistence_monitoring.MonitoringMessage.id == message_id,
             )
-            .values(update_values)
+            .values(update_values),
         )
 
     # ========== Query Methods ==========
@@ -777,13 +903,55 @@ class MonitoringService:
             embedding_conditions.append(persistence_monitoring.MonitoringEmbeddingCall.timestamp <= end_time)
             session_conditions.append(persistence_monitoring.MonitoringSession.start_time <= end_time)
 
-        # Total messages
-        message_query = sqlalchemy.select(sqlalchemy.func.count(persistence_monitoring.MonitoringMessage.id))
+        # Closed hours below the rollup watermark come from pre-aggregated
+        # rows; only the remainder of the range scans the raw tables.
+        window = await self.rollups.get_window(workspace_uuid, start_time, end_time)
+        rollup_totals: dict[str, tuple[int, int]] = {}
+        if window is not None:
+            message_conditions.extend(window.raw_conditions(persistence_monitoring.MonitoringMessage.timestamp))
+            llm_conditions.extend(window.raw_conditions(persistence_monitoring.MonitoringLLMCall.timestamp))
+            embedding_conditions.extend(window.raw_conditions(persistence_monitoring.MonitoringEmbeddingCall.timestamp))
+            Rollup = persistence_monitoring.MonitoringHourlyRollup
+            rollup_conditions = [Rollup.workspace_uuid == workspace_uuid, *window.rollup_conditions()]
+            # Embedding calls carry no bot or pipeline and are never filtered by them.
+            if bot_ids:
+                rollup_conditions.append(
+                    sqlalchemy.or_(Rollup.source == SOURCE_EMBEDDING_CALL, Rollup.bot_id.in_(bot_ids))
+                )
+            if pipeline_ids:
+                rollup_conditions.append(
+                    sqlalchemy.or_(Rollup.source == SOURCE_EMBEDDING_CALL, Rollup.pipeline_id.in_(pipeline_ids))
+                )
+            rollup_result = await self.ap.persistence_mgr.execute_async(
+                sqlalchemy.select(
+                    Rollup.source,
+                    sqlalchemy.func.coalesce(sqlalchemy.func.sum(Rollup.record_count), 0),
+                    sqlalchemy.func.coalesce(sqlalchemy.func.sum(Rollup.success_count), 0),
+                )
+                .where(*rollup_conditions)
+                .group_by(Rollup.source)
+            )
+            rollup_totals = {
+                source: (int(record_count or 0), int(success_count or 0))
+                for source, record_count, success_count in rollup_result.all()
+            }
+
+        # Total and successful messages
+        message_query = sqlalchemy.select(
+            sqlalchemy.func.count(persistence_monitoring.MonitoringMessage.id),
+            sqlalchemy.func.sum(
+                sqlalchemy.case((persistence_monitoring.MonitoringMessage.status == 'success', 1), else_=0)
+            ),
+        )
         if message_conditions:
             message_query = message_query.where(sqlalchemy.and_(*message_conditions))
 
-        total_messages_result = await self.ap.persistence_mgr.execute_async(message_query)
-        total_messages = total_messages_result.scalar() or 0
+        message_result = await self.ap.persistence_mgr.execute_async(message_query)
+        message_row = message_result.first()
+        raw_messages, raw_successes = message_row if message_row else (0, 0)
+        rollup_messages, rollup_successes = rollup_totals.get(SOURCE_MESSAGE, (0, 0))
+        total_messages = (raw_messages or 0) + rollup_messages
+        success_count = (raw_successes or 0) + rollup_successes
 
         # Total LLM calls
         llm_query = sqlalchemy.select(sqlalchemy.func.count(persistence_monitoring.MonitoringLLMCall.id))
@@ -791,7 +959,7 @@ class MonitoringService:
             llm_query = llm_query.where(sqlalchemy.and_(*llm_conditions))
 
         llm_calls_result = await self.ap.persistence_mgr.execute_async(llm_query)
-        llm_calls = llm_calls_result.scalar() or 0
+        llm_calls = (llm_calls_result.scalar() or 0) + rollup_totals.get(SOURCE_LLM_CALL, (0, 0))[0]
 
         # Total Embedding calls
         embedding_query = sqlalchemy.select(sqlalchemy.func.count(persistence_monitoring.MonitoringEmbeddingCall.id))
@@ -799,20 +967,12 @@ class MonitoringService:
             embedding_query = embedding_query.where(sqlalchemy.and_(*embedding_conditions))
 
         embedding_calls_result = await self.ap.persistence_mgr.execute_async(embedding_query)
-        embedding_calls = embedding_calls_result.scalar() or 0
+        embedding_calls = (embedding_calls_result.scalar() or 0) + rollup_totals.get(SOURCE_EMBEDDING_CALL, (0, 0))[0]
 
         # Total model calls (LLM + Embedding)
         model_calls = llm_calls + embedding_calls
 
         # Success rate (based on messages)
-        success_query = sqlalchemy.select(sqlalchemy.func.count(persistence_monitoring.MonitoringMessage.id)).where(
-            persistence_monitoring.MonitoringMessage.status == 'success'
-        )
-        if message_conditions:
-            success_query = success_query.where(sqlalchemy.and_(*message_conditions))
-
-        success_result = await self.ap.persistence_mgr.execute_async(success_query)
-        success_count = success_result.scalar() or 0
         success_rate = (success_count / total_messages * 100) if total_messages > 0 else 100
 
         # Active sessions
@@ -859,16 +1019,27 @@ class MonitoringService:
         if bucket not in {'hour', 'day'}:
             bucket = 'hour'
 
+        Rollup = persistence_monitoring.MonitoringHourlyRollup
         conditions = [LLMCall.workspace_uuid == workspace_uuid]
+        rollup_conditions = [Rollup.workspace_uuid == workspace_uuid, Rollup.source == SOURCE_LLM_CALL]
         if bot_ids:
             conditions.append(LLMCall.bot_id.in_(bot_ids))
+            rollup_conditions.append(Rollup.bot_id.in_(bot_ids))
         if pipeline_ids:
             conditions.append(LLMCall.pipeline_id.in_(pipeline_ids))
+            rollup_conditions.append(Rollup.pipeline_id.in_(pipeline_ids))
         if start_time:
             conditions.append(LLMCall.timestamp >= start_time)
         if end_time:
             conditions.append(LLMCall.timestamp <= end_time)
 
+        # Closed hours below the rollup watermark are read from
+        # pre-aggregated rows and the raw scan is limited to the remainder.
+        window = await self.rollups.get_window(workspace_uuid, start_time, end_time)
+        if window is not None:
+            conditions.extend(window.raw_conditions(LLMCall.timestamp))
+            rollup_conditions.extend(window.rollup_conditions())
+
         def _apply(query):
             if conditions:
                 query = query.where(sqlalchemy.and_(*conditions))
@@ -897,6 +1068,24 @@ class MonitoringService:
         )
         summary_result = await self.ap.persistence_mgr.execute_async(summary_query)
         row = summary_result.first()
+        summary_totals = [value or 0 for value in row] if row else [0, 0, 0, 0, 0, 0.0, 0, 0, 0]
+        if window is not None:
+            rollup_summary_result = await self.ap.persistence_mgr.execute_async(
+                sqlalchemy.select(
+                    sqlalchemy.func.sum(Rollup.record_count),
+                    sqlalchemy.func.sum(Rollup.input_tokens),
+                    sqlalchemy.func.sum(Rollup.output_tokens),
+                    sqlalchemy.func.sum(Rollup.total_tokens),
+                    sqlalchemy.func.sum(Rollup.duration),
+                    sqlalchemy.func.sum(Rollup.cost),
+                    sqlalchemy.func.sum(Rollup.success_count),
+                    sqlalchemy.func.sum(Rollup.error_count),
+                    sqlalchemy.func.sum(Rollup.zero_token_success_count),
+                ).where(*rollup_conditions)
+            )
+            rollup_row = rollup_summary_result.first()
+            if rollup_row:
+                summary_totals = [total + (value or 0) for total, value in zip(summary_totals, rollup_row)]
         (
             total_calls,
             total_input_tokens,
@@ -907,12 +1096,7 @@ class MonitoringService:
             success_calls,
             error_calls,
             zero_token_success_calls,
-        ) = row if row else (0, 0, 0, 0, 0, 0.0, 0, 0, 0)
-
-        total_calls = total_calls or 0
-        success_calls = success_calls or 0
-        error_calls = error_calls or 0
-        zero_token_success_calls = zero_token_success_calls or 0
+        ) = summary_totals
 
         summary = {
             'total_calls': total_calls,
@@ -952,6 +1136,40 @@ class MonitoringService:
         by_model_result = await self.ap.persistence_mgr.execute_async(by_model_query)
         by_model_rows = by_model_result.all()
         by_model_truncated = len(by_model_rows) > model_limit
+        if window is not None:
+            rollup_model_total_tokens = sqlalchemy.func.sum(Rollup.total_tokens)
+            rollup_model_result = await self.ap.persistence_mgr.execute_async(
+                sqlalchemy.select(
+                    Rollup.model_name,
+                    sqlalchemy.func.sum(Rollup.record_count),
+                    sqlalchemy.func.sum(Rollup.input_tokens),
+                    sqlalchemy.func.sum(Rollup.output_tokens),
+                    rollup_model_total_tokens,
+                    sqlalchemy.func.sum(Rollup.duration),
+                    sqlalchemy.func.sum(Rollup.cost),
+                    sqlalchemy.func.sum(Rollup.error_count),
+                )
+                .where(*rollup_conditions)
+                .group_by(Rollup.model_name)
+                .order_by(rollup_model_total_tokens.desc())
+                .limit(model_limit + 1)
+            )
+            rollup_model_rows = rollup_model_result.all()
+            merged_models: dict[str, list] = {}
+            for model_name, *values in [*by_model_rows, *rollup_model_rows]:
+                totals = merged_models.get(model_name)
+                if totals is None:
+                    merged_models[model_name] = [value or 0 for value in values]
+                else:
+                    merged_models[model_name] = [total + (value or 0) for total, value in zip(totals, values)]
+            by_model_truncated = (
+                by_model_truncated or len(rollup_model_rows) > model_limit or len(merged_models) > model_limit
+            )
+            by_model_rows = sorted(
+                ((model_name, *values) for model_name, values in merged_models.items()),
+                key=lambda model_row: model_row[4],
+                reverse=True,
+            )
         by_model = []
         for mrow in by_model_rows[:model_limit]:
             (
@@ -1002,10 +1220,45 @@ class MonitoringService:
             .limit(bucket_limit + 1)
         )
         series_result = await self.ap.persistence_mgr.execute_async(series_query)
-
-        bucket_fmt = '%Y-%m-%d %H:00' if bucket == 'hour' else '%Y-%m-%d'
         series_rows = series_result.all()
         timeseries_truncated = len(series_rows) > bucket_limit
+        if window is not None:
+            rollup_bucket_expression = self._token_bucket_expression(
+                Rollup.bucket_start,
+                bucket=bucket,
+                dialect_name=engine.dialect.name,
+            )
+            rollup_series_result = await self.ap.persistence_mgr.execute_async(
+                sqlalchemy.select(
+                    rollup_bucket_expression.label('bucket'),
+                    sqlalchemy.func.sum(Rollup.input_tokens),
+                    sqlalchemy.func.sum(Rollup.output_tokens),
+                    sqlalchemy.func.sum(Rollup.total_tokens),
+                    sqlalchemy.func.sum(Rollup.record_count),
+                )
+                .where(*rollup_conditions)
+                .group_by(rollup_bucket_expression)
+                .order_by(rollup_bucket_expression.desc())
+                .limit(bucket_limit + 1)
+            )
+            rollup_series_rows = rollup_series_result.all()
+            merged_buckets: dict[object, list] = {}
+            for bucket_value, *values in [*series_rows, *rollup_series_rows]:
+                if bucket_value is None:
+                    continue
+                totals = merged_buckets.get(bucket_value)
+                if totals is None:
+                    merged_buckets[bucket_value] = [value or 0 for value in values]
+                else:
+                    merged_buckets[bucket_value] = [total + (value or 0) for total, value in zip(totals, values)]
+            timeseries_truncated = (
+                timeseries_truncated or len(rollup_series_rows) > bucket_limit or len(merged_buckets) > bucket_limit
+            )
+            series_rows = [
+                (bucket_value, *merged_buckets[bucket_value]) for bucket_value in sorted(merged_buckets, reverse=True)
+            ]
+
+        bucket_fmt = '%Y-%m-%d %H:00' if bucket == 'hour' else '%Y-%m-%d'
         timeseries = []
         for bucket_value, s_in, s_out, s_total, calls in reversed(series_rows[:bucket_limit]):
             if bucket_value is None:
@@ -1755,6 +2008,65 @@ class MonitoringService:
             # If not valid JSON, return as-is
             return message_content
 
+    def _export_page_rows(self) -> int:
+        return self._configured_query_limit(
+            'export_page_rows',
+            _DEFAULT_MONITORING_EXPORT_PAGE_ROWS,
+            _HARD_MAX_MONITORING_EXPORT_PAGE_ROWS,
+        )
+
+    async def _iter_export_rows(
+        self,
+        workspace_uuid: str,
+        model: type,
+        conditions: list,
+        order_column: sqlalchemy.Column,
+        key_column: sqlalchemy.Column,
+        limit: int,
+    ) -> typing.AsyncIterator[sqlalchemy.Row]:
+        """Yield rows newest first in keyset pages of ``export_page_rows``.
+
+        Each page is a separate short Workspace transaction, so a slow export
+        consumer holds neither a connection nor more than one page of rows.
+        """
+
+        page_rows = self._export_page_rows()
+        remaining = limit
+        cursor: tuple | None = None
+        while remaining > 0:
+            page_conditions = list(conditions)
+            if cursor is not None:
+                last_order, last_key = cursor
+                page_conditions.append(
+                    sqlalchemy.or_(
+                        order_column < last_order,
+                        sqlalchemy.and_(order_column == last_order, key_column < last_key),
+                    )
+                )
+            page_limit = min(page_rows, remaining)
+            query = (
+                sqlalchemy.select(model)
+                .where(sqlalchemy.and_(*page_conditions))
+                .order_by(order_column.desc(), key_column.desc())
+                .limit(page_limit)
+            )
+            tenant_uow = getattr(self.ap.persistence_mgr, 'tenant_uow', None)
+            if callable(tenant_uow):
+                async with tenant_uow(workspace_uuid):
+                    result = await self.ap.persistence_mgr.execute_async(query)
+                    rows = result.all()
+            else:
+                result = await self.ap.persistence_mgr.execute_async(query)
+                rows = result.all()
+
+            for row in rows:
+                yield row
+            if len(rows) < page_limit:
+                return
+            remaining -= len(rows)
+            last_row = rows[-1]
+            cursor = (getattr(last_row, order_column.key), getattr(last_row, key_column.key))
+
     async def export_messages(
         self,
         context: TenantContext,
@@ -1765,51 +2077,66 @@ class MonitoringService:
         limit: int = 100000,
     ) -> list[dict]:
         """Export messages as list of dictionaries for CSV conversion"""
-        limit = self.normalize_export_limit(limit)
+        return [
+            row
+            async for row in self.iter_export_messages(
+                context,
+                bot_ids=bot_ids,
+                pipeline_ids=pipeline_ids,
+                start_time=start_time,
+                end_time=end_time,
+                limit=self.normalize_export_limit(limit),
+            )
+        ]
+
+    async def iter_export_messages(
+        self,
+        context: TenantContext,
+        bot_ids: list[str] | None = None,
+        pipeline_ids: list[str] | None = None,
+        start_time: datetime.datetime | None = None,
+        end_time: datetime.datetime | None = None,
+        limit: int = 100000,
+    ) -> typing.AsyncIterator[dict]:
+        """Stream messages for export, newest first"""
+        limit = self.normalize_stream_export_limit(limit)
         workspace_uuid = require_workspace_uuid(context)
-        conditions = [persistence_monitoring.MonitoringMessage.workspace_uuid == workspace_uuid]
+        MonitoringMessage = persistence_monitoring.MonitoringMessage
+        conditions = [MonitoringMessage.workspace_uuid == workspace_uuid]
 
         if bot_ids:
-            conditions.append(persistence_monitoring.MonitoringMessage.bot_id.in_(bot_ids))
+            conditions.append(MonitoringMessage.bot_id.in_(bot_ids))
         if pipeline_ids:
-            conditions.append(persistence_monitoring.MonitoringMessage.pipeline_id.in_(pipeline_ids))
+            conditions.append(MonitoringMessage.pipeline_id.in_(pipeline_ids))
         if start_time:
-            conditions.append(persistence_monitoring.MonitoringMessage.timestamp >= start_time)
+            conditions.append(MonitoringMessage.timestamp >= start_time)
         if end_time:
-            conditions.append(persistence_monitoring.MonitoringMessage.timestamp <= end_time)
-
-        query = sqlalchemy.select(persistence_monitoring.MonitoringMessage).order_by(
-            persistence_monitoring.MonitoringMessage.timestamp.desc()
-        )
-        if conditions:
-            query = query.where(sqlalchemy.and_(*conditions))
-
-        query = query.limit(limit)
-
-        result = await self.ap.persistence_mgr.execute_async(query)
-        rows = result.all()
-
-        return [
-            {
-                'id': row[0].id if isinstance(row, tuple) else row.id,
-                'timestamp': self._format_timestamp(row[0].timestamp if isinstance(row, tuple) else row.timestamp),
-                'bot_id': row[0].bot_id if isinstance(row, tuple) else row.bot_id,
-                'bot_name': row[0].bot_name if isinstance(row, tuple) else row.bot_name,
-                'pipeline_id': row[0].pipeline_id if isinstance(row, tuple) else row.pipeline_id,
-                'pipeline_name': row[0].pipeline_name if isinstance(row, tuple) else row.pipeline_name,
-                'runner_name': row[0].runner_name if isinstance(row, tuple) else row.runner_name,
-                'message_content': row[0].message_content if isinstance(row, tuple) else row.message_content,
-                'message_text': self._extract_message_text(
-                    row[0].message_content if isinstance(row, tuple) else row.message_content
-                ),
-                'session_id': row[0].session_id if isinstance(row, tuple) else row.session_id,
-                'status': row[0].status if isinstance(row, tuple) else row.status,
-                'level': row[0].level if isinstance(row, tuple) else row.level,
-                'platform': row[0].platform if isinstance(row, tuple) else row.platform,
-                'user_id': row[0].user_id if isinstance(row, tuple) else row.user_id,
+            conditions.append(MonitoringMessage.timestamp <= end_time)
+
+        async for row in self._iter_export_rows(
+            workspace_uuid,
+            MonitoringMessage,
+            conditions,
+            MonitoringMessage.timestamp,
+            MonitoringMessage.id,
+            limit,
+        ):
+            yield {
+                'id': row.id,
+                'timestamp': self._format_timestamp(row.timestamp),
+                'bot_id': row.bot_id,
+                'bot_name': row.bot_name,
+                'pipeline_id': row.pipeline_id,
+                'pipeline_name': row.pipeline_name,
+                'runner_name': row.runner_name,
+                'message_content': row.message_content,
+                'message_text': self._extract_message_text(row.message_content),
+                'session_id': row.session_id,
+                'status': row.status,
+                'level': row.level,
+                'platform': row.platform,
+                'user_id': row.user_id,
             }
-            for row in rows
-        ]
 
     async def export_llm_calls(
         self,
@@ -1821,51 +2148,68 @@ class MonitoringService:
         limit: int = 100000,
     ) -> list[dict]:
         """Export LLM calls as list of dictionaries for CSV conversion"""
-        limit = self.normalize_export_limit(limit)
+        return [
+            row
+            async for row in self.iter_export_llm_calls(
+                context,
+                bot_ids=bot_ids,
+                pipeline_ids=pipeline_ids,
+                start_time=start_time,
+                end_time=end_time,
+                limit=self.normalize_export_limit(limit),
+            )
+        ]
+
+    async def iter_export_llm_calls(
+        self,
+        context: TenantContext,
+        bot_ids: list[str] | None = None,
+        pipeline_ids: list[str] | None = None,
+        start_time: datetime.datetime | None = None,
+        end_time: datetime.datetime | None = None,
+        limit: int = 100000,
+    ) -> typing.AsyncIterator[dict]:
+        """Stream LLM calls for export, newest first"""
+        limit = self.normalize_stream_export_limit(limit)
         workspace_uuid = require_workspace_uuid(context)
-        conditions = [persistence_monitoring.MonitoringLLMCall.workspace_uuid == workspace_uuid]
+        MonitoringLLMCall = persistence_monitoring.MonitoringLLMCall
+        conditions = [MonitoringLLMCall.workspace_uuid == workspace_uuid]
 
         if bot_ids:
-            conditions.append(persistence_monitoring.MonitoringLLMCall.bot_id.in_(bot_ids))
+            conditions.append(MonitoringLLMCall.bot_id.in_(bot_ids))
         if pipeline_ids:
-            conditions.append(persistence_monitoring.MonitoringLLMCall.pipeline_id.in_(pipeline_ids))
+            conditions.append(MonitoringLLMCall.pipeline_id.in_(pipeline_ids))
         if start_time:
-            conditions.append(persistence_monitoring.MonitoringLLMCall.timestamp >= start_time)
+            conditions.append(MonitoringLLMCall.timestamp >= start_time)
         if end_time:
-            conditions.append(persistence_monitoring.MonitoringLLMCall.timestamp <= end_time)
-
-        query = sqlalchemy.select(persistence_monitoring.MonitoringLLMCall).order_by(
-            persistence_monitoring.MonitoringLLMCall.timestamp.desc()
-        )
-        if conditions:
-            query = query.where(sqlalchemy.and_(*conditions))
-
-        query = query.limit(limit)
-
-        result = await self.ap.persistence_mgr.execute_async(query)
-        rows = result.all()
-
-        return [
-            {
-                'id': row[0].id if isinstance(row, tuple) else row.id,
-                'timestamp': self._format_timestamp(row[0].timestamp if isinstance(row, tuple) else row.timestamp),
-                'model_name': row[0].model_name if isinstance(row, tuple) else row.model_name,
-                'input_tokens': row[0].input_tokens if isinstance(row, tuple) else row.input_tokens,
-                'output_tokens': row[0].output_tokens if isinstance(row, tuple) else row.output_tokens,
-                'total_tokens': row[0].total_tokens if isinstance(row, tuple) else row.total_tokens,
-                'duration_ms': row[0].duration if isinstance(row, tuple) else row.duration,
-                'cost': row[0].cost if isinstance(row, tuple) else row.cost,
-                'status': row[0].status if isinstance(row, tuple) else row.status,
-                'bot_id': row[0].bot_id if isinstance(row, tuple) else row.bot_id,
-                'bot_name': row[0].bot_name if isinstance(row, tuple) else row.bot_name,
-                'pipeline_id': row[0].pipeline_id if isinstance(row, tuple) else row.pipeline_id,
-                'pipeline_name': row[0].pipeline_name if isinstance(row, tuple) else row.pipeline_name,
-                'session_id': row[0].session_id if isinstance(row, tuple) else row.session_id,
-                'message_id': row[0].message_id if isinstance(row, tuple) else row.message_id,
-                'error_message': row[0].error_message if isinstance(row, tuple) else row.error_message,
+            conditions.append(MonitoringLLMCall.timestamp <= end_time)
+
+        async for row in self._iter_export_rows(
+            workspace_uuid,
+            MonitoringLLMCall,
+            conditions,
+            MonitoringLLMCall.timestamp,
+            MonitoringLLMCall.id,
+            limit,
+        ):
+            yield {
+                'id': row.id,
+                'timestamp': self._format_timestamp(row.timestamp),
+                'model_name': row.model_name,
+                'input_tokens': row.input_tokens,
+                'output_tokens': row.output_tokens,
+                'total_tokens': row.total_tokens,
+                'duration_ms': row.duration,
+                'cost': row.cost,
+                'status': row.status,
+                'bot_id': row.bot_id,
+                'bot_name': row.bot_name,
+                'pipeline_id': row.pipeline_id,
+                'pipeline_name': row.pipeline_name,
+                'session_id': row.session_id,
+                'message_id': row.message_id,
+                'error_message': row.error_message,
             }
-            for row in rows
-        ]
 
     async def export_embedding_calls(
         self,
@@ -1876,47 +2220,62 @@ class MonitoringService:
         limit: int = 100000,
     ) -> list[dict]:
         """Export embedding calls as list of dictionaries for CSV conversion"""
-        limit = self.normalize_export_limit(limit)
+        return [
+            row
+            async for row in self.iter_export_embedding_calls(
+                context,
+                start_time=start_time,
+                end_time=end_time,
+                knowledge_base_id=knowledge_base_id,
+                limit=self.normalize_export_limit(limit),
+            )
+        ]
+
+    async def iter_export_embedding_calls(
+        self,
+        context: TenantContext,
+        start_time: datetime.datetime | None = None,
+        end_time: datetime.datetime | None = None,
+        knowledge_base_id: str | None = None,
+        limit: int = 100000,
+    ) -> typing.AsyncIterator[dict]:
+        """Stream embedding calls for export, newest first"""
+        limit = self.normalize_stream_export_limit(limit)
         workspace_uuid = require_workspace_uuid(context)
-        conditions = [persistence_monitoring.MonitoringEmbeddingCall.workspace_uuid == workspace_uuid]
+        MonitoringEmbeddingCall = persistence_monitoring.MonitoringEmbeddingCall
+        conditions = [MonitoringEmbeddingCall.workspace_uuid == workspace_uuid]
 
         if start_time:
-            conditions.append(persistence_monitoring.MonitoringEmbeddingCall.timestamp >= start_time)
+            conditions.append(MonitoringEmbeddingCall.timestamp >= start_time)
         if end_time:
-            conditions.append(persistence_monitoring.MonitoringEmbeddingCall.timestamp <= end_time)
+            conditions.append(MonitoringEmbeddingCall.timestamp <= end_time)
         if knowledge_base_id:
-            conditions.append(persistence_monitoring.MonitoringEmbeddingCall.knowledge_base_id == knowledge_base_id)
-
-        query = sqlalchemy.select(persistence_monitoring.MonitoringEmbeddingCall).order_by(
-            persistence_monitoring.MonitoringEmbeddingCall.timestamp.desc()
-        )
-        if conditions:
-            query = query.where(sqlalchemy.and_(*conditions))
-
-        query = query.limit(limit)
-
-        result = await self.ap.persistence_mgr.execute_async(query)
-        rows = result.all()
-
-        return [
-            {
-                'id': row[0].id if isinstance(row, tuple) else row.id,
-                'timestamp': self._format_timestamp(row[0].timestamp if isinstance(row, tuple) else row.timestamp),
-                'model_name': row[0].model_name if isinstance(row, tuple) else row.model_name,
-                'prompt_tokens': row[0].prompt_tokens if isinstance(row, tuple) else row.prompt_tokens,
-                'total_tokens': row[0].total_tokens if isinstance(row, tuple) else row.total_tokens,
-                'duration_ms': row[0].duration if isinstance(row, tuple) else row.duration,
-                'input_count': row[0].input_count if isinstance(row, tuple) else row.input_count,
-                'status': row[0].status if isinstance(row, tuple) else row.status,
-                'error_message': row[0].error_message if isinstance(row, tuple) else row.error_message,
-                'knowledge_base_id': row[0].knowledge_base_id if isinstance(row, tuple) else row.knowledge_base_id,
-                'query_text': row[0].query_text if isinstance(row, tuple) else row.query_text,
-                'session_id': row[0].session_id if isinstance(row, tuple) else row.session_id,
-                'message_id': row[0].message_id if isinstance(row, tuple) else row.message_id,
-                'call_type': row[0].call_type if isinstance(row, tuple) else row.call_type,
+            conditions.append(MonitoringEmbeddingCall.knowledge_base_id == knowledge_base_id)
+
+        async for row in self._iter_export_rows(
+            workspace_uuid,
+            MonitoringEmbeddingCall,
+            conditions,
+            MonitoringEmbeddingCall.timestamp,
+            MonitoringEmbeddingCall.id,
+            limit,
+        ):
+            yield {
+                'id': row.id,
+                'timestamp': self._format_timestamp(row.timestamp),
+                'model_name': row.model_name,
+                'prompt_tokens': row.prompt_tokens,
+                'total_tokens': row.total_tokens,
+                'duration_ms': row.duration,
+                'input_count': row.input_count,
+                'status': row.status,
+                'error_message': row.error_message,
+                'knowledge_base_id': row.knowledge_base_id,
+                'query_text': row.query_text,
+                'session_id': row.session_id,
+                'message_id': row.message_id,
+                'call_type': row.call_type,
             }
-            for row in rows
-        ]
 
     async def export_errors(
         self,
@@ -1928,46 +2287,63 @@ class MonitoringService:
         limit: int = 100000,
     ) -> list[dict]:
         """Export errors as list of dictionaries for CSV conversion"""
-        limit = self.normalize_export_limit(limit)
+        return [
+            row
+            async for row in self.iter_export_errors(
+                context,
+                bot_ids=bot_ids,
+                pipeline_ids=pipeline_ids,
+                start_time=start_time,
+                end_time=end_time,
+                limit=self.normalize_export_limit(limit),
+            )
+        ]
+
+    async def iter_export_errors(
+        self,
+        context: TenantContext,
+        bot_ids: list[str] | None = None,
+        pipeline_ids: list[str] | None = None,
+        start_time: datetime.datetime | None = None,
+        end_time: datetime.datetime | None = None,
+        limit: int = 100000,
+    ) -> typing.AsyncIterator[dict]:
+        """Stream errors for export, newest first"""
+        limit = self.normalize_stream_export_limit(limit)
         workspace_uuid = require_workspace_uuid(context)
-        conditions = [persistence_monitoring.MonitoringError.workspace_uuid == workspace_uuid]
+        MonitoringError = persistence_monitoring.MonitoringError
+        conditions = [MonitoringError.workspace_uuid == workspace_uuid]
 
         if bot_ids:
-            conditions.append(persistence_monitoring.MonitoringError.bot_id.in_(bot_ids))
+            conditions.append(MonitoringError.bot_id.in_(bot_ids))
         if pipeline_ids:
-            conditions.append(persistence_monitoring.MonitoringError.pipeline_id.in_(pipeline_ids))
+            conditions.append(MonitoringError.pipeline_id.in_(pipeline_ids))
         if start_time:
-            conditions.append(persistence_monitoring.MonitoringError.timestamp >= start_time)
+            conditions.append(MonitoringError.timestamp >= start_time)
         if end_time:
-            conditions.append(persistence_monitoring.MonitoringError.timestamp <= end_time)
-
-        query = sqlalchemy.select(persistence_monitoring.MonitoringError).order_by(
-            persistence_monitoring.MonitoringError.timestamp.desc()
-        )
-        if conditions:
-            query = query.where(sqlalchemy.and_(*conditions))
-
-        query = query.limit(limit)
-
-        result = await self.ap.persistence_mgr.execute_async(query)
-        rows = result.all()
-
-        return [
-            {
-                'id': row[0].id if isinstance(row, tuple) else row.id,
-                'timestamp': self._format_timestamp(row[0].timestamp if isinstance(row, tuple) else row.timestamp),
-                'error_type': row[0].error_type if isinstance(row, tuple) else row.error_type,
-                'error_message': row[0].error_message if isinstance(row, tuple) else row.error_message,
-                'bot_id': row[0].bot_id if isinstance(row, tuple) else row.bot_id,
-                'bot_name': row[0].bot_name if isinstance(row, tuple) else row.bot_name,
-                'pipeline_id': row[0].pipeline_id if isinstance(row, tuple) else row.pipeline_id,
-                'pipeline_name': row[0].pipeline_name if isinstance(row, tuple) else row.pipeline_name,
-                'session_id': row[0].session_id if isinstance(row, tuple) else row.session_id,
-                'message_id': row[0].message_id if isinstance(row, tuple) else row.message_id,
-                'stack_trace': row[0].stack_trace if isinstance(row, tuple) else row.stack_trace,
+            conditions.append(MonitoringError.timestamp <= end_time)
+
+        async for row in self._iter_export_rows(
+            workspace_uuid,
+            MonitoringError,
+            conditions,
+            MonitoringError.timestamp,
+            MonitoringError.id,
+            limit,
+        ):
+            yield {
+                'id': row.id,
+                'timestamp': self._format_timestamp(row.timestamp),
+                'error_type': row.error_type,
+                'error_message': row.error_message,
+                'bot_id': row.bot_id,
+                'bot_name': row.bot_name,
+                'pipeline_id': row.pipeline_id,
+                'pipeline_name': row.pipeline_name,
+                'session_id': row.session_id,
+                'message_id': row.message_id,
+                'stack_trace': row.stack_trace,
             }
-            for row in rows
-        ]
 
     async def export_sessions(
         self,
@@ -1979,48 +2355,63 @@ class MonitoringService:
         limit: int = 100000,
     ) -> list[dict]:
         """Export sessions as list of dictionaries for CSV conversion"""
-        limit = self.normalize_export_limit(limit)
+        return [
+            row
+            async for row in self.iter_export_sessions(
+                context,
+                bot_ids=bot_ids,
+                pipeline_ids=pipeline_ids,
+                start_time=start_time,
+                end_time=end_time,
+                limit=self.normalize_export_limit(limit),
+            )
+        ]
+
+    async def iter_export_sessions(
+        self,
+        context: TenantContext,
+        bot_ids: list[str] | None = None,
+        pipeline_ids: list[str] | None = None,
+        start_time: datetime.datetime | None = None,
+        end_time: datetime.datetime | None = None,
+        limit: int = 100000,
+    ) -> typing.AsyncIterator[dict]:
+        """Stream sessions for export, most recently active first"""
+        limit = self.normalize_stream_export_limit(limit)
         workspace_uuid = require_workspace_uuid(context)
-        conditions = [persistence_monitoring.MonitoringSession.workspace_uuid == workspace_uuid]
+        MonitoringSession = persistence_monitoring.MonitoringSession
+        conditions = [MonitoringSession.workspace_uuid == workspace_uuid]
 
         if bot_ids:
-            conditions.append(persistence_monitoring.MonitoringSession.bot_id.in_(bot_ids))
+            conditions.append(MonitoringSession.bot_id.in_(bot_ids))
         if pipeline_ids:
-            conditions.append(persistence_monitoring.MonitoringSession.pipeline_id.in_(pipeline_ids))
+            conditions.append(MonitoringSession.pipeline_id.in_(pipeline_ids))
         if start_time:
-            conditions.append(persistence_monitoring.MonitoringSession.start_time >= start_time)
+            conditions.append(MonitoringSession.start_time >= start_time)
         if end_time:
-            conditions.append(persistence_monitoring.MonitoringSession.start_time <= end_time)
-
-        query = sqlalchemy.select(persistence_monitoring.MonitoringSession).order_by(
-            persistence_monitoring.MonitoringSession.last_activity.desc()
-        )
-        if conditions:
-            query = query.where(sqlalchemy.and_(*conditions))
-
-        query = query.limit(limit)
-
-        result = await self.ap.persistence_mgr.execute_async(query)
-        rows = result.all()
-
-        return [
-            {
-                'session_id': row[0].session_id if isinstance(row, tuple) else row.session_id,
-                'bot_id': row[0].bot_id if isinstance(row, tuple) else row.bot_id,
-                'bot_name': row[0].bot_name if isinstance(row, tuple) else row.bot_name,
-                'pipeline_id': row[0].pipeline_id if isinstance(row, tuple) else row.pipeline_id,
-                'pipeline_name': row[0].pipeline_name if isinstance(row, tuple) else row.pipeline_name,
-                'message_count': row[0].message_count if isinstance(row, tuple) else row.message_count,
-                'start_time': self._format_timestamp(row[0].start_time if isinstance(row, tuple) else row.start_time),
-                'last_activity': self._format_timestamp(
-                    row[0].last_activity if isinstance(row, tuple) else row.last_activity
-                ),
-                'is_active': str(row[0].is_active if isinstance(row, tuple) else row.is_active),
-                'platform': row[0].platform if isinstance(row, tuple) else row.platform,
-                'user_id': row[0].user_id if isinstance(row, tuple) else row.user_id,
+            conditions.append(MonitoringSession.start_time <= end_time)
+
+        async for row in self._iter_export_rows(
+            workspace_uuid,
+            MonitoringSession,
+            conditions,
+            MonitoringSession.last_activity,
+            MonitoringSession.session_id,
+            limit,
+        ):
+            yield {
+                'session_id': row.session_id,
+                'bot_id': row.bot_id,
+                'bot_name': row.bot_name,
+                'pipeline_id': row.pipeline_id,
+                'pipeline_name': row.pipeline_name,
+                'message_count': row.message_count,
+                'start_time': self._format_timestamp(row.start_time),
+                'last_activity': self._format_timestamp(row.last_activity),
+                'is_active': str(row.is_active),
+                'platform': row.platform,
+                'user_id': row.user_id,
             }
-            for row in rows
-        ]
 
     # ========== Feedback Methods ==========
 
@@ -2286,48 +2677,64 @@ class MonitoringService:
         limit: int = 100000,
     ) -> list[dict]:
         """Export feedback as list of dictionaries for CSV conversion."""
-        limit = self.normalize_export_limit(limit)
+        return [
+            row
+            async for row in self.iter_export_feedback(
+                context,
+                bot_ids=bot_ids,
+                pipeline_ids=pipeline_ids,
+                start_time=start_time,
+                end_time=end_time,
+                limit=self.normalize_export_limit(limit),
+            )
+        ]
+
+    async def iter_export_feedback(
+        self,
+        context: TenantContext,
+        bot_ids: list[str] | None = None,
+        pipeline_ids: list[str] | None = None,
+        start_time: datetime.datetime | None = None,
+        end_time: datetime.datetime | None = None,
+        limit: int = 100000,
+    ) -> typing.AsyncIterator[dict]:
+        """Stream feedback for export, newest first."""
+        limit = self.normalize_stream_export_limit(limit)
         workspace_uuid = require_workspace_uuid(context)
-        conditions = [persistence_monitoring.MonitoringFeedback.workspace_uuid == workspace_uuid]
+        MonitoringFeedback = persistence_monitoring.MonitoringFeedback
+        conditions = [MonitoringFeedback.workspace_uuid == workspace_uuid]
 
         if bot_ids:
-            conditions.append(persistence_monitoring.MonitoringFeedback.bot_id.in_(bot_ids))
+            conditions.append(MonitoringFeedback.bot_id.in_(bot_ids))
         if pipeline_ids:
-            conditions.append(persistence_monitoring.MonitoringFeedback.pipeline_id.in_(pipeline_ids))
+            conditions.append(MonitoringFeedback.pipeline_id.in_(pipeline_ids))
         if start_time:
-            conditions.append(persistence_monitoring.MonitoringFeedback.timestamp >= start_time)
+            conditions.append(MonitoringFeedback.timestamp >= start_time)
         if end_time:
-            conditions.append(persistence_monitoring.MonitoringFeedback.timestamp <= end_time)
-
-        query = sqlalchemy.select(persistence_monitoring.MonitoringFeedback).order_by(
-            persistence_monitoring.MonitoringFeedback.timestamp.desc()
-        )
-        if conditions:
-            query = query.where(sqlalchemy.and_(*conditions))
-        query = query.limit(limit)
-
-        result = await self.ap.persistence_mgr.execute_async(query)
-        rows = result.all()
-
-        return [
-            {
-                'id': row[0].id if isinstance(row, tuple) else row.id,
-                'timestamp': self._format_timestamp(row[0].timestamp if isinstance(row, tuple) else row.timestamp),
-                'feedback_id': row[0].feedback_id if isinstance(row, tuple) else row.feedback_id,
-                'feedback_type': 'like'
-                if (row[0].feedback_type if isinstance(row, tuple) else row.feedback_type) == 1
-                else 'dislike',
-                'feedback_content': row[0].feedback_content if isinstance(row, tuple) else row.feedback_content,
-                'inaccurate_reasons': row[0].inaccurate_reasons if isinstance(row, tuple) else row.inaccurate_reasons,
-                'bot_id': row[0].bot_id if isinstance(row, tuple) else row.bot_id,
-                'bot_name': row[0].bot_name if isinstance(row, tuple) else row.bot_name,
-                'pipeline_id': row[0].pipeline_id if isinstance(row, tuple) else row.pipeline_id,
-                'pipeline_name': row[0].pipeline_name if isinstance(row, tuple) else row.pipeline_name,
-                'session_id': row[0].session_id if isinstance(row, tuple) else row.session_id,
-                'message_id': row[0].message_id if isinstance(row, tuple) else row.message_id,
-                'stream_id': row[0].stream_id if isinstance(row, tuple) else row.stream_id,
-                'user_id': row[0].user_id if isinstance(row, tuple) else row.user_id,
-                'platform': row[0].platform if isinstance(row, tuple) else row.platform,
+            conditions.append(MonitoringFeedback.timestamp <= end_time)
+
+        async for row in self._iter_export_rows(
+            workspace_uuid,
+            MonitoringFeedback,
+            conditions,
+            MonitoringFeedback.timestamp,
+            MonitoringFeedback.id,
+            limit,
+        ):
+            yield {
+                'id': row.id,
+                'timestamp': self._format_timestamp(row.timestamp),
+                'feedback_id': row.feedback_id,
+                'feedback_type': 'like' if row.feedback_type == 1 else 'dislike',
+                'feedback_content': row.feedback_content,
+                'inaccurate_reasons': row.inaccurate_reasons,
+                'bot_id': row.bot_id,
+                'bot_name': row.bot_name,
+                'pipeline_id': row.pipeline_id,
+                'pipeline_name': row.pipeline_name,
+                'session_id': row.session_id,
+                'message_id': row.message_id,
+                'stream_id': row.stream_id,
+                'user_id': row.user_id,
+                'platform': row.platform,
             }
-            for row in rows
-        ]
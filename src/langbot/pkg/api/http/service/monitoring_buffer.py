@@ -0,0 +1,304 @@
+from __future__ import annotations
+
+import asyncio
+import collections
+import dataclasses
+import time
+import typing
+
+import sqlalchemy
+
+from ....core import app
+from ....entity.persistence import monitoring as persistence_monitoring
+
+
+_DEFAULT_MAX_PENDING_ROWS = 10000
+_DEFAULT_FLUSH_ROWS = 500
+_DEFAULT_FLUSH_INTERVAL_SECONDS = 1.0
+# Keep one multi-row INSERT well below SQLite's bound-parameter limit for the
+# widest monitoring table.
+_DEFAULT_ROWS_PER_STATEMENT = 200
+
+BufferGroupKey = tuple[str, str]
+
+
+@dataclasses.dataclass(slots=True)
+class TableWriteStats:
+    """Cumulative write-behind counters for one monitoring table."""
+
+    enqueued: int = 0
+    flushed: int = 0
+    dropped: int = 0
+    failed: int = 0
+    statements: int = 0
+    flush_seconds: float = 0.0
+
+
+class MonitoringWriteBuffer:
+    """Bounded write-behind queue for monitoring INSERTs.
+
+    Rows are grouped by table and Workspace and written as multi-row INSERTs,
+    one Workspace unit of work per group, whenever ``flush_rows`` rows are
+    pending or ``flush_interval_seconds`` has elapsed. When ``max_pending_rows``
+    rows are already waiting, new rows are dropped and counted instead of
+    delaying the caller.
+
+    Message rows stay addressable by ID until they are committed so that a
+    status update can be folded into the pending row, and tool calls can
+    inherit the message's bot and pipeline fields without a database read.
+    """
+
+    ap: app.Application
+
+    def __init__(
+        self,
+        ap: app.Application,
+        *,
+        max_pending_rows: int = _DEFAULT_MAX_PENDING_ROWS,
+        flush_rows: int = _DEFAULT_FLUSH_ROWS,
+        flush_interval_seconds: float = _DEFAULT_FLUSH_INTERVAL_SECONDS,
+        rows_per_statement: int = _DEFAULT_ROWS_PER_STATEMENT,
+    ) -> None:
+        if max_pending_rows < 1:
+            raise ValueError('max_pending_rows must be positive')
+        if flush_rows < 1:
+            raise ValueError('flush_rows must be positive')
+        if flush_interval_seconds <= 0:
+            raise ValueError('flush_interval_seconds must be positive')
+        if rows_per_statement < 1:
+            raise ValueError('rows_per_statement must be positive')
+        self.ap = ap
+        self.max_pending_rows = max_pending_rows
+        self.flush_rows = min(flush_rows, max_pending_rows)
+        self.flush_interval_seconds = flush_interval_seconds
+        self.rows_per_statement = rows_per_statement
+
+        self._tables: dict[str, sqlalchemy.Table] = {}
+        self._pending: collections.OrderedDict[BufferGroupKey, list[dict]] = collections.OrderedDict()
+        self._pending_rows = 0
+        self._pending_messages: dict[tuple[str, str], dict] = {}
+        self._inflight_rows = 0
+        self._inflight_messages: dict[tuple[str, str], dict] = {}
+        self._stats: dict[str, TableWriteStats] = {}
+        self._flush_lock = asyncio.Lock()
+        self._wakeup = asyncio.Event()
+        self._closed = False
+        self.last_flush_seconds = 0.0
+
+    @property
+    def pending_rows(self) -> int:
+        return self._pending_rows
+
+    def _table_stats(self, table_name: str) -> TableWriteStats:
+        stats = self._stats.get(table_name)
+        if stats is None:
+            stats = self._stats[table_name] = TableWriteStats()
+        return stats
+
+    def enqueue(
+        self,
+        model: type[persistence_monitoring.Base],
+        workspace_uuid: str,
+        row: dict,
+    ) -> bool:
+        """Queue one row without awaiting the database; return False when dropped."""
+
+        table = model.__table__
+        stats = self._table_stats(table.name)
+        if self._closed or self._pending_rows >= self.max_pending_rows:
+            stats.dropped += 1
+            return False
+
+        self._tables[table.name] = table
+        key = (table.name, workspace_uuid)
+        rows = self._pending.get(key)
+        if rows is None:
+            rows = self._pending[key] = []
+        rows.append(row)
+        self._pending_rows += 1
+        stats.enqueued += 1
+        if table.name == persistence_monitoring.MonitoringMessage.__tablename__:
+            self._pending_messages[(workspace_uuid, row['id'])] = row
+        if self._pending_rows >= self.flush_rows:
+            self._wakeup.set()
+        return True
+
+    def get_pending_message(self, workspace_uuid: str, message_id: str | None) -> dict | None:
+        """Return a message row that has not been committed yet."""
+
+        if not message_id:
+            return None
+        key = (workspace_uuid, message_id)
+        return self._pending_messages.get(key) or self._inflight_messages.get(key)
+
+    def update_pending_message(self, workspace_uuid: str, message_id: str, values: dict) -> bool:
+        """Fold an update into a still-queued message row."""
+
+        columns = persistence_monitoring.MonitoringMessage.__table__.c
+        unknown = [key for key in values if key not in columns]
+        if unknown:
+            raise ValueError(f'Unknown monitoring message columns: {", ".join(sorted(unknown))}')
+        row = self._pending_messages.get((workspace_uuid, message_id))
+        if row is None:
+            return False
+        row.update(values)
+        return True
+
+    async def wait_for_message(self, workspace_uuid: str, message_id: str) -> None:
+        """Wait until an in-flight message row has been written or discarded."""
+
+        if (workspace_uuid, message_id) not in self._inflight_messages:
+            return
+        async with self._flush_lock:
+            return
+
+    def _take_pending(self) -> collections.OrderedDict[BufferGroupKey, list[dict]]:
+        pending = self._pending
+        self._pending = collections.OrderedDict()
+        self._inflight_rows += self._pending_rows
+        self._pending_rows = 0
+        self._inflight_messages.update(self._pending_messages)
+        self._pending_messages = {}
+        return pending
+
+    def _requeue(self, groups: typing.Iterable[tuple[BufferGroupKey, list[dict]]]) -> None:
+        """Put unwritten rows back in front of rows queued during the flush."""
+
+        restored: collections.OrderedDict[BufferGroupKey, list[dict]] = collections.OrderedDict()
+        for key, rows in groups:
+            if rows:
+                restored.setdefault(key, []).extend(rows)
+        for key, rows in self._pending.items():
+            restored.setdefault(key, []).extend(rows)
+        self._pending = restored
+        self._pending_rows = sum(len(rows) for rows in restored.values())
+        message_table = persistence_monitoring.MonitoringMessage.__tablename__
+        self._pending_messages = {
+            (workspace_uuid, row['id']): row
+            for (table_name, workspace_uuid), rows in restored.items()
+            if table_name == message_table
+            for row in rows
+        }
+
+    @staticmethod
+    def _uniform_rows(table: sqlalchemy.Table, rows: list[dict]) -> list[dict]:
+        """Give every row the same keys; a multi-row INSERT takes its columns from the first row.
+
+        Updates folded into a queued row may add keys the other rows lack.
+        Missing values fall back to the column's scalar default, else NULL.
+        """
+
+        keys = {key for row in rows for key in row}
+        if all(len(row) == len(keys) for row in rows):
+            return rows
+        fallbacks = {}
+        for key in keys:
+            default = table.c[key].default
+            fallbacks[key] = default.arg if default is not None and default.is_scalar else None
+        return [{**fallbacks, **row} for row in rows]
+
+    async def _write_group(self, table: sqlalchemy.Table, workspace_uuid: str, rows: list[dict]) -> int:
+        """Insert one table/Workspace group and return the number of statements."""
+
+        rows = self._uniform_rows(table, rows)
+        statements = [
+            sqlalchemy.insert(table).values(rows[start : start + self.rows_per_statement])
+            for start in range(0, len(rows), self.rows_per_statement)
+        ]
+        tenant_uow = getattr(self.ap.persistence_mgr, 'tenant_uow', None)
+        if callable(tenant_uow):
+            async with tenant_uow(workspace_uuid):
+                for statement in statements:
+                    await self.ap.persistence_mgr.execute_async(statement)
+        else:
+            for statement in statements:
+                await self.ap.persistence_mgr.execute_async(statement)
+        return len(statements)
+
+    async def flush(self) -> int:
+        """Write every pending row and return the number of rows committed."""
+
+        async with self._flush_lock:
+            if not self._pending_rows:
+                return 0
+            started_at = time.perf_counter()
+            groups = list(self._take_pending().items())
+            written = 0
+            try:
+                while groups:
+                    (table_name, workspace_uuid), rows = groups[0]
+                    stats = self._table_stats(table_name)
+                    group_started_at = time.perf_counter()
+                    try:
+                        stats.statements += await self._write_group(
+                            self._tables[table_name],
+                            workspace_uuid,
+                            rows,
+                        )
+                    except asyncio.CancelledError:
+                        raise
+                    except Exception as exc:
+                        stats.failed += len(rows)
+                        self.ap.logger.warning(
+                            f'Monitoring write-behind dropped {len(rows)} {table_name} rows '
+                            f'for Workspace {workspace_uuid}: {exc}'
+                        )
+                    else:
+                        stats.flushed += len(rows)
+                        written += len(rows)
+                    finally:
+                        stats.flush_seconds += time.perf_counter() - group_started_at
+                    groups.pop(0)
+            except asyncio.CancelledError:
+                # The interrupted group's unit of work was rolled back. Keep it
+                # and everything after it for the shutdown flush.
+                self._requeue(groups)
+                raise
+            finally:
+                self._inflight_rows = 0
+                self._inflight_messages = {}
+                self.last_flush_seconds = time.perf_counter() - started_at
+            return written
+
+    async def run(self) -> None:
+        """Flush on the size threshold or the flush interval, whichever comes first."""
+
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.flush()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                self.ap.logger.warning(f'Monitoring write-behind flush failed: {exc}')
+
+    async def close(self) -> None:
+        """Stop admitting rows and write everything that is still queued."""
+
+        self._closed = True
+        await self.flush()
+
+    def snapshot(self) -> dict[str, object]:
+        return {
+            'pending_rows': self._pending_rows,
+            'inflight_rows': self._inflight_rows,
+            'max_pending_rows': self.max_pending_rows,
+            'last_flush_ms': round(self.last_flush_seconds * 1000, 3),
+            'tables': {
+                table_name: {
+                    'enqueued': stats.enqueued,
+                    'flushed': stats.flushed,
+                    'dropped': stats.dropped,
+                    'failed': stats.failed,
+                    'statements': stats.statements,
+                    'rows_per_second': (
+                        round(stats.flushed / stats.flush_seconds, 1) if stats.flush_seconds > 0 else 0.0
+                    ),
+                }
+                for table_name, stats in self._stats.items()
+            },
+        }
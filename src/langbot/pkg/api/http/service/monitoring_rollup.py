@@ -0,0 +1,389 @@
+from __future__ import annotations
+
+import dataclasses
+import datetime
+
+import sqlalchemy
+
+from ....core import app
+from ....entity.persistence import monitoring as persistence_monitoring
+
+
+ROLLUP_BUCKET = datetime.timedelta(hours=1)
+_DEFAULT_SETTLE_MINUTES = 15
+_DEFAULT_MAX_HOURS_PER_RUN = 24 * 7
+_ROWS_PER_STATEMENT = 200
+
+SOURCE_MESSAGE = 'message'
+SOURCE_LLM_CALL = 'llm_call'
+SOURCE_EMBEDDING_CALL = 'embedding_call'
+
+
+def floor_hour(value: datetime.datetime) -> datetime.datetime:
+    return value.replace(minute=0, second=0, microsecond=0)
+
+
+def ceil_hour(value: datetime.datetime) -> datetime.datetime:
+    floored = floor_hour(value)
+    return floored if floored == value else floored + ROLLUP_BUCKET
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class RollupWindow:
+    """Whole hours ``[start, end)`` of a query range that are served by rollups.
+
+    ``start`` is None when the query range has no lower bound. Records outside
+    the window, including everything at or after ``end``, are read from the raw
+    tables.
+    """
+
+    start: datetime.datetime | None
+    end: datetime.datetime
+
+    def raw_conditions(self, timestamp_column) -> list:
+        """Conditions selecting the raw records this window does not cover."""
+
+        if self.start is None:
+            return [timestamp_column >= self.end]
+        return [sqlalchemy.or_(timestamp_column < self.start, timestamp_column >= self.end)]
+
+    def rollup_conditions(self) -> list:
+        Rollup = persistence_monitoring.MonitoringHourlyRollup
+        conditions = [Rollup.bucket_start < self.end]
+        if self.start is not None:
+            conditions.append(Rollup.bucket_start >= self.start)
+        return conditions
+
+
+class MonitoringRollups:
+    """Maintain and resolve hourly monitoring rollups.
+
+    A compactor folds each closed hour of message, LLM call and embedding
+    call records into ``MonitoringHourlyRollup`` rows and advances a
+    per-Workspace watermark in the same transaction. Readers combine rollups
+    below the watermark with a raw-table tail above it, so results stay exact
+    however far the compactor lags behind.
+
+    Hours are only compacted once ``settle_minutes`` have passed after they
+    end, which leaves time for buffered writes and late message status
+    updates to land in the raw tables first.
+    """
+
+    ap: app.Application
+
+    def __init__(self, ap: app.Application) -> None:
+        self.ap = ap
+
+    def _config(self) -> dict:
+        config = getattr(getattr(self.ap, 'instance_config', None), 'data', {}).get('monitoring', {}).get('rollups')
+        return config if isinstance(config, dict) else {}
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._config().get('enabled', True))
+
+    def _positive_int_config(self, name: str, default: int) -> int:
+        try:
+            value = int(self._config().get(name, default))
+        except (TypeError, ValueError):
+            return default
+        return value if value > 0 else default
+
+    async def get_watermark(self, workspace_uuid: str) -> datetime.datetime | None:
+        State = persistence_monitoring.MonitoringRollupState
+        result = await self.ap.persistence_mgr.execute_async(
+            sqlalchemy.select(State.rolled_up_until).where(State.workspace_uuid == workspace_uuid)
+        )
+        return result.scalar()
+
+    async def get_window(
+        self,
+        workspace_uuid: str,
+        start_time: datetime.datetime | None,
+        end_time: datetime.datetime | None,
+    ) -> RollupWindow | None:
+        """Return the rollup-covered part of a query range, if any."""
+
+        if not self.enabled:
+            return None
+        watermark = await self.get_watermark(workspace_uuid)
+        if watermark is None:
+            return None
+        window_start = ceil_hour(start_time) if start_time is not None else None
+        # ``end_time`` is inclusive, so the hour that contains it must come
+        # from raw records.
+        window_end = min(watermark, floor_hour(end_time)) if end_time is not None else watermark
+        if window_start is not None and window_start >= window_end:
+            return None
+        return RollupWindow(start=window_start, end=window_end)
+
+    def _bucket_expression(self, timestamp_column):
+        dialect_name = self.ap.persistence_mgr.get_db_engine().dialect.name
+        if dialect_name == 'postgresql':
+            return sqlalchemy.func.date_trunc('hour', timestamp_column)
+        if dialect_name == 'sqlite':
+            return sqlalchemy.func.strftime('%Y-%m-%d %H:00:00', timestamp_column)
+        raise RuntimeError(f'Unsupported monitoring database dialect: {dialect_name}')
+
+    @staticmethod
+    def _bucket_value(value) -> datetime.datetime:
+        if isinstance(value, datetime.datetime):
+            return value.replace(tzinfo=None)
+        return datetime.datetime.strptime(str(value), '%Y-%m-%d %H:%M:%S')
+
+    async def _oldest_record_time(self, workspace_uuid: str) -> datetime.datetime | None:
+        oldest = None
+        for model in (
+            persistence_monitoring.MonitoringMessage,
+            persistence_monitoring.MonitoringLLMCall,
+            persistence_monitoring.MonitoringEmbeddingCall,
+        ):
+            result = await self.ap.persistence_mgr.execute_async(
+                sqlalchemy.select(sqlalchemy.func.min(model.timestamp)).where(model.workspace_uuid == workspace_uuid)
+            )
+            value = result.scalar()
+            if value is not None and (oldest is None or value < oldest):
+                oldest = value
+        return oldest
+
+    async def _aggregate(
+        self,
+        workspace_uuid: str,
+        start: datetime.datetime,
+        end: datetime.datetime,
+    ) -> list[dict]:
+        """Aggregate raw records in ``[start, end)`` into rollup rows."""
+
+        Message = persistence_monitoring.MonitoringMessage
+        LLMCall = persistence_monitoring.MonitoringLLMCall
+        EmbeddingCall = persistence_monitoring.MonitoringEmbeddingCall
+        rows: list[dict] = []
+
+        message_bucket = self._bucket_expression(Message.timestamp)
+        message_result = await self.ap.persistence_mgr.execute_async(
+            sqlalchemy.select(
+                message_bucket,
+                Message.bot_id,
+                Message.pipeline_id,
+                sqlalchemy.func.count(Message.id),
+                sqlalchemy.func.sum(sqlalchemy.case((Message.status == 'success', 1), else_=0)),
+                sqlalchemy.func.sum(sqlalchemy.case((Message.status == 'error', 1), else_=0)),
+            )
+            .where(
+                Message.workspace_uuid == workspace_uuid,
+                Message.timestamp >= start,
+                Message.timestamp < end,
+            )
+            .group_by(message_bucket, Message.bot_id, Message.pipeline_id)
+        )
+        for bucket_value, bot_id, pipeline_id, count, success_count, error_count in message_result.all():
+            rows.append(
+                {
+                    'source': SOURCE_MESSAGE,
+                    'bucket_start': self._bucket_value(bucket_value),
+                    'bot_id': bot_id,
+                    'pipeline_id': pipeline_id,
+                    'model_name': '',
+                    'record_count': int(count or 0),
+                    'success_count': int(success_count or 0),
+                    'error_count': int(error_count or 0),
+                }
+            )
+
+        llm_bucket = self._bucket_expression(LLMCall.timestamp)
+        llm_result = await self.ap.persistence_mgr.execute_async(
+            sqlalchemy.select(
+                llm_bucket,
+                LLMCall.bot_id,
+                LLMCall.pipeline_id,
+                LLMCall.model_name,
+                sqlalchemy.func.count(LLMCall.id),
+                sqlalchemy.func.sum(sqlalchemy.case((LLMCall.status == 'success', 1), else_=0)),
+                sqlalchemy.func.sum(sqlalchemy.case((LLMCall.status == 'error', 1), else_=0)),
+                sqlalchemy.func.sum(
+                    sqlalchemy.case(
+                        (sqlalchemy.and_(LLMCall.status == 'success', LLMCall.total_tokens == 0), 1),
+                        else_=0,
+                    )
+                ),
+                sqlalchemy.func.coalesce(sqlalchemy.func.sum(LLMCall.input_tokens), 0),
+                sqlalchemy.func.coalesce(sqlalchemy.func.sum(LLMCall.output_tokens), 0),
+                sqlalchemy.func.coalesce(sqlalchemy.func.sum(LLMCall.total_tokens), 0),
+                sqlalchemy.func.coalesce(sqlalchemy.func.sum(LLMCall.duration), 0),
+                sqlalchemy.func.coalesce(sqlalchemy.func.sum(LLMCall.cost), 0.0),
+            )
+            .where(
+                LLMCall.workspace_uuid == workspace_uuid,
+                LLMCall.timestamp >= start,
+                LLMCall.timestamp < end,
+            )
+            .group_by(llm_bucket, LLMCall.bot_id, LLMCall.pipeline_id, LLMCall.model_name)
+        )
+        for (
+            bucket_value,
+            bot_id,
+            pipeline_id,
+            model_name,
+            count,
+            success_count,
+            error_count,
+            zero_token_success_count,
+            input_tokens,
+            output_tokens,
+            total_tokens,
+            duration,
+            cost,
+        ) in llm_result.all():
+            rows.append(
+                {
+                    'source': SOURCE_LLM_CALL,
+                    'bucket_start': self._bucket_value(bucket_value),
+                    'bot_id': bot_id,
+                    'pipeline_id': pipeline_id,
+                    'model_name': model_name,
+                    'record_count': int(count or 0),
+                    'success_count': int(success_count or 0),
+                    'error_count': int(error_count or 0),
+                    'zero_token_success_count': int(zero_token_success_count or 0),
+                    'input_tokens': int(input_tokens or 0),
+                    'output_tokens': int(output_tokens or 0),
+                    'total_tokens': int(total_tokens or 0),
+                    'duration': int(duration or 0),
+                    'cost': float(cost or 0.0),
+                }
+            )
+
+        embedding_bucket = self._bucket_expression(EmbeddingCall.timestamp)
+        embedding_result = await self.ap.persistence_mgr.execute_async(
+            sqlalchemy.select(
+                embedding_bucket,
+                EmbeddingCall.model_name,
+                sqlalchemy.func.count(EmbeddingCall.id),
+                sqlalchemy.func.sum(sqlalchemy.case((EmbeddingCall.status == 'success', 1), else_=0)),
+                sqlalchemy.func.sum(sqlalchemy.case((EmbeddingCall.status == 'error', 1), else_=0)),
+                sqlalchemy.func.coalesce(sqlalchemy.func.sum(EmbeddingCall.prompt_tokens), 0),
+                sqlalchemy.func.coalesce(sqlalchemy.func.sum(EmbeddingCall.total_tokens), 0),
+                sqlalchemy.func.coalesce(sqlalchemy.func.sum(EmbeddingCall.duration), 0),
+            )
+            .where(
+                EmbeddingCall.workspace_uuid == workspace_uuid,
+                EmbeddingCall.timestamp >= start,
+                EmbeddingCall.timestamp < end,
+            )
+            .group_by(embedding_bucket, EmbeddingCall.model_name)
+        )
+        for (
+            bucket_value,
+            model_name,
+            count,
+            success_count,
+            error_count,
+            input_tokens,
+            total_tokens,
+            duration,
+        ) in embedding_result.all():
+            rows.append(
+                {
+                    'source': SOURCE_EMBEDDING_CALL,
+                    'bucket_start': self._bucket_value(bucket_value),
+                    'bot_id': '',
+                    'pipeline_id': '',
+                    'model_name': model_name,
+                    'record_count': int(count or 0),
+                    'success_count': int(success_count or 0),
+                    'error_count': int(error_count or 0),
+                    'input_tokens': int(input_tokens or 0),
+                    'total_tokens': int(total_tokens or 0),
+                    'duration': int(duration or 0),
+                }
+            )
+
+        defaults = {
+            'workspace_uuid': workspace_uuid,
+            'record_count': 0,
+            'success_count': 0,
+            'error_count': 0,
+            'zero_token_success_count': 0,
+            'input_tokens': 0,
+            'output_tokens': 0,
+            'total_tokens': 0,
+            'duration': 0,
+            'cost': 0.0,
+        }
+        return [defaults | row for row in rows]
+
+    async def _advance(
+        self,
+        workspace_uuid: str,
+        start: datetime.datetime,
+        end: datetime.datetime,
+        now: datetime.datetime,
+    ) -> int:
+        """Replace the rollups of ``[start, end)`` and move the watermark to ``end``."""
+
+        Rollup = persistence_monitoring.MonitoringHourlyRollup
+        State = persistence_monitoring.MonitoringRollupState
+        rows = await self._aggregate(workspace_uuid, start, end)
+        await self.ap.persistence_mgr.execute_async(
+            sqlalchemy.delete(Rollup).where(
+                Rollup.workspace_uuid == workspace_uuid,
+                Rollup.bucket_start >= start,
+                Rollup.bucket_start < end,
+            )
+        )
+        for offset in range(0, len(rows), _ROWS_PER_STATEMENT):
+            await self.ap.persistence_mgr.execute_async(
+                sqlalchemy.insert(Rollup).values(rows[offset : offset + _ROWS_PER_STATEMENT])
+            )
+        updated = await self.ap.persistence_mgr.execute_async(
+            sqlalchemy.update(State)
+            .where(State.workspace_uuid == workspace_uuid)
+            .values(rolled_up_until=end, updated_at=now)
+        )
+        if not updated.rowcount:
+            await self.ap.persistence_mgr.execute_async(
+                sqlalchemy.insert(State).values(
+                    workspace_uuid=workspace_uuid,
+                    rolled_up_until=end,
+                    updated_at=now,
+                )
+            )
+        return len(rows)
+
+    async def compact(self, workspace_uuid: str, *, now: datetime.datetime | None = None) -> int:
+        """Fold closed hours into rollups and return the number of rollup rows written.
+
+        At most ``max_hours_per_run`` hours are compacted per call so that a
+        first run over a long history is spread across maintenance cycles.
+        The caller provides the Workspace transaction.
+        """
+
+        if now is None:
+            now = datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+        settle = datetime.timedelta(minutes=self._positive_int_config('settle_minutes', _DEFAULT_SETTLE_MINUTES))
+        target = floor_hour(now - settle)
+
+        start = await self.get_watermark(workspace_uuid)
+        if start is None:
+            # First run: start at the oldest record, or publish an empty
+            # watermark so readers switch to the rollup path right away.
+            oldest = await self._oldest_record_time(workspace_uuid)
+            start = min(floor_hour(oldest), target) if oldest is not None else target
+        elif start >= target:
+            return 0
+
+        max_hours = self._positive_int_config('max_hours_per_run', _DEFAULT_MAX_HOURS_PER_RUN)
+        end = min(target, start + max_hours * ROLLUP_BUCKET)
+        return await self._advance(workspace_uuid, start, end, now)
+
+    async def prune(self, workspace_uuid: str, cutoff: datetime.datetime) -> int:
+        """Delete rollup hours that ended before the retention cutoff."""
+
+        Rollup = persistence_monitoring.MonitoringHourlyRollup
+        result = await self.ap.persistence_mgr.execute_async(
+            sqlalchemy.delete(Rollup).where(
+                Rollup.workspace_uuid == workspace_uuid,
+                Rollup.bucket_start < floor_hour(cutoff),
+            )
+        )
+        return int(result.rowcount or 0)
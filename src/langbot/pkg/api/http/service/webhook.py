@@ -60,6 +60,7 @@ class WebhookService:
         url: str,
         description: str = '',
         enabled: bool = True,
+        can_skip_pipeline: bool = False,
     ) -> dict:
         """Create a new webhook"""
         workspace_uuid = require_workspace_uuid(context)
@@ -79,6 +80,7 @@ class WebhookService:
             'url': url,
             'description': description,
             'enabled': enabled,
+            'can_skip_pipeline': can_skip_pipeline,
         }
 
         insert_result = await self.ap.persistence_mgr.execute_async(
@@ -128,6 +130,7 @@ class WebhookService:
         url: str | None = None,
         description: str | None = None,
         enabled: bool | None = None,
+        can_skip_pipeline: bool | None = None,
     ) -> bool:
         """Update a webhook's metadata"""
         update_data = {}
@@ -144,6 +147,8 @@ class WebhookService:
             update_data['description'] = description
         if enabled is not None:
             update_data['enabled'] = enabled
+        if can_skip_pipeline is not None:
+            update_data['can_skip_pipeline'] = can_skip_pipeline
 
         if update_data:
             result = await self.ap.persistence_mgr.execute_async(
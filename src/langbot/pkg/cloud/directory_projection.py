@@ -11,6 +11,8 @@ from typing import TYPE_CHECKING, Any
 import sqlalchemy
 from sqlalchemy.dialects import postgresql, sqlite
 
+from ..api.http.context import PrincipalType
+from ..api.http.principal_cache import PrincipalCache
 from ..entity.persistence.cloud_directory import DirectoryProjectionInbox, DirectoryProjectionState
 from ..entity.persistence.user import AccountSource, AccountStatus, User
 from ..entity.persistence.workspace import (
@@ -357,6 +359,8 @@ class DirectoryProjectionService:
 
             await session.flush()
 
+        self._invalidate_execution_bindings(None)
+        self._invalidate_principals(None)
         await self._reconcile_entitlement_snapshot_set(snapshot)
         self._publish_runtime_execution_projection(snapshot.workspaces)
         self._request_model_catalog_sync()
@@ -460,6 +464,8 @@ class DirectoryProjectionService:
             await session.flush()
             projection_caught_up = batch.cursor == batch.high_water_cursor and int(state.cursor) == batch.cursor
 
+        self._invalidate_execution_bindings(requested)
+        self._invalidate_principals(requested)
         await self._update_entitlement_workspace_activity(
             returned.values(),
             requested_workspace_uuids=requested,
@@ -478,6 +484,24 @@ class DirectoryProjectionService:
             self._record_success()
         self._consumer_cursor = batch.cursor
 
+    def _invalidate_execution_bindings(self, workspace_uuids: set[str] | None) -> None:
+        """Drop cached execution bindings of Workspaces a committed projection touched."""
+
+        invalidate = getattr(getattr(self.ap, 'workspace_service', None), 'invalidate_execution_bindings', None)
+        if callable(invalidate):
+            invalidate(workspace_uuids)
+
+    def _invalidate_principals(self, workspace_uuids: set[str] | None) -> None:
+        """Drop cached HTTP principals whose Workspace or Account a committed projection touched."""
+
+        cache = getattr(self.ap, 'principal_cache', None)
+        if not isinstance(cache, PrincipalCache):
+            return
+        cache.invalidate(workspace_uuids)
+        if workspace_uuids is not None:
+            # A delta also updates Accounts, whose tokens may be cached for other Workspaces.
+            cache.invalidate(principal_type=PrincipalType.ACCOUNT)
+
     def _request_model_catalog_sync(self) -> None:
         """Wake model provisioning after a committed directory change."""
 
@@ -193,6 +193,28 @@ class EntitlementResolver:
             )
         return candidate.model_copy(deep=True)
 
+    def current_revision(self, workspace_uuid: str, *, now: int | None = None) -> int | None:
+        """Revision of the last snapshot resolved for a Workspace, if it is still valid.
+
+        Reads only what ``resolve`` retained, so callers can check a revision
+        they cached against it without calling the provider.
+        """
+
+        if self._deployment_admission is not None:
+            self._deployment_admission()
+        active_workspace_uuids = self._active_workspace_uuids
+        if active_workspace_uuids is not None and workspace_uuid not in active_workspace_uuids:
+            return None
+        cached = self._snapshots.get(workspace_uuid)
+        if cached is None:
+            return None
+        revision, _, snapshot = cached
+        try:
+            snapshot.require_active(instance_uuid=self.instance_uuid, workspace_uuid=workspace_uuid, now=now)
+        except EntitlementUnavailableError:
+            return None
+        return revision
+
     def _require_projected_workspace_locked(self, workspace_uuid: str) -> None:
         active_workspace_uuids = self._active_workspace_uuids
         if active_workspace_uuids is not None and workspace_uuid not in active_workspace_uuids:
@@ -19,9 +19,12 @@ from ..plugin import connector as plugin_connector
 from ..pipeline import pool
 from ..pipeline import controller, pipelinemgr
 from ..pipeline import aggregator as message_aggregator
+from ..pipeline.ratelimit import backend as ratelimit_backend
 from ..utils import version as version_mgr, proxy as proxy_mgr, httpclient
 from ..persistence import mgr as persistencemgr
+from ..persistence import statement_stats as persistence_statement_stats
 from ..api.http.controller import main as http_controller
+from ..api.http import principal_cache as http_principal_cache
 from ..api.http.service import user as user_service
 from ..api.http.service import space as space_service
 from ..api.http.service import model as model_service
@@ -122,6 +125,8 @@ class Application:
 
     pipeline_mgr: pipelinemgr.PipelineManager = None
 
+    rate_limit_backend: ratelimit_backend.RateLimitBackend = None
+
     ver_mgr: version_mgr.VersionManager = None
 
     proxy_mgr: proxy_mgr.ProxyManager = None
@@ -181,6 +186,8 @@ class Application:
 
     apikey_service: apikey_service.ApiKeyService = None
 
+    principal_cache: http_principal_cache.PrincipalCache | None = None
+
     webhook_service: webhook_service.WebhookService = None
 
     telemetry: telemetry_module.TelemetryManager = None
@@ -216,7 +223,7 @@ class Application:
         query_pool_stats = {}
         if self.query_pool is not None:
             query_pool_stats = {
-                'queued': len(self.query_pool.queries),
+                'queued': self.query_pool.queued_query_count,
                 'cached': len(self.query_pool.cached_queries),
                 'active_workspaces': len(self.query_pool.active_query_count_by_workspace),
             }
@@ -229,6 +236,9 @@ class Application:
                 'embeddings': len(self.model_mgr.embedding_model_dict),
                 'rerankers': len(self.model_mgr.rerank_model_dict),
             }
+            embedding_cache = getattr(self.model_mgr, 'embedding_cache', None)
+            if embedding_cache is not None:
+                model_stats['embedding_cache'] = embedding_cache.snapshot()
 
         runtime_stats = {
             'bots': len(getattr(self.platform_mgr, '_bots_by_key', {})),
@@ -275,23 +285,53 @@ class Application:
             }
         )
 
+        response_cache = getattr(self.pipeline_mgr, 'response_cache', None)
+        if response_cache is not None:
+            runtime_stats['response_cache'] = response_cache.snapshot()
+
+        conversation_store = getattr(self.sess_mgr, 'store', None)
+        if conversation_store is not None:
+            runtime_stats['conversation_store'] = conversation_store.snapshot()
+        webhook_outbox = getattr(self.webhook_pusher, 'outbox', None)
+        if webhook_outbox is not None:
+            runtime_stats['webhook_outbox'] = webhook_outbox.snapshot()
+        payload_transfer_stats = getattr(self.plugin_connector, 'payload_transfer_stats', None)
+        if payload_transfer_stats is not None:
+            runtime_stats['plugin_payload_transfer'] = payload_transfer_stats.snapshot()
+
         directory_stats = {}
         directory_snapshot = getattr(self.directory_projection_service, 'resource_snapshot', None)
         if callable(directory_snapshot):
             directory_stats = directory_snapshot()
 
+        monitoring_write_buffer = getattr(self.monitoring_service, 'write_buffer', None)
+        monitoring_stats = monitoring_write_buffer.snapshot() if monitoring_write_buffer is not None else {}
+
         database_stats = {}
         database_snapshot = getattr(self.persistence_mgr, 'get_resource_stats', None)
         if callable(database_snapshot):
             database_stats = database_snapshot()
+        query_statement_stats = getattr(self.persistence_mgr, 'query_statement_stats', None)
+        database_statement_stats = (
+            query_statement_stats.snapshot()
+            if isinstance(query_statement_stats, persistence_statement_stats.QueryStatementStats)
+            else {}
+        )
 
         return {
             'asyncio_tasks': asyncio_tasks,
+            'http_principal_cache': (
+                self.principal_cache.snapshot()
+                if isinstance(self.principal_cache, http_principal_cache.PrincipalCache)
+                else {}
+            ),
             'event_loop': self.event_loop_monitor.snapshot(),
             'blocking_executor': (self.blocking_executor.snapshot() if self.blocking_executor is not None else {}),
             'application_tasks': task_stats,
             'database_pool': database_stats,
+            'database_statements': database_statement_stats,
             'directory': directory_stats,
+            'monitoring_write_buffer': monitoring_stats,
             'query_pool': query_pool_stats,
             'models': model_stats,
             'runtimes': runtime_stats,
@@ -374,6 +414,33 @@ class Application:
             )
             self._start_plugin_runtime_initialization()
 
+            enable_monitoring_write_buffer = getattr(self.monitoring_service, 'enable_write_buffer', None)
+            if callable(enable_monitoring_write_buffer):
+                monitoring_write_buffer = enable_monitoring_write_buffer()
+                if monitoring_write_buffer is not None:
+                    self.task_mgr.create_task(
+                        monitoring_write_buffer.run(),
+                        name='monitoring-write-buffer',
+                        scopes=[core_entities.LifecycleControlScope.APPLICATION],
+                    )
+
+            conversation_store = getattr(self.sess_mgr, 'store', None)
+            conversation_store_enabled = conversation_store is not None and conversation_store.persistent
+            if conversation_store_enabled:
+                self.task_mgr.create_task(
+                    conversation_store.run(),
+                    name='conversation-store-write-behind',
+                    scopes=[core_entities.LifecycleControlScope.APPLICATION],
+                )
+
+            webhook_outbox = getattr(self.webhook_pusher, 'outbox', None)
+            if webhook_outbox is not None and webhook_outbox.persistent:
+                self.task_mgr.create_task(
+                    webhook_outbox.run(),
+                    name='webhook-outbox-delivery',
+                    scopes=[core_entities.LifecycleControlScope.APPLICATION],
+                )
+
             # Telemetry instance heartbeat (startup + daily); respects
             # space.disable_telemetry via TelemetryManager.send().
             if self.telemetry is not None:
@@ -407,6 +474,22 @@ class Application:
                 * 3600
             )
 
+            rollups_cfg = monitoring_cfg.get('rollups', {})
+            rollups_enabled = rollups_cfg.get('enabled', True) and callable(
+                getattr(self.monitoring_service, 'compact_rollups', None)
+            )
+            rollups_interval_seconds = (
+                self._get_positive_float_config(
+                    rollups_cfg.get('compact_interval_minutes', 5),
+                    default=5,
+                    name='monitoring.rollups.compact_interval_minutes',
+                )
+                * 60
+            )
+
+            embedding_cache = getattr(self.model_mgr, 'embedding_cache', None)
+            embedding_cache_enabled = embedding_cache is not None and embedding_cache.persistent
+
             storage_cleanup_cfg = self.instance_config.data.get('storage', {}).get('cleanup', {})
             storage_enabled = storage_cleanup_cfg.get('enabled', True) and self.maintenance_service is not None
             storage_interval_seconds = (
@@ -421,6 +504,12 @@ class Application:
             maintenance_intervals: dict[str, float] = {}
             if monitoring_enabled:
                 maintenance_intervals['monitoring'] = monitoring_interval_seconds
+            if rollups_enabled:
+                maintenance_intervals['monitoring_rollups'] = rollups_interval_seconds
+            if embedding_cache_enabled:
+                maintenance_intervals['embedding_cache'] = 3600.0
+            if conversation_store_enabled:
+                maintenance_intervals['conversation_store'] = 3600.0
             if storage_enabled:
                 maintenance_intervals['storage'] = storage_interval_seconds
             if self.workspace_collaboration_service is not None:
@@ -475,6 +564,34 @@ class Application:
                                             f'Monitoring auto-cleanup failed for '
                                             f'Workspace {context.workspace_uuid}: {exc}'
                                         )
+                                if 'monitoring_rollups' in due:
+                                    try:
+                                        await self.monitoring_service.compact_rollups(context)
+                                    except asyncio.CancelledError:
+                                        raise
+                                    except Exception as exc:
+                                        self.logger.warning(
+                                            f'Monitoring rollup compaction failed for '
+                                            f'Workspace {context.workspace_uuid}: {exc}'
+                                        )
+                                if 'embedding_cache' in due:
+                                    try:
+                                        await embedding_cache.prune_expired(context.workspace_uuid)
+                                    except asyncio.CancelledError:
+                                        raise
+                                    except Exception as exc:
+                                        self.logger.warning(
+                                            f'Embedding cache pruning failed for Workspace {context.workspace_uuid}: {exc}'
+                                        )
+                                if 'conversation_store' in due:
+                                    try:
+                                        await conversation_store.prune_expired(context.workspace_uuid)
+                                    except asyncio.CancelledError:
+                                        raise
+                                    except Exception as exc:
+                                        self.logger.warning(
+                                            f'Conversation store pruning failed for Workspace {context.workspace_uuid}: {exc}'
+                                        )
                                 if 'storage' in due:
                                     try:
                                         deleted = await self.maintenance_service.cleanup_expired_files(context)
@@ -580,6 +697,14 @@ class Application:
             if self.plugin_connector is not None:
                 with contextlib.suppress(Exception):
                     await self.plugin_connector.aclose()
+            monitoring_shutdown = getattr(self.monitoring_service, 'shutdown', None)
+            if callable(monitoring_shutdown):
+                with contextlib.suppress(Exception):
+                    await monitoring_shutdown()
+            conversation_store = getattr(self.sess_mgr, 'store', None)
+            if conversation_store is not None:
+                with contextlib.suppress(Exception):
+                    await conversation_store.close()
             if self.telemetry is not None:
                 with contextlib.suppress(Exception):
                     await self.telemetry.shutdown()
@@ -589,6 +714,9 @@ class Application:
             if self.storage_mgr is not None:
                 with contextlib.suppress(Exception):
                     await self.storage_mgr.shutdown()
+            if self.rate_limit_backend is not None:
+                with contextlib.suppress(Exception):
+                    await self.rate_limit_backend.close()
             manifest_provider = getattr(self.deployment, 'manifest_provider', None)
             if manifest_provider is not None:
                 with contextlib.suppress(Exception):
@@ -7,6 +7,7 @@ import os
 
 from . import app
 from . import stage
+from .bootutils import startup_profile
 from ..utils import constants, importutil
 
 # Import startup stage implementation to register
@@ -39,9 +40,11 @@ async def make_app(loop: asyncio.AbstractEventLoop) -> app.Application:
             stage_cls = stage.preregistered_stages[stage_name]
             stage_inst = stage_cls()
 
-            await stage_inst.run(ap)
+            with startup_profile.measure('stage', stage_name):
+                await stage_inst.run(ap)
 
-        await ap.initialize()
+        with startup_profile.measure('stage', 'Application.initialize'):
+            await ap.initialize()
     except BaseException:
         # ``main()`` cannot clean up a partially built application because
         # ``make_app()`` has not returned it yet. Release managers, pools and
@@ -49,6 +52,10 @@ async def make_app(loop: asyncio.AbstractEventLoop) -> app.Application:
         with contextlib.suppress(BaseException):
             await ap.shutdown()
         raise
+    finally:
+        profiler = startup_profile.finish()
+        if profiler is not None and ap.logger is not None:
+            ap.logger.info(profiler.report())
 
     return ap
 
@@ -0,0 +1,122 @@
+"""Wall time and memory of startup stages, manager initialization and imports.
+
+Enabled with ``--profile-startup`` or ``LANGBOT_PROFILE_STARTUP=1``. The report
+is logged once the application is built. For a per-module breakdown of the
+import graph, combine it with ``python -X importtime``.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import dataclasses
+import os
+import time
+import typing
+
+
+@dataclasses.dataclass
+class StartupRecord:
+    category: str
+    """``import``, ``stage`` or ``init``"""
+
+    name: str
+
+    depth: int
+    """Nesting level; imports triggered while a manager initializes sit below it."""
+
+    seconds: float = 0.0
+
+    rss_bytes: int | None = None
+    """Change of the resident set size while the step ran."""
+
+
+def _rss_bytes() -> int | None:
+    try:
+        import psutil
+
+        return psutil.Process().memory_info().rss
+    except Exception:
+        return None
+
+
+class StartupProfiler:
+    def __init__(self) -> None:
+        self.records: list[StartupRecord] = []
+        self._depth = 0
+        self._started_at = time.perf_counter()
+        self._started_rss = _rss_bytes()
+
+    @contextlib.contextmanager
+    def measure(self, category: str, name: str) -> typing.Iterator[StartupRecord]:
+        record = StartupRecord(category=category, name=name, depth=self._depth)
+        self.records.append(record)
+        self._depth += 1
+        rss_before = _rss_bytes()
+        started = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record.seconds = time.perf_counter() - started
+            rss_after = _rss_bytes()
+            if rss_before is not None and rss_after is not None:
+                record.rss_bytes = rss_after - rss_before
+            self._depth -= 1
+
+    def report(self) -> str:
+        total_seconds = time.perf_counter() - self._started_at
+        rss = _rss_bytes()
+        lines = [f'Startup profile: {total_seconds * 1000:.0f} ms, RSS {_format_mib(rss)}']
+        if self._started_rss is not None and rss is not None:
+            lines[0] += f' ({_format_mib(rss - self._started_rss, signed=True)} since profiling started)'
+        for record in self.records:
+            indent = '  ' * (record.depth + 1)
+            lines.append(
+                f'{indent}{record.category} {record.name}: {record.seconds * 1000:.1f} ms, '
+                f'RSS {_format_mib(record.rss_bytes, signed=True)}'
+            )
+        return '\n'.join(lines)
+
+
+def _format_mib(value: int | None, *, signed: bool = False) -> str:
+    if value is None:
+        return 'n/a'
+    return f'{value / (1024 * 1024):{"+" if signed else ""}.1f} MiB'
+
+
+_active: StartupProfiler | None = None
+
+
+def enabled_by_environment() -> bool:
+    return os.environ.get('LANGBOT_PROFILE_STARTUP', '').lower() in ('true', '1')
+
+
+def enable() -> StartupProfiler:
+    """Start collecting records, keeping the profiler that is already running."""
+
+    global _active
+    if _active is None:
+        _active = StartupProfiler()
+    return _active
+
+
+def active() -> StartupProfiler | None:
+    return _active
+
+
+def finish() -> StartupProfiler | None:
+    """Stop collecting and return the profiler so its report can be logged."""
+
+    global _active
+    profiler, _active = _active, None
+    return profiler
+
+
+@contextlib.contextmanager
+def measure(category: str, name: str) -> typing.Iterator[StartupRecord | None]:
+    """Record ``name`` while profiling is enabled; a no-op otherwise."""
+
+    if _active is None:
+        yield None
+        return
+    with _active.measure(category, name) as record:
+        yield record
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
 from .. import stage, app, entities as core_entities
+from ..bootutils import startup_profile
 from ...utils import version, proxy, constants
 from ...pipeline import pool, controller, pipelinemgr
+from ...pipeline.ratelimit import backend as ratelimit_backend
 from ...pipeline import aggregator as message_aggregator
 from ...box import service as box_service
 from ...plugin import connector as plugin_connector
@@ -16,6 +18,7 @@ from ...platform import botmgr as im_mgr
 from ...platform.webhook_pusher import WebhookPusher
 from ...persistence import mgr as persistencemgr
 from ...api.http.controller import main as http_controller
+from ...api.http import principal_cache
 from ...api.http.service import user as user_service
 from ...api.http.service import space as space_service
 from ...api.http.service import model as model_service
@@ -143,14 +146,16 @@ class BuildAppStage(stage.BootingStage):
 
         storage_mgr_inst = storagemgr.StorageMgr(ap)
         ap.storage_mgr = storage_mgr_inst
-        await storage_mgr_inst.initialize()
+        with startup_profile.measure('init', 'StorageMgr'):
+            await storage_mgr_inst.initialize()
 
         persistence_mgr_inst = persistencemgr.PersistenceManager(
             ap,
             mode=persistencemgr.PersistenceMode(deployment.persistence_mode),
         )
         ap.persistence_mgr = persistence_mgr_inst
-        await persistence_mgr_inst.initialize()
+        with startup_profile.measure('init', 'PersistenceManager'):
+            await persistence_mgr_inst.initialize()
 
         if deployment.multi_workspace_enabled:
             directory_projection_service = DirectoryProjectionService(
@@ -197,6 +202,9 @@ class BuildAppStage(stage.BootingStage):
 
         user_service_inst = user_service.UserService(ap)
         ap.user_service = user_service_inst
+        ap.principal_cache = principal_cache.PrincipalCache.from_config(
+            ap.instance_config.data.get('api', {}).get('principal_cache', {}) or {}
+        )
 
         async def resolve_singleton_execution_context() -> ExecutionContext:
             if workspace_policy.multi_workspace_enabled:
@@ -232,7 +240,8 @@ class BuildAppStage(stage.BootingStage):
 
         llm_model_mgr_inst = llm_model_mgr.ModelManager(ap)
         ap.model_mgr = llm_model_mgr_inst
-        await llm_model_mgr_inst.initialize()
+        with startup_profile.measure('init', 'ModelManager'):
+            await llm_model_mgr_inst.initialize()
 
         llm_session_mgr_inst = llm_session_mgr.SessionManager(ap)
         await llm_session_mgr_inst.initialize()
@@ -240,22 +249,29 @@ class BuildAppStage(stage.BootingStage):
 
         box_service_inst = box_service.BoxService(ap)
         ap.box_service = box_service_inst
-        await box_service_inst.initialize()
+        with startup_profile.measure('init', 'BoxService'):
+            await box_service_inst.initialize()
 
         llm_tool_mgr_inst = llm_tool_mgr.ToolManager(ap)
         ap.tool_mgr = llm_tool_mgr_inst
-        await llm_tool_mgr_inst.initialize()
+        with startup_profile.measure('init', 'ToolManager'):
+            await llm_tool_mgr_inst.initialize()
 
         im_mgr_inst = im_mgr.PlatformManager(ap=ap)
         ap.platform_mgr = im_mgr_inst
-        await im_mgr_inst.initialize()
+        with startup_profile.measure('init', 'PlatformManager'):
+            await im_mgr_inst.initialize()
 
         # Initialize webhook pusher
         webhook_pusher_inst = WebhookPusher(ap)
         ap.webhook_pusher = webhook_pusher_inst
 
+        # Rate limit counters, shared between replicas when a store is configured
+        ap.rate_limit_backend = ratelimit_backend.create_backend(ap)
+
         pipeline_mgr = pipelinemgr.PipelineManager(ap)
-        await pipeline_mgr.initialize()
+        with startup_profile.measure('init', 'PipelineManager'):
+            await pipeline_mgr.initialize()
         ap.pipeline_mgr = pipeline_mgr
 
         # Initialize message aggregator (after pipeline_mgr, as it needs pipeline config)
@@ -264,11 +280,13 @@ class BuildAppStage(stage.BootingStage):
 
         # Initialize skill manager
         skill_mgr_inst = skill_mgr.SkillManager(ap)
-        await skill_mgr_inst.initialize()
+        with startup_profile.measure('init', 'SkillManager'):
+            await skill_mgr_inst.initialize()
         ap.skill_mgr = skill_mgr_inst
 
         rag_mgr_inst = rag_mgr.RAGManager(ap)
-        await rag_mgr_inst.initialize()
+        with startup_profile.measure('init', 'RAGManager'):
+            await rag_mgr_inst.initialize()
         ap.rag_mgr = rag_mgr_inst
 
         # Initialize RAG Runtime Service for plugins
@@ -277,11 +295,13 @@ class BuildAppStage(stage.BootingStage):
         # 初始化向量数据库管理器
         vectordb_mgr_inst = vectordb_mgr.VectorDBManager(ap)
         ap.vector_db_mgr = vectordb_mgr_inst
-        await vectordb_mgr_inst.initialize()
+        with startup_profile.measure('init', 'VectorDBManager'):
+            await vectordb_mgr_inst.initialize()
 
         http_ctrl = http_controller.HTTPController(ap)
         ap.http_ctrl = http_ctrl
-        await http_ctrl.initialize()
+        with startup_profile.measure('init', 'HTTPController'):
+            await http_ctrl.initialize()
 
         monitoring_service_inst = monitoring_service.MonitoringService(ap)
         ap.monitoring_service = monitoring_service_inst
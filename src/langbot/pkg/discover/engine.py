@@ -3,10 +3,12 @@ from __future__ import annotations
 import typing
 import importlib
 import os
+import collections.abc
 import yaml
 import pydantic
 
 from langbot.pkg.core import app
+from langbot.pkg.core.bootutils import startup_profile
 from langbot.pkg.utils import importutil
 
 
@@ -200,6 +202,46 @@ class Component(pydantic.BaseModel):
         }
 
 
+class ComponentClassRegistry(collections.abc.Mapping):
+    """按组件名称延迟导入的组件类映射
+
+    名称来自组件清单，组件模块在第一次取用其类时才导入，未使用的组件不会被加载。
+    """
+
+    def __init__(self, components: typing.Iterable[Component]):
+        self._components: typing.Dict[str, Component] = {component.metadata.name: component for component in components}
+        self._classes: typing.Dict[str, typing.Type[typing.Any]] = {}
+
+    def __getitem__(self, name: str) -> typing.Type[typing.Any]:
+        component_class = self._classes.get(name)
+        if component_class is None:
+            component = self._components[name]
+            with startup_profile.measure('import', f'{component.kind}/{name}'):
+                component_class = component.get_python_component_class()
+            self._classes[name] = component_class
+        return component_class
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._components
+
+    def __iter__(self) -> typing.Iterator[str]:
+        return iter(self._components)
+
+    def __len__(self) -> int:
+        return len(self._components)
+
+    def loaded(self) -> typing.Dict[str, typing.Type[typing.Any]]:
+        """已导入的组件类"""
+        return dict(self._classes)
+
+    def name_of(self, component_class: type) -> str | None:
+        """在已导入的组件类中查找名称，不会触发导入"""
+        for name, loaded_class in self._classes.items():
+            if loaded_class is component_class:
+                return name
+        return None
+
+
 class ComponentDiscoveryEngine:
     """组件发现引擎"""
 
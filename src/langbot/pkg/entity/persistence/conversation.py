@@ -0,0 +1,24 @@
+import sqlalchemy
+
+from .base import Base
+
+
+class ConversationSnapshot(Base):
+    """Persisted history of the conversation a session is using, the cold tier behind SessionManager"""
+
+    __tablename__ = 'conversation_snapshots'
+
+    workspace_uuid = sqlalchemy.Column(
+        sqlalchemy.String(36),
+        sqlalchemy.ForeignKey('workspaces.uuid', ondelete='CASCADE'),
+        primary_key=True,
+    )
+    session_digest = sqlalchemy.Column(sqlalchemy.String(64), primary_key=True)  # sha256 of bot and launcher
+    bot_uuid = sqlalchemy.Column(sqlalchemy.String(255), nullable=False)
+    pipeline_uuid = sqlalchemy.Column(sqlalchemy.String(255), nullable=False)
+    conversation_uuid = sqlalchemy.Column(sqlalchemy.String(255), nullable=True)
+    message_count = sqlalchemy.Column(sqlalchemy.Integer, nullable=False, default=0)
+    messages = sqlalchemy.Column(sqlalchemy.LargeBinary, nullable=False)  # zlib-compressed JSON
+    updated_at = sqlalchemy.Column(sqlalchemy.DateTime, nullable=False)
+
+    __table_args__ = (sqlalchemy.Index('ix_conversation_snapshots_workspace_updated', 'workspace_uuid', 'updated_at'),)
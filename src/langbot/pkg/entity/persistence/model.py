@@ -141,3 +141,21 @@ class RerankModel(Base):
         sqlalchemy.Index('ix_rerank_models_workspace_provider', 'workspace_uuid', 'provider_uuid'),
         sqlalchemy.Index('ix_rerank_models_workspace_name', 'workspace_uuid', 'name'),
     )
+
+
+class EmbeddingCacheEntry(Base):
+    """Persisted query embedding, addressed by a digest of model settings and normalized text"""
+
+    __tablename__ = 'embedding_cache_entries'
+
+    workspace_uuid = sqlalchemy.Column(
+        sqlalchemy.String(36),
+        sqlalchemy.ForeignKey('workspaces.uuid', ondelete='CASCADE'),
+        primary_key=True,
+    )
+    cache_key = sqlalchemy.Column(sqlalchemy.String(64), primary_key=True)
+    embedding_model_uuid = sqlalchemy.Column(sqlalchemy.String(255), nullable=False)
+    vector = sqlalchemy.Column(sqlalchemy.LargeBinary, nullable=False)  # little-endian float64
+    created_at = sqlalchemy.Column(sqlalchemy.DateTime, nullable=False)
+
+    __table_args__ = (sqlalchemy.Index('ix_embedding_cache_entries_workspace_created', 'workspace_uuid', 'created_at'),)
@@ -29,6 +29,11 @@ class MonitoringMessage(Base):
     runner_name = sqlalchemy.Column(sqlalchemy.String(255), nullable=True)  # Runner name for this query
     variables = sqlalchemy.Column(sqlalchemy.Text, nullable=True)  # Query variables as JSON string
     role = sqlalchemy.Column(sqlalchemy.String(50), nullable=True, default='user')  # user, assistant
+    db_statements = sqlalchemy.Column(sqlalchemy.Integer, nullable=True)  # SQL statements issued by the query
+    db_time_ms = sqlalchemy.Column(sqlalchemy.Integer, nullable=True)  # milliseconds spent in those statements
+    tool_rounds = sqlalchemy.Column(sqlalchemy.Integer, nullable=True)  # tool call rounds run by the agent
+    tool_wall_ms = sqlalchemy.Column(sqlalchemy.Integer, nullable=True)  # wall time of those rounds
+    tool_time_ms = sqlalchemy.Column(sqlalchemy.Integer, nullable=True)  # summed duration of their tool calls
 
     __table_args__ = (
         sqlalchemy.Index('ix_monitoring_messages_workspace_timestamp', 'workspace_uuid', 'timestamp'),
@@ -234,3 +239,55 @@ class MonitoringFeedback(Base):
         sqlalchemy.Index('ix_monitoring_feedback_workspace_timestamp', 'workspace_uuid', 'timestamp'),
         sqlalchemy.Index('ix_monitoring_feedback_workspace_session', 'workspace_uuid', 'session_id'),
     )
+
+
+class MonitoringHourlyRollup(Base):
+    """Hourly aggregates of message, LLM call and embedding call records.
+
+    Dimensions that do not apply to a source are stored as empty strings so
+    they can take part in the primary key.
+    """
+
+    __tablename__ = 'monitoring_hourly_rollups'
+
+    workspace_uuid = sqlalchemy.Column(
+        sqlalchemy.String(36),
+        sqlalchemy.ForeignKey('workspaces.uuid', ondelete='CASCADE'),
+        primary_key=True,
+    )
+    source = sqlalchemy.Column(sqlalchemy.String(32), primary_key=True)  # message, llm_call, embedding_call
+    bucket_start = sqlalchemy.Column(sqlalchemy.DateTime, primary_key=True)
+    bot_id = sqlalchemy.Column(sqlalchemy.String(255), primary_key=True, default='')
+    pipeline_id = sqlalchemy.Column(sqlalchemy.String(255), primary_key=True, default='')
+    model_name = sqlalchemy.Column(sqlalchemy.String(255), primary_key=True, default='')
+    record_count = sqlalchemy.Column(sqlalchemy.Integer, nullable=False, default=0)
+    success_count = sqlalchemy.Column(sqlalchemy.Integer, nullable=False, default=0)
+    error_count = sqlalchemy.Column(sqlalchemy.Integer, nullable=False, default=0)
+    zero_token_success_count = sqlalchemy.Column(sqlalchemy.Integer, nullable=False, default=0)
+    input_tokens = sqlalchemy.Column(sqlalchemy.BigInteger, nullable=False, default=0)
+    output_tokens = sqlalchemy.Column(sqlalchemy.BigInteger, nullable=False, default=0)
+    total_tokens = sqlalchemy.Column(sqlalchemy.BigInteger, nullable=False, default=0)
+    duration = sqlalchemy.Column(sqlalchemy.BigInteger, nullable=False, default=0)  # milliseconds
+    cost = sqlalchemy.Column(sqlalchemy.Float, nullable=False, default=0.0)
+
+    __table_args__ = (
+        sqlalchemy.Index('ix_monitoring_hourly_rollups_workspace_bucket', 'workspace_uuid', 'bucket_start'),
+    )
+
+
+class MonitoringRollupState(Base):
+    """Per-Workspace rollup watermark.
+
+    Records older than ``rolled_up_until`` are represented by
+    ``MonitoringHourlyRollup`` rows; newer records are read from raw tables.
+    """
+
+    __tablename__ = 'monitoring_rollup_states'
+
+    workspace_uuid = sqlalchemy.Column(
+        sqlalchemy.String(36),
+        sqlalchemy.ForeignKey('workspaces.uuid', ondelete='CASCADE'),
+        primary_key=True,
+    )
+    rolled_up_until = sqlalchemy.Column(sqlalchemy.DateTime, nullable=False)
+    updated_at = sqlalchemy.Column(sqlalchemy.DateTime, nullable=False)
@@ -18,6 +18,10 @@ class Webhook(Base):
     url = sqlalchemy.Column(sqlalchemy.String(1024), nullable=False)
     description = sqlalchemy.Column(sqlalchemy.String(512), nullable=True, default='')
     enabled = sqlalchemy.Column(sqlalchemy.Boolean, nullable=False, default=True)
+    # Whether inbound messages wait for this webhook, whose response may set skip_pipeline.
+    # Other webhooks are delivered asynchronously through the outbox; the outbox turns this on
+    # once the webhook answers with skip_pipeline=true.
+    can_skip_pipeline = sqlalchemy.Column(sqlalchemy.Boolean, nullable=False, server_default=sqlalchemy.false())
     created_at = sqlalchemy.Column(sqlalchemy.DateTime, nullable=False, server_default=sqlalchemy.func.now())
     updated_at = sqlalchemy.Column(
         sqlalchemy.DateTime,
@@ -27,3 +31,29 @@ class Webhook(Base):
     )
 
     __table_args__ = (sqlalchemy.Index('ix_webhooks_workspace_name', 'workspace_uuid', 'name'),)
+
+
+class WebhookOutboxEvent(Base):
+    """Bot event waiting to be delivered, or retried, to one webhook"""
+
+    __tablename__ = 'webhook_outbox'
+
+    id = sqlalchemy.Column(sqlalchemy.Integer, primary_key=True, autoincrement=True)
+    workspace_uuid = sqlalchemy.Column(
+        sqlalchemy.String(36),
+        sqlalchemy.ForeignKey('workspaces.uuid', ondelete='CASCADE'),
+        nullable=False,
+    )
+    webhook_id = sqlalchemy.Column(
+        sqlalchemy.Integer,
+        sqlalchemy.ForeignKey('webhooks.id', ondelete='CASCADE'),
+        nullable=False,
+    )
+    payload = sqlalchemy.Column(sqlalchemy.Text, nullable=False)  # JSON event body
+    attempts = sqlalchemy.Column(sqlalchemy.Integer, nullable=False, default=0)
+    next_attempt_at = sqlalchemy.Column(sqlalchemy.DateTime, nullable=False)
+    claim_token = sqlalchemy.Column(sqlalchemy.String(36), nullable=True)
+    last_error = sqlalchemy.Column(sqlalchemy.String(512), nullable=True)
+    created_at = sqlalchemy.Column(sqlalchemy.DateTime, nullable=False)
+
+    __table_args__ = (sqlalchemy.Index('ix_webhook_outbox_workspace_due', 'workspace_uuid', 'next_attempt_at'),)
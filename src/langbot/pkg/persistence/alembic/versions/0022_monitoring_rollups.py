@@ -0,0 +1,106 @@
+"""add monitoring hourly rollups
+
+Revision ID: 0022_monitoring_rollups
+Revises: 0021_merge_reasoning_config
+Create Date: 2026-10-18
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+
+revision = '0022_monitoring_rollups'
+down_revision = '0021_merge_reasoning_config'
+branch_labels = None
+depends_on = None
+
+
+_ROLLUP_TABLE = 'monitoring_hourly_rollups'
+_STATE_TABLE = 'monitoring_rollup_states'
+_POLICY_NAME = 'langbot_workspace_isolation'
+_TENANT_SETTING = 'langbot.workspace_uuid'
+
+
+def _setting(name: str) -> str:
+    return f"NULLIF(current_setting('{name}', true), '')"
+
+
+def _quote(conn: sa.Connection, identifier: str) -> str:
+    return conn.dialect.identifier_preparer.quote(identifier)
+
+
+def _workspace_column(*, primary_key: bool) -> sa.Column:
+    return sa.Column(
+        'workspace_uuid',
+        sa.String(36),
+        sa.ForeignKey('workspaces.uuid', ondelete='CASCADE'),
+        nullable=False,
+        primary_key=primary_key,
+    )
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    existing_tables = set(sa.inspect(conn).get_table_names())
+    if _ROLLUP_TABLE not in existing_tables:
+        op.create_table(
+            _ROLLUP_TABLE,
+            _workspace_column(primary_key=True),
+            sa.Column('source', sa.String(32), primary_key=True),
+            sa.Column('bucket_start', sa.DateTime(), primary_key=True),
+            sa.Column('bot_id', sa.String(255), primary_key=True),
+            sa.Column('pipeline_id', sa.String(255), primary_key=True),
+            sa.Column('model_name', sa.String(255), primary_key=True),
+            sa.Column('record_count', sa.Integer(), nullable=False),
+            sa.Column('success_count', sa.Integer(), nullable=False),
+            sa.Column('error_count', sa.Integer(), nullable=False),
+            sa.Column('zero_token_success_count', sa.Integer(), nullable=False),
+            sa.Column('input_tokens', sa.BigInteger(), nullable=False),
+            sa.Column('output_tokens', sa.BigInteger(), nullable=False),
+            sa.Column('total_tokens', sa.BigInteger(), nullable=False),
+            sa.Column('duration', sa.BigInteger(), nullable=False),
+            sa.Column('cost', sa.Float(), nullable=False),
+        )
+        op.create_index(
+            'ix_monitoring_hourly_rollups_workspace_bucket',
+            _ROLLUP_TABLE,
+            ['workspace_uuid', 'bucket_start'],
+            unique=False,
+        )
+    if _STATE_TABLE not in existing_tables:
+        op.create_table(
+            _STATE_TABLE,
+            _workspace_column(primary_key=True),
+            sa.Column('rolled_up_until', sa.DateTime(), nullable=False),
+            sa.Column('updated_at', sa.DateTime(), nullable=False),
+        )
+
+    if conn.dialect.name != 'postgresql':
+        return
+
+    policy = _quote(conn, _POLICY_NAME)
+    expression = f'workspace_uuid::text = {_setting(_TENANT_SETTING)}'
+    for table_name in (_ROLLUP_TABLE, _STATE_TABLE):
+        table = _quote(conn, table_name)
+        op.execute(sa.text(f'ALTER TABLE {table} ENABLE ROW LEVEL SECURITY'))
+        op.execute(sa.text(f'ALTER TABLE {table} FORCE ROW LEVEL SECURITY'))
+        op.execute(sa.text(f'DROP POLICY IF EXISTS {policy} ON {table}'))
+        op.execute(
+            sa.text(
+                f'CREATE POLICY {policy} ON {table} AS PERMISSIVE FOR ALL TO PUBLIC '
+                f'USING ({expression}) WITH CHECK ({expression})'
+            )
+        )
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    if conn.dialect.name == 'postgresql':
+        policy = _quote(conn, _POLICY_NAME)
+        for table_name in (_ROLLUP_TABLE, _STATE_TABLE):
+            op.execute(sa.text(f'DROP POLICY IF EXISTS {policy} ON {_quote(conn, table_name)}'))
+    op.drop_table(_STATE_TABLE)
+    op.drop_index('ix_monitoring_hourly_rollups_workspace_bucket', table_name=_ROLLUP_TABLE)
+    op.drop_table(_ROLLUP_TABLE)
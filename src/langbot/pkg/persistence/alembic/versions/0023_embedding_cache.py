@@ -0,0 +1,75 @@
+"""add persistent query embedding cache
+
+Revision ID: 0023_embedding_cache
+Revises: 0022_monitoring_rollups
+Create Date: 2026-10-18
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+
+revision = '0023_embedding_cache'
+down_revision = '0022_monitoring_rollups'
+branch_labels = None
+depends_on = None
+
+
+_TABLE = 'embedding_cache_entries'
+_INDEX = 'ix_embedding_cache_entries_workspace_created'
+_POLICY_NAME = 'langbot_workspace_isolation'
+_TENANT_SETTING = 'langbot.workspace_uuid'
+
+
+def _setting(name: str) -> str:
+    return f"NULLIF(current_setting('{name}', true), '')"
+
+
+def _quote(conn: sa.Connection, identifier: str) -> str:
+    return conn.dialect.identifier_preparer.quote(identifier)
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    if _TABLE not in set(sa.inspect(conn).get_table_names()):
+        op.create_table(
+            _TABLE,
+            sa.Column(
+                'workspace_uuid',
+                sa.String(36),
+                sa.ForeignKey('workspaces.uuid', ondelete='CASCADE'),
+                nullable=False,
+                primary_key=True,
+            ),
+            sa.Column('cache_key', sa.String(64), primary_key=True),
+            sa.Column('embedding_model_uuid', sa.String(255), nullable=False),
+            sa.Column('vector', sa.LargeBinary(), nullable=False),
+            sa.Column('created_at', sa.DateTime(), nullable=False),
+        )
+        op.create_index(_INDEX, _TABLE, ['workspace_uuid', 'created_at'], unique=False)
+
+    if conn.dialect.name != 'postgresql':
+        return
+
+    policy = _quote(conn, _POLICY_NAME)
+    table = _quote(conn, _TABLE)
+    expression = f'workspace_uuid::text = {_setting(_TENANT_SETTING)}'
+    op.execute(sa.text(f'ALTER TABLE {table} ENABLE ROW LEVEL SECURITY'))
+    op.execute(sa.text(f'ALTER TABLE {table} FORCE ROW LEVEL SECURITY'))
+    op.execute(sa.text(f'DROP POLICY IF EXISTS {policy} ON {table}'))
+    op.execute(
+        sa.text(
+            f'CREATE POLICY {policy} ON {table} AS PERMISSIVE FOR ALL TO PUBLIC '
+            f'USING ({expression}) WITH CHECK ({expression})'
+        )
+    )
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    if conn.dialect.name == 'postgresql':
+        op.execute(sa.text(f'DROP POLICY IF EXISTS {_quote(conn, _POLICY_NAME)} ON {_quote(conn, _TABLE)}'))
+    op.drop_index(_INDEX, table_name=_TABLE)
+    op.drop_table(_TABLE)
@@ -0,0 +1,78 @@
+"""add persistent conversation snapshots
+
+Revision ID: 0024_conversation_snapshots
+Revises: 0023_embedding_cache
+Create Date: 2026-10-18
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+
+revision = '0024_conversation_snapshots'
+down_revision = '0023_embedding_cache'
+branch_labels = None
+depends_on = None
+
+
+_TABLE = 'conversation_snapshots'
+_INDEX = 'ix_conversation_snapshots_workspace_updated'
+_POLICY_NAME = 'langbot_workspace_isolation'
+_TENANT_SETTING = 'langbot.workspace_uuid'
+
+
+def _setting(name: str) -> str:
+    return f"NULLIF(current_setting('{name}', true), '')"
+
+
+def _quote(conn: sa.Connection, identifier: str) -> str:
+    return conn.dialect.identifier_preparer.quote(identifier)
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    if _TABLE not in set(sa.inspect(conn).get_table_names()):
+        op.create_table(
+            _TABLE,
+            sa.Column(
+                'workspace_uuid',
+                sa.String(36),
+                sa.ForeignKey('workspaces.uuid', ondelete='CASCADE'),
+                nullable=False,
+                primary_key=True,
+            ),
+            sa.Column('session_digest', sa.String(64), primary_key=True),
+            sa.Column('bot_uuid', sa.String(255), nullable=False),
+            sa.Column('pipeline_uuid', sa.String(255), nullable=False),
+            sa.Column('conversation_uuid', sa.String(255), nullable=True),
+            sa.Column('message_count', sa.Integer(), nullable=False),
+            sa.Column('messages', sa.LargeBinary(), nullable=False),
+            sa.Column('updated_at', sa.DateTime(), nullable=False),
+        )
+        op.create_index(_INDEX, _TABLE, ['workspace_uuid', 'updated_at'], unique=False)
+
+    if conn.dialect.name != 'postgresql':
+        return
+
+    policy = _quote(conn, _POLICY_NAME)
+    table = _quote(conn, _TABLE)
+    expression = f'workspace_uuid::text = {_setting(_TENANT_SETTING)}'
+    op.execute(sa.text(f'ALTER TABLE {table} ENABLE ROW LEVEL SECURITY'))
+    op.execute(sa.text(f'ALTER TABLE {table} FORCE ROW LEVEL SECURITY'))
+    op.execute(sa.text(f'DROP POLICY IF EXISTS {policy} ON {table}'))
+    op.execute(
+        sa.text(
+            f'CREATE POLICY {policy} ON {table} AS PERMISSIVE FOR ALL TO PUBLIC '
+            f'USING ({expression}) WITH CHECK ({expression})'
+        )
+    )
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    if conn.dialect.name == 'postgresql':
+        op.execute(sa.text(f'DROP POLICY IF EXISTS {_quote(conn, _POLICY_NAME)} ON {_quote(conn, _TABLE)}'))
+    op.drop_index(_INDEX, table_name=_TABLE)
+    op.drop_table(_TABLE)
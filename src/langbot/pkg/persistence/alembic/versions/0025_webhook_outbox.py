@@ -0,0 +1,99 @@
+"""add webhook outbox
+
+Revision ID: 0025_webhook_outbox
+Revises: 0024_conversation_snapshots
+Create Date: 2026-10-18
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+
+revision = '0025_webhook_outbox'
+down_revision = '0024_conversation_snapshots'
+branch_labels = None
+depends_on = None
+
+
+_TABLE = 'webhook_outbox'
+_INDEX = 'ix_webhook_outbox_workspace_due'
+_POLICY_NAME = 'langbot_workspace_isolation'
+_TENANT_SETTING = 'langbot.workspace_uuid'
+
+
+def _setting(name: str) -> str:
+    return f"NULLIF(current_setting('{name}', true), '')"
+
+
+def _quote(conn: sa.Connection, identifier: str) -> str:
+    return conn.dialect.identifier_preparer.quote(identifier)
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    tables = set(inspector.get_table_names())
+
+    # New webhooks start on the outbox. The outbox moves one inline once it answers with skip_pipeline=true.
+    # Existing webhooks were all called inline before this revision, and some of them may rely on
+    # skip_pipeline, so they keep being called inline.
+    if 'webhooks' in tables and 'can_skip_pipeline' not in {
+        column['name'] for column in inspector.get_columns('webhooks')
+    }:
+        op.add_column(
+            'webhooks',
+            sa.Column('can_skip_pipeline', sa.Boolean(), nullable=False, server_default=sa.false()),
+        )
+        op.execute(sa.text('UPDATE webhooks SET can_skip_pipeline = :enabled').bindparams(enabled=True))
+
+    if _TABLE not in tables:
+        op.create_table(
+            _TABLE,
+            sa.Column('id', sa.Integer(), primary_key=True, autoincrement=True),
+            sa.Column(
+                'workspace_uuid',
+                sa.String(36),
+                sa.ForeignKey('workspaces.uuid', ondelete='CASCADE'),
+                nullable=False,
+            ),
+            sa.Column('webhook_id', sa.Integer(), sa.ForeignKey('webhooks.id', ondelete='CASCADE'), nullable=False),
+            sa.Column('payload', sa.Text(), nullable=False),
+            sa.Column('attempts', sa.Integer(), nullable=False),
+            sa.Column('next_attempt_at', sa.DateTime(), nullable=False),
+            sa.Column('claim_token', sa.String(36), nullable=True),
+            sa.Column('last_error', sa.String(512), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=False),
+        )
+        op.create_index(_INDEX, _TABLE, ['workspace_uuid', 'next_attempt_at'], unique=False)
+
+    if conn.dialect.name != 'postgresql':
+        return
+
+    policy = _quote(conn, _POLICY_NAME)
+    table = _quote(conn, _TABLE)
+    expression = f'workspace_uuid::text = {_setting(_TENANT_SETTING)}'
+    op.execute(sa.text(f'ALTER TABLE {table} ENABLE ROW LEVEL SECURITY'))
+    op.execute(sa.text(f'ALTER TABLE {table} FORCE ROW LEVEL SECURITY'))
+    op.execute(sa.text(f'DROP POLICY IF EXISTS {policy} ON {table}'))
+    op.execute(
+        sa.text(
+            f'CREATE POLICY {policy} ON {table} AS PERMISSIVE FOR ALL TO PUBLIC '
+            f'USING ({expression}) WITH CHECK ({expression})'
+        )
+    )
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    if conn.dialect.name == 'postgresql':
+        op.execute(sa.text(f'DROP POLICY IF EXISTS {_quote(conn, _POLICY_NAME)} ON {_quote(conn, _TABLE)}'))
+    op.drop_index(_INDEX, table_name=_TABLE)
+    op.drop_table(_TABLE)
+    inspector = sa.inspect(conn)
+    if 'webhooks' in inspector.get_table_names() and 'can_skip_pipeline' in {
+        column['name'] for column in inspector.get_columns('webhooks')
+    }:
+        with op.batch_alter_table('webhooks') as batch_op:
+            batch_op.drop_column('can_skip_pipeline')
@@ -0,0 +1,49 @@
+"""add per-query SQL cost to monitoring messages
+
+Revision ID: 0026_monitoring_query_sql_cost
+Revises: 0025_webhook_outbox
+Create Date: 2026-10-18
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+
+revision = '0026_monitoring_query_sql_cost'
+down_revision = '0025_webhook_outbox'
+branch_labels = None
+depends_on = None
+
+
+_TABLE = 'monitoring_messages'
+_COLUMNS = ('db_statements', 'db_time_ms')
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    if _TABLE not in inspector.get_table_names():
+        return
+    existing = {column['name'] for column in inspector.get_columns(_TABLE)}
+    missing = [name for name in _COLUMNS if name not in existing]
+    if not missing:
+        return
+    with op.batch_alter_table(_TABLE) as batch_op:
+        for name in missing:
+            batch_op.add_column(sa.Column(name, sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    if _TABLE not in inspector.get_table_names():
+        return
+    existing = {column['name'] for column in inspector.get_columns(_TABLE)}
+    present = [name for name in _COLUMNS if name in existing]
+    if not present:
+        return
+    with op.batch_alter_table(_TABLE) as batch_op:
+        for name in present:
+            batch_op.drop_column(name)
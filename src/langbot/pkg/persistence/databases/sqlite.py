@@ -1,15 +1,180 @@
 from __future__ import annotations
 
+import os
+import urllib.parse
+
+import sqlalchemy
 import sqlalchemy.ext.asyncio as sqlalchemy_asyncio
 
-from .. import database
+from .. import database, sqlite_writer
+
+
+DEFAULT_PROFILE = 'default'
+TUNED_PROFILE = 'tuned'
+MAX_CACHE_SIZE_KIB = 4 * 1024 * 1024
+MAX_BUSY_TIMEOUT_MS = 300_000
+MAX_READER_POOL_SIZE = 64
+MAX_WRITE_BATCH_STATEMENTS = 1000
+MAX_WRITER_TIMEOUT_SECONDS = 300
 
 
 @database.manager_class('sqlite')
 class SQLiteDatabaseManager(database.BaseDatabaseManager):
-    """SQLite database manager"""
+    """SQLite database manager
+
+    The ``tuned`` profile switches the file to WAL and routes every transaction
+    through one writer connection. Once migrations have run,
+    ``enable_runtime_profile`` adds a read-only pool for standalone reads and a
+    queue that commits standalone writes in batches.
+
+    A unit of work holds the writer connection, and its write lock, until it
+    ends, so every other writer waits for it. Units of work that only read
+    should pass ``read_only=True`` to run on the read-only pool instead.
+    """
+
+    read_engine: sqlalchemy_asyncio.AsyncEngine | None = None
+    """Read-only pool of the tuned profile, serving standalone SELECTs"""
+
+    write_queue: sqlite_writer.SQLiteWriteQueue | None = None
+    """Batches standalone writes of the tuned profile onto the writer connection"""
+
+    @staticmethod
+    def _integer(config: dict, name: str, default: int, *, maximum: int) -> int:
+        value = config.get(name, default)
+        if isinstance(value, bool) or not isinstance(value, int) or not 1 <= value <= maximum:
+            raise ValueError(f'database.sqlite.{name} must be a positive integer no greater than {maximum}')
+        return value
 
     async def initialize(self) -> None:
-        db_file_path = self.ap.instance_config.data.get('database', {}).get('sqlite', {}).get('path', 'data/langbot.db')
-        engine_url = f'sqlite+aiosqlite:///{db_file_path}'
-        self.engine = sqlalchemy_asyncio.create_async_engine(engine_url)
+        sqlite_config = self.ap.instance_config.data.get('database', {}).get('sqlite', {})
+        if not isinstance(sqlite_config, dict):
+            raise ValueError('database.sqlite must be an object')
+        self.db_file_path = sqlite_config.get('path', 'data/langbot.db')
+        engine_url = f'sqlite+aiosqlite:///{self.db_file_path}'
+        self.profile = sqlite_config.get('profile', DEFAULT_PROFILE)
+        if self.profile not in (DEFAULT_PROFILE, TUNED_PROFILE):
+            raise ValueError(f"database.sqlite.profile must be '{DEFAULT_PROFILE}' or '{TUNED_PROFILE}'")
+        if self.profile == DEFAULT_PROFILE:
+            self.engine = sqlalchemy_asyncio.create_async_engine(engine_url)
+            return
+
+        if not isinstance(self.db_file_path, str) or self.db_file_path in ('', ':memory:'):
+            raise ValueError('database.sqlite.profile tuned requires a database file path')
+        self.cache_size_kib = self._integer(sqlite_config, 'cache_size_kib', 65536, maximum=MAX_CACHE_SIZE_KIB)
+        self.busy_timeout_ms = self._integer(sqlite_config, 'busy_timeout_ms', 5000, maximum=MAX_BUSY_TIMEOUT_MS)
+        self.reader_pool_size = self._integer(sqlite_config, 'reader_pool_size', 4, maximum=MAX_READER_POOL_SIZE)
+        self.write_batch_max_statements = self._integer(
+            sqlite_config,
+            'write_batch_max_statements',
+            sqlite_writer.DEFAULT_MAX_BATCH_STATEMENTS,
+            maximum=MAX_WRITE_BATCH_STATEMENTS,
+        )
+        self.writer_timeout_seconds = self._integer(
+            sqlite_config,
+            'writer_timeout_seconds',
+            30,
+            maximum=MAX_WRITER_TIMEOUT_SECONDS,
+        )
+        # SQLite admits one writer at a time. Queue for the single connection
+        # in-process instead of retrying on "database is locked".
+        self.engine = sqlalchemy_asyncio.create_async_engine(
+            engine_url,
+            pool_size=1,
+            max_overflow=0,
+            pool_timeout=self.writer_timeout_seconds,
+        )
+        self._explicit_begin = False
+        sqlalchemy.event.listen(self.engine.sync_engine, 'connect', self._configure_writer_connection)
+
+    def _apply_pragmas(self, dbapi_connection, pragmas: tuple[str, ...]) -> None:
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+
+    def _configure_writer_connection(self, dbapi_connection, _connection_record) -> None:
+        self._apply_pragmas(
+            dbapi_connection,
+            (
+                'PRAGMA journal_mode=WAL',
+                # WAL only syncs at checkpoints then. A power loss may drop the
+                # last commits but cannot corrupt the file.
+                'PRAGMA synchronous=NORMAL',
+                f'PRAGMA cache_size=-{self.cache_size_kib}',
+                f'PRAGMA busy_timeout={self.busy_timeout_ms}',
+                'PRAGMA temp_store=MEMORY',
+            ),
+        )
+        if self._explicit_begin:
+            dbapi_connection.isolation_level = None
+
+    def _configure_reader_connection(self, dbapi_connection, _connection_record) -> None:
+        self._apply_pragmas(
+            dbapi_connection,
+            (
+                f'PRAGMA cache_size=-{self.cache_size_kib}',
+                f'PRAGMA busy_timeout={self.busy_timeout_ms}',
+                'PRAGMA temp_store=MEMORY',
+            ),
+        )
+
+    @staticmethod
+    def _begin_immediate(conn: sqlalchemy.Connection) -> None:
+        # The sqlite3 driver defers BEGIN to the first write, which breaks
+        # SAVEPOINTs and lets a reader fail to upgrade. Take the write lock
+        # when the transaction starts, without counting it as a query statement.
+        # AUTOCOMMIT connections (checkpoint, VACUUM) must stay outside any transaction.
+        if conn.get_execution_options().get('isolation_level') == 'AUTOCOMMIT':
+            return
+        cursor = conn.connection.cursor()
+        try:
+            cursor.execute('BEGIN IMMEDIATE')
+        finally:
+            cursor.close()
+
+    def enable_runtime_profile(self) -> None:
+        """Start the tuned profile's reader pool and write queue.
+
+        Called once migrations are done and before the writer pool is disposed,
+        so every runtime connection opens with explicit transactions.
+        """
+
+        if self.profile != TUNED_PROFILE or self.write_queue is not None:
+            return
+        self._explicit_begin = True
+        sqlalchemy.event.listen(self.engine.sync_engine, 'begin', self._begin_immediate)
+        read_path = urllib.parse.quote(os.path.abspath(self.db_file_path))
+        self.read_engine = sqlalchemy_asyncio.create_async_engine(
+            f'sqlite+aiosqlite:///file:{read_path}?mode=ro&uri=true',
+            pool_size=self.reader_pool_size,
+            max_overflow=0,
+            pool_timeout=self.writer_timeout_seconds,
+        )
+        sqlalchemy.event.listen(self.read_engine.sync_engine, 'connect', self._configure_reader_connection)
+        self.write_queue = sqlite_writer.SQLiteWriteQueue(
+            self.engine,
+            max_batch_statements=self.write_batch_max_statements,
+        )
+        self.write_queue.start()
+
+    async def close(self) -> None:
+        """Commit queued writes and release the reader pool; the writer engine is disposed by the caller."""
+
+        if self.write_queue is not None:
+            await self.write_queue.close()
+        if self.read_engine is not None:
+            await self.read_engine.dispose()
+
+    def resource_stats(self) -> dict[str, int]:
+        if self.profile != TUNED_PROFILE:
+            return {}
+        stats = {
+            'writer_checked_out': self.engine.pool.checkedout(),
+            'reader_pool_size': self.reader_pool_size,
+            'reader_checked_out': self.read_engine.pool.checkedout() if self.read_engine is not None else 0,
+        }
+        if self.write_queue is not None:
+            stats.update(self.write_queue.snapshot())
+        return stats
@@ -13,7 +13,7 @@ import re
 import sqlalchemy.ext.asyncio as sqlalchemy_asyncio
 import sqlalchemy
 
-from . import database, migration, sqlite_migration_backup
+from . import database, migration, sqlite_migration_backup, sqlite_writer, statement_stats
 from ..entity.persistence import base, metadata, model as persistence_model
 from ..entity.persistence import workspace as persistence_workspace
 from ..entity import persistence
@@ -42,6 +42,7 @@ from .tenant_uow import (
     TenantScopeRequiredError,
     TenantScopedAsyncSession,
     TenantUnitOfWork,
+    _validate_scoped_statement_call,
 )
 
 importutil.import_modules_in_pkg(databases)
@@ -65,6 +66,8 @@ _ALEMBIC_TENANT_TABLES = {
     'llm_models',
     'embedding_models',
     'rerank_models',
+    'embedding_cache_entries',
+    'conversation_snapshots',
     'legacy_pipelines',
     'pipeline_run_records',
     'plugin_settings',
@@ -72,6 +75,7 @@ _ALEMBIC_TENANT_TABLES = {
     'knowledge_base_files',
     'knowledge_base_chunks',
     'webhooks',
+    'webhook_outbox',
     'monitoring_messages',
     'monitoring_llm_calls',
     'monitoring_tool_calls',
@@ -79,6 +83,8 @@ _ALEMBIC_TENANT_TABLES = {
     'monitoring_errors',
     'monitoring_embedding_calls',
     'monitoring_feedback',
+    'monitoring_hourly_rollups',
+    'monitoring_rollup_states',
     'langbot_vectors',
     'directory_projection_states',
     'directory_projection_inbox',
@@ -152,6 +158,12 @@ class PersistenceManager:
             f'langbot_persistence_boundary_{id(self)}',
             default=None,
         )
+        config = getattr(getattr(ap, 'instance_config', None), 'data', None) or {}
+        budget_config = config.get('database', {}).get('query_statement_budget')
+        self.query_statement_stats = statement_stats.QueryStatementStats.from_config(
+            budget_config if isinstance(budget_config, dict) else {},
+            logger=getattr(ap, 'logger', None),
+        )
 
     async def initialize(self):
         database_type = self.ap.instance_config.data.get('database', {}).get('use', 'sqlite')
@@ -168,6 +180,7 @@ class PersistenceManager:
             raise RuntimeError(f'Unsupported database type: {database_type!r}')
 
         engine = self.get_db_engine()
+        statement_stats.install(engine)
         if self.mode in {PersistenceMode.CLOUD_RUNTIME, PersistenceMode.RELEASE_MIGRATION}:
             if engine.dialect.name != 'postgresql':
                 raise RuntimeError(f'{self.mode.value} persistence mode requires PostgreSQL')
@@ -193,6 +206,8 @@ class PersistenceManager:
         """Dispose the owned database engine when initialization or runtime ends."""
 
         db = getattr(self, 'db', None)
+        if isinstance(getattr(db, 'write_queue', None), sqlite_writer.SQLiteWriteQueue):
+            await db.close()
         engine = getattr(db, 'engine', None)
         if engine is not None:
             await engine.dispose()
@@ -380,6 +395,14 @@ class PersistenceManager:
             return
         await engine.dispose()
         self._enable_sqlite_foreign_keys()
+        # The tuned profile switches to explicit transactions and opens its
+        # reader pool only now, so migrations keep the driver defaults.
+        enable_runtime_profile = getattr(self.db, 'enable_runtime_profile', None)
+        if callable(enable_runtime_profile):
+            enable_runtime_profile()
+            read_engine = getattr(self.db, 'read_engine', None)
+            if isinstance(read_engine, sqlalchemy_asyncio.AsyncEngine):
+                statement_stats.install(read_engine)
         # Dispose again so every runtime connection is opened through the new
         # listener instead of reusing a pre-migration pooled connection.
         await engine.dispose()
@@ -1782,17 +1805,41 @@ class PersistenceManager:
                 raise
         active_scope = self._get_active_scope()
         if active_scope is not None:
+            if self._sqlite_write_queue() is not None:
+                # SQLite applies no scope settings; keep the checks a scoped
+                # session runs before executing.
+                _validate_scoped_statement_call(args, kwargs)
+                return await self._execute_standalone_sqlite(*args, **kwargs)
             async with self._scoped_uow(active_scope.scope) as uow:
                 return await self._execute_on_scoped_connection(uow.session, *args, **kwargs)
         if self.mode == PersistenceMode.CLOUD_RUNTIME:
             raise TenantScopeRequiredError(
                 'Cloud persistence access requires an explicit Workspace or discovery scope/unit of work'
             )
+        if self._sqlite_write_queue() is not None:
+            return await self._execute_standalone_sqlite(*args, **kwargs)
         async with self.get_db_engine().connect() as conn:
             result = await conn.execute(*args, **kwargs)
             await conn.commit()
             return result
 
+    def _sqlite_write_queue(self) -> sqlite_writer.SQLiteWriteQueue | None:
+        write_queue = getattr(getattr(self, 'db', None), 'write_queue', None)
+        return write_queue if isinstance(write_queue, sqlite_writer.SQLiteWriteQueue) else None
+
+    async def _execute_standalone_sqlite(self, *args, **kwargs) -> sqlalchemy.engine.cursor.CursorResult:
+        """Run a statement outside any unit of work under the tuned SQLite profile.
+
+        SELECTs go to the read-only pool; everything else waits for the write
+        queue to commit it.
+        """
+
+        read_engine = getattr(self.db, 'read_engine', None)
+        if args and getattr(args[0], 'is_select', False) and read_engine is not None:
+            async with read_engine.connect() as conn:
+                return await conn.execute(*args, **kwargs)
+        return await self._sqlite_write_queue().execute(*args, **kwargs)
+
     @staticmethod
     async def _execute_on_scoped_connection(
         session: sqlalchemy_asyncio.AsyncSession,
@@ -1817,8 +1864,15 @@ class PersistenceManager:
             raise TypeError('Scoped Core execution requires a TenantScopedAsyncSession')
         return await session.execute_on_transaction_connection(*args, **kwargs)
 
-    def tenant_uow(self, workspace_uuid: str) -> TenantUnitOfWork:
-        return self._scoped_uow(PersistenceScope.workspace(workspace_uuid))
+    def tenant_uow(self, workspace_uuid: str, *, read_only: bool = False) -> TenantUnitOfWork:
+        """Open a Workspace transaction.
+
+        With ``read_only`` the tuned SQLite profile runs it on the read-only
+        pool, so the reads neither wait for nor hold the single writer
+        connection.
+        """
+
+        return self._scoped_uow(PersistenceScope.workspace(workspace_uuid), read_only=read_only)
 
     def tenant_scope(self, workspace_uuid: str) -> PersistenceScopeBoundary:
         """Bind a Workspace without holding a database session between calls."""
@@ -1890,14 +1944,19 @@ class PersistenceManager:
             )
         return active.session
 
-    def _scoped_uow(self, scope: PersistenceScope) -> TenantUnitOfWork:
+    def _scoped_uow(self, scope: PersistenceScope, *, read_only: bool = False) -> TenantUnitOfWork:
         on_pool_timeout = getattr(getattr(self, 'db', None), 'record_pool_timeout', None)
+        engine = self.get_db_engine()
+        read_engine = getattr(getattr(self, 'db', None), 'read_engine', None)
+        if read_only and isinstance(read_engine, sqlalchemy_asyncio.AsyncEngine):
+            engine = read_engine
         return TenantUnitOfWork(
-            self.get_db_engine(),
+            engine,
             scope=scope,
             active_transaction=self._active_transaction,
             active_scope=self._active_scope,
             on_pool_timeout=(on_pool_timeout if callable(on_pool_timeout) else None),
+            read_only=read_only,
         )
 
     def _get_active_transaction(self) -> ActiveScopedTransaction | None:
@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import dataclasses
+import time
+import typing
+
+import sqlalchemy
+import sqlalchemy.ext.asyncio as sqlalchemy_asyncio
+
+from . import statement_stats
+
+
+DEFAULT_MAX_BATCH_STATEMENTS = 64
+
+
+@dataclasses.dataclass(slots=True)
+class _PendingWrite:
+    args: tuple[typing.Any, ...]
+    kwargs: dict[str, typing.Any]
+    future: asyncio.Future[sqlalchemy.engine.CursorResult[typing.Any]]
+    tally: statement_stats.StatementTally | None
+
+
+class SQLiteWriteQueue:
+    """Serialize standalone SQLite writes and commit them in batches.
+
+    ``execute`` queues one statement and returns once it is committed. A single
+    task drains the queue on the writer connection and runs up to
+    ``max_batch_statements`` waiting statements in one transaction. When a
+    statement of a batch fails, the batch is rolled back and replayed with each
+    statement inside its own SAVEPOINT, so only the failing statement is undone
+    and raised to its caller. If the commit itself fails, every caller of the
+    batch receives that error.
+
+    A caller cancelled before its statement ran is skipped. Once the statement
+    has started it is committed with the rest of the batch.
+    """
+
+    def __init__(
+        self,
+        engine: sqlalchemy_asyncio.AsyncEngine,
+        *,
+        max_batch_statements: int = DEFAULT_MAX_BATCH_STATEMENTS,
+    ) -> None:
+        if max_batch_statements < 1:
+            raise ValueError('max_batch_statements must be positive')
+        self._engine = engine
+        self.max_batch_statements = max_batch_statements
+        self._queue: asyncio.Queue[_PendingWrite] = asyncio.Queue()
+        self._worker: asyncio.Task[None] | None = None
+        self._closed = False
+        self._submitted = 0
+        self._committed = 0
+        self._failed = 0
+        self._batches = 0
+        self._largest_batch = 0
+        self._commit_seconds = 0.0
+
+    def start(self) -> None:
+        """Start the writer task on the running event loop."""
+
+        if self._worker is None:
+            # Run outside the caller's context so its query tally and
+            # persistence scope do not leak into every later batch.
+            self._worker = asyncio.get_running_loop().create_task(
+                self.run(),
+                name='sqlite-write-queue',
+                context=contextvars.Context(),
+            )
+
+    async def execute(self, *args: typing.Any, **kwargs: typing.Any) -> sqlalchemy.engine.CursorResult[typing.Any]:
+        if self._closed:
+            raise RuntimeError('SQLite write queue is closed')
+        self.start()
+        future: asyncio.Future[sqlalchemy.engine.CursorResult[typing.Any]] = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait(_PendingWrite(args, kwargs, future, statement_stats.current_tally()))
+        self._submitted += 1
+        return await future
+
+    async def run(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self.max_batch_statements:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+            try:
+                await self._write_batch(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _write_batch(self, batch: list[_PendingWrite]) -> None:
+        writes = [write for write in batch if not write.future.done()]
+        if not writes:
+            return
+        started_at = time.perf_counter()
+        try:
+            try:
+                outcomes = await self._run(writes, isolate=False)
+            except Exception:
+                # A lone statement's rollback already undid exactly that
+                # statement; otherwise replay the batch with savepoints.
+                if len(writes) == 1:
+                    raise
+                outcomes = await self._run(writes, isolate=True)
+        except asyncio.CancelledError:
+            for write in writes:
+                write.future.cancel()
+            raise
+        except Exception as exc:
+            for write in writes:
+                if not write.future.done():
+                    write.future.set_exception(exc)
+            self._failed += len(writes)
+            return
+        finally:
+            self._commit_seconds += time.perf_counter() - started_at
+
+        self._batches += 1
+        self._largest_batch = max(self._largest_batch, len(outcomes))
+        for write, result, exc in outcomes:
+            if exc is None:
+                self._committed += 1
+            else:
+                self._failed += 1
+            if write.future.done():
+                continue
+            if exc is None:
+                write.future.set_result(result)
+            else:
+                write.future.set_exception(exc)
+
+    async def _run(
+        self,
+        writes: list[_PendingWrite],
+        *,
+        isolate: bool,
+    ) -> list[tuple[_PendingWrite, typing.Any, Exception | None]]:
+        """Run ``writes`` in one transaction; with ``isolate``, each inside its own SAVEPOINT."""
+
+        outcomes: list[tuple[_PendingWrite, typing.Any, Exception | None]] = []
+        async with self._engine.connect() as conn:
+            async with conn.begin():
+                for write in writes:
+                    if write.future.done():
+                        continue
+                    if not isolate:
+                        outcomes.append((write, await self._execute(conn, write), None))
+                        continue
+                    try:
+                        async with conn.begin_nested():
+                            result = await self._execute(conn, write)
+                    except Exception as exc:
+                        outcomes.append((write, None, exc))
+                    else:
+                        outcomes.append((write, result, None))
+        return outcomes
+
+    @staticmethod
+    async def _execute(
+        conn: sqlalchemy_asyncio.AsyncConnection,
+        write: _PendingWrite,
+    ) -> sqlalchemy.engine.CursorResult[typing.Any]:
+        with statement_stats.attribute_to(write.tally):
+            return await conn.execute(*write.args, **write.kwargs)
+
+    async def close(self) -> None:
+        """Stop admitting writes, commit everything still queued and stop the writer task."""
+
+        self._closed = True
+        if self._worker is None:
+            return
+        await self._queue.join()
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        self._worker = None
+
+    def snapshot(self) -> dict[str, int]:
+        return {
+            'write_queue_pending': self._queue.qsize(),
+            'write_queue_submitted': self._submitted,
+            'write_queue_committed': self._committed,
+            'write_queue_failed': self._failed,
+            'write_queue_batches': self._batches,
+            'write_queue_largest_batch': self._largest_batch,
+            'write_queue_commit_ms': round(self._commit_seconds * 1000),
+        }
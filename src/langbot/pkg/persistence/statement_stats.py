@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import bisect
+import collections
+import contextlib
+import contextvars
+import logging
+import re
+import time
+import typing
+
+import sqlalchemy
+import sqlalchemy.ext.asyncio as sqlalchemy_asyncio
+
+
+DEFAULT_MAX_STATEMENTS_PER_QUERY = 30
+# Upper bounds of the per-query histogram buckets; larger values land in ``inf``.
+STATEMENT_COUNT_BUCKETS = (1, 2, 5, 10, 20, 40, 80)
+SQL_TIME_MS_BUCKETS = (1, 5, 10, 25, 50, 100, 250, 1000)
+_MAX_FINGERPRINT_LENGTH = 160
+_LOGGED_FINGERPRINTS = 10
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r'\b\d+(?:\.\d+)?\b')
+_PLACEHOLDER_LIST = re.compile(r'\(\s*(?:\?|%\([^)]*\)s|:\w+|\$\d+)(?:\s*,\s*(?:\?|%\([^)]*\)s|:\w+|\$\d+))*\s*\)')
+_WHITESPACE = re.compile(r'\s+')
+
+_current_tally: contextvars.ContextVar[StatementTally | None] = contextvars.ContextVar(
+    'langbot_statement_tally',
+    default=None,
+)
+_STARTED_AT_KEY = 'langbot_statement_started_at'
+
+
+class StatementTally:
+    """SQL statements issued while one unit of work, such as a query, was running."""
+
+    __slots__ = ('statements', 'elapsed_seconds', 'fingerprints')
+
+    def __init__(self, *, record_fingerprints: bool = False) -> None:
+        self.statements = 0
+        self.elapsed_seconds = 0.0
+        self.fingerprints: collections.Counter[str] | None = collections.Counter() if record_fingerprints else None
+
+    @property
+    def elapsed_ms(self) -> int:
+        return round(self.elapsed_seconds * 1000)
+
+
+def current_tally() -> StatementTally | None:
+    """Return the tally of the query running in the current task, if any."""
+
+    return _current_tally.get()
+
+
+@contextlib.contextmanager
+def attribute_to(tally: StatementTally | None) -> typing.Iterator[None]:
+    """Count statements issued here towards ``tally``, for work run on a query's behalf in another task."""
+
+    token = _current_tally.set(tally)
+    try:
+        yield
+    finally:
+        _current_tally.reset(token)
+
+
+def fingerprint(statement: str) -> str:
+    """Reduce a SQL statement to its shape so repeated lookups group together."""
+
+    text = _STRING_LITERAL.sub('?', statement)
+    text = _NUMBER_LITERAL.sub('?', text)
+    text = _PLACEHOLDER_LIST.sub('(?)', text)
+    text = _WHITESPACE.sub(' ', text).strip()
+    if len(text) > _MAX_FINGERPRINT_LENGTH:
+        text = text[: _MAX_FINGERPRINT_LENGTH - 3] + '...'
+    return text
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    tally = _current_tally.get()
+    if tally is None:
+        return
+    tally.statements += 1
+    if tally.fingerprints is not None:
+        tally.fingerprints[fingerprint(statement)] += 1
+    conn.info.setdefault(_STARTED_AT_KEY, []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    tally = _current_tally.get()
+    started = conn.info.get(_STARTED_AT_KEY)
+    if tally is None or not started:
+        return
+    tally.elapsed_seconds += time.perf_counter() - started.pop()
+
+
+def _handle_error(exception_context) -> None:
+    connection = exception_context.connection
+    if _current_tally.get() is None or connection is None:
+        return
+    started = connection.info.get(_STARTED_AT_KEY)
+    if started:
+        started.pop()
+
+
+def install(engine: sqlalchemy_asyncio.AsyncEngine) -> None:
+    """Count statements on ``engine`` towards the tally of the running query.
+
+    The hooks sit below ``execute_async`` and ``TenantUnitOfWork`` sessions
+    alike, so ORM flushes and tenant scope setup are counted too.
+    """
+
+    sync_engine = engine.sync_engine
+    if sqlalchemy.event.contains(sync_engine, 'before_cursor_execute', _before_cursor_execute):
+        return
+    sqlalchemy.event.listen(sync_engine, 'before_cursor_execute', _before_cursor_execute)
+    sqlalchemy.event.listen(sync_engine, 'after_cursor_execute', _after_cursor_execute)
+    sqlalchemy.event.listen(sync_engine, 'handle_error', _handle_error)
+
+
+class _Histogram:
+    def __init__(self, bounds: tuple[int, ...]) -> None:
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+
+    def snapshot(self) -> dict[str, int]:
+        labels = [f'le_{bound}' for bound in self.bounds] + ['inf']
+        return dict(zip(labels, self.counts))
+
+
+class QueryStatementStats:
+    """Per-query SQL statement counts and time, aggregated into histograms.
+
+    With ``debug`` enabled, queries issuing more than ``max_statements``
+    statements log their most frequent statement fingerprints.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_statements: int = DEFAULT_MAX_STATEMENTS_PER_QUERY,
+        debug: bool = False,
+        logger: logging.Logger | None = None,
+    ) -> None:
+        self.max_statements = max_statements
+        self.debug = debug
+        self.logger = logger
+        self._queries = 0
+        self._statements_total = 0
+        self._sql_time_ms_total = 0
+        self._over_budget = 0
+        self._statement_counts = _Histogram(STATEMENT_COUNT_BUCKETS)
+        self._sql_time_ms = _Histogram(SQL_TIME_MS_BUCKETS)
+
+    @classmethod
+    def from_config(cls, config: dict[str, typing.Any], logger: logging.Logger | None = None) -> QueryStatementStats:
+        """Build from the ``database.query_statement_budget`` section."""
+
+        max_statements = config.get('max_statements_per_query', DEFAULT_MAX_STATEMENTS_PER_QUERY)
+        if isinstance(max_statements, bool) or not isinstance(max_statements, int) or max_statements < 0:
+            max_statements = DEFAULT_MAX_STATEMENTS_PER_QUERY
+        return cls(max_statements=max_statements, debug=config.get('debug') is True, logger=logger)
+
+    @contextlib.contextmanager
+    def track(self, label: str) -> typing.Iterator[StatementTally]:
+        """Count the statements issued by the current task and its children until exit."""
+
+        tally = StatementTally(record_fingerprints=self.debug)
+        token = _current_tally.set(tally)
+        try:
+            yield tally
+        finally:
+            _current_tally.reset(token)
+            self.observe(tally, label)
+
+    def observe(self, tally: StatementTally, label: str) -> None:
+        self._queries += 1
+        self._statements_total += tally.statements
+        self._sql_time_ms_total += tally.elapsed_ms
+        self._statement_counts.observe(tally.statements)
+        self._sql_time_ms.observe(tally.elapsed_ms)
+        if tally.statements <= self.max_statements:
+            return
+        self._over_budget += 1
+        if self.debug and self.logger is not None and tally.fingerprints is not None:
+            statements = '\n'.join(
+                f'  {count}x {statement}' for statement, count in tally.fingerprints.most_common(_LOGGED_FINGERPRINTS)
+            )
+            self.logger.warning(
+                f'{label} issued {tally.statements} SQL statements in {tally.elapsed_ms} ms, '
+                f'over the budget of {self.max_statements}:\n{statements}'
+            )
+
+    def snapshot(self) -> dict[str, object]:
+        return {
+            'queries': self._queries,
+            'statements_total': self._statements_total,
+            'sql_time_ms_total': self._sql_time_ms_total,
+            'over_budget': self._over_budget,
+            'max_statements_per_query': self.max_statements,
+            'statements_per_query': self._statement_counts.snapshot(),
+            'sql_time_ms_per_query': self._sql_time_ms.snapshot(),
+        }
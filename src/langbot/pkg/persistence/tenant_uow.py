@@ -54,6 +54,8 @@ TENANT_TABLE_COLUMNS: dict[str, str] = {
     'llm_models': 'workspace_uuid',
     'embedding_models': 'workspace_uuid',
     'rerank_models': 'workspace_uuid',
+    'embedding_cache_entries': 'workspace_uuid',
+    'conversation_snapshots': 'workspace_uuid',
     'legacy_pipelines': 'workspace_uuid',
     'pipeline_run_records': 'workspace_uuid',
     'plugin_settings': 'workspace_uuid',
@@ -61,6 +63,7 @@ TENANT_TABLE_COLUMNS: dict[str, str] = {
     'knowledge_base_files': 'workspace_uuid',
     'knowledge_base_chunks': 'workspace_uuid',
     'webhooks': 'workspace_uuid',
+    'webhook_outbox': 'workspace_uuid',
     'monitoring_messages': 'workspace_uuid',
     'monitoring_llm_calls': 'workspace_uuid',
     'monitoring_tool_calls': 'workspace_uuid',
@@ -68,6 +71,8 @@ TENANT_TABLE_COLUMNS: dict[str, str] = {
     'monitoring_errors': 'workspace_uuid',
     'monitoring_embedding_calls': 'workspace_uuid',
     'monitoring_feedback': 'workspace_uuid',
+    'monitoring_hourly_rollups': 'workspace_uuid',
+    'monitoring_rollup_states': 'workspace_uuid',
     # Created by 0013 rather than ORM metadata; it is still part of the same
     # business-database RLS contract and permits no discovery policies.
     'langbot_vectors': 'workspace_uuid',
@@ -175,6 +180,7 @@ class ActiveScopedTransaction:
     engine: sqlalchemy_asyncio.AsyncEngine
     owner_task: asyncio.Task[typing.Any] | None
     depth: int = 1
+    read_only: bool = False
     rollback_only: bool = False
     rollback_only_cause: BaseException | None = None
     after_commit_waiters: list[asyncio.Future[None]] = dataclasses.field(default_factory=list)
@@ -1211,6 +1217,9 @@ class TenantUnitOfWork:
     SQLite keeps the same transaction boundary so OSS code exercises the same
     request/task ownership and rollback semantics. A manager-owned ContextVar
     lets all legacy ``execute_async`` helpers reuse this exact session.
+
+    ``read_only`` marks a unit of work that only reads, so it may run on a
+    read-only engine. A nested unit of work that may write cannot join it.
     """
 
     def __init__(
@@ -1222,6 +1231,7 @@ class TenantUnitOfWork:
         active_transaction: ActiveTransactionVar | None = None,
         active_scope: ActivePersistenceScopeVar | None = None,
         on_pool_timeout: typing.Callable[[], None] | None = None,
+        read_only: bool = False,
     ) -> None:
         if (workspace_uuid is None) == (scope is None):
             raise ValueError('TenantUnitOfWork requires exactly one Workspace or persistence scope')
@@ -1232,6 +1242,7 @@ class TenantUnitOfWork:
         self._active_transaction = active_transaction
         self._active_scope = active_scope
         self._on_pool_timeout = on_pool_timeout
+        self.read_only = read_only
         self._session: sqlalchemy_asyncio.AsyncSession | None = None
         self._transaction: sqlalchemy_asyncio.AsyncSessionTransaction | None = None
         self._active_state: ActiveScopedTransaction | None = None
@@ -1285,6 +1296,8 @@ class TenantUnitOfWork:
                     raise CrossScopeTransactionError(
                         f'Cannot enter {self.scope.kind.value} scope while {active.scope.kind.value} scope is active'
                     )
+                if active.read_only and not self.read_only:
+                    raise CrossScopeTransactionError('Cannot enter a writable unit of work inside a read-only one')
                 active.depth += 1
                 self._active_state = active
                 self._session = active.session
@@ -1318,6 +1331,7 @@ class TenantUnitOfWork:
                 session=session,
                 engine=self._engine,
                 owner_task=owner_task,
+                read_only=self.read_only,
             )
             session._bind_transaction_state(_UOW_SESSION_CONTROL_CAPABILITY, state)
             self._active_state = state
@@ -1,10 +1,12 @@
 from __future__ import annotations
 
 import asyncio
+import contextlib
 import traceback
 
 from ..core import app
 from ..core import entities as core_entities
+from ..persistence import statement_stats
 from ..workspace.errors import WorkspaceError, WorkspaceInvariantError
 
 import langbot_plugin.api.entities.builtin.pipeline.query as pipeline_query
@@ -47,6 +49,25 @@ class Controller:
     ) -> None:
         """Run one selected query and always release its scheduling slot."""
 
+        query_statement_stats = getattr(self.ap.persistence_mgr, 'query_statement_stats', None)
+        with (
+            query_statement_stats.track(f'Query {selected_query.query_id}')
+            if isinstance(query_statement_stats, statement_stats.QueryStatementStats)
+            else contextlib.nullcontext()
+        ):
+            await self._run_selected_query(
+                selected_query,
+                selected_session=selected_session,
+                global_slot_reserved=global_slot_reserved,
+            )
+
+    async def _run_selected_query(
+        self,
+        selected_query: pipeline_query.Query,
+        *,
+        selected_session=None,
+        global_slot_reserved: bool = False,
+    ) -> None:
         try:
             queued_context = get_query_execution_context(selected_query)
 
@@ -90,6 +111,7 @@ class Controller:
                         session = selected_session or await self.ap.sess_mgr.get_session(selected_query)
                         try:
                             session._semaphore.release()
+                            self.ap.query_pool.release_session_slot_locked(selected_query)
                         finally:
                             self.ap.query_pool.condition.notify_all()
             finally:
@@ -103,8 +125,11 @@ class Controller:
             await self.ap.query_pool.remove_query(selected_query)
         finally:
             async with self.ap.query_pool:
-                selected_session._semaphore.release()
-                self.ap.query_pool.condition.notify_all()
+                try:
+                    selected_session._semaphore.release()
+                    self.ap.query_pool.release_session_slot_locked(selected_query)
+                finally:
+                    self.ap.query_pool.condition.notify_all()
 
     async def consumer(self):
         """事件处理循环"""
@@ -115,22 +140,24 @@ class Controller:
 
                 # 取请求
                 async with self.ap.query_pool:
-                    queries: list[pipeline_query.Query] = self.ap.query_pool.queries
+                    while selected_query is None:
+                        query = self.ap.query_pool.next_runnable_query_locked()
+                        if query is None:
+                            break
 
-                    for query in queries:
                         session = await self.ap.sess_mgr.get_session(query)
-                        # Debug logging removed from tight loop to prevent excessive log generation
-                        # that can cause memory overflow in high-traffic scenarios
-
-                        if not session._semaphore.locked():
-                            selected_query = query
-                            selected_session = session
-                            await session._semaphore.acquire()
-                            self.ap.query_pool.mark_query_running_locked(query)
-                            # Only log when actually selecting a query
-                            self.ap.logger.debug(f'Selected query {query.query_id} for processing')
-
-                            break
+                        if session._semaphore.locked():
+                            # Park the whole session; it becomes runnable again
+                            # when one of its running queries releases a slot.
+                            self.ap.query_pool.mark_session_saturated_locked(query)
+                            continue
+
+                        await session._semaphore.acquire()
+                        self.ap.query_pool.mark_query_running_locked(query)
+                        selected_query = query
+                        selected_session = session
+                        # Only log when actually selecting a query
+                        self.ap.logger.debug(f'Selected query {query.query_id} for processing')
 
                     if not selected_query:  # No query is runnable under the current session limits.
                         await self.ap.query_pool.condition.wait()
@@ -15,12 +15,39 @@ if typing.TYPE_CHECKING:
     from ..core import app
     import langbot_plugin.api.entities.builtin.pipeline.query as pipeline_query
 
+from ..persistence import statement_stats
+from ..telemetry import features as telemetry_features
 from .pool import get_query_execution_context
 
 
 class MonitoringHelper:
     """Helper class for monitoring operations"""
 
+    @staticmethod
+    def statement_cost() -> dict[str, int]:
+        """SQL statements the running query has issued so far, as monitoring fields"""
+        tally = statement_stats.current_tally()
+        if tally is None:
+            return {}
+        return {'db_statements': tally.statements, 'db_time_ms': tally.elapsed_ms}
+
+    @staticmethod
+    def tool_round_cost(query: pipeline_query.Query | None) -> dict[str, int]:
+        """Tool call rounds the agent ran for the query, as monitoring fields
+
+        ``tool_wall_ms`` well below ``tool_time_ms`` means the calls of a round ran concurrently.
+        """
+        if query is None:
+            return {}
+        round_timings = telemetry_features.get_features(query).get('tool_call_round_timings')
+        if not isinstance(round_timings, list) or not round_timings:
+            return {}
+        return {
+            'tool_rounds': len(round_timings),
+            'tool_wall_ms': sum(timing['wall_ms'] for timing in round_timings),
+            'tool_time_ms': sum(timing['tool_ms'] for timing in round_timings),
+        }
+
     @staticmethod
     async def record_query_start(
         ap: app.Application,
@@ -127,6 +154,8 @@ class MonitoringHelper:
                     message_id=message_id,
                     status='success',
                     variables=query_variables_str,
+                    **MonitoringHelper.statement_cost(),
+                    **MonitoringHelper.tool_round_cost(query),
                 )
         except Exception as e:
             ap.logger.error(f'Failed to record query success: {e}')
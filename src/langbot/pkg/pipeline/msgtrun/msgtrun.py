@@ -19,7 +19,8 @@ class ConversationMessageTruncator(stage.PipelineStage):
     trun: truncator.Truncator
 
     async def initialize(self, pipeline_config: dict):
-        use_method = 'round'
+        local_agent_config = (pipeline_config or {}).get('ai', {}).get('local-agent', {})
+        use_method = local_agent_config.get('truncate-method') or 'round'
 
         for trun in truncator.preregistered_truncators:
             if trun.name == use_method:
@@ -27,6 +28,7 @@ class ConversationMessageTruncator(stage.PipelineStage):
                 break
         else:
             raise ValueError(f'Unknown truncator: {use_method}')
+        await self.trun.initialize()
 
     async def process(self, query: pipeline_query.Query, stage_inst_name: str) -> entities.StageProcessResult:
         """处理"""
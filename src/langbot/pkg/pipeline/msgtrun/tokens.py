@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import json
+import math
+import typing
+
+import langbot_plugin.api.entities.builtin.provider.message as provider_message
+import langbot_plugin.api.entities.builtin.resource.tool as resource_tool
+
+try:
+    import tiktoken
+except ImportError:  # pragma: no cover - tiktoken is a declared dependency
+    tiktoken = None
+
+
+HEURISTIC = 'heuristic'
+"""Estimate used for models without a known local tokenizer."""
+
+# Chat formats wrap every message in a few role/separator tokens.
+MESSAGE_OVERHEAD_TOKENS = 4
+# Flat cost of an image or file attachment. Providers bill images by size;
+# 765 tokens is what OpenAI charges for a 1024x1024 high-detail image.
+ATTACHMENT_TOKENS = 765
+
+# Model name prefixes, most specific first, mapped to tiktoken encodings.
+_ENCODING_PREFIXES: tuple[tuple[str, str], ...] = (
+    ('gpt-4o', 'o200k_base'),
+    ('chatgpt-4o', 'o200k_base'),
+    ('gpt-4.1', 'o200k_base'),
+    ('gpt-4.5', 'o200k_base'),
+    ('gpt-5', 'o200k_base'),
+    ('gpt-oss', 'o200k_base'),
+    ('o1', 'o200k_base'),
+    ('o3', 'o200k_base'),
+    ('o4', 'o200k_base'),
+    ('gpt-4', 'cl100k_base'),
+    ('gpt-3.5', 'cl100k_base'),
+)
+
+
+def model_family(model_name: str) -> str:
+    """Return the tiktoken encoding for ``model_name``, or ``HEURISTIC``."""
+
+    name = (model_name or '').rsplit('/', 1)[-1].lower()
+    for prefix, encoding_name in _ENCODING_PREFIXES:
+        if name.startswith(prefix):
+            return encoding_name
+    return HEURISTIC
+
+
+# Loaded tokenizers by encoding name; ``None`` records one that failed to load.
+_encodings: dict[str, typing.Any] = {}
+
+
+def load_encoding(family: str) -> typing.Any:
+    """Load and cache a tokenizer; ``None`` when it is unavailable offline.
+
+    Loading reads the BPE ranks from disk, so call this off the event loop
+    the first time. A failed load is cached too, and text of that family is
+    estimated from its characters from then on.
+    """
+
+    if family == HEURISTIC or tiktoken is None:
+        return None
+    if family not in _encodings:
+        try:
+            _encodings[family] = tiktoken.get_encoding(family)
+        except Exception:
+            _encodings[family] = None
+    return _encodings[family]
+
+
+def encoding_loaded(family: str) -> bool:
+    """Whether ``load_encoding(family)`` returns without loading anything."""
+
+    return family == HEURISTIC or tiktoken is None or family in _encodings
+
+
+def load_all_encodings() -> None:
+    """Load the tokenizer of every known model family."""
+
+    for encoding_name in dict.fromkeys(encoding_name for _, encoding_name in _ENCODING_PREFIXES):
+        load_encoding(encoding_name)
+
+
+def count_text(text: str, family: str) -> int:
+    if not text:
+        return 0
+    encoding = load_encoding(family)
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    # About four characters per token for ASCII text, and at most one token
+    # per character for CJK and other non-ASCII scripts.
+    if text.isascii():
+        return math.ceil(len(text) / 4)
+    ascii_chars = len(text.encode('ascii', 'ignore'))
+    return math.ceil(ascii_chars / 4) + len(text) - ascii_chars
+
+
+def count_message(message: provider_message.Message, family: str) -> int:
+    tokens = MESSAGE_OVERHEAD_TOKENS
+    content = message.content
+    if isinstance(content, str):
+        tokens += count_text(content, family)
+    elif isinstance(content, list):
+        for element in content:
+            if element.type == 'text':
+                tokens += count_text(element.text or '', family)
+            else:
+                tokens += ATTACHMENT_TOKENS
+    for tool_call in message.tool_calls or []:
+        tokens += count_text(tool_call.function.name, family)
+        tokens += count_text(tool_call.function.arguments, family)
+    return tokens
+
+
+def count_tools(tools: typing.Iterable[resource_tool.LLMTool], family: str) -> int:
+    tokens = 0
+    for tool in tools:
+        schema = json.dumps(tool.parameters, ensure_ascii=False, separators=(',', ':'))
+        tokens += MESSAGE_OVERHEAD_TOKENS
+        tokens += count_text(tool.name, family) + count_text(tool.description, family) + count_text(schema, family)
+    return tokens
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import asyncio
+
+from .. import truncator, tokens
+from ...pool import get_query_execution_context
+from ....provider.modelmgr import requester
+from . import round as round_truncator
+import langbot_plugin.api.entities.builtin.pipeline.query as pipeline_query
+import langbot_plugin.api.entities.builtin.provider.message as provider_message
+
+
+# Share of the context window kept free for the reply when the model does not
+# set max_tokens, capped so large windows are not wasted.
+_OUTPUT_RESERVE_RATIO = 0.25
+_MAX_OUTPUT_RESERVE_TOKENS = 8192
+
+_TOKEN_COUNTS_ATTR = '_message_token_counts'
+
+
+@truncator.truncator_class('token-budget')
+class TokenBudgetTruncator(truncator.Truncator):
+    """Keep as much of the newest history as fits in the model's context window.
+
+    History is cut only before a user message, so tool calls stay next to
+    their results. Counts for history messages are remembered on the session,
+    so each request only tokenizes the messages added since the last one.
+    Falls back to RoundTruncator when the context length of the model is
+    unknown.
+    """
+
+    def __init__(self, ap):
+        super().__init__(ap)
+        self._round = round_truncator.RoundTruncator(ap)
+        self._context_lengths: dict[tuple[int, str], int | None] = {}
+
+    async def initialize(self):
+        # Load the tokenizers once here instead of on the first query of each model family.
+        await asyncio.to_thread(tokens.load_all_encodings)
+
+    async def _model(self, query: pipeline_query.Query) -> requester.RuntimeLLMModel | None:
+        model_uuid = getattr(query, 'use_llm_model_uuid', None)
+        if not model_uuid:
+            return None
+        try:
+            return await self.ap.model_mgr.get_model_by_uuid(get_query_execution_context(query), model_uuid)
+        except ValueError:
+            return None
+
+    def _context_length(self, model: requester.RuntimeLLMModel) -> int | None:
+        context_length = getattr(model.model_entity, 'context_length', None)
+        if isinstance(context_length, int) and not isinstance(context_length, bool) and context_length > 0:
+            return context_length
+
+        # Models added before scanning recorded a context length: ask the
+        # requester, which knows LiteLLM's model metadata.
+        model_requester = getattr(model.provider, 'requester', None)
+        key = (id(model_requester), model.model_entity.name)
+        if key not in self._context_lengths:
+            lookup = getattr(model_requester, '_safe_context_length', None)
+            try:
+                context_length = lookup(model.model_entity.name) if callable(lookup) else None
+            except Exception:
+                context_length = None
+            valid = isinstance(context_length, int) and not isinstance(context_length, bool) and context_length > 0
+            self._context_lengths[key] = context_length if valid else None
+        return self._context_lengths[key]
+
+    @staticmethod
+    def _output_reserve(model: requester.RuntimeLLMModel, context_length: int) -> int:
+        extra_args = getattr(model.model_entity, 'extra_args', None) or {}
+        for name in ('max_completion_tokens', 'max_tokens'):
+            value = extra_args.get(name) if isinstance(extra_args, dict) else None
+            if isinstance(value, int) and not isinstance(value, bool) and value > 0:
+                return value
+        return min(int(context_length * _OUTPUT_RESERVE_RATIO), _MAX_OUTPUT_RESERVE_TOKENS)
+
+    @staticmethod
+    def _history_counts(
+        query: pipeline_query.Query, family: str
+    ) -> tuple[list[int], dict[int, tuple[provider_message.Message, str, int]]]:
+        """Count each history message, reusing the counts memoized on the session."""
+
+        memo = getattr(query.session, _TOKEN_COUNTS_ATTR, None)
+        if not isinstance(memo, dict):
+            memo = {}
+        counts = []
+        retained = {}
+        for message in query.messages:
+            entry = memo.get(id(message))
+            if entry is None or entry[0] is not message or entry[1] != family:
+                entry = (message, family, tokens.count_message(message, family))
+            retained[id(message)] = entry
+            counts.append(entry[2])
+        return counts, retained
+
+    async def truncate(self, query: pipeline_query.Query) -> pipeline_query.Query:
+        """截断"""
+        model = await self._model(query)
+        context_length = self._context_length(model) if model is not None else None
+        if context_length is None:
+            return await self._round.truncate(query)
+
+        family = tokens.model_family(model.model_entity.name)
+        if not tokens.encoding_loaded(family):
+            await asyncio.to_thread(tokens.load_encoding, family)
+
+        budget = context_length - self._output_reserve(model, context_length)
+        if query.prompt is not None:
+            budget -= sum(tokens.count_message(message, family) for message in query.prompt.messages)
+        if query.user_message is not None:
+            budget -= tokens.count_message(query.user_message, family)
+        budget -= tokens.count_tools(query.use_funcs or [], family)
+
+        counts, retained = self._history_counts(query, family)
+        if query.session is not None:
+            object.__setattr__(query.session, _TOKEN_COUNTS_ATTR, retained)
+
+        keep_from = len(query.messages)
+        used = 0
+        for index in range(len(query.messages) - 1, -1, -1):
+            used += counts[index]
+            if used > budget:
+                break
+            if query.messages[index].role == 'user' or index == 0:
+                keep_from = index
+
+        if keep_from:
+            self.ap.logger.debug(
+                f'Truncated {keep_from} of {len(query.messages)} history messages of query {query.query_id} '
+                f'to fit {context_length} context tokens'
+            )
+        query.messages = query.messages[keep_from:]
+        return query
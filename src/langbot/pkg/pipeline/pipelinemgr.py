@@ -19,6 +19,7 @@ from ..api.http.context import ExecutionContext, PrincipalContext, PrincipalType
 from ..workspace.errors import WorkspaceError, WorkspaceInvariantError
 from .config_coercion import coerce_pipeline_config
 from .pool import get_query_execution_context
+from .respcache import cache as respcache_cache
 
 import langbot_plugin.api.entities.builtin.provider.session as provider_session
 import langbot_plugin.api.entities.builtin.pipeline.query as pipeline_query
@@ -34,6 +35,7 @@ from . import (
     preproc,
     ratelimit,
     msgtrun,
+    respcache,
 )
 
 importutil.import_modules_in_pkgs(
@@ -48,9 +50,25 @@ importutil.import_modules_in_pkgs(
         preproc,
         ratelimit,
         msgtrun,
+        respcache,
     ]
 )
 
+# Stages introduced after pipelines were first persisted, each mapped to the
+# stage it follows. Stored stage lists that predate them get them on load.
+_BACKFILLED_STAGES = {
+    'ResponseCacheLookupStage': 'ConversationMessageTruncator',
+    'ResponseCacheStoreStage': 'PostContentFilterStage',
+}
+
+
+def _backfill_stages(stage_names: list[str], registered: typing.Container[str]) -> list[str]:
+    stage_names = list(stage_names)
+    for stage_name, anchor in _BACKFILLED_STAGES.items():
+        if stage_name in registered and stage_name not in stage_names and anchor in stage_names:
+            stage_names.insert(stage_names.index(anchor) + 1, stage_name)
+    return stage_names
+
 
 class StageInstContainer:
     """阶段实例容器"""
@@ -260,11 +278,15 @@ class RuntimePipeline:
 
                 # Update message status to error
                 if message_id:
+                    from . import monitoring_helper
+
                     await self.ap.monitoring_service.update_message_status(
                         get_query_execution_context(query),
                         message_id=message_id,
                         status='error',
                         level='error',
+                        **monitoring_helper.MonitoringHelper.statement_cost(),
+                        **monitoring_helper.MonitoringHelper.tool_round_cost(query),
                     )
 
                 # Record error log
@@ -505,6 +527,7 @@ class PipelineManager:
             set[tuple[str, str, str]],
         ] = {}
         self._scope_generations: dict[tuple[str, str], int] = {}
+        self.response_cache = respcache_cache.ResponseCache(ap)
 
     @property
     def pipelines(self) -> list[RuntimePipeline]:
@@ -649,7 +672,7 @@ class PipelineManager:
 
         # initialize stage containers according to pipeline_entity.stages
         stage_containers: list[StageInstContainer] = []
-        for stage_name in pipeline_entity.stages:
+        for stage_name in _backfill_stages(pipeline_entity.stages, self.stage_dict):
             stage_containers.append(StageInstContainer(inst_name=stage_name, inst=self.stage_dict[stage_name](self.ap)))
 
         for stage_container in stage_containers:
@@ -676,6 +699,8 @@ class PipelineManager:
         )
         self._pipelines_by_key[key] = runtime_pipeline
         self._pipeline_keys_by_scope.setdefault(key[:2], set()).add(key)
+        # Cached replies were produced under the previous config.
+        self.response_cache.invalidate_pipeline(execution_context.workspace_uuid, pipeline_entity.uuid)
 
     async def get_pipeline_by_uuid(
         self,
@@ -719,6 +744,7 @@ class PipelineManager:
             execution_context.workspace_uuid,
             uuid,
         )
+        self.response_cache.invalidate_pipeline(execution_context.workspace_uuid, uuid)
         if self._pipelines_by_key.pop(key, None) is not None:
             scope_keys = self._pipeline_keys_by_scope.get(key[:2])
             if scope_keys is not None:
@@ -14,6 +14,7 @@ import langbot_plugin.api.entities.builtin.provider.session as provider_session
 
 from ..api.http.context import ExecutionContext
 from . import plugin_diagnostics
+from .scheduler import RunnableQueryScheduler, SessionKey
 
 QueryCacheKey = tuple[str, str]
 LegacyQueryKey = tuple[str, int]
@@ -111,12 +112,47 @@ def get_query_execution_context(query: pipeline_query.Query) -> ExecutionContext
     raise ExecutionContextRequiredError('Query is missing its trusted ExecutionContext')
 
 
+def query_session_key(query: pipeline_query.Query) -> tuple[SessionKey, ExecutionContext]:
+    """Return the session identity shared by the scheduler and SessionManager."""
+
+    execution_context = get_query_execution_context(query)
+    bot_uuid = getattr(query, 'bot_uuid', None)
+    if not isinstance(bot_uuid, str) or not bot_uuid.strip():
+        raise ExecutionContextRequiredError('Query.bot_uuid is required for session lookup')
+
+    execution_context = bind_execution_context(execution_context, bot_uuid=bot_uuid)
+    key = _session_key(
+        execution_context,
+        bot_uuid=bot_uuid,
+        launcher_type=query.launcher_type,
+        launcher_id=query.launcher_id,
+    )
+    return key, execution_context
+
+
+def _session_key(
+    execution_context: ExecutionContext,
+    *,
+    bot_uuid: str,
+    launcher_type: provider_session.LauncherTypes,
+    launcher_id: int | str,
+) -> SessionKey:
+    return (
+        execution_context.instance_uuid,
+        execution_context.workspace_uuid,
+        execution_context.placement_generation,
+        bot_uuid,
+        launcher_type.value,
+        launcher_id,
+    )
+
+
 class QueryPool:
     """Workspace-scoped queue of requests waiting for pipeline scheduling."""
 
     query_id_counter: int
     pool_lock: asyncio.Lock
-    queries: list[pipeline_query.Query]
+    scheduler: RunnableQueryScheduler
     cached_queries: dict[QueryCacheKey, pipeline_query.Query]
     legacy_query_index: dict[LegacyQueryKey, str]
     query_count_by_scope: dict[QueryCounterKey, int]
@@ -137,7 +173,7 @@ class QueryPool:
             raise ValueError('max_queries_per_workspace cannot exceed max_queries')
         self.query_id_counter = 0
         self.pool_lock = asyncio.Lock()
-        self.queries = []
+        self.scheduler = RunnableQueryScheduler()
         self.cached_queries = {}
         self.active_query_count_by_workspace: dict[str, int] = {}
         self.legacy_query_index = {}
@@ -155,30 +191,28 @@ class QueryPool:
     ) -> pipeline_query.Query | None:
         """Discard the oldest queued query from one scope and all indexes."""
 
-        for index, query in enumerate(self.queries):
-            execution_context = get_query_execution_context(query)
-            if workspace_uuid is not None and execution_context.workspace_uuid != workspace_uuid:
-                continue
-            self.queries.pop(index)
-            query_uuid = execution_context.query_uuid
-            if query_uuid is not None:
-                self.cached_queries.pop((execution_context.workspace_uuid, query_uuid), None)
-            self.legacy_query_index.pop((execution_context.workspace_uuid, query.query_id), None)
-            query_workspace_uuid = execution_context.workspace_uuid
-            remaining = self.active_query_count_by_workspace.get(query_workspace_uuid, 0) - 1
-            if remaining > 0:
-                self.active_query_count_by_workspace[query_workspace_uuid] = remaining
-            else:
-                self.active_query_count_by_workspace.pop(query_workspace_uuid, None)
-            plugin_diagnostics.discard_query_state(query)
-            counter_key = (
-                execution_context.instance_uuid,
-                execution_context.workspace_uuid,
-                execution_context.placement_generation,
-            )
-            self.dropped_query_count_by_scope[counter_key] = self.dropped_query_count_by_scope.get(counter_key, 0) + 1
-            return query
-        return None
+        query = self.scheduler.pop_oldest(workspace_uuid)
+        if query is None:
+            return None
+        execution_context = get_query_execution_context(query)
+        query_uuid = execution_context.query_uuid
+        if query_uuid is not None:
+            self.cached_queries.pop((execution_context.workspace_uuid, query_uuid), None)
+        self.legacy_query_index.pop((execution_context.workspace_uuid, query.query_id), None)
+        query_workspace_uuid = execution_context.workspace_uuid
+        remaining = self.active_query_count_by_workspace.get(query_workspace_uuid, 0) - 1
+        if remaining > 0:
+            self.active_query_count_by_workspace[query_workspace_uuid] = remaining
+        else:
+            self.active_query_count_by_workspace.pop(query_workspace_uuid, None)
+        plugin_diagnostics.discard_query_state(query)
+        counter_key = (
+            execution_context.instance_uuid,
+            execution_context.workspace_uuid,
+            execution_context.placement_generation,
+        )
+        self.dropped_query_count_by_scope[counter_key] = self.dropped_query_count_by_scope.get(counter_key, 0) + 1
+        return query
 
     def _admit_query_locked(self, workspace_uuid: str) -> None:
         workspace_query_count = self.active_query_count_by_workspace.get(workspace_uuid, 0)
@@ -190,16 +224,46 @@ class QueryPool:
             if self._discard_queued_query_locked() is None:
                 raise QueryPoolCapacityError(f'Global query capacity reached ({self.max_queries})')
 
+    @property
+    def queries(self) -> list[pipeline_query.Query]:
+        """Snapshot of queued queries in arrival order, for diagnostics."""
+
+        return list(self.scheduler)
+
+    @property
+    def queued_query_count(self) -> int:
+        return len(self.scheduler)
+
+    def next_runnable_query_locked(self) -> pipeline_query.Query | None:
+        """Return the next query whose session is not known to be saturated."""
+
+        if not self.pool_lock.locked():
+            raise RuntimeError('Query pool lock is required to schedule a query')
+        return self.scheduler.peek()
+
+    def mark_session_saturated_locked(self, query: pipeline_query.Query) -> None:
+        """Park the query's session until one of its running queries finishes."""
+
+        if not self.pool_lock.locked():
+            raise RuntimeError('Query pool lock is required to schedule a query')
+        session_key, execution_context = query_session_key(query)
+        self.scheduler.mark_session_saturated(session_key, execution_context.workspace_uuid)
+
+    def release_session_slot_locked(self, query: pipeline_query.Query) -> None:
+        """Make the query's session runnable again after releasing its slot."""
+
+        if not self.pool_lock.locked():
+            raise RuntimeError('Query pool lock is required to schedule a query')
+        session_key, execution_context = query_session_key(query)
+        self.scheduler.release_session_slot(session_key, execution_context.workspace_uuid)
+
     def mark_query_running_locked(self, query: pipeline_query.Query) -> None:
         """Remove a scheduled query from the overload-discardable queue."""
 
         if not self.pool_lock.locked():
             raise RuntimeError('Query pool lock is required to schedule a query')
-        for index, queued_query in enumerate(self.queries):
-            if queued_query is query:
-                self.queries.pop(index)
-                return
-        raise QueryNotFoundError('Scheduled query is no longer queued')
+        if not self.scheduler.take(query):
+            raise QueryNotFoundError('Scheduled query is no longer queued')
 
     def _make_scope_counter_room_locked(self, counter_key: QueryCounterKey) -> None:
         """Retain recent counters without pinning every historical Workspace."""
@@ -306,7 +370,16 @@ class QueryPool:
             object.__setattr__(query, 'query_uuid', query_uuid)
             object.__setattr__(query, '_execution_context', execution_context)
 
-            self.queries.append(query)
+            self.scheduler.push(
+                query,
+                session_key=_session_key(
+                    execution_context,
+                    bot_uuid=bot_uuid,
+                    launcher_type=launcher_type,
+                    launcher_id=launcher_id,
+                ),
+                workspace_uuid=execution_context.workspace_uuid,
+            )
             self.cached_queries[(execution_context.workspace_uuid, query_uuid)] = query
             self.active_query_count_by_workspace[execution_context.workspace_uuid] = (
                 self.active_query_count_by_workspace.get(execution_context.workspace_uuid, 0) + 1
@@ -413,10 +486,7 @@ class QueryPool:
                 (execution_context.workspace_uuid, query.query_id),
                 None,
             )
-            for index, queued_query in enumerate(self.queries):
-                if queued_query is query:
-                    self.queries.pop(index)
-                    break
+            self.scheduler.remove(query)
             plugin_diagnostics.discard_query_state(query)
             return True
 
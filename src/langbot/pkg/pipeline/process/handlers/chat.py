@@ -10,6 +10,8 @@ from datetime import datetime
 from .. import handler
 from ... import entities
 from ... import plugin_diagnostics
+from ... import stream_coalescer
+from ....discover import engine as discover_engine
 from ....provider import runner as runner_module
 
 import langbot_plugin.api.entities.events as events
@@ -46,6 +48,22 @@ class ChatMessageHandler(handler.MessageHandler):
         if isinstance(content, str) and len(content) > self._response_limit('max_generated_chars', 1024 * 1024):
             raise RuntimeError('Provider response exceeds the configured limit')
 
+    def _stream_coalescer(self, query: pipeline_query.Query) -> stream_coalescer.StreamCoalescer:
+        platform = None
+        adapter_dict = getattr(getattr(self.ap, 'platform_mgr', None), 'adapter_dict', None)
+        if isinstance(adapter_dict, discover_engine.ComponentClassRegistry):
+            # The running adapter's class is already imported; never import the others.
+            platform = adapter_dict.name_of(type(query.adapter))
+        elif isinstance(adapter_dict, dict):
+            platform = next(
+                (name for name, adapter_class in adapter_dict.items() if type(query.adapter) is adapter_class),
+                None,
+            )
+        instance_config = getattr(self.ap, 'instance_config', None)
+        data = getattr(instance_config, 'data', {})
+        config = data.get('system', {}).get('stream_coalescing', {}) if isinstance(data, dict) else {}
+        return stream_coalescer.StreamCoalescer(**stream_coalescer.resolve_settings(config, platform))
+
     async def handle(
         self,
         query: pipeline_query.Query,
@@ -126,9 +144,39 @@ class ChatMessageHandler(handler.MessageHandler):
                 if is_stream:
                     resp_message_id = uuid.uuid4()
                     chunk_count = 0  # Track streaming chunks to reduce excessive logging
-
-                    async for result in runner.run(query):
-                        self._check_response_size(result)
+                    coalescer = self._stream_coalescer(query)
+
+                    async def runner_chunks():
+                        nonlocal chunk_count, text_length
+                        async for result in runner.run(query):
+                            self._check_response_size(result)
+                            chunk_count += 1
+                            if chunk_count > self._response_limit(
+                                'max_stream_chunks',
+                                100_000,
+                            ):
+                                raise RuntimeError('Provider stream exceeds the configured event limit')
+                            # Only log every 10th chunk to reduce excessive logging during streaming
+                            # This prevents memory overflow from thousands of log entries per conversation
+                            # First chunk uses INFO level to confirm connection establishment
+                            if chunk_count == 1:
+                                summary = self.format_result_log(result)
+                                if summary is not None:
+                                    self.ap.logger.info(f'Conversation({query.query_id}) Streaming started: {summary}')
+                                else:
+                                    self.ap.logger.info(f'Conversation({query.query_id}) Streaming started')
+                            elif chunk_count % 10 == 0:
+                                self.ap.logger.debug(
+                                    f'Conversation({query.query_id}) Streaming chunk {chunk_count}: {self.cut_str(result.readable_str())}'
+                                )
+
+                            if result.content is not None:
+                                text_length += len(result.content)
+                            yield result
+
+                    # Intermediate chunks are paced per platform; a held chunk
+                    # is delivered on time even while the runner stalls.
+                    async for result in coalescer.pace(runner_chunks()):
                         result.resp_message_id = str(resp_message_id)
                         if query.resp_messages:
                             query.resp_messages.pop()
@@ -140,34 +188,17 @@ class ChatMessageHandler(handler.MessageHandler):
                             is_create_card = True
                         query.resp_messages.append(result)
 
-                        chunk_count += 1
-                        if chunk_count > self._response_limit(
-                            'max_stream_chunks',
-                            100_000,
-                        ):
-                            raise RuntimeError('Provider stream exceeds the configured event limit')
-                        # Only log every 10th chunk to reduce excessive logging during streaming
-                        # This prevents memory overflow from thousands of log entries per conversation
-                        # First chunk uses INFO level to confirm connection establishment
-                        if chunk_count == 1:
-                            summary = self.format_result_log(result)
-                            if summary is not None:
-                                self.ap.logger.info(f'Conversation({query.query_id}) Streaming started: {summary}')
-                            else:
-                                self.ap.logger.info(f'Conversation({query.query_id}) Streaming started')
-                        elif chunk_count % 10 == 0:
-                            self.ap.logger.debug(
-                                f'Conversation({query.query_id}) Streaming chunk {chunk_count}: {self.cut_str(result.readable_str())}'
-                            )
-
-                        if result.content is not None:
-                            text_length += len(result.content)
-
                         yield entities.StageProcessResult(result_type=entities.ResultType.CONTINUE, new_query=query)
 
+                    telemetry_features.set_value(
+                        query,
+                        'stream_coalescing',
+                        {'received': coalescer.received, 'emitted': coalescer.emitted},
+                    )
                     # Log final summary after streaming completes
                     self.ap.logger.info(
-                        f'Conversation({query.query_id}) Streaming completed: {chunk_count} chunks, {text_length} chars'
+                        f'Conversation({query.query_id}) Streaming completed: {chunk_count} chunks '
+                        f'({coalescer.emitted} delivered), {text_length} chars'
                     )
 
                 else:
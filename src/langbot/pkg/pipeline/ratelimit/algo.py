@@ -1,9 +1,12 @@
 from __future__ import annotations
 import abc
+import asyncio
 import typing
 
 from ...core import app
 import langbot_plugin.api.entities.builtin.pipeline.query as pipeline_query
+from ..pool import get_query_execution_context
+from . import backend as ratelimit_backend
 
 
 preregistered_algos: list[typing.Type[ReteLimitAlgo]] = []
@@ -18,6 +21,26 @@ def algo_class(name: str):
     return decorator
 
 
+def session_key(
+    query: pipeline_query.Query,
+    launcher_type: str,
+    launcher_id: typing.Union[int, str],
+) -> str:
+    """限速会话标识，同一 Workspace 放置代次内的同一机器人、流水线与会话共享配额"""
+    execution_context = get_query_execution_context(query)
+    return ':'.join(
+        (
+            execution_context.instance_uuid,
+            execution_context.workspace_uuid,
+            str(execution_context.placement_generation),
+            str(getattr(query, 'bot_uuid', '')),
+            str(getattr(query, 'pipeline_uuid', '')),
+            str(launcher_type),
+            str(launcher_id),
+        )
+    )
+
+
 class ReteLimitAlgo(metaclass=abc.ABCMeta):
     """限流算法抽象类"""
 
@@ -31,6 +54,38 @@ class ReteLimitAlgo(metaclass=abc.ABCMeta):
     async def initialize(self):
         pass
 
+    def shared_backend(self) -> ratelimit_backend.RateLimitBackend | None:
+        """跨进程共享的计数存储，未配置时返回 None"""
+        backend = getattr(self.ap, 'rate_limit_backend', None)
+        if isinstance(backend, ratelimit_backend.RateLimitBackend) and backend.shared:
+            return backend
+        return None
+
+    async def acquire_from_backend(
+        self,
+        backend: ratelimit_backend.RateLimitBackend,
+        query: pipeline_query.Query,
+        session_name: str,
+    ) -> bool:
+        """按流水线的窗口、次数与策略向计数存储申请一次访问"""
+        rate_limit_config = query.pipeline_config['safety']['rate-limit']
+        limit = int(rate_limit_config['limitation'])
+        if limit <= 0:
+            # 次数为 0 时拒绝所有请求，等待也不会等到空位
+            return False
+        while True:
+            retry_after = await backend.acquire(
+                session_name,
+                algorithm=self.name,
+                window_seconds=int(rate_limit_config['window-length']),
+                limit=limit,
+            )
+            if retry_after <= 0:
+                return True
+            if rate_limit_config['strategy'] != 'wait':
+                return False
+            await asyncio.sleep(ratelimit_backend.retry_delay(retry_after))
+
     @abc.abstractmethod
     async def require_access(
         self,
@@ -5,7 +5,6 @@ import time
 import typing
 from .. import algo
 import langbot_plugin.api.entities.builtin.pipeline.query as pipeline_query
-from ...pool import get_query_execution_context
 
 
 _MAX_SESSION_CONTAINERS = 10000
@@ -47,22 +46,15 @@ class FixedWindowAlgo(algo.ReteLimitAlgo):
         launcher_type: str,
         launcher_id: typing.Union[int, str],
     ) -> bool:
+        session_name = algo.session_key(query, launcher_type, launcher_id)
+
+        backend = self.shared_backend()
+        if backend is not None:
+            return await self.acquire_from_backend(backend, query, session_name)
+
         # 加锁，找容器
         container: SessionContainer = None
 
-        execution_context = get_query_execution_context(query)
-        session_name = ':'.join(
-            (
-                execution_context.instance_uuid,
-                execution_context.workspace_uuid,
-                str(execution_context.placement_generation),
-                str(getattr(query, 'bot_uuid', '')),
-                str(getattr(query, 'pipeline_uuid', '')),
-                str(launcher_type),
-                str(launcher_id),
-            )
-        )
-
         async with self.containers_lock:
             container = self.containers.get(session_name)
 
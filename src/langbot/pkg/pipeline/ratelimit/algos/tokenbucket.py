@@ -0,0 +1,40 @@
+from __future__ import annotations
+import typing
+from .. import algo, backend as ratelimit_backend
+import langbot_plugin.api.entities.builtin.pipeline.query as pipeline_query
+
+
+# 令牌桶算法
+@algo.algo_class('tokenbucket')
+class TokenBucketAlgo(algo.ReteLimitAlgo):
+    """令牌桶算法
+
+    每个会话的桶容量为 limitation，每 window-length 秒匀速补满，
+    允许突发请求的同时避免固定窗口在边界处放行两倍请求。
+    配置了共享计数存储时由所有实例共同计数。
+    """
+
+    backend: ratelimit_backend.RateLimitBackend
+
+    async def initialize(self):
+        self.backend = self.shared_backend() or ratelimit_backend.MemoryRateLimitBackend()
+
+    async def require_access(
+        self,
+        query: pipeline_query.Query,
+        launcher_type: str,
+        launcher_id: typing.Union[int, str],
+    ) -> bool:
+        return await self.acquire_from_backend(
+            self.backend,
+            query,
+            algo.session_key(query, launcher_type, launcher_id),
+        )
+
+    async def release_access(
+        self,
+        query: pipeline_query.Query,
+        launcher_type: str,
+        launcher_id: typing.Union[int, str],
+    ):
+        pass
@@ -0,0 +1,255 @@
+from __future__ import annotations
+
+import abc
+import asyncio
+import collections
+import hashlib
+import math
+import time
+
+from ...core import app
+
+try:
+    from glide import (
+        GlideClient,
+        GlideClientConfiguration,
+        NodeAddress,
+        Script,
+        ServerCredentials,
+    )
+
+    VALKEY_AVAILABLE = True
+except ImportError:
+    VALKEY_AVAILABLE = False
+
+
+FIXED_WINDOW = 'fixwin'
+TOKEN_BUCKET = 'tokenbucket'
+
+_MAX_MEMORY_KEYS = 10000
+_DEFAULT_KEY_PREFIX = 'langbot:ratelimit:'
+_DEFAULT_REQUEST_TIMEOUT_MS = 500
+VALKEY_CLIENT_NAME = 'langbot_ratelimit_client'
+
+# Both scripts read the clock of the server so replicas with skewed clocks
+# still agree on window boundaries. They return 0 when the request is
+# admitted, otherwise the milliseconds until one would be. A limit of 0 admits
+# nothing.
+_FIXED_WINDOW_SCRIPT = """
+local now = redis.call('TIME')
+local now_ms = tonumber(now[1]) * 1000 + math.floor(tonumber(now[2]) / 1000)
+local window_ms = tonumber(ARGV[1])
+local limit = tonumber(ARGV[2])
+local window_start = now_ms - (now_ms % window_ms)
+local window_end = window_start + window_ms
+local stored = redis.call('HMGET', KEYS[1], 'w', 'c')
+local count = 0
+if tonumber(stored[1]) == window_start then
+    count = tonumber(stored[2]) or 0
+end
+if count >= limit then
+    return window_end - now_ms
+end
+redis.call('HSET', KEYS[1], 'w', window_start, 'c', count + 1)
+redis.call('PEXPIRE', KEYS[1], window_end - now_ms)
+return 0
+"""
+
+# Generic cell rate algorithm: a token bucket holding ``limit`` tokens that
+# refills ``limit`` tokens per window, stored as one theoretical arrival time.
+_TOKEN_BUCKET_SCRIPT = """
+local now = redis.call('TIME')
+local now_ms = tonumber(now[1]) * 1000 + math.floor(tonumber(now[2]) / 1000)
+local window_ms = tonumber(ARGV[1])
+local limit = tonumber(ARGV[2])
+if limit <= 0 then
+    return window_ms
+end
+local interval_ms = window_ms / limit
+local tat = tonumber(redis.call('GET', KEYS[1])) or now_ms
+if tat < now_ms then
+    tat = now_ms
+end
+local new_tat = tat + interval_ms
+local allow_at = new_tat - window_ms
+if allow_at > now_ms then
+    return math.ceil(allow_at - now_ms)
+end
+redis.call('SET', KEYS[1], string.format('%.3f', new_tat), 'PX', math.ceil(new_tat - now_ms))
+return 0
+"""
+
+
+def _config(ap: app.Application) -> dict:
+    instance_config = getattr(ap, 'instance_config', None)
+    data = getattr(instance_config, 'data', {})
+    rate_limit_config = data.get('system', {}).get('rate_limit', {}) if isinstance(data, dict) else {}
+    return rate_limit_config if isinstance(rate_limit_config, dict) else {}
+
+
+class RateLimitBackend(metaclass=abc.ABCMeta):
+    """限速计数存储
+
+    Counts admissions per session key. ``shared`` backends keep their state
+    outside the process so every replica enforces one quota.
+    """
+
+    shared: bool = False
+
+    @abc.abstractmethod
+    async def acquire(self, key: str, *, algorithm: str, window_seconds: int, limit: int) -> float:
+        """Count one request against ``key``. A ``limit`` of 0 or less admits nothing.
+
+        Returns:
+            float: 0 when the request is admitted, otherwise the seconds until one would be
+        """
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        pass
+
+
+class MemoryRateLimitBackend(RateLimitBackend):
+    """Process-local backend bounded to the most recently used keys."""
+
+    def __init__(self, max_keys: int = _MAX_MEMORY_KEYS):
+        self.max_keys = max_keys
+        self._states: collections.OrderedDict[tuple[str, str], list[float]] = collections.OrderedDict()
+
+    async def acquire(self, key: str, *, algorithm: str, window_seconds: int, limit: int) -> float:
+        if limit <= 0:
+            return float(window_seconds)
+        now = time.time()
+        state_key = (algorithm, key)
+        state = self._states.get(state_key)
+        if state is None:
+            state = self._states[state_key] = [0.0, 0.0]
+            while len(self._states) > self.max_keys:
+                self._states.popitem(last=False)
+        else:
+            self._states.move_to_end(state_key)
+
+        if algorithm == TOKEN_BUCKET:
+            interval = window_seconds / limit
+            new_tat = max(state[0], now) + interval
+            allow_at = new_tat - window_seconds
+            if allow_at > now:
+                return allow_at - now
+            state[0] = new_tat
+            return 0.0
+
+        window_start = now - now % window_seconds
+        if state[0] != window_start:
+            state[0], state[1] = window_start, 0
+        if state[1] >= limit:
+            return window_start + window_seconds - now
+        state[1] += 1
+        return 0.0
+
+
+class ValkeyRateLimitBackend(RateLimitBackend):
+    """Shared backend on a Valkey/Redis-protocol server.
+
+    Each check is a single ``EVALSHA`` of an atomic script. When the server
+    cannot be reached the check falls back to a process-local backend, so
+    limits degrade to per-replica enforcement instead of rejecting traffic.
+    """
+
+    shared = True
+
+    def __init__(self, ap: app.Application, config: dict):
+        if not VALKEY_AVAILABLE:
+            raise ImportError(
+                'valkey-glide is not installed or is unavailable on this platform. '
+                "On Linux or macOS, install it with: pip install 'valkey-glide>=2.4.1,<3.0.0'"
+            )
+        self.ap = ap
+        self._host = config.get('host', 'localhost')
+        self._port = int(config.get('port', 6379))
+        self._db = int(config.get('db', 0))
+        self._password = config.get('password', '') or None
+        self._username = config.get('username', '') or None
+        self._tls = bool(config.get('tls', False))
+        self._request_timeout = int(config.get('request_timeout', _DEFAULT_REQUEST_TIMEOUT_MS))
+        self.key_prefix = str(config.get('key_prefix', _DEFAULT_KEY_PREFIX))
+        if self._username is not None and self._password is None:
+            raise ValueError('Rate limit Valkey backend: a username was configured without a password.')
+
+        self._scripts = {
+            FIXED_WINDOW: Script(_FIXED_WINDOW_SCRIPT),
+            TOKEN_BUCKET: Script(_TOKEN_BUCKET_SCRIPT),
+        }
+        self._client: GlideClient | None = None
+        self._client_lock = asyncio.Lock()
+        self.fallback = MemoryRateLimitBackend()
+        self.fallback_count = 0
+
+    async def _ensure_client(self) -> GlideClient:
+        if self._client is not None:
+            return self._client
+        async with self._client_lock:
+            if self._client is not None:
+                return self._client
+            credentials = None
+            if self._password is not None:
+                credentials = ServerCredentials(password=self._password, username=self._username)
+            self._client = await GlideClient.create(
+                GlideClientConfiguration(
+                    addresses=[NodeAddress(self._host, self._port)],
+                    client_name=VALKEY_CLIENT_NAME,
+                    database_id=self._db,
+                    use_tls=self._tls,
+                    lazy_connect=True,
+                    credentials=credentials,
+                    request_timeout=self._request_timeout,
+                )
+            )
+            self.ap.logger.info(f'Initialized rate limit Valkey client to {self._host}:{self._port} (db={self._db})')
+        return self._client
+
+    def storage_key(self, key: str, algorithm: str) -> str:
+        return f'{self.key_prefix}{algorithm}:{hashlib.sha256(key.encode("utf-8")).hexdigest()}'
+
+    async def acquire(self, key: str, *, algorithm: str, window_seconds: int, limit: int) -> float:
+        script = self._scripts.get(algorithm)
+        if script is None:
+            raise ValueError(f'未知的限速算法: {algorithm}')
+        try:
+            client = await self._ensure_client()
+            retry_after_ms = await client.invoke_script(
+                script,
+                keys=[self.storage_key(key, algorithm)],
+                args=[str(int(window_seconds * 1000)), str(int(limit))],
+            )
+        except Exception as e:
+            self.fallback_count += 1
+            self.ap.logger.warning(f'Rate limit backend unavailable, enforcing limits in this process: {e}')
+            return await self.fallback.acquire(key, algorithm=algorithm, window_seconds=window_seconds, limit=limit)
+        return max(int(retry_after_ms), 0) / 1000
+
+    async def close(self) -> None:
+        if self._client is not None:
+            try:
+                await self._client.close()
+            except Exception:
+                self.ap.logger.warning('Rate limit Valkey backend: error while closing client (ignored)')
+            finally:
+                self._client = None
+
+
+def create_backend(ap: app.Application) -> RateLimitBackend:
+    """Build the backend selected by ``system.rate_limit.backend``."""
+
+    config = _config(ap)
+    backend_name = config.get('backend', 'memory')
+    if backend_name == 'valkey':
+        return ValkeyRateLimitBackend(ap, config.get('valkey', {}) or {})
+    if backend_name != 'memory':
+        raise ValueError(f'Unknown rate limit backend: {backend_name}')
+    return MemoryRateLimitBackend()
+
+
+def retry_delay(retry_after: float) -> float:
+    """Sleep slightly past ``retry_after`` so the next attempt lands in the new window."""
+
+    return math.ceil(retry_after * 1000 + 1) / 1000
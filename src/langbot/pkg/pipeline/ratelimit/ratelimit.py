@@ -24,7 +24,8 @@ class RateLimit(stage.PipelineStage):
     algo: algo.ReteLimitAlgo
 
     async def initialize(self, pipeline_config: dict):
-        algo_name = 'fixwin'
+        rate_limit_config = (pipeline_config or {}).get('safety', {}).get('rate-limit', {})
+        algo_name = rate_limit_config.get('algorithm') or 'fixwin'
 
         algo_class = None
 
@@ -0,0 +1,301 @@
+from __future__ import annotations
+
+import collections
+import dataclasses
+import hashlib
+import time
+import typing
+import unicodedata
+
+import numpy as np
+
+from ...core import app
+
+
+_DEFAULT_MAX_ENTRIES = 5000
+_DEFAULT_MAX_ENTRIES_PER_PIPELINE = 500
+_DEFAULT_MAX_QUESTION_CHARS = 1000
+_HARD_MAX_ENTRIES = 100000
+_HARD_MAX_ENTRIES_PER_PIPELINE = 10000
+
+PipelineKey = tuple[str, str]
+"""(workspace_uuid, pipeline_uuid)"""
+
+
+def normalize_question(text: str) -> str:
+    """Return the form of a question used for exact matching."""
+
+    return ' '.join(unicodedata.normalize('NFKC', text).casefold().split())
+
+
+def question_digest(text: str) -> str:
+    return hashlib.sha256(normalize_question(text).encode('utf-8')).hexdigest()
+
+
+def unit_vector(vector: typing.Sequence[float]) -> np.ndarray | None:
+    """Return ``vector`` scaled to unit length, or ``None`` when it cannot be."""
+
+    array = np.asarray(vector, dtype=np.float32)
+    if array.ndim != 1 or array.size == 0:
+        return None
+    norm = float(np.linalg.norm(array))
+    if not np.isfinite(norm) or norm == 0.0:
+        return None
+    return array / norm
+
+
+@dataclasses.dataclass(slots=True)
+class CachedResponse:
+    text: str
+    expires_at: float
+    vector: np.ndarray | None = None
+    embedding_model_uuid: str = ''
+
+
+@dataclasses.dataclass(slots=True)
+class ResponseCacheHit:
+    text: str
+    kind: typing.Literal['exact', 'semantic']
+    similarity: float = 1.0
+
+
+@dataclasses.dataclass(slots=True)
+class ResponseCacheStats:
+    lookups: int = 0
+    exact_hits: int = 0
+    semantic_hits: int = 0
+    stores: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+    @property
+    def hits(self) -> int:
+        return self.exact_hits + self.semantic_hits
+
+    def as_dict(self) -> dict[str, object]:
+        return {
+            'lookups': self.lookups,
+            'exact_hits': self.exact_hits,
+            'semantic_hits': self.semantic_hits,
+            'misses': self.lookups - self.hits,
+            'hit_ratio': round(self.hits / self.lookups, 4) if self.lookups else 0.0,
+            'stores': self.stores,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+        }
+
+
+@dataclasses.dataclass
+class _PipelineIndex:
+    entries: collections.OrderedDict[str, CachedResponse] = dataclasses.field(default_factory=collections.OrderedDict)
+    stats: ResponseCacheStats = dataclasses.field(default_factory=ResponseCacheStats)
+    # Stacked unit vectors of ``entries`` for one embedding model, rebuilt
+    # lazily after the entry set changes.
+    matrix: np.ndarray | None = None
+    matrix_digests: list[str] = dataclasses.field(default_factory=list)
+    matrix_model_uuid: str = ''
+
+
+class ResponseCache:
+    """Per-pipeline cache of final replies, matched by exact question or by embedding similarity.
+
+    Each (Workspace, pipeline) pair owns a small index of normalized question
+    digests. Entries that were stored with an embedding also take part in a
+    cosine-similarity scan, which is a single matrix-vector product over at
+    most ``max_entries_per_pipeline`` rows. Entries expire after the TTL set
+    by the pipeline and are evicted least-recently-used, both per pipeline
+    and across the whole process.
+    """
+
+    ap: app.Application
+
+    def __init__(self, ap: app.Application) -> None:
+        self.ap = ap
+        self._indexes: dict[PipelineKey, _PipelineIndex] = {}
+        # Process-wide LRU order over (workspace_uuid, pipeline_uuid, digest).
+        self._lru: collections.OrderedDict[tuple[str, str, str], None] = collections.OrderedDict()
+        self.stats = ResponseCacheStats()
+
+    def _config(self) -> dict:
+        instance_config = getattr(self.ap, 'instance_config', None)
+        data = getattr(instance_config, 'data', {})
+        cache_config = data.get('system', {}).get('response_cache', {}) if isinstance(data, dict) else {}
+        return cache_config if isinstance(cache_config, dict) else {}
+
+    def _positive_int(self, name: str, default: int, hard_max: int | None = None) -> int:
+        value = self._config().get(name, default)
+        if isinstance(value, bool) or not isinstance(value, int) or value < 1:
+            value = default
+        return min(value, hard_max) if hard_max is not None else value
+
+    @property
+    def max_entries(self) -> int:
+        return self._positive_int('max_entries', _DEFAULT_MAX_ENTRIES, _HARD_MAX_ENTRIES)
+
+    @property
+    def max_entries_per_pipeline(self) -> int:
+        return self._positive_int(
+            'max_entries_per_pipeline',
+            _DEFAULT_MAX_ENTRIES_PER_PIPELINE,
+            _HARD_MAX_ENTRIES_PER_PIPELINE,
+        )
+
+    @property
+    def max_question_chars(self) -> int:
+        return self._positive_int('max_question_chars', _DEFAULT_MAX_QUESTION_CHARS)
+
+    def _remove(self, key: PipelineKey, index: _PipelineIndex, digest: str) -> None:
+        index.entries.pop(digest, None)
+        index.matrix = None
+        self._lru.pop((*key, digest), None)
+
+    def _prune_expired(self, key: PipelineKey, index: _PipelineIndex, now: float) -> None:
+        expired = [digest for digest, entry in index.entries.items() if entry.expires_at <= now]
+        for digest in expired:
+            self._remove(key, index, digest)
+        index.stats.expirations += len(expired)
+        self.stats.expirations += len(expired)
+
+    def _touch(self, key: PipelineKey, index: _PipelineIndex, digest: str) -> None:
+        index.entries.move_to_end(digest)
+        self._lru.move_to_end((*key, digest))
+
+    def _similar(
+        self,
+        index: _PipelineIndex,
+        vector: np.ndarray,
+        embedding_model_uuid: str,
+    ) -> tuple[str, float] | None:
+        if index.matrix is None or index.matrix_model_uuid != embedding_model_uuid:
+            rows = [
+                (digest, entry.vector)
+                for digest, entry in index.entries.items()
+                if entry.vector is not None
+                and entry.embedding_model_uuid == embedding_model_uuid
+                and entry.vector.shape == vector.shape
+            ]
+            index.matrix_digests = [digest for digest, _ in rows]
+            index.matrix = np.stack([row for _, row in rows]) if rows else np.empty((0, vector.size), np.float32)
+            index.matrix_model_uuid = embedding_model_uuid
+        if index.matrix.shape[0] == 0 or index.matrix.shape[1] != vector.size:
+            return None
+        similarities = index.matrix @ vector
+        best = int(np.argmax(similarities))
+        return index.matrix_digests[best], float(similarities[best])
+
+    def find_exact(self, workspace_uuid: str, pipeline_uuid: str, digest: str) -> ResponseCacheHit | None:
+        """Return the reply cached for an identical question."""
+
+        key = (workspace_uuid, pipeline_uuid)
+        index = self._indexes.get(key)
+        if index is None:
+            return None
+        self._prune_expired(key, index, time.monotonic())
+        entry = index.entries.get(digest)
+        if entry is None:
+            return None
+        self._touch(key, index, digest)
+        return ResponseCacheHit(text=entry.text, kind='exact')
+
+    def find_similar(
+        self,
+        workspace_uuid: str,
+        pipeline_uuid: str,
+        vector: np.ndarray,
+        embedding_model_uuid: str,
+        similarity_threshold: float,
+    ) -> ResponseCacheHit | None:
+        """Return the reply of the most similar cached question above ``similarity_threshold``."""
+
+        key = (workspace_uuid, pipeline_uuid)
+        index = self._indexes.get(key)
+        if index is None:
+            return None
+        self._prune_expired(key, index, time.monotonic())
+        match = self._similar(index, vector, embedding_model_uuid)
+        if match is None or match[1] < similarity_threshold:
+            return None
+        digest, similarity = match
+        self._touch(key, index, digest)
+        return ResponseCacheHit(text=index.entries[digest].text, kind='semantic', similarity=similarity)
+
+    def record_lookup(self, workspace_uuid: str, pipeline_uuid: str, hit: ResponseCacheHit | None) -> None:
+        """Count one lookup towards the hit rate of the process and of the pipeline."""
+
+        index = self._indexes.setdefault((workspace_uuid, pipeline_uuid), _PipelineIndex())
+        for stats in (self.stats, index.stats):
+            stats.lookups += 1
+            if hit is not None and hit.kind == 'exact':
+                stats.exact_hits += 1
+            elif hit is not None:
+                stats.semantic_hits += 1
+
+    def store(
+        self,
+        workspace_uuid: str,
+        pipeline_uuid: str,
+        digest: str,
+        text: str,
+        ttl_seconds: int,
+        *,
+        vector: np.ndarray | None = None,
+        embedding_model_uuid: str = '',
+    ) -> None:
+        key = (workspace_uuid, pipeline_uuid)
+        index = self._indexes.setdefault(key, _PipelineIndex())
+        index.entries[digest] = CachedResponse(
+            text=text,
+            expires_at=time.monotonic() + ttl_seconds,
+            vector=vector,
+            embedding_model_uuid=embedding_model_uuid if vector is not None else '',
+        )
+        index.matrix = None
+        self._lru[(*key, digest)] = None
+        self._touch(key, index, digest)
+        index.stats.stores += 1
+        self.stats.stores += 1
+
+        max_entries_per_pipeline = self.max_entries_per_pipeline
+        while len(index.entries) > max_entries_per_pipeline:
+            self._remove(key, index, next(iter(index.entries)))
+            index.stats.evictions += 1
+            self.stats.evictions += 1
+        max_entries = self.max_entries
+        while len(self._lru) > max_entries:
+            evicted_workspace, evicted_pipeline, evicted_digest = next(iter(self._lru))
+            evicted_key = (evicted_workspace, evicted_pipeline)
+            evicted_index = self._indexes[evicted_key]
+            self._remove(evicted_key, evicted_index, evicted_digest)
+            evicted_index.stats.evictions += 1
+            self.stats.evictions += 1
+            if not evicted_index.entries and evicted_key != key:
+                del self._indexes[evicted_key]
+
+    def invalidate_pipeline(self, workspace_uuid: str, pipeline_uuid: str) -> int:
+        """Drop every reply cached for a pipeline, e.g. after its config changed."""
+
+        key = (workspace_uuid, pipeline_uuid)
+        index = self._indexes.pop(key, None)
+        if index is None:
+            return 0
+        for digest in index.entries:
+            self._lru.pop((*key, digest), None)
+        return len(index.entries)
+
+    def pipeline_stats(self, workspace_uuid: str, pipeline_uuid: str) -> dict[str, object]:
+        index = self._indexes.get((workspace_uuid, pipeline_uuid))
+        if index is None:
+            return {'entries': 0, **ResponseCacheStats().as_dict()}
+        return {'entries': len(index.entries), **index.stats.as_dict()}
+
+    def clear(self) -> None:
+        self._indexes.clear()
+        self._lru.clear()
+
+    def snapshot(self) -> dict[str, object]:
+        return {
+            'entries': len(self._lru),
+            'pipelines': len(self._indexes),
+            'max_entries': self.max_entries,
+            **self.stats.as_dict(),
+        }
@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import dataclasses
+import typing
+
+import numpy as np
+
+import langbot_plugin.api.entities.builtin.pipeline.query as pipeline_query
+import langbot_plugin.api.entities.builtin.platform.message as platform_message
+import langbot_plugin.api.entities.builtin.provider.message as provider_message
+
+from .. import entities, stage
+from ..pool import get_query_execution_context
+from ...api.http.context import ExecutionContext
+from ..respback import respback
+from ...telemetry import features as telemetry_features
+from . import cache
+
+
+_DEFAULT_SIMILARITY_THRESHOLD = 0.95
+_DEFAULT_TTL_SECONDS = 86400
+
+_PROBE_ATTR = '_response_cache_probe'
+
+
+@dataclasses.dataclass(slots=True)
+class _Probe:
+    """What the lookup stage learned about a query that missed the cache."""
+
+    digest: str
+    vector: np.ndarray | None
+    embedding_model_uuid: str
+
+
+def _stage_config(query: pipeline_query.Query) -> dict:
+    config = (query.pipeline_config or {}).get('output', {}).get('response-cache', {})
+    return config if isinstance(config, dict) else {}
+
+
+def _similarity_threshold(config: dict) -> float:
+    value = config.get('similarity-threshold', _DEFAULT_SIMILARITY_THRESHOLD)
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not 0 < value <= 1:
+        return _DEFAULT_SIMILARITY_THRESHOLD
+    return float(value)
+
+
+def _ttl_seconds(config: dict) -> int:
+    value = config.get('ttl', _DEFAULT_TTL_SECONDS)
+    if isinstance(value, bool) or not isinstance(value, int) or value < 1:
+        return _DEFAULT_TTL_SECONDS
+    return value
+
+
+def _question_text(query: pipeline_query.Query) -> str | None:
+    """Return the text of a text-only user message, otherwise ``None``."""
+
+    user_message = query.user_message
+    if user_message is None:
+        return None
+    content = user_message.content
+    if isinstance(content, str):
+        text = content
+    elif isinstance(content, list) and all(element.type == 'text' for element in content):
+        text = ''.join(element.text or '' for element in content)
+    else:
+        return None
+    return text if text.strip() else None
+
+
+def _answer_text(query: pipeline_query.Query) -> str | None:
+    """Return the final plain assistant reply of a turn that used no tools."""
+
+    if not query.resp_messages or query.variables.get('_monitoring_has_error', False):
+        return None
+    if telemetry_features.get_features(query).get('tool_call_rounds'):
+        return None
+    for message in query.resp_messages:
+        if not isinstance(message, (provider_message.Message, provider_message.MessageChunk)):
+            return None
+        if message.role != 'assistant' or message.tool_calls:
+            return None
+    last = query.resp_messages[-1]
+    if isinstance(last, provider_message.MessageChunk) and not last.is_final:
+        return None
+    if not isinstance(last.content, str) or not last.content.strip():
+        return None
+    return last.content
+
+
+@stage.stage_class('ResponseCacheLookupStage')
+@stage.stage_class('ResponseCacheStoreStage')
+class ResponseCacheStage(stage.PipelineStage):
+    """回复缓存阶段
+
+    ResponseCacheLookupStage 在调用 AI 之前按问题原文或向量相似度查找此前的回复，
+    命中时通过 SendResponseBackStage 直接回复并中断流水线；
+    ResponseCacheStoreStage 在内容过滤之后记录本次的最终回复。
+
+    命中缓存的请求不会经过限速、ResponseWrapper 与长文本处理。
+    """
+
+    def _cache(self) -> cache.ResponseCache | None:
+        response_cache = getattr(getattr(self.ap, 'pipeline_mgr', None), 'response_cache', None)
+        return response_cache if isinstance(response_cache, cache.ResponseCache) else None
+
+    async def _embed(
+        self,
+        query: pipeline_query.Query,
+        execution_context: ExecutionContext,
+        embedding_model_uuid: str,
+        text: str,
+    ) -> np.ndarray | None:
+        try:
+            model = await self.ap.model_mgr.get_embedding_model_by_uuid(execution_context, embedding_model_uuid)
+            [vector] = await model.provider.invoke_embedding(
+                model,
+                [text],
+                execution_context=execution_context,
+                query_text=text,
+            )
+        except Exception as e:
+            self.ap.logger.warning(f'Response cache could not embed query {query.query_id}: {e}')
+            return None
+        return cache.unit_vector(vector)
+
+    async def _lookup(self, query: pipeline_query.Query, response_cache: cache.ResponseCache, config: dict):
+        text = _question_text(query)
+        if text is None or len(text) > response_cache.max_question_chars:
+            return None
+        if config.get('scope', 'first-message') != 'all' and query.messages:
+            return None
+
+        execution_context = get_query_execution_context(query)
+        scope = (execution_context.workspace_uuid, execution_context.pipeline_uuid)
+        digest = cache.question_digest(text)
+        embedding_model_uuid = config.get('embedding-model') or ''
+        vector = None
+        hit = response_cache.find_exact(*scope, digest)
+        if hit is None and embedding_model_uuid:
+            vector = await self._embed(query, execution_context, embedding_model_uuid, text)
+            if vector is not None:
+                hit = response_cache.find_similar(
+                    *scope,
+                    vector,
+                    embedding_model_uuid,
+                    _similarity_threshold(config),
+                )
+        response_cache.record_lookup(*scope, hit)
+        if hit is None:
+            telemetry_features.set_value(query, 'response_cache', 'miss')
+            object.__setattr__(
+                query,
+                _PROBE_ATTR,
+                _Probe(digest, vector, embedding_model_uuid if vector is not None else ''),
+            )
+        return hit
+
+    async def _reply(self, query: pipeline_query.Query, hit: cache.ResponseCacheHit) -> None:
+        query.resp_messages.append(provider_message.Message(role='assistant', content=hit.text))
+        query.resp_message_chain = [platform_message.MessageChain([platform_message.Plain(text=hit.text)])]
+        await respback.SendResponseBackStage(self.ap).process(query, 'SendResponseBackStage')
+
+        conversation = getattr(query.session, 'using_conversation', None)
+        if conversation is not None and query.user_message is not None:
+            conversation.messages.append(query.user_message)
+            conversation.messages.extend(query.resp_messages)
+            self.ap.sess_mgr.trim_conversation_messages(
+                conversation,
+                max_rounds=query.pipeline_config['ai'].get('local-agent', {}).get('max-round', 10),
+            )
+
+    async def process(
+        self,
+        query: pipeline_query.Query,
+        stage_inst_name: str,
+    ) -> typing.Union[
+        entities.StageProcessResult,
+        typing.AsyncGenerator[entities.StageProcessResult, None],
+    ]:
+        """处理"""
+        config = _stage_config(query)
+        response_cache = self._cache()
+        if config.get('enabled', False) is not True or response_cache is None:
+            return entities.StageProcessResult(result_type=entities.ResultType.CONTINUE, new_query=query)
+
+        if stage_inst_name == 'ResponseCacheLookupStage':
+            hit = await self._lookup(query, response_cache, config)
+            if hit is None:
+                return entities.StageProcessResult(result_type=entities.ResultType.CONTINUE, new_query=query)
+
+            query.variables['_response_cache_hit'] = hit.kind
+            await self._reply(query, hit)
+            return entities.StageProcessResult(
+                result_type=entities.ResultType.INTERRUPT,
+                new_query=query,
+                console_notice=(
+                    f'Response cache {hit.kind} hit for query {query.query_id} (similarity {hit.similarity:.3f})'
+                ),
+            )
+
+        probe: _Probe | None = getattr(query, _PROBE_ATTR, None)
+        answer = _answer_text(query) if probe is not None else None
+        if answer is not None:
+            execution_context = get_query_execution_context(query)
+            response_cache.store(
+                execution_context.workspace_uuid,
+                execution_context.pipeline_uuid,
+                probe.digest,
+                answer,
+                _ttl_seconds(config),
+                vector=probe.vector,
+                embedding_model_uuid=probe.embedding_model_uuid,
+            )
+            # A streamed reply passes this stage once per chunk; store it once.
+            object.__setattr__(query, _PROBE_ATTR, None)
+        return entities.StageProcessResult(result_type=entities.ResultType.CONTINUE, new_query=query)
@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import collections
+import typing
+
+import langbot_plugin.api.entities.builtin.pipeline.query as pipeline_query
+
+SessionKey = tuple[
+    str,
+    str,
+    int,
+    str,
+    str,
+    int | str,
+]
+
+
+class _QueuedEntry(typing.NamedTuple):
+    query: pipeline_query.Query
+    session_key: SessionKey
+    workspace_uuid: str
+
+
+class RunnableQueryScheduler:
+    """Per-session FIFO queues with a fair ring of runnable sessions.
+
+    Every queued query lives in exactly one session FIFO. Sessions that have
+    queued work and are not known to be saturated sit in a per-Workspace ready
+    ring, and Workspaces with at least one ready session sit in a global ring.
+    Selecting, starting, and discarding a query are O(1) amortised; the
+    Workspace and session rings rotate on every start so a busy chat cannot
+    starve its neighbours.
+
+    The scheduler does not own session semaphores. The caller reports a
+    saturated session with ``mark_session_saturated`` and a released slot
+    with ``release_session_slot``.
+    """
+
+    def __init__(self):
+        self._entries: collections.OrderedDict[int, _QueuedEntry] = collections.OrderedDict()
+        self._entries_by_workspace: dict[str, collections.OrderedDict[int, _QueuedEntry]] = {}
+        self._session_queues: dict[SessionKey, collections.deque[pipeline_query.Query]] = {}
+        self._ready_sessions: dict[str, collections.OrderedDict[SessionKey, None]] = {}
+        self._ready_workspaces: collections.OrderedDict[str, None] = collections.OrderedDict()
+        self._saturated_sessions: set[SessionKey] = set()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, query: object) -> bool:
+        entry = self._entries.get(id(query))
+        return entry is not None and entry.query is query
+
+    def __iter__(self) -> typing.Iterator[pipeline_query.Query]:
+        """Iterate queued queries in arrival order."""
+
+        return (entry.query for entry in self._entries.values())
+
+    @property
+    def ready_session_count(self) -> int:
+        return sum(len(sessions) for sessions in self._ready_sessions.values())
+
+    @property
+    def saturated_session_count(self) -> int:
+        return len(self._saturated_sessions)
+
+    def _make_ready(self, session_key: SessionKey, workspace_uuid: str) -> None:
+        if session_key in self._saturated_sessions:
+            return
+        ready_sessions = self._ready_sessions.setdefault(workspace_uuid, collections.OrderedDict())
+        if session_key not in ready_sessions:
+            ready_sessions[session_key] = None
+        if workspace_uuid not in self._ready_workspaces:
+            self._ready_workspaces[workspace_uuid] = None
+
+    def _make_unready(self, session_key: SessionKey, workspace_uuid: str) -> None:
+        ready_sessions = self._ready_sessions.get(workspace_uuid)
+        if ready_sessions is None:
+            return
+        ready_sessions.pop(session_key, None)
+        if not ready_sessions:
+            del self._ready_sessions[workspace_uuid]
+            self._ready_workspaces.pop(workspace_uuid, None)
+
+    def push(
+        self,
+        query: pipeline_query.Query,
+        *,
+        session_key: SessionKey,
+        workspace_uuid: str,
+    ) -> None:
+        """Append a query to the tail of its session FIFO."""
+
+        query_key = id(query)
+        if query_key in self._entries:
+            raise ValueError('Query is already queued')
+        entry = _QueuedEntry(query, session_key, workspace_uuid)
+        self._entries[query_key] = entry
+        self._entries_by_workspace.setdefault(workspace_uuid, collections.OrderedDict())[query_key] = entry
+        self._session_queues.setdefault(session_key, collections.deque()).append(query)
+        self._make_ready(session_key, workspace_uuid)
+
+    def peek(self) -> pipeline_query.Query | None:
+        """Return the head query of the next ready session without removing it."""
+
+        if not self._ready_workspaces:
+            return None
+        workspace_uuid = next(iter(self._ready_workspaces))
+        session_key = next(iter(self._ready_sessions[workspace_uuid]))
+        return self._session_queues[session_key][0]
+
+    def _remove(self, query: pipeline_query.Query) -> _QueuedEntry | None:
+        query_key = id(query)
+        entry = self._entries.get(query_key)
+        if entry is None or entry.query is not query:
+            return None
+        del self._entries[query_key]
+        workspace_entries = self._entries_by_workspace[entry.workspace_uuid]
+        del workspace_entries[query_key]
+        if not workspace_entries:
+            del self._entries_by_workspace[entry.workspace_uuid]
+
+        session_queue = self._session_queues[entry.session_key]
+        if session_queue[0] is query:
+            session_queue.popleft()
+        else:
+            # Only explicit removals of a query that is not at its session
+            # head reach this path; the scheduler itself always takes heads.
+            for index, queued_query in enumerate(session_queue):
+                if queued_query is query:
+                    del session_queue[index]
+                    break
+        if not session_queue:
+            del self._session_queues[entry.session_key]
+            self._make_unready(entry.session_key, entry.workspace_uuid)
+        return entry
+
+    def take(self, query: pipeline_query.Query) -> bool:
+        """Remove a query that is starting and rotate its session and Workspace."""
+
+        entry = self._remove(query)
+        if entry is None:
+            return False
+        ready_sessions = self._ready_sessions.get(entry.workspace_uuid)
+        if ready_sessions is not None:
+            if entry.session_key in ready_sessions:
+                ready_sessions.move_to_end(entry.session_key)
+            self._ready_workspaces.move_to_end(entry.workspace_uuid)
+        return True
+
+    def remove(self, query: pipeline_query.Query) -> bool:
+        """Remove a queued query without affecting scheduling order."""
+
+        return self._remove(query) is not None
+
+    def pop_oldest(self, workspace_uuid: str | None = None) -> pipeline_query.Query | None:
+        """Remove the oldest queued query globally or from one Workspace.
+
+        The oldest query of any scope is always at the head of its own session
+        FIFO, so removal never scans a queue.
+        """
+
+        if workspace_uuid is None:
+            entries = self._entries
+        else:
+            entries = self._entries_by_workspace.get(workspace_uuid)
+        if not entries:
+            return None
+        entry = next(iter(entries.values()))
+        self._remove(entry.query)
+        return entry.query
+
+    def mark_session_saturated(self, session_key: SessionKey, workspace_uuid: str) -> None:
+        """Park a session whose concurrency slots are all in use."""
+
+        self._saturated_sessions.add(session_key)
+        self._make_unready(session_key, workspace_uuid)
+
+    def release_session_slot(self, session_key: SessionKey, workspace_uuid: str) -> None:
+        """Make a parked session runnable again after one of its slots frees."""
+
+        self._saturated_sessions.discard(session_key)
+        if session_key in self._session_queues:
+            self._make_ready(session_key, workspace_uuid)
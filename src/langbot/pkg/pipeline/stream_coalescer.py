@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import time
+import typing
+
+import langbot_plugin.api.entities.builtin.provider.message as provider_message
+
+
+_DEFAULT_SETTINGS: dict[str, float] = {
+    'interval_seconds': 0.5,
+    'min_interval_seconds': 0.1,
+    'max_buffered_chars': 200,
+}
+
+# Built-in pacing per platform adapter (the adapter's manifest name), derived
+# from the edit-rate limits of each platform's streaming API.
+_PLATFORM_DEFAULTS: dict[str, dict[str, float]] = {
+    # CardKit accepts at most 10 updates per second for one card.
+    'lark': {'interval_seconds': 0.5, 'min_interval_seconds': 0.2},
+    # AI card streaming updates are throttled per card instance.
+    'dingtalk': {'interval_seconds': 0.8, 'min_interval_seconds': 0.4},
+    # editMessageText / sendMessageDraft hit flood control above ~1 edit per second per chat.
+    'telegram': {'interval_seconds': 1.0, 'min_interval_seconds': 1.0},
+    # Message edits are limited to 5 per 5 seconds per channel.
+    'discord': {'interval_seconds': 1.0, 'min_interval_seconds': 1.0},
+    # Local transports have no edit limit; keep updates smooth but batched.
+    'websocket': {'interval_seconds': 0.1, 'min_interval_seconds': 0.05},
+    'web_page_bot': {'interval_seconds': 0.1, 'min_interval_seconds': 0.05},
+}
+
+_HARD_MAX_INTERVAL_SECONDS = 10.0
+_HARD_MAX_BUFFERED_CHARS = 100_000
+
+
+def _number(value: typing.Any, default: float, hard_max: float) -> float:
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or value < 0:
+        return default
+    return min(float(value), hard_max)
+
+
+def resolve_settings(config: typing.Any, platform: str | None) -> dict[str, float]:
+    """Merge the built-in and configured pacing for one platform adapter.
+
+    ``config`` is the ``system.stream_coalescing`` section of the instance
+    config; its top-level keys apply to every platform and its ``platforms``
+    mapping overrides them per adapter name.
+    """
+
+    config = config if isinstance(config, dict) else {}
+    platform_overrides = config.get('platforms', {})
+    platform_overrides = platform_overrides if isinstance(platform_overrides, dict) else {}
+    platform_config = platform_overrides.get(platform, {}) if platform else {}
+    platform_config = platform_config if isinstance(platform_config, dict) else {}
+
+    settings = dict(_DEFAULT_SETTINGS)
+    settings.update(_PLATFORM_DEFAULTS.get(platform or '', {}))
+    for layer in (config, platform_config):
+        for name, default in list(settings.items()):
+            hard_max = _HARD_MAX_BUFFERED_CHARS if name == 'max_buffered_chars' else _HARD_MAX_INTERVAL_SECONDS
+            settings[name] = _number(layer.get(name, default), default, hard_max)
+    settings['min_interval_seconds'] = min(settings['min_interval_seconds'], settings['interval_seconds'])
+    return settings
+
+
+async def _next_chunk(chunks: typing.AsyncIterator[typing.Any]) -> typing.Any:
+    return await anext(chunks)
+
+
+class StreamCoalescer:
+    """Pace the streamed chunks of one reply before they reach the platform adapter.
+
+    Runners usually yield cumulative ``MessageChunk`` objects: each one carries
+    the whole reply so far, so an intermediate chunk can be dropped when a
+    newer one supersedes it. The coalescer forwards the first chunk at once,
+    then at most one update per ``interval_seconds``, or earlier once
+    ``max_buffered_chars`` new characters are buffered, but never twice within
+    ``min_interval_seconds``. Final chunks, tool calls, tool results and any
+    chunk that does not extend the previous text (non-text content or a
+    delta) are forwarded immediately, after the held chunk it does not contain.
+    """
+
+    def __init__(
+        self,
+        interval_seconds: float = _DEFAULT_SETTINGS['interval_seconds'],
+        min_interval_seconds: float = _DEFAULT_SETTINGS['min_interval_seconds'],
+        max_buffered_chars: float = _DEFAULT_SETTINGS['max_buffered_chars'],
+        clock: typing.Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.interval_seconds = interval_seconds
+        self.min_interval_seconds = min(min_interval_seconds, interval_seconds)
+        self.max_buffered_chars = max_buffered_chars
+        self._clock = clock
+        self._held: provider_message.MessageChunk | None = None
+        self._previous_content: typing.Any = None
+        self._last_emitted_at: float | None = None
+        self._last_emitted_chars = 0
+        self.received = 0
+        self.emitted = 0
+
+    @staticmethod
+    def _chars(chunk: provider_message.MessageChunk) -> int:
+        return len(chunk.content) if isinstance(chunk.content, str) else 0
+
+    @staticmethod
+    def _must_forward(chunk: provider_message.MessageChunk) -> bool:
+        if not isinstance(chunk, provider_message.MessageChunk):
+            return True
+        return bool(chunk.is_final or chunk.tool_calls or chunk.role != 'assistant')
+
+    def _emit(self, chunk: provider_message.MessageChunk, now: float) -> provider_message.MessageChunk:
+        self._held = None
+        self._last_emitted_at = now
+        self._last_emitted_chars = self._chars(chunk)
+        self.emitted += 1
+        return chunk
+
+    def push(self, chunk: provider_message.MessageChunk) -> list[provider_message.MessageChunk]:
+        """Accept a chunk from the runner and return the updates to deliver now, oldest first."""
+
+        self.received += 1
+        now = self._clock()
+        content = chunk.content if isinstance(chunk, provider_message.MessageChunk) else None
+        previous, self._previous_content = self._previous_content, content
+        extends = isinstance(content, str) and isinstance(previous, str) and content.startswith(previous)
+
+        updates = []
+        if self._held is not None and not extends:
+            # The held text is not part of this chunk, so dropping it would lose it.
+            updates.append(self._emit(self._held, now))
+        if self._last_emitted_at is None or not extends or self._must_forward(chunk):
+            updates.append(self._emit(chunk, now))
+            return updates
+
+        elapsed = now - self._last_emitted_at
+        buffered_chars = self._chars(chunk) - self._last_emitted_chars
+        if elapsed >= self.interval_seconds or (
+            elapsed >= self.min_interval_seconds and buffered_chars >= self.max_buffered_chars
+        ):
+            updates.append(self._emit(chunk, now))
+        else:
+            self._held = chunk
+        return updates
+
+    def due_in(self) -> float | None:
+        """Seconds until the held chunk is due, or ``None`` when nothing is held."""
+
+        if self._held is None:
+            return None
+        return max(self._last_emitted_at + self.interval_seconds - self._clock(), 0.0)
+
+    def flush(self) -> provider_message.MessageChunk | None:
+        """Return the chunk still held back, e.g. when the runner stops without a final chunk."""
+
+        if self._held is None:
+            return None
+        return self._emit(self._held, self._clock())
+
+    async def pace(
+        self, chunks: typing.AsyncIterator[provider_message.MessageChunk]
+    ) -> typing.AsyncIterator[provider_message.MessageChunk]:
+        """Yield the updates for ``chunks``, delivering a held chunk once it is due even while the runner stalls.
+
+        Each step of ``chunks`` runs as a task in one copy of the caller's
+        context, so context variables set by the runner persist across its
+        chunks but are not seen by the caller. ``chunks`` is closed when pacing
+        ends, including when the caller stops early.
+        """
+
+        context = contextvars.copy_context()
+        pending: asyncio.Task | None = None
+        try:
+            while True:
+                if pending is None:
+                    pending = asyncio.get_running_loop().create_task(_next_chunk(chunks), context=context)
+                done, _ = await asyncio.wait({pending}, timeout=self.due_in())
+                if not done:
+                    update = self.flush()
+                    if update is not None:
+                        yield update
+                    continue
+                step, pending = pending, None
+                try:
+                    chunk = step.result()
+                except StopAsyncIteration:
+                    break
+                for update in self.push(chunk):
+                    yield update
+            update = self.flush()
+            if update is not None:
+                yield update
+        finally:
+            if pending is not None:
+                pending.cancel()
+                await asyncio.wait({pending})
+            aclose = getattr(chunks, 'aclose', None)
+            if aclose is not None:
+                await asyncio.get_running_loop().create_task(aclose(), context=context)
@@ -8,6 +8,7 @@ import json
 import re
 import time
 import traceback
+import typing
 import uuid
 import sqlalchemy
 
@@ -530,7 +531,7 @@ class PlatformManager:
 
     adapter_components: list[engine.Component]
 
-    adapter_dict: dict[str, type[abstract_platform_adapter.AbstractMessagePlatformAdapter]]
+    adapter_dict: typing.Mapping[str, type[abstract_platform_adapter.AbstractMessagePlatformAdapter]]
 
     def __init__(self, ap: app.Application = None):
         self.ap = ap
@@ -676,12 +677,11 @@ class PlatformManager:
         disabled_adapters = self.ap.instance_config.data.get('system', {}).get('disabled_adapters', []) or []
 
         self.adapter_components = self.ap.discover.get_components_by_kind('MessagePlatformAdapter')
-        adapter_dict: dict[str, type[abstract_platform_adapter.AbstractMessagePlatformAdapter]] = {}
-        for component in self.adapter_components:
-            if component.metadata.name in disabled_adapters:
-                continue
-            adapter_dict[component.metadata.name] = component.get_python_component_class()
-        self.adapter_dict = adapter_dict
+        # Adapter modules pull in their platform SDKs, so each one is imported
+        # only when a bot of that adapter is first loaded.
+        self.adapter_dict = engine.ComponentClassRegistry(
+            component for component in self.adapter_components if component.metadata.name not in disabled_adapters
+        )
 
         # Filter out disabled adapters from components list (for API responses)
         if disabled_adapters:
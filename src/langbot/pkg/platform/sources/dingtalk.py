@@ -622,7 +622,6 @@ class DingTalkAdapter(abstract_platform_adapter.AbstractMessagePlatformAdapter):
         is_final: bool = False,
     ):
         message_id = bot_message.resp_message_id
-        msg_seq = bot_message.msg_sequence
 
         form_template_id = (self.config.get('human_input_card_template_id') or '').strip()
         form_data = getattr(bot_message, '_form_data', None)
@@ -636,77 +635,77 @@ class DingTalkAdapter(abstract_platform_adapter.AbstractMessagePlatformAdapter):
             await self._handle_form_chunk(message_source, bot_message, message, form_data)
             return
 
-        if (msg_seq - 1) % 8 == 0 or is_final:
-            markdown_enabled = self.config.get('markdown_card', False)
-            content, at = await DingTalkMessageConverter.yiri2target(message, markdown_enabled)
-            if not content and bot_message.content:
-                content = bot_message.content  # 兼容直接传入content的情况
-
-            chat_card_entry = self.card_instance_id_dict.get(message_id)
+        # Chunks arrive already paced by the pipeline's stream coalescer.
+        markdown_enabled = self.config.get('markdown_card', False)
+        content, at = await DingTalkMessageConverter.yiri2target(message, markdown_enabled)
+        if not content and bot_message.content:
+            content = bot_message.content  # 兼容直接传入content的情况
+
+        chat_card_entry = self.card_instance_id_dict.get(message_id)
+        if chat_card_entry is None:
+            # No streaming chat card was created for this query — common
+            # path for synthetic events (e.g. resumed workflow after a
+            # button click). Lazy-create one so the resumed output streams
+            # into a card just like a normal conversation, instead of
+            # being deferred and sent in one shot on is_final.
+            if not content:
+                return  # nothing to stream yet
+            chat_card_entry = await self._lazy_create_resume_chat_card(message_source, message_id)
             if chat_card_entry is None:
-                # No streaming chat card was created for this query — common
-                # path for synthetic events (e.g. resumed workflow after a
-                # button click). Lazy-create one so the resumed output streams
-                # into a card just like a normal conversation, instead of
-                # being deferred and sent in one shot on is_final.
-                if not content:
-                    return  # nothing to stream yet
-                chat_card_entry = await self._lazy_create_resume_chat_card(message_source, message_id)
-                if chat_card_entry is None:
-                    # Lazy-create failed (no template configured); fall back
-                    # to a one-shot proactive message on the final chunk.
-                    if is_final:
-                        await self._send_proactive_to_event(message_source, content)
-                    return
-
-            card_instance, card_instance_id = chat_card_entry
-            # btns is reserved exclusively for Dify form-action buttons.
-            # The template renders an Avatar header above the markdown
-            # content; no feedback buttons get injected here.
-            if content:
-                if form_template_id:
-                    # The card content has already been written via
-                    # update_card_data (in _paint_form_on_card and the
-                    # initial card creation). The streaming endpoint
-                    # (PUT /v1.0/card/streaming) does not propagate
-                    # updates on cards whose content was last set via
-                    # update_card_data — they take different code paths
-                    # on the DingTalk client. Stick with update_card_data
-                    # for the whole turn for consistency.
-                    try:
-                        await self.bot.update_card_data(
-                            out_track_id=card_instance_id,
-                            card_param_map=self._card_params(
-                                content=content,
-                                btns='[]',
-                                flowStatus='3' if is_final else '1',
-                                **_dingtalk_empty_form_component_params(),
-                            ),
-                        )
-                        session_key = self._session_key_from_event(message_source)
-                        if session_key:
-                            self.active_turn_text[session_key] = content
-                    except Exception:
-                        if self.ap is not None:
-                            self.ap.logger.exception('DingTalk: update card content failed')
-                else:
-                    await self.bot.send_card_message(card_instance, card_instance_id, content, is_final)
-            if is_final:
-                if form_template_id and not content:
-                    # Empty final chunk still needs to leave the card with
-                    # flowStatus=3 so the spinner stops.
-                    try:
-                        await self.bot.update_card_data(
-                            out_track_id=card_instance_id,
-                            card_param_map=self._card_params(
-                                flowStatus='3',
-                                **_dingtalk_empty_form_component_params(),
-                            ),
-                        )
-                    except Exception:
-                        pass
-                if bot_message.tool_calls is None:
-                    self.card_instance_id_dict.pop(message_id, None)
+                # Lazy-create failed (no template configured); fall back
+                # to a one-shot proactive message on the final chunk.
+                if is_final:
+                    await self._send_proactive_to_event(message_source, content)
+                return
+
+        card_instance, card_instance_id = chat_card_entry
+        # btns is reserved exclusively for Dify form-action buttons.
+        # The template renders an Avatar header above the markdown
+        # content; no feedback buttons get injected here.
+        if content:
+            if form_template_id:
+                # The card content has already been written via
+                # update_card_data (in _paint_form_on_card and the
+                # initial card creation). The streaming endpoint
+                # (PUT /v1.0/card/streaming) does not propagate
+                # updates on cards whose content was last set via
+                # update_card_data — they take different code paths
+                # on the DingTalk client. Stick with update_card_data
+                # for the whole turn for consistency.
+                try:
+                    await self.bot.update_card_data(
+                        out_track_id=card_instance_id,
+                        card_param_map=self._card_params(
+                            content=content,
+                            btns='[]',
+                            flowStatus='3' if is_final else '1',
+                            **_dingtalk_empty_form_component_params(),
+                        ),
+                    )
+                    session_key = self._session_key_from_event(message_source)
+                    if session_key:
+                        self.active_turn_text[session_key] = content
+                except Exception:
+                    if self.ap is not None:
+                        self.ap.logger.exception('DingTalk: update card content failed')
+            else:
+                await self.bot.send_card_message(card_instance, card_instance_id, content, is_final)
+        if is_final:
+            if form_template_id and not content:
+                # Empty final chunk still needs to leave the card with
+                # flowStatus=3 so the spinner stops.
+                try:
+                    await self.bot.update_card_data(
+                        out_track_id=card_instance_id,
+                        card_param_map=self._card_params(
+                            flowStatus='3',
+                            **_dingtalk_empty_form_component_params(),
+                        ),
+                    )
+                except Exception:
+                    pass
+            if bot_message.tool_calls is None:
+                self.card_instance_id_dict.pop(message_id, None)
 
     async def send_message(self, target_type: str, target_id: str, message: platform_message.MessageChain):
         markdown_enabled = self.config.get('markdown_card', False)
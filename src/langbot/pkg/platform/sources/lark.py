@@ -153,11 +153,13 @@ def _lark_should_update_stream_element(
     *,
     resume_from: bool,
     form_data: dict | None,
-    msg_seq: int,
-    is_final: bool,
 ) -> bool:
-    """Return whether the still-open streaming element should be updated."""
-    return not resume_from and not form_data and (msg_seq % 8 == 0 or is_final)
+    """Return whether the still-open streaming element should be updated.
+
+    Update pacing is decided by the pipeline's stream coalescer, so every
+    chunk that reaches the adapter is rendered.
+    """
+    return not resume_from and not form_data
 
 
 def _lark_display_input_value(field: dict, value: typing.Any) -> str:
@@ -2269,8 +2271,6 @@ class LarkAdapter(abstract_platform_adapter.AbstractMessagePlatformAdapter):
         if _lark_should_update_stream_element(
             resume_from=resume_from,
             form_data=form_data,
-            msg_seq=msg_seq,
-            is_final=is_final,
         ):
             cached = self.card_streaming_text.get(card_id)
             if text_message != cached:
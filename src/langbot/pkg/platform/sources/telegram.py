@@ -614,7 +614,6 @@ class TelegramAdapter(abstract_platform_adapter.AbstractMessagePlatformAdapter):
         is_final: bool = False,
     ):
         message_id = bot_message.resp_message_id
-        msg_seq = bot_message.msg_sequence
         assert isinstance(message_source.source_platform_object, Update)
         update = message_source.source_platform_object
         chat_id = update.effective_chat.id
@@ -652,21 +651,21 @@ class TelegramAdapter(abstract_platform_adapter.AbstractMessagePlatformAdapter):
             return
 
         if chat_mode == 'private':
-            # Streaming via draft (ephemeral preview in the chat input area)
-            if (msg_seq - 1) % 8 == 0 or is_final:
-                args = self._build_message_args(chat_id, content, message_thread_id, draft_id=stream_id)
-                try:
-                    await self.bot.send_message_draft(**args)
-                except telegram.error.BadRequest as exc:
-                    if 'Message_too_long' in str(exc):
-                        args['text'] = content[:4000] + '\n\n… (truncated)'
-                        try:
-                            await self.bot.send_message_draft(**args)
-                        except telegram.error.RetryAfter:
-                            pass
-                    else:
-                        pass  # Ignore other draft errors (cosmetic)
-                self.msg_stream_id[message_id] = (chat_mode, stream_id, True)
+            # Streaming via draft (ephemeral preview in the chat input area).
+            # Chunks arrive already paced by the pipeline's stream coalescer.
+            args = self._build_message_args(chat_id, content, message_thread_id, draft_id=stream_id)
+            try:
+                await self.bot.send_message_draft(**args)
+            except telegram.error.BadRequest as exc:
+                if 'Message_too_long' in str(exc):
+                    args['text'] = content[:4000] + '\n\n… (truncated)'
+                    try:
+                        await self.bot.send_message_draft(**args)
+                    except telegram.error.RetryAfter:
+                        pass
+                else:
+                    pass  # Ignore other draft errors (cosmetic)
+            self.msg_stream_id[message_id] = (chat_mode, stream_id, True)
             if is_final and bot_message.tool_calls is None:
                 # Finalise: send the real message, discard the draft
                 args = self._build_message_args(chat_id, content, message_thread_id)
@@ -696,23 +695,22 @@ class TelegramAdapter(abstract_platform_adapter.AbstractMessagePlatformAdapter):
                     self.msg_stream_id.pop(message_id, None)
                 return
 
-            if not has_visible_content or (msg_seq - 1) % 8 == 0 or is_final:
-                args = {
-                    'message_id': stream_id,
-                    'chat_id': chat_id,
-                    'text': self._process_markdown(content),
-                }
-                if self.config.get('markdown_card', False):
-                    args['parse_mode'] = 'MarkdownV2'
-                try:
+            args = {
+                'message_id': stream_id,
+                'chat_id': chat_id,
+                'text': self._process_markdown(content),
+            }
+            if self.config.get('markdown_card', False):
+                args['parse_mode'] = 'MarkdownV2'
+            try:
+                await self.bot.edit_message_text(**args)
+            except telegram.error.BadRequest as exc:
+                if 'Message_too_long' in str(exc):
+                    args['text'] = self._process_markdown(content[:4000] + '\n\n… (truncated)')
                     await self.bot.edit_message_text(**args)
-                except telegram.error.BadRequest as exc:
-                    if 'Message_too_long' in str(exc):
-                        args['text'] = self._process_markdown(content[:4000] + '\n\n… (truncated)')
-                        await self.bot.edit_message_text(**args)
-                    else:
-                        raise
-                self.msg_stream_id[message_id] = (chat_mode, stream_id, True)
+                else:
+                    raise
+            self.msg_stream_id[message_id] = (chat_mode, stream_id, True)
 
             if is_final and bot_message.tool_calls is None:
                 self.msg_stream_id.pop(message_id)
@@ -0,0 +1,563 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import dataclasses
+import datetime
+import functools
+import json
+import random
+import time
+import typing
+import uuid
+
+import sqlalchemy
+
+from ..entity.persistence import webhook as persistence_webhook
+
+if typing.TYPE_CHECKING:
+    from ..core import app
+    from .webhook_pusher import WebhookPusher
+
+
+_DEFAULT_BATCH_SIZE = 1
+_HARD_MAX_BATCH_SIZE = 100
+_DEFAULT_ENDPOINT_CONCURRENCY = 2
+_HARD_MAX_ENDPOINT_CONCURRENCY = 16
+_DEFAULT_MAX_ATTEMPTS = 8
+_HARD_MAX_ATTEMPTS = 50
+_DEFAULT_RETRY_BASE_SECONDS = 2.0
+_DEFAULT_RETRY_MAX_SECONDS = 600.0
+_HARD_MAX_RETRY_SECONDS = 86400.0
+_DEFAULT_CIRCUIT_FAILURE_THRESHOLD = 5
+_DEFAULT_CIRCUIT_COOLDOWN_SECONDS = 60.0
+_DEFAULT_POLL_INTERVAL_SECONDS = 1.0
+# A claimed event is offered to other workers again if its lease is not
+# renewed, e.g. because the replica holding it stopped. A worker renews the
+# lease every third of this while the delivery is in flight.
+_CLAIM_LEASE_SECONDS = 120
+_CAPACITY_RETRY_SECONDS = 1.0
+_MAX_ERROR_LENGTH = 512
+
+OutboxKey = tuple[str, int]
+"""(workspace_uuid, webhook_id)"""
+
+
+def _utcnow() -> datetime.datetime:
+    return datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+
+
+class WebhookDeliveryError(Exception):
+    """A webhook could not be reached or rejected the event."""
+
+
+@dataclasses.dataclass(slots=True)
+class _Circuit:
+    failures: int = 0
+    open_until: float = 0.0
+
+
+@dataclasses.dataclass(slots=True)
+class WebhookOutboxStats:
+    enqueued: int = 0
+    enqueue_errors: int = 0
+    delivered: int = 0
+    posts: int = 0
+    failed_posts: int = 0
+    dead_lettered: int = 0
+    circuit_opens: int = 0
+    lost_leases: int = 0
+
+
+class WebhookOutbox:
+    """Durable queue for webhook events that are not delivered inline.
+
+    Events are stored in the ``webhook_outbox`` table, one row per
+    destination webhook. Each webhook with due events is drained by its own
+    task, so a slow or unreachable endpoint only delays its own events. A
+    drain claims at most ``max_concurrency_per_endpoint`` × ``batch_size``
+    rows at a time, sends them as that many concurrent POSTs and renews the
+    claim while they are in flight. Rows are only deleted or rescheduled under
+    the claim token, so a worker whose lease expired cannot touch rows that
+    another worker claimed since.
+
+    Failed deliveries are retried with exponential backoff until
+    ``max_attempts``. After ``circuit_failure_threshold`` consecutive failures
+    a webhook is skipped for ``circuit_cooldown_seconds``. With ``batch_size``
+    above 1, several queued events for the same webhook are sent in one POST.
+    """
+
+    ap: app.Application
+
+    def __init__(self, ap: app.Application, pusher: WebhookPusher) -> None:
+        self.ap = ap
+        self.pusher = pusher
+        self._workspaces: set[str] = set()
+        self._wake = asyncio.Event()
+        self._circuits: dict[OutboxKey, _Circuit] = {}
+        self._drains: dict[OutboxKey, asyncio.Task[int]] = {}
+        self.stats = WebhookOutboxStats()
+
+    def _config(self) -> dict:
+        instance_config = getattr(self.ap, 'instance_config', None)
+        data = getattr(instance_config, 'data', {})
+        config = data.get('webhooks', {}).get('outbox', {}) if isinstance(data, dict) else {}
+        return config if isinstance(config, dict) else {}
+
+    def _positive_number(self, name: str, default: float, hard_max: float) -> float:
+        value = self._config().get(name, default)
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or value <= 0:
+            value = default
+        return min(value, hard_max)
+
+    @property
+    def persistent(self) -> bool:
+        return (
+            self._config().get('enabled', True) is not False and getattr(self.ap, 'persistence_mgr', None) is not None
+        )
+
+    @property
+    def batch_size(self) -> int:
+        return int(self._positive_number('batch_size', _DEFAULT_BATCH_SIZE, _HARD_MAX_BATCH_SIZE))
+
+    @property
+    def max_concurrency_per_endpoint(self) -> int:
+        return int(
+            self._positive_number(
+                'max_concurrency_per_endpoint',
+                _DEFAULT_ENDPOINT_CONCURRENCY,
+                _HARD_MAX_ENDPOINT_CONCURRENCY,
+            )
+        )
+
+    @property
+    def max_attempts(self) -> int:
+        return int(self._positive_number('max_attempts', _DEFAULT_MAX_ATTEMPTS, _HARD_MAX_ATTEMPTS))
+
+    def retry_delay(self, attempts: int) -> float:
+        """Backoff before the next attempt of an event that has failed ``attempts`` times."""
+
+        base = self._positive_number('retry_base_seconds', _DEFAULT_RETRY_BASE_SECONDS, _HARD_MAX_RETRY_SECONDS)
+        ceiling = self._positive_number('retry_max_seconds', _DEFAULT_RETRY_MAX_SECONDS, _HARD_MAX_RETRY_SECONDS)
+        delay = min(base * 2 ** max(attempts - 1, 0), ceiling)
+        return delay * random.uniform(0.8, 1.2)
+
+    async def _execute(self, workspace_uuid: str, statement) -> sqlalchemy.Result:
+        tenant_uow = getattr(self.ap.persistence_mgr, 'tenant_uow', None)
+        if callable(tenant_uow):
+            async with tenant_uow(workspace_uuid):
+                return await self.ap.persistence_mgr.execute_async(statement)
+        return await self.ap.persistence_mgr.execute_async(statement)
+
+    async def enqueue(
+        self,
+        workspace_uuid: str,
+        webhook_ids: list[int],
+        payload: dict,
+        *,
+        attempts: int = 0,
+        error: str | None = None,
+    ) -> int:
+        """Store one event for each webhook and wake the delivery worker."""
+
+        if not webhook_ids:
+            return 0
+        now = _utcnow()
+        next_attempt_at = now + datetime.timedelta(seconds=self.retry_delay(attempts)) if attempts else now
+        body = json.dumps(payload, ensure_ascii=False, separators=(',', ':'))
+        rows = [
+            {
+                'workspace_uuid': workspace_uuid,
+                'webhook_id': webhook_id,
+                'payload': body,
+                'attempts': attempts,
+                'next_attempt_at': next_attempt_at,
+                'last_error': error[:_MAX_ERROR_LENGTH] if error else None,
+                'created_at': now,
+            }
+            for webhook_id in webhook_ids
+        ]
+        try:
+            await self._execute(
+                workspace_uuid,
+                sqlalchemy.insert(persistence_webhook.WebhookOutboxEvent).values(rows),
+            )
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            self.stats.enqueue_errors += len(rows)
+            self.ap.logger.error(f'Failed to queue {len(rows)} webhook events for Workspace {workspace_uuid}: {exc}')
+            return 0
+        self.stats.enqueued += len(rows)
+        self._workspaces.add(workspace_uuid)
+        self._wake.set()
+        return len(rows)
+
+    def _circuit_open(self, key: OutboxKey, now: float) -> bool:
+        circuit = self._circuits.get(key)
+        return circuit is not None and circuit.open_until > now
+
+    def _record_result(self, key: OutboxKey, success: bool) -> None:
+        if success:
+            self._circuits.pop(key, None)
+            return
+        circuit = self._circuits.setdefault(key, _Circuit())
+        circuit.failures += 1
+        threshold = int(
+            self._positive_number('circuit_failure_threshold', _DEFAULT_CIRCUIT_FAILURE_THRESHOLD, _HARD_MAX_ATTEMPTS)
+        )
+        if circuit.failures >= threshold:
+            cooldown = self._positive_number(
+                'circuit_cooldown_seconds',
+                _DEFAULT_CIRCUIT_COOLDOWN_SECONDS,
+                _HARD_MAX_RETRY_SECONDS,
+            )
+            circuit.open_until = time.monotonic() + cooldown
+            # After the cooldown a single further failure reopens the circuit.
+            circuit.failures = threshold - 1
+            self.stats.circuit_opens += 1
+            self.ap.logger.warning(
+                f'Webhook {key[1]} of Workspace {key[0]} failed {threshold} times in a row; '
+                f'pausing deliveries for {cooldown:g}s'
+            )
+
+    def _paused_webhooks(self, workspace_uuid: str) -> list[int]:
+        monotonic_now = time.monotonic()
+        return [
+            webhook_id
+            for (circuit_workspace, webhook_id), circuit in self._circuits.items()
+            if circuit_workspace == workspace_uuid and circuit.open_until > monotonic_now
+        ]
+
+    async def _due_webhooks(self, workspace_uuid: str) -> list[int]:
+        Event = persistence_webhook.WebhookOutboxEvent
+        due = (
+            sqlalchemy.select(Event.webhook_id)
+            .where(Event.workspace_uuid == workspace_uuid, Event.next_attempt_at <= _utcnow())
+            .distinct()
+        )
+        paused = self._paused_webhooks(workspace_uuid)
+        if paused:
+            due = due.where(Event.webhook_id.notin_(paused))
+        result = await self._execute(workspace_uuid, due)
+        return [row.webhook_id for row in result.all()]
+
+    async def _claim(self, workspace_uuid: str, webhook_id: int, limit: int) -> tuple[str, list]:
+        Event = persistence_webhook.WebhookOutboxEvent
+        now = _utcnow()
+        due = (
+            sqlalchemy.select(Event.id)
+            .where(
+                Event.workspace_uuid == workspace_uuid,
+                Event.webhook_id == webhook_id,
+                Event.next_attempt_at <= now,
+            )
+            .order_by(Event.next_attempt_at, Event.id)
+            .limit(limit)
+        )
+
+        token = str(uuid.uuid4())
+        await self._execute(
+            workspace_uuid,
+            sqlalchemy.update(Event)
+            .where(Event.workspace_uuid == workspace_uuid, Event.id.in_(due.scalar_subquery()))
+            .values(claim_token=token, next_attempt_at=now + datetime.timedelta(seconds=_CLAIM_LEASE_SECONDS))
+            .execution_options(synchronize_session=False),
+        )
+        result = await self._execute(
+            workspace_uuid,
+            sqlalchemy.select(Event.id, Event.webhook_id, Event.payload, Event.attempts)
+            .where(Event.workspace_uuid == workspace_uuid, Event.claim_token == token)
+            .order_by(Event.id),
+        )
+        return token, result.all()
+
+    async def _renew_lease(self, workspace_uuid: str, token: str) -> None:
+        """Keep the rows of ``token`` claimed until their deliveries finish."""
+
+        Event = persistence_webhook.WebhookOutboxEvent
+        while True:
+            await asyncio.sleep(_CLAIM_LEASE_SECONDS / 3)
+            try:
+                await self._execute(
+                    workspace_uuid,
+                    sqlalchemy.update(Event)
+                    .where(Event.workspace_uuid == workspace_uuid, Event.claim_token == token)
+                    .values(next_attempt_at=_utcnow() + datetime.timedelta(seconds=_CLAIM_LEASE_SECONDS)),
+                )
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                self.ap.logger.warning(f'Failed to renew webhook outbox lease for Workspace {workspace_uuid}: {exc}')
+
+    async def _has_events(self, workspace_uuid: str) -> bool:
+        Event = persistence_webhook.WebhookOutboxEvent
+        result = await self._execute(
+            workspace_uuid,
+            sqlalchemy.select(Event.id).where(Event.workspace_uuid == workspace_uuid).limit(1),
+        )
+        return result.first() is not None
+
+    def _check_lease(self, workspace_uuid: str, event_ids: list[int], result: sqlalchemy.Result) -> None:
+        if getattr(result, 'rowcount', None) == 0:
+            # The lease expired and another worker claimed the rows; they are its responsibility now.
+            self.stats.lost_leases += 1
+            self.ap.logger.warning(
+                f'Lost the webhook outbox lease on {len(event_ids)} events of Workspace {workspace_uuid}'
+            )
+
+    async def _delete(self, workspace_uuid: str, token: str, event_ids: list[int]) -> None:
+        Event = persistence_webhook.WebhookOutboxEvent
+        result = await self._execute(
+            workspace_uuid,
+            sqlalchemy.delete(Event).where(
+                Event.workspace_uuid == workspace_uuid,
+                Event.id.in_(event_ids),
+                Event.claim_token == token,
+            ),
+        )
+        self._check_lease(workspace_uuid, event_ids, result)
+
+    async def _reschedule(
+        self,
+        workspace_uuid: str,
+        token: str,
+        event_ids: list[int],
+        next_attempt_at: datetime.datetime,
+        *,
+        attempts: int | None = None,
+        error: str | None = None,
+    ) -> None:
+        Event = persistence_webhook.WebhookOutboxEvent
+        values: dict[str, typing.Any] = {'claim_token': None, 'next_attempt_at': next_attempt_at}
+        if attempts is not None:
+            values['attempts'] = attempts
+            values['last_error'] = error[:_MAX_ERROR_LENGTH] if error else None
+        result = await self._execute(
+            workspace_uuid,
+            sqlalchemy.update(Event)
+            .where(
+                Event.workspace_uuid == workspace_uuid,
+                Event.id.in_(event_ids),
+                Event.claim_token == token,
+            )
+            .values(values),
+        )
+        self._check_lease(workspace_uuid, event_ids, result)
+
+    async def _enable_skip_pipeline(self, workspace_uuid: str, webhook_id: int) -> None:
+        """Call a webhook that answers with skip_pipeline inline from the next event on."""
+
+        Webhook = persistence_webhook.Webhook
+        await self._execute(
+            workspace_uuid,
+            sqlalchemy.update(Webhook)
+            .where(Webhook.workspace_uuid == workspace_uuid, Webhook.id == webhook_id)
+            .values(can_skip_pipeline=True),
+        )
+        self.ap.logger.info(
+            f'Webhook {webhook_id} of Workspace {workspace_uuid} answered with skip_pipeline=true; '
+            'later events wait for its response before the pipeline runs'
+        )
+
+    def _batch_payload(self, rows: list) -> dict:
+        events = [json.loads(row.payload) for row in rows]
+        if len(events) == 1:
+            return events[0]
+        return {'uuid': str(uuid.uuid4()), 'event_type': 'batch', 'data': {'events': events}}
+
+    async def _deliver_batch(self, workspace_uuid: str, webhook_id: int, url: str, token: str, rows: list) -> int:
+        key = (workspace_uuid, webhook_id)
+        event_ids = [row.id for row in rows]
+        if self._circuit_open(key, time.monotonic()):
+            remaining = self._circuits[key].open_until - time.monotonic()
+            await self._reschedule(
+                workspace_uuid, token, event_ids, _utcnow() + datetime.timedelta(seconds=max(remaining, 0.0))
+            )
+            return 0
+        if await self.pusher._reserve_delivery_slots(1) == 0:
+            await self._reschedule(
+                workspace_uuid, token, event_ids, _utcnow() + datetime.timedelta(seconds=_CAPACITY_RETRY_SECONDS)
+            )
+            return 0
+        self.stats.posts += 1
+        try:
+            response = await self.pusher._push_to_webhook(url, self._batch_payload(rows))
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            error = str(exc) or exc.__class__.__name__
+        else:
+            error = None
+        finally:
+            await self.pusher._release_delivery_slots(1)
+
+        self._record_result(key, error is None)
+        if error is None:
+            await self._delete(workspace_uuid, token, event_ids)
+            self.stats.delivered += len(rows)
+            if response.get('skip_pipeline') is True:
+                await self._enable_skip_pipeline(workspace_uuid, webhook_id)
+            return len(rows)
+
+        self.stats.failed_posts += 1
+        rows_by_attempts: dict[int, list[int]] = {}
+        for row in rows:
+            rows_by_attempts.setdefault(row.attempts + 1, []).append(row.id)
+        for attempts, ids in rows_by_attempts.items():
+            if attempts >= self.max_attempts:
+                await self._delete(workspace_uuid, token, ids)
+                self.stats.dead_lettered += len(ids)
+                self.ap.logger.warning(
+                    f'Dropped {len(ids)} events for webhook {webhook_id} of Workspace {workspace_uuid} '
+                    f'after {attempts} failed attempts: {error}'
+                )
+            else:
+                await self._reschedule(
+                    workspace_uuid,
+                    token,
+                    ids,
+                    _utcnow() + datetime.timedelta(seconds=self.retry_delay(attempts)),
+                    attempts=attempts,
+                    error=error,
+                )
+        return 0
+
+    async def _webhook_url(self, workspace_uuid: str, webhook_id: int) -> str | None:
+        Webhook = persistence_webhook.Webhook
+        result = await self._execute(
+            workspace_uuid,
+            sqlalchemy.select(Webhook.url).where(
+                Webhook.workspace_uuid == workspace_uuid,
+                Webhook.id == webhook_id,
+                Webhook.enabled == True,  # noqa: E712
+            ),
+        )
+        return result.scalar_one_or_none()
+
+    async def _drain(self, workspace_uuid: str, webhook_id: int) -> int:
+        """Deliver the due events of one webhook until none are left or its circuit opens."""
+
+        key = (workspace_uuid, webhook_id)
+        delivered = 0
+        while not self._circuit_open(key, time.monotonic()):
+            batch_size = self.batch_size
+            token, rows = await self._claim(workspace_uuid, webhook_id, self.max_concurrency_per_endpoint * batch_size)
+            if not rows:
+                break
+            url = await self._webhook_url(workspace_uuid, webhook_id)
+            if url is None:
+                # The webhook was deleted or disabled after the event was queued.
+                await self._delete(workspace_uuid, token, [row.id for row in rows])
+                continue
+
+            lease = asyncio.create_task(self._renew_lease(workspace_uuid, token))
+            try:
+                results = await asyncio.gather(
+                    *(
+                        self._deliver_batch(workspace_uuid, webhook_id, url, token, rows[index : index + batch_size])
+                        for index in range(0, len(rows), batch_size)
+                    ),
+                    return_exceptions=True,
+                )
+            finally:
+                lease.cancel()
+                await asyncio.wait({lease})
+            for result in results:
+                if isinstance(result, asyncio.CancelledError):
+                    raise result
+                if isinstance(result, Exception):
+                    self.ap.logger.warning(
+                        f'Webhook outbox delivery failed for webhook {webhook_id} of Workspace {workspace_uuid}: '
+                        f'{result}'
+                    )
+            delivered += sum(result for result in results if isinstance(result, int))
+        return delivered
+
+    def _drain_done(self, key: OutboxKey, task: asyncio.Task[int]) -> None:
+        if self._drains.get(key) is task:
+            del self._drains[key]
+        if not task.cancelled() and task.exception() is not None:
+            self.ap.logger.warning(
+                f'Webhook outbox delivery failed for webhook {key[1]} of Workspace {key[0]}: {task.exception()}'
+            )
+
+    async def _start_drains(self) -> list[asyncio.Task[int]]:
+        """Start a drain for every webhook with due events that has none running, and return all running drains."""
+
+        for workspace_uuid in list(self._workspaces):
+            try:
+                webhook_ids = await self._due_webhooks(workspace_uuid)
+                if not webhook_ids and not any(key[0] == workspace_uuid for key in self._drains):
+                    if not await self._has_events(workspace_uuid):
+                        self._workspaces.discard(workspace_uuid)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                self.ap.logger.warning(f'Webhook outbox delivery failed for Workspace {workspace_uuid}: {exc}')
+                continue
+            for webhook_id in webhook_ids:
+                key = (workspace_uuid, webhook_id)
+                if key in self._drains:
+                    continue
+                task = asyncio.create_task(self._drain(workspace_uuid, webhook_id))
+                task.add_done_callback(functools.partial(self._drain_done, key))
+                self._drains[key] = task
+        return list(self._drains.values())
+
+    async def deliver_due(self) -> int:
+        """Deliver every due event and return the number of events delivered."""
+
+        drains = await self._start_drains()
+        results = await asyncio.gather(*drains, return_exceptions=True)
+        return sum(result for result in results if isinstance(result, int))
+
+    async def _discover_workspaces(self) -> None:
+        """Pick up events queued before a restart."""
+
+        try:
+            bindings = await self.ap.workspace_service.list_active_execution_bindings()
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            self.ap.logger.warning(f'Webhook outbox Workspace discovery failed: {exc}')
+            return
+        self._workspaces.update(binding.workspace_uuid for binding in bindings)
+
+    async def run(self) -> None:
+        """Deliver queued events as they arrive and retries as they become due."""
+
+        await self._discover_workspaces()
+        try:
+            while True:
+                with contextlib.suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(
+                        self._wake.wait(),
+                        self._positive_number('poll_interval_seconds', _DEFAULT_POLL_INTERVAL_SECONDS, 60.0),
+                    )
+                self._wake.clear()
+                # Drains run on their own; the loop only starts them.
+                await self._start_drains()
+        finally:
+            drains = list(self._drains.values())
+            for task in drains:
+                task.cancel()
+            if drains:
+                await asyncio.wait(drains)
+
+    def snapshot(self) -> dict[str, object]:
+        monotonic_now = time.monotonic()
+        return {
+            'persistent': self.persistent,
+            'workspaces_with_events': len(self._workspaces),
+            'enqueued': self.stats.enqueued,
+            'enqueue_errors': self.stats.enqueue_errors,
+            'delivered': self.stats.delivered,
+            'posts': self.stats.posts,
+            'failed_posts': self.stats.failed_posts,
+            'dead_lettered': self.stats.dead_lettered,
+            'circuit_opens': self.stats.circuit_opens,
+            'lost_leases': self.stats.lost_leases,
+            'active_drains': len(self._drains),
+            'open_circuits': sum(1 for circuit in self._circuits.values() if circuit.open_until > monotonic_now),
+        }
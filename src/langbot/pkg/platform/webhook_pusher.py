@@ -6,6 +6,7 @@ import aiohttp
 
 from langbot.pkg.utils import httpclient
 from langbot.pkg.api.http.context import ExecutionContext
+from .webhook_outbox import WebhookDeliveryError, WebhookOutbox
 import uuid
 from typing import TYPE_CHECKING
 
@@ -30,6 +31,7 @@ class WebhookPusher:
         self.logger = self.ap.logger
         self._delivery_lock = asyncio.Lock()
         self._inflight_requests = 0
+        self.outbox = WebhookOutbox(ap, self)
 
     def _max_inflight_requests(self) -> int:
         config = getattr(getattr(self.ap, 'instance_config', None), 'data', {})
@@ -61,7 +63,7 @@ class WebhookPusher:
         admitted = await self._reserve_delivery_slots(len(webhooks))
         if admitted < len(webhooks):
             self.logger.warning(
-                'Webhook delivery capacity reached; skipped %d of %d destinations',
+                'Webhook delivery capacity reached; %d of %d destinations not delivered inline',
                 len(webhooks) - admitted,
                 len(webhooks),
             )
@@ -79,6 +81,47 @@ class WebhookPusher:
         finally:
             await self._release_delivery_slots(admitted)
 
+    async def _push_event(self, execution_context: ExecutionContext, payload: dict) -> bool:
+        """Deliver an event to every enabled webhook of the Workspace.
+
+        Webhooks that may skip the pipeline are called inline and their
+        responses are awaited. The others, and inline deliveries that fail or
+        exceed the instance admission limit, are handed to the outbox.
+
+        Returns:
+            bool: True if any webhook responded with skip_pipeline=true, False otherwise
+        """
+        webhooks = await self.ap.webhook_service.get_enabled_webhooks(execution_context)
+        if not webhooks:
+            return False
+
+        outbox = self.outbox if self.outbox.persistent else None
+        inline = [webhook for webhook in webhooks if outbox is None or webhook.get('can_skip_pipeline', False)]
+        if outbox is not None:
+            queued = [webhook['id'] for webhook in webhooks if not webhook.get('can_skip_pipeline', False)]
+            await outbox.enqueue(execution_context.workspace_uuid, queued, payload)
+
+        results = await self._push_to_webhooks(inline, payload)
+
+        skip_pipeline = False
+        failures: dict[str, list[int]] = {}
+        for webhook, result in zip(inline, results):
+            if isinstance(result, BaseException):
+                self.logger.warning(f'Webhook delivery failed: {result}')
+                failures.setdefault(str(result) or result.__class__.__name__, []).append(webhook['id'])
+            elif isinstance(result, dict) and result.get('skip_pipeline') is True:
+                skip_pipeline = True
+        if outbox is not None:
+            for error, webhook_ids in failures.items():
+                await outbox.enqueue(execution_context.workspace_uuid, webhook_ids, payload, attempts=1, error=error)
+            # Destinations over the admission limit are delivered by the outbox worker.
+            await outbox.enqueue(
+                execution_context.workspace_uuid,
+                [webhook['id'] for webhook in inline[len(results) :]],
+                payload,
+            )
+        return skip_pipeline
+
     async def push_person_message(
         self,
         execution_context: ExecutionContext,
@@ -92,10 +135,6 @@ class WebhookPusher:
             bool: True if any webhook responded with skip_pipeline=true, False otherwise
         """
         try:
-            webhooks = await self.ap.webhook_service.get_enabled_webhooks(execution_context)
-            if not webhooks:
-                return False
-
             # Build payload
             payload = {
                 'uuid': str(uuid.uuid4()),  # unique id for the event
@@ -112,13 +151,9 @@ class WebhookPusher:
                 },
             }
 
-            results = await self._push_to_webhooks(webhooks, payload)
-
-            # Check if any webhook responded with skip_pipeline=true
-            for result in results:
-                if isinstance(result, dict) and result.get('skip_pipeline') is True:
-                    self.logger.info('Webhook responded with skip_pipeline=true, skipping pipeline for person message')
-                    return True
+            if await self._push_event(execution_context, payload):
+                self.logger.info('Webhook responded with skip_pipeline=true, skipping pipeline for person message')
+                return True
 
             return False
 
@@ -139,10 +174,6 @@ class WebhookPusher:
             bool: True if any webhook responded with skip_pipeline=true, False otherwise
         """
         try:
-            webhooks = await self.ap.webhook_service.get_enabled_webhooks(execution_context)
-            if not webhooks:
-                return False
-
             # Build payload
             payload = {
                 'uuid': str(uuid.uuid4()),  # unique id for the event
@@ -163,13 +194,9 @@ class WebhookPusher:
                 },
             }
 
-            results = await self._push_to_webhooks(webhooks, payload)
-
-            # Check if any webhook responded with skip_pipeline=true
-            for result in results:
-                if isinstance(result, dict) and result.get('skip_pipeline') is True:
-                    self.logger.info('Webhook responded with skip_pipeline=true, skipping pipeline for group message')
-                    return True
+            if await self._push_event(execution_context, payload):
+                self.logger.info('Webhook responded with skip_pipeline=true, skipping pipeline for group message')
+                return True
 
             return False
 
@@ -177,11 +204,14 @@ class WebhookPusher:
             self.logger.error(f'Failed to push group message to webhooks: {e}')
             return False
 
-    async def _push_to_webhook(self, url: str, payload: dict) -> dict | None:
+    async def _push_to_webhook(self, url: str, payload: dict) -> dict:
         """Push payload to a single webhook URL
 
         Returns:
-            dict | None: The response JSON if successful, None otherwise
+            dict: The response JSON, or an empty dict if the response has no JSON object
+
+        Raises:
+            WebhookDeliveryError: The webhook could not be reached or returned an error status
         """
         try:
             session = httpclient.get_session()
@@ -192,19 +222,17 @@ class WebhookPusher:
                 timeout=aiohttp.ClientTimeout(total=15),
             ) as response:
                 if response.status >= 400:
-                    self.logger.warning(f'Webhook {url} returned status {response.status}')
-                    return None
-                else:
-                    self.logger.debug(f'Successfully pushed to webhook {url}')
-                    try:
-                        result = await httpclient.read_json_limited(response)
-                        return result if isinstance(result, dict) else None
-                    except Exception as json_error:
-                        self.logger.debug(f'Failed to parse JSON response from webhook {url}: {json_error}')
-                        return None
-        except asyncio.TimeoutError:
-            self.logger.warning(f'Timeout pushing to webhook {url}')
-            return None
+                    raise WebhookDeliveryError(f'Webhook {url} returned status {response.status}')
+                self.logger.debug(f'Successfully pushed to webhook {url}')
+                try:
+                    result = await httpclient.read_json_limited(response)
+                    return result if isinstance(result, dict) else {}
+                except Exception as json_error:
+                    self.logger.debug(f'Failed to parse JSON response from webhook {url}: {json_error}')
+                    return {}
+        except WebhookDeliveryError:
+            raise
+        except asyncio.TimeoutError as e:
+            raise WebhookDeliveryError(f'Timeout pushing to webhook {url}') from e
         except Exception as e:
-            self.logger.warning(f'Error pushing to webhook {url}: {e}')
-            return None
+            raise WebhookDeliveryError(f'Error pushing to webhook {url}: {e}') from e
@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 import asyncio
+import collections
 import contextlib
 import contextvars
 import hashlib
@@ -20,7 +21,7 @@ from urllib.parse import urljoin, urlparse
 from langbot_plugin.api.entities.builtin.pipeline.query import provider_session
 
 from ..core import app
-from . import handler
+from . import handler, transfer
 from .archive import inspect_plugin_archive_metadata
 from .github import (
     validate_github_plugin_install_info,
@@ -78,6 +79,13 @@ _GITHUB_ASSET_HOSTS = frozenset(
 )
 _HTTP_REDIRECT_STATUSES = frozenset({301, 302, 303, 307, 308})
 _DEFAULT_CONNECT_TIMEOUT_SECONDS = 180.0
+# Tool manifests listed from the Runtime are reused until a plugin of the
+# Workspace changes, the Runtime reconnects, or this many seconds pass.
+_DEFAULT_TOOL_CATALOG_TTL_SECONDS = 60.0
+_MAX_TOOL_CATALOGS = 1024
+# Event listener indexes follow the tool catalog revision of their Workspace.
+_MAX_EVENT_LISTENER_INDEXES = 1024
+_EVENT_LISTENER_KIND = 'EventListener'
 _HEARTBEAT_INTERVAL_SEC = 20.0
 _HEARTBEAT_FAILURE_THRESHOLD = 3
 _RECONNECT_MAX_DELAY_SEC = 60.0
@@ -200,6 +208,17 @@ class PluginRuntimeConnector(ManagedRuntimeConnector):
         self._reconnect_task: asyncio.Task | None = None
         self._generation = 0
         self._connected = asyncio.Event()
+        self._tool_catalog_revisions: dict[str, int] = {}
+        # Outlives individual Runtime connections so counters survive reconnects.
+        self.payload_transfer_stats = transfer.PayloadTransferStats()
+        self._tool_catalogs: collections.OrderedDict[
+            tuple[str, int, tuple[str, ...] | None],
+            tuple[tuple, list[ComponentManifest], dict[str, ComponentManifest]],
+        ] = collections.OrderedDict()
+        self._event_listener_indexes: collections.OrderedDict[
+            tuple[str, int],
+            tuple[tuple, dict[str, frozenset[str] | None]],
+        ] = collections.OrderedDict()
 
     @staticmethod
     def _build_runtime_id() -> str:
@@ -394,7 +413,7 @@ class PluginRuntimeConnector(ManagedRuntimeConnector):
 
         tenant_uow = getattr(self.ap.persistence_mgr, 'tenant_uow', None)
         if callable(tenant_uow):
-            async with tenant_uow(execution_context.workspace_uuid) as uow:
+            async with tenant_uow(execution_context.workspace_uuid, read_only=True) as uow:
                 return await load(uow.execute)
         return await load(self.ap.persistence_mgr.execute_async)
 
@@ -447,7 +466,7 @@ class PluginRuntimeConnector(ManagedRuntimeConnector):
         )
         tenant_uow = getattr(self.ap.persistence_mgr, 'tenant_uow', None)
         if callable(tenant_uow):
-            async with tenant_uow(execution_context.workspace_uuid) as uow:
+            async with tenant_uow(execution_context.workspace_uuid, read_only=True) as uow:
                 result = await uow.execute(statement)
                 return [persistence_plugin.PluginSetting(**dict(row)) for row in result.mappings().all()]
         result = await self.ap.persistence_mgr.execute_async(statement)
@@ -785,6 +804,35 @@ class PluginRuntimeConnector(ManagedRuntimeConnector):
             entitlement_revision=getattr(context, 'entitlement_revision', 0),
         )
 
+    def _tool_catalog_ttl(self) -> float:
+        value = self.ap.instance_config.data.get('plugin', {}).get(
+            'tool_catalog_ttl_seconds', _DEFAULT_TOOL_CATALOG_TTL_SECONDS
+        )
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value) or value < 0:
+            return _DEFAULT_TOOL_CATALOG_TTL_SECONDS
+        return float(value)
+
+    def tool_catalog_revision(self, workspace_uuid: str) -> tuple[int, bool, int, int]:
+        """Return a marker that changes whenever the tools or event listeners of a Workspace's plugins may have changed.
+
+        Plugin installs, upgrades, deletions and configuration changes bump
+        it, and so does a Runtime reconnect. It also rolls over every
+        ``plugin.tool_catalog_ttl_seconds`` to pick up changes the Runtime
+        does not report; a TTL of 0 disables tool catalog caching.
+        """
+
+        ttl = self._tool_catalog_ttl()
+        ttl_window = int(time.monotonic() // ttl) if ttl > 0 else time.monotonic_ns()
+        return (
+            self._generation,
+            self._connected.is_set(),
+            self._tool_catalog_revisions.get(workspace_uuid, 0),
+            ttl_window,
+        )
+
+    def _invalidate_tool_catalog(self, workspace_uuid: str) -> None:
+        self._tool_catalog_revisions[workspace_uuid] = self._tool_catalog_revisions.get(workspace_uuid, 0) + 1
+
     async def _synchronize_workspace(self, execution_context: ExecutionContext) -> None:
         if not self.is_enable_plugin or not hasattr(self, 'handler'):
             return
@@ -796,6 +844,7 @@ class PluginRuntimeConnector(ManagedRuntimeConnector):
             for installation_uuid in previous_ids - set(desired_by_uuid):
                 previous = self._known_desired_states.get(installation_uuid)
                 if previous is not None:
+                    self._invalidate_tool_catalog(execution_context.workspace_uuid)
                     await runtime_handler.remove_plugin_installation(previous.binding)
                     runtime_handler.unregister_installation_binding(previous.binding)
                     self._known_desired_states.pop(installation_uuid, None)
@@ -804,6 +853,7 @@ class PluginRuntimeConnector(ManagedRuntimeConnector):
             for installation_uuid, desired in desired_by_uuid.items():
                 if self._known_desired_states.get(installation_uuid) == desired:
                     continue
+                self._invalidate_tool_catalog(execution_context.workspace_uuid)
                 try:
                     await self._apply_desired_state(desired)
                 except PluginInstallationFailedError:
@@ -905,6 +955,7 @@ class PluginRuntimeConnector(ManagedRuntimeConnector):
                     disconnect_callback,
                     self.ap,
                 )
+                runtime_handler.transfer_stats = self.payload_transfer_stats
                 self.handler = runtime_handler
                 self.handler_task = asyncio.create_task(runtime_handler.run())
                 try:
@@ -1766,7 +1817,9 @@ class PluginRuntimeConnector(ManagedRuntimeConnector):
                         pass
             except Exception as exc:
                 self.ap.logger.debug(f'Legacy OSS plugin cleanup skipped: {exc}')
+        self._invalidate_tool_catalog(binding.workspace_uuid)
         await self._wait_for_installed_plugin_ready(plugin_author, plugin_name, task_context)
+        self._invalidate_tool_catalog(binding.workspace_uuid)
 
     async def upgrade_plugin(
         self,
@@ -1841,6 +1894,7 @@ class PluginRuntimeConnector(ManagedRuntimeConnector):
             workspace_installations.discard(binding.installation_uuid)
             if not workspace_installations:
                 self._workspace_installations.pop(binding.workspace_uuid, None)
+        self._invalidate_tool_catalog(binding.workspace_uuid)
         if task_context is not None:
             task_context.set_current_action('plugin removed')
         return {}
@@ -1967,6 +2021,7 @@ class PluginRuntimeConnector(ManagedRuntimeConnector):
         else:
             await self._apply_desired_state(desired)
         self._known_desired_states[binding.installation_uuid] = desired
+        self._invalidate_tool_catalog(binding.workspace_uuid)
         return {}
 
     async def get_plugin_icon(self, plugin_author: str, plugin_name: str) -> dict[str, Any]:
@@ -2036,23 +2091,77 @@ class PluginRuntimeConnector(ManagedRuntimeConnector):
             event_ctx._response_sources = []
             return event_ctx
 
+        listener_index = await self._event_listener_index()
+        bindings = []
+        for binding in await self._operation_bindings(include_plugins=bound_plugins):
+            listeners = listener_index.get(binding.installation_uuid)
+            if listeners is None or (listeners if bound_plugins is None else not listeners.isdisjoint(bound_plugins)):
+                bindings.append(binding)
+        if not bindings:
+            event_ctx._emitted_plugins = []
+            event_ctx._response_sources = []
+            return event_ctx
+
         runtime_handler = self._runtime_handler()
         emitted_plugins: list[Any] = []
         response_sources: list[dict[str, Any]] = []
-        for binding in await self._operation_bindings(include_plugins=bound_plugins):
+        sent_event_context = event_ctx.model_dump(serialize_as_any=False)
+        event_context_data = sent_event_context
+        for binding in bindings:
             with runtime_handler.installation_scope(binding):
-                result = await runtime_handler.emit_event(
-                    event_ctx.model_dump(serialize_as_any=False),
-                    include_plugins=bound_plugins,
-                )
-            event_ctx = context.EventContext.model_validate(result['event_context'])
+                result = await runtime_handler.emit_event(event_context_data, include_plugins=bound_plugins)
+            # The Runtime validates the context it receives, so the reply is
+            # passed on as-is and only parsed once all bindings have run.
+            event_context_data = result['event_context']
             emitted_plugins.extend(result.get('emitted_plugins', []))
             response_sources.extend(result.get('response_sources', []))
+        if event_context_data != sent_event_context:
+            event_ctx = context.EventContext.model_validate(event_context_data)
         event_ctx._emitted_plugins = emitted_plugins
         event_ctx._response_sources = response_sources
 
         return event_ctx
 
+    async def _event_listener_index(self) -> dict[str, frozenset[str] | None]:
+        """Map each installation of the current Workspace to its plugins that register an event listener.
+
+        Installations whose plugins could not be listed map to ``None`` and
+        keep receiving every event.
+        """
+        execution_context = await self._current_execution_context()
+        revision = self.tool_catalog_revision(execution_context.workspace_uuid)
+        cache_key = (execution_context.workspace_uuid, execution_context.placement_generation)
+        cached = self._event_listener_indexes.get(cache_key)
+        if cached is not None and cached[0] == revision:
+            self._event_listener_indexes.move_to_end(cache_key)
+            return cached[1]
+
+        runtime_handler = self._runtime_handler()
+        index: dict[str, frozenset[str] | None] = {}
+        for binding in await self._operation_bindings():
+            try:
+                with runtime_handler.installation_scope(binding):
+                    scoped_plugins = await runtime_handler.list_plugins()
+            except Exception as e:
+                self.ap.logger.debug(f'Could not list event listeners of installation {binding.installation_uuid}: {e}')
+                index[binding.installation_uuid] = None
+                continue
+            listeners: set[str] = set()
+            for plugin in scoped_plugins:
+                if any(
+                    component.get('manifest', {}).get('manifest', {}).get('kind') == _EVENT_LISTENER_KIND
+                    for component in plugin.get('components', [])
+                ):
+                    metadata = plugin.get('manifest', {}).get('manifest', {}).get('metadata', {})
+                    listeners.add(f'{metadata.get("author", "")}/{metadata.get("name", "")}')
+            index[binding.installation_uuid] = frozenset(listeners)
+
+        self._event_listener_indexes[cache_key] = (revision, index)
+        self._event_listener_indexes.move_to_end(cache_key)
+        while len(self._event_listener_indexes) > _MAX_EVENT_LISTENER_INDEXES:
+            self._event_listener_indexes.popitem(last=False)
+        return index
+
     async def notify_plugin_diagnostic(self, diagnostic: dict[str, Any]) -> None:
         """Best-effort diagnostic forwarding to the plugin runtime."""
         if not self.is_enable_plugin or not self._runtime_available():
@@ -2074,12 +2183,24 @@ class PluginRuntimeConnector(ManagedRuntimeConnector):
         except Exception as e:
             self.ap.logger.debug(f'Plugin diagnostic forwarding skipped: {e}')
 
-    async def list_tools(self, bound_plugins: list[str] | None = None) -> list[ComponentManifest]:
-        if not self.is_enable_plugin or not self._runtime_available():
-            return []
+    async def _tool_catalog(
+        self, bound_plugins: list[str] | None
+    ) -> tuple[list[ComponentManifest], dict[str, ComponentManifest]]:
+        execution_context = await self._current_execution_context()
+        revision = self.tool_catalog_revision(execution_context.workspace_uuid)
+        cache_key = (
+            execution_context.workspace_uuid,
+            execution_context.placement_generation,
+            tuple(bound_plugins) if bound_plugins is not None else None,
+        )
+        cached = self._tool_catalogs.get(cache_key)
+        if cached is not None and cached[0] == revision:
+            self._tool_catalogs.move_to_end(cache_key)
+            return cached[1], cached[2]
 
         runtime_handler = self._runtime_handler()
         tools: list[ComponentManifest] = []
+        tools_by_name: dict[str, ComponentManifest] = {}
         seen: set[tuple[str, str]] = set()
         for binding in await self._operation_bindings(include_plugins=bound_plugins):
             with runtime_handler.installation_scope(binding):
@@ -2090,7 +2211,30 @@ class PluginRuntimeConnector(ManagedRuntimeConnector):
                 if key not in seen:
                     seen.add(key)
                     tools.append(tool)
-        return tools
+                    tools_by_name.setdefault(tool.metadata.name, tool)
+
+        # A catalog listed while a plugin changed carries the old revision
+        # and is refreshed by the next lookup.
+        self._tool_catalogs[cache_key] = (revision, tools, tools_by_name)
+        self._tool_catalogs.move_to_end(cache_key)
+        while len(self._tool_catalogs) > _MAX_TOOL_CATALOGS:
+            self._tool_catalogs.popitem(last=False)
+        return tools, tools_by_name
+
+    async def list_tools(self, bound_plugins: list[str] | None = None) -> list[ComponentManifest]:
+        if not self.is_enable_plugin or not self._runtime_available():
+            return []
+
+        tools, _ = await self._tool_catalog(bound_plugins)
+        return list(tools)
+
+    async def get_tool(self, tool_name: str) -> ComponentManifest | None:
+        """Look up one tool of the current Workspace's enabled plugins by name."""
+        if not self.is_enable_plugin or not self._runtime_available():
+            return None
+
+        _, tools_by_name = await self._tool_catalog(None)
+        return tools_by_name.get(tool_name)
 
     async def call_tool(
         self,
@@ -7,7 +7,9 @@ from typing import Any
 import base64
 import contextlib
 import contextvars
+import re
 import traceback
+import uuid
 from dataclasses import dataclass
 
 import sqlalchemy
@@ -45,9 +47,11 @@ from ..entity.persistence import model as persistence_model
 
 from ..core import app
 from ..utils import constants
+from . import transfer
 
 _DEFAULT_BINARY_STORAGE_VALUE_BYTES = 10 * 1024 * 1024
 _HARD_MAX_BINARY_STORAGE_VALUE_BYTES = 64 * 1024 * 1024
+_SAFE_FILE_EXTENSION = re.compile(r'^[A-Za-z0-9][A-Za-z0-9_-]{0,31}$')
 
 
 def _binary_storage_value_limit(ap: Any) -> int:
@@ -65,6 +69,12 @@ def _binary_storage_value_limit(ap: Any) -> int:
     return min(configured, _HARD_MAX_BINARY_STORAGE_VALUE_BYTES)
 
 
+async def _memory_chunks(value: bytes) -> typing.AsyncIterator[memoryview]:
+    view = memoryview(value)
+    for start in range(0, len(view), transfer.FILE_CHUNK_LENGTH):
+        yield view[start : start + transfer.FILE_CHUNK_LENGTH]
+
+
 class _RawAction:
     def __init__(self, value: str):
         self.value = value
@@ -486,6 +496,7 @@ class RuntimeConnectionHandler(handler.Handler):
             str,
             tuple[InstallationBinding, _PluginInstallationIdentity],
         ] = {}
+        self.transfer_stats = transfer.PayloadTransferStats()
 
         @self.action(RuntimeToLangBotAction.INITIALIZE_PLUGIN_SETTINGS)
         async def initialize_plugin_settings(data: dict[str, Any]) -> handler.ActionResponse:
@@ -894,13 +905,24 @@ class RuntimeConnectionHandler(handler.Handler):
                     message=str(e),
                 )
             max_value_bytes = _binary_storage_value_limit(self.ap)
-            encoded_value = data['value_base64']
-            max_encoded_chars = 4 * ((max_value_bytes + 2) // 3) + 4
-            if len(encoded_value) > max_encoded_chars:
-                return handler.ActionResponse.error(
-                    message=f'Binary storage value exceeds the {max_value_bytes}-byte limit',
-                )
-            value = await asyncio.to_thread(base64.b64decode, encoded_value)
+            action = RuntimeToLangBotAction.SET_BINARY_STORAGE.value
+            if data.get('value_file_key'):
+                # Large values may arrive as a FILE_CHUNK transfer instead of inline base64.
+                try:
+                    value = await self.receive_file(data['value_file_key'], action=action, max_bytes=max_value_bytes)
+                except ValueError:
+                    return handler.ActionResponse.error(
+                        message=f'Binary storage value exceeds the {max_value_bytes}-byte limit',
+                    )
+            else:
+                encoded_value = data['value_base64']
+                max_encoded_chars = 4 * ((max_value_bytes + 2) // 3) + 4
+                if len(encoded_value) > max_encoded_chars:
+                    return handler.ActionResponse.error(
+                        message=f'Binary storage value exceeds the {max_value_bytes}-byte limit',
+                    )
+                value = await asyncio.to_thread(base64.b64decode, encoded_value)
+                self.transfer_stats.record(action, received=len(value), wire_bytes=len(encoded_value))
             if len(value) > max_value_bytes:
                 return handler.ActionResponse.error(
                     message=f'Binary storage value exceeds limit ({len(value)} > {max_value_bytes} bytes)',
@@ -1052,9 +1074,13 @@ class RuntimeConnectionHandler(handler.Handler):
                 )
 
             return handler.ActionResponse.success(
-                data={
-                    'value_base64': (await asyncio.to_thread(base64.b64encode, storage.value)).decode('utf-8'),
-                },
+                data=await self._outbound_payload(
+                    data,
+                    action=RuntimeToLangBotAction.GET_BINARY_STORAGE.value,
+                    inline_key='value_base64',
+                    file_key='value_file_key',
+                    value=storage.value,
+                ),
             )
 
         @self.action(RuntimeToLangBotAction.DELETE_BINARY_STORAGE)
@@ -1134,6 +1160,21 @@ class RuntimeConnectionHandler(handler.Handler):
                 # The persisted config is user-controlled and therefore cannot
                 # turn an arbitrary opaque object key into authority. Validate
                 # every trusted scope dimension before touching the provider.
+                action = PluginToRuntimeAction.GET_CONFIG_FILE.value
+                if data.get('accept_file_key') is True:
+                    config_file = await self.ap.storage_mgr.open_scoped_object_key(
+                        execution_context,
+                        file_key,
+                        expected_owner_type='plugin_config',
+                    )
+                    if config_file.size > transfer.INLINE_PAYLOAD_MAX_BYTES:
+                        transferred_key = await self.send_file_stream(
+                            config_file.iter_chunks(),
+                            config_file.size,
+                            '',
+                            action=action,
+                        )
+                        return handler.ActionResponse.success(data={'file_file_key': transferred_key})
                 file_bytes = await self.ap.storage_mgr.load_scoped_object_key(
                     execution_context,
                     file_key,
@@ -1141,9 +1182,13 @@ class RuntimeConnectionHandler(handler.Handler):
                 )
 
                 return handler.ActionResponse.success(
-                    data={
-                        'file_base64': (await asyncio.to_thread(base64.b64encode, file_bytes)).decode('utf-8'),
-                    },
+                    data=await self._outbound_payload(
+                        {},
+                        action=action,
+                        inline_key='file_base64',
+                        file_key='file_file_key',
+                        value=file_bytes,
+                    ),
                 )
             except Exception as e:
                 return handler.ActionResponse.error(
@@ -1364,11 +1409,17 @@ class RuntimeConnectionHandler(handler.Handler):
             execution_context = self._execution_context(action_context)
             storage_path = data['storage_path']
             try:
-                content_bytes = await self.ap.rag_runtime_service.get_file_stream(
+                knowledge_file = await self.ap.rag_runtime_service.open_file_stream(
                     execution_context,
                     storage_path,
                 )
-                file_key = await self.send_file(content_bytes, '')
+                # Storage chunks are forwarded as they are read; the file is never loaded whole.
+                file_key = await self.send_file_stream(
+                    knowledge_file.iter_chunks(),
+                    knowledge_file.size,
+                    '',
+                    action=PluginToRuntimeAction.GET_KNOWLEDEGE_FILE_STREAM.value,
+                )
                 return handler.ActionResponse.success(data={'file_key': file_key})
             except Exception as e:
                 return _make_rag_error_response(e, 'FileServiceError', storage_path=storage_path)
@@ -1642,6 +1693,92 @@ class RuntimeConnectionHandler(handler.Handler):
             raise ValueError('Host plugin action requires an InstallationBinding scope')
         return binding
 
+    # ====== file transfer ======
+    async def send_file(self, file_bytes: bytes, file_extension: str) -> str:
+        """Send ``file_bytes`` to the Runtime as FILE_CHUNK frames without copying slices of it."""
+
+        return await self.send_file_stream(_memory_chunks(file_bytes), len(file_bytes), file_extension)
+
+    async def send_file_stream(
+        self,
+        chunks: typing.AsyncIterable[bytes | memoryview],
+        size: int,
+        file_extension: str,
+        *,
+        action: str = CommonAction.FILE_CHUNK.value,
+    ) -> str:
+        """Send ``size`` bytes produced by ``chunks`` and return the Runtime-side file key.
+
+        Only one protocol chunk is held at a time, so callers can stream
+        storage objects of any size up to the connection's file limit.
+        """
+
+        if self.max_file_bytes is not None and size > self.max_file_bytes:
+            raise ValueError('File transfer exceeds the configured size limit')
+        extension = file_extension.strip('.')
+        if extension and _SAFE_FILE_EXTENSION.fullmatch(extension) is None:
+            raise ValueError('Invalid file transfer extension')
+        file_key = f'{uuid.uuid4().hex}.{extension}' if extension else uuid.uuid4().hex
+        chunk_amount = max(1, (size + transfer.FILE_CHUNK_LENGTH - 1) // transfer.FILE_CHUNK_LENGTH)
+
+        async def send_chunk(index: int, chunk: bytes | memoryview) -> None:
+            await self.call_action(
+                CommonAction.FILE_CHUNK,
+                {
+                    'file_key': file_key,
+                    'file_length': size,
+                    'chunk_base64': base64.b64encode(chunk).decode('ascii'),
+                    'chunk_index': index,
+                    'chunk_amount': chunk_amount,
+                    'chunk_size': len(chunk),
+                },
+            )
+
+        sent = 0
+        index = 0
+        async for chunk in transfer.fixed_chunks(chunks):
+            sent += len(chunk)
+            if index >= chunk_amount or sent > size:
+                raise ValueError('File transfer is larger than announced')
+            await send_chunk(index, chunk)
+            index += 1
+        if sent != size:
+            raise ValueError('File transfer is smaller than announced')
+        if index == 0:
+            # The Runtime creates the file when chunk 0 arrives, even when it is empty.
+            await send_chunk(0, b'')
+        self.transfer_stats.record(action, sent=size)
+        return file_key
+
+    async def receive_file(self, file_key: str, *, action: str, max_bytes: int | None = None) -> bytes:
+        """Read and release a file the Runtime sent with FILE_CHUNK frames."""
+
+        try:
+            value = await self.read_local_file(file_key)
+        finally:
+            await self.delete_local_file(file_key)
+        if max_bytes is not None and len(value) > max_bytes:
+            raise ValueError(f'File transfer exceeds the {max_bytes}-byte limit')
+        self.transfer_stats.record(action, received=len(value))
+        return value
+
+    async def _outbound_payload(
+        self,
+        data: dict[str, Any],
+        *,
+        action: str,
+        inline_key: str,
+        file_key: str,
+        value: bytes,
+    ) -> dict[str, Any]:
+        """Return ``value`` inline as base64, or as a transferred file when the Runtime accepts one."""
+
+        if data.get('accept_file_key') is True and len(value) > transfer.INLINE_PAYLOAD_MAX_BYTES:
+            return {file_key: await self.send_file_stream(_memory_chunks(value), len(value), '', action=action)}
+        encoded = (await asyncio.to_thread(base64.b64encode, value)).decode('utf-8')
+        self.transfer_stats.record(action, sent=len(value), wire_bytes=len(encoded))
+        return {inline_key: encoded}
+
     async def ping(self) -> dict[str, Any]:
         """Ping the runtime"""
         with self.installation_scope(None):
@@ -1698,7 +1835,12 @@ class RuntimeConnectionHandler(handler.Handler):
         with self.installation_scope(binding):
             artifact_file_key = None
             if artifact_package is not None:
-                artifact_file_key = await self.send_file(artifact_package, 'lbpkg')
+                artifact_file_key = await self.send_file_stream(
+                    _memory_chunks(artifact_package),
+                    len(artifact_package),
+                    'lbpkg',
+                    action=LangBotToRuntimeAction.APPLY_PLUGIN_INSTALLATION.value,
+                )
             request = ApplyPluginInstallationRequest(
                 artifact_file_key=artifact_file_key,
                 enabled=enabled,
@@ -1861,16 +2003,13 @@ class RuntimeConnectionHandler(handler.Handler):
             },
         )
 
-        plugin_icon_file_key = result['plugin_icon_file_key']
-        mime_type = result['mime_type']
-
-        plugin_icon_bytes = await self.read_local_file(plugin_icon_file_key)
-
-        await self.delete_local_file(plugin_icon_file_key)
-
+        plugin_icon_bytes = await self.receive_file(
+            result['plugin_icon_file_key'],
+            action=LangBotToRuntimeAction.GET_PLUGIN_ICON.value,
+        )
         return {
-            'plugin_icon_base64': (await asyncio.to_thread(base64.b64encode, plugin_icon_bytes)).decode('utf-8'),
-            'mime_type': mime_type,
+            'plugin_icon': plugin_icon_bytes,
+            'mime_type': result['mime_type'],
         }
 
     async def get_plugin_readme(self, plugin_author: str, plugin_name: str, language: str = 'en') -> str:
@@ -1893,9 +2032,7 @@ class RuntimeConnectionHandler(handler.Handler):
         if not readme_file_key:
             return ''
 
-        readme_bytes = await self.read_local_file(readme_file_key)
-        await self.delete_local_file(readme_file_key)
-
+        readme_bytes = await self.receive_file(readme_file_key, action=LangBotToRuntimeAction.GET_PLUGIN_README.value)
         return readme_bytes.decode('utf-8')
 
     async def get_plugin_logs(
@@ -1937,15 +2074,15 @@ class RuntimeConnectionHandler(handler.Handler):
         asset_file_key = result['file_file_key']
         if not asset_file_key:
             return {
-                'asset_base64': '',
+                'asset': b'',
                 'mime_type': '',
             }
-        mime_type = result['mime_type']
-        asset_bytes = await self.read_local_file(asset_file_key)
-        await self.delete_local_file(asset_file_key)
+        asset_bytes = await self.receive_file(
+            asset_file_key, action=LangBotToRuntimeAction.GET_PLUGIN_ASSETS_FILE.value
+        )
         return {
-            'asset_base64': (await asyncio.to_thread(base64.b64encode, asset_bytes)).decode('utf-8'),
-            'mime_type': mime_type,
+            'asset': asset_bytes,
+            'mime_type': result['mime_type'],
         }
 
     async def handle_page_api(
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import typing
+
+from langbot_plugin.runtime.io.handler import FILE_CHUNK_LENGTH
+
+# Payloads up to this size stay inline as base64 in the action JSON; larger
+# ones go through FILE_CHUNK transfers when the Runtime accepts file keys.
+# Released SDKs never send ``accept_file_key`` yet, so every payload still
+# travels inline.
+INLINE_PAYLOAD_MAX_BYTES = 64 * 1024
+
+# FILE_CHUNK frames stay base64 and at most FILE_CHUNK_LENGTH bytes, one
+# acknowledged frame at a time: the SDK receiver rejects longer frames and
+# appends each frame in arrival order, so frames can neither grow nor be sent
+# ahead of their acknowledgement until the SDK side changes.
+
+
+def encoded_size(size: int) -> int:
+    """Number of base64 characters needed for ``size`` bytes."""
+
+    return 4 * ((size + 2) // 3)
+
+
+async def fixed_chunks(
+    chunks: typing.AsyncIterable[bytes | memoryview],
+    chunk_size: int = FILE_CHUNK_LENGTH,
+) -> typing.AsyncIterator[bytes | memoryview]:
+    """Re-cut ``chunks`` into pieces of exactly ``chunk_size`` bytes (the last may be shorter).
+
+    Pieces that already have the right size are passed through without copying.
+    """
+
+    pending = bytearray()
+    async for chunk in chunks:
+        view = memoryview(chunk)
+        if pending:
+            take = min(chunk_size - len(pending), len(view))
+            pending += view[:take]
+            view = view[take:]
+            if len(pending) < chunk_size:
+                continue
+            yield bytes(pending)
+            pending.clear()
+        while len(view) >= chunk_size:
+            yield view[:chunk_size]
+            view = view[chunk_size:]
+        pending += view
+    if pending:
+        yield bytes(pending)
+
+
+class PayloadTransferStats:
+    """Bytes moved across the plugin Runtime connection, per action.
+
+    ``wire_bytes`` counts the base64 characters actually sent or received, so
+    comparing it with the raw byte counts shows the encoding overhead.
+    """
+
+    def __init__(self) -> None:
+        self._actions: dict[str, dict[str, int]] = {}
+
+    def record(self, action: str, *, sent: int = 0, received: int = 0, wire_bytes: int | None = None) -> None:
+        stats = self._actions.setdefault(
+            action,
+            {'transfers': 0, 'bytes_sent': 0, 'bytes_received': 0, 'wire_bytes': 0},
+        )
+        stats['transfers'] += 1
+        stats['bytes_sent'] += sent
+        stats['bytes_received'] += received
+        stats['wire_bytes'] += encoded_size(sent + received) if wire_bytes is None else wire_bytes
+
+    def snapshot(self) -> dict[str, dict[str, int]]:
+        return {action: dict(stats) for action, stats in sorted(self._actions.items())}
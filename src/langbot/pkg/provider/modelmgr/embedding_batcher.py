@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import asyncio
+import collections
+import typing
+
+from ...core import app
+
+if typing.TYPE_CHECKING:
+    from . import requester
+
+
+_DEFAULT_BATCH_SIZE = 64
+_DEFAULT_MAX_CONCURRENCY = 4
+_HARD_MAX_BATCH_SIZE = 2048
+_HARD_MAX_CONCURRENCY = 32
+_MAX_TRACKED_MODELS = 1024
+# Providers that reject larger embedding requests. Config overrides win.
+_REQUESTER_BATCH_SIZES = {
+    'bailian-chat-completions': 10,
+}
+
+EmbeddingCall = typing.Callable[
+    [list[str]],
+    typing.Awaitable[typing.Union[list[list[float]], tuple[list[list[float]], dict]]],
+]
+
+
+class EmbeddingBatcher:
+    """Split embedding requests into provider-sized batches.
+
+    Document ingestion hands Core hundreds of chunks at once. Each request is
+    cut into batches no larger than the provider accepts and the batches are
+    sent concurrently, bounded per embedding model so that ingestion of many
+    files cannot exceed the provider's rate limits.
+    """
+
+    ap: app.Application
+
+    def __init__(self, ap: app.Application) -> None:
+        self.ap = ap
+        self._semaphores: collections.OrderedDict[str, tuple[int, asyncio.Semaphore]] = collections.OrderedDict()
+
+    def _config(self) -> dict:
+        instance_config = getattr(self.ap, 'instance_config', None)
+        data = getattr(instance_config, 'data', {})
+        batching_config = data.get('system', {}).get('embedding_batching', {}) if isinstance(data, dict) else {}
+        return batching_config if isinstance(batching_config, dict) else {}
+
+    @staticmethod
+    def _positive_int(value: typing.Any, default: int, hard_max: int) -> int:
+        if isinstance(value, bool) or not isinstance(value, int) or value < 1:
+            value = default
+        return min(value, hard_max)
+
+    def batch_size(self, model: requester.RuntimeEmbeddingModel) -> int:
+        config = self._config()
+        default = self._positive_int(config.get('batch_size'), _DEFAULT_BATCH_SIZE, _HARD_MAX_BATCH_SIZE)
+        requester_name = getattr(getattr(model.provider, 'provider_entity', None), 'requester', None)
+        overrides = config.get('requester_batch_sizes')
+        overrides = overrides if isinstance(overrides, dict) else {}
+        provider_size = overrides.get(requester_name, _REQUESTER_BATCH_SIZES.get(requester_name))
+        if provider_size is None:
+            return default
+        return self._positive_int(provider_size, default, _HARD_MAX_BATCH_SIZE)
+
+    def max_concurrency(self) -> int:
+        return self._positive_int(
+            self._config().get('max_concurrency'), _DEFAULT_MAX_CONCURRENCY, _HARD_MAX_CONCURRENCY
+        )
+
+    def _semaphore(self, model_uuid: str) -> asyncio.Semaphore:
+        limit = self.max_concurrency()
+        entry = self._semaphores.get(model_uuid)
+        if entry is None or entry[0] != limit:
+            entry = (limit, asyncio.Semaphore(limit))
+            self._semaphores[model_uuid] = entry
+        self._semaphores.move_to_end(model_uuid)
+        while len(self._semaphores) > _MAX_TRACKED_MODELS:
+            self._semaphores.popitem(last=False)
+        return entry[1]
+
+    async def embed(
+        self,
+        model: requester.RuntimeEmbeddingModel,
+        input_text: list[str],
+        call: EmbeddingCall,
+    ) -> tuple[list[list[float]], dict[str, int]]:
+        """Embed ``input_text`` with ``call`` and return vectors in input order plus summed usage."""
+
+        semaphore = self._semaphore(model.model_entity.uuid)
+        batch_size = self.batch_size(model)
+        batches = [input_text[start : start + batch_size] for start in range(0, len(input_text), batch_size)]
+
+        async def run(batch: list[str]) -> tuple[list[list[float]], dict]:
+            async with semaphore:
+                result = await call(batch)
+            if isinstance(result, tuple):
+                embeddings, usage_info = result
+            else:
+                embeddings, usage_info = result, {}
+            # Vectors of split requests are concatenated, so every batch must line up with its texts.
+            if len(batches) > 1 and len(embeddings) != len(batch):
+                raise ValueError(f'Embedding provider returned {len(embeddings)} vectors for {len(batch)} texts')
+            return embeddings, usage_info or {}
+
+        results = await asyncio.gather(*(run(batch) for batch in batches))
+
+        embeddings: list[list[float]] = []
+        usage = {'prompt_tokens': 0, 'total_tokens': 0}
+        for batch_embeddings, usage_info in results:
+            embeddings.extend(batch_embeddings)
+            for key in usage:
+                usage[key] += usage_info.get(key) or 0
+        return embeddings, usage
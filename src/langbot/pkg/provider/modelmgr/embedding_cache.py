@@ -0,0 +1,336 @@
+from __future__ import annotations
+
+import array
+import collections
+import dataclasses
+import datetime
+import hashlib
+import json
+import sys
+import time
+import typing
+import unicodedata
+
+import sqlalchemy
+from sqlalchemy.dialects import postgresql as postgresql_dialect
+from sqlalchemy.dialects import sqlite as sqlite_dialect
+
+from ...core import app
+from ...entity.persistence import model as persistence_model
+
+if typing.TYPE_CHECKING:
+    from . import requester
+
+
+_DEFAULT_MAX_ENTRIES = 2000
+_DEFAULT_TTL_SECONDS = 86400
+# Query embeddings are requested one text at a time. Larger batches come from
+# document ingestion and would only churn the cache.
+_DEFAULT_MAX_BATCH_TEXTS = 4
+_HARD_MAX_ENTRIES = 100000
+_HARD_MAX_BATCH_TEXTS = 64
+
+CacheKey = tuple[str, str]
+
+
+def normalize_text(text: str) -> str:
+    """Return the form of ``text`` used to address the cache."""
+
+    return ' '.join(unicodedata.normalize('NFC', text).split())
+
+
+def _pack(vector: typing.Sequence[float]) -> array.array:
+    packed = array.array('d', vector)
+    if sys.byteorder != 'little':
+        packed.byteswap()
+    return packed
+
+
+def _unpack(data: bytes) -> array.array:
+    packed = array.array('d')
+    packed.frombytes(data)
+    if sys.byteorder != 'little':
+        packed.byteswap()
+    return packed
+
+
+def _utcnow() -> datetime.datetime:
+    return datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+
+
+@dataclasses.dataclass(slots=True)
+class EmbeddingCacheStats:
+    """Cumulative embedding cache counters for the whole process."""
+
+    hits: int = 0
+    persistent_hits: int = 0
+    misses: int = 0
+    stores: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    persistent_errors: int = 0
+
+
+@dataclasses.dataclass(slots=True)
+class _Entry:
+    embedding_model_uuid: str
+    vector: array.array
+    expires_at: float
+
+
+class EmbeddingCache:
+    """Content-addressed LRU + TTL cache of query embeddings.
+
+    Entries are keyed by Workspace and a digest of the embedding model, its
+    provider settings and the normalized input text, so editing a model or
+    its provider simply stops matching old entries. Vectors are held as packed
+    float64 arrays to keep the memory footprint predictable.
+
+    With ``persistent`` enabled, misses fall through to the
+    ``embedding_cache_entries`` table and new vectors are written there too,
+    so repeated questions survive restarts and are shared between replicas.
+    """
+
+    ap: app.Application
+
+    def __init__(self, ap: app.Application) -> None:
+        self.ap = ap
+        self._entries: collections.OrderedDict[CacheKey, _Entry] = collections.OrderedDict()
+        self.stats = EmbeddingCacheStats()
+
+    def _config(self) -> dict:
+        instance_config = getattr(self.ap, 'instance_config', None)
+        data = getattr(instance_config, 'data', {})
+        cache_config = data.get('system', {}).get('embedding_cache', {}) if isinstance(data, dict) else {}
+        return cache_config if isinstance(cache_config, dict) else {}
+
+    def _positive_int(self, name: str, default: int, hard_max: int | None = None) -> int:
+        value = self._config().get(name, default)
+        if isinstance(value, bool) or not isinstance(value, int) or value < 1:
+            value = default
+        return min(value, hard_max) if hard_max is not None else value
+
+    @property
+    def enabled(self) -> bool:
+        return self._config().get('enabled', True) is not False
+
+    @property
+    def persistent(self) -> bool:
+        return self.enabled and self._config().get('persistent', False) is True
+
+    @property
+    def max_entries(self) -> int:
+        return self._positive_int('max_entries', _DEFAULT_MAX_ENTRIES, _HARD_MAX_ENTRIES)
+
+    @property
+    def ttl_seconds(self) -> int:
+        return self._positive_int('ttl_seconds', _DEFAULT_TTL_SECONDS)
+
+    def accepts(self, input_text: typing.Sequence[str]) -> bool:
+        """Whether a request is small enough to be a query rather than ingestion."""
+
+        max_batch_texts = self._positive_int('max_batch_texts', _DEFAULT_MAX_BATCH_TEXTS, _HARD_MAX_BATCH_TEXTS)
+        return self.enabled and 0 < len(input_text) <= max_batch_texts
+
+    @staticmethod
+    def keys_for(
+        model: requester.RuntimeEmbeddingModel,
+        input_text: typing.Sequence[str],
+        extra_args: dict[str, typing.Any] | None = None,
+    ) -> list[str]:
+        """Return one cache key per input text."""
+
+        provider_entity = model.provider.provider_entity
+        fingerprint = json.dumps(
+            [
+                model.model_entity.uuid,
+                model.model_entity.name,
+                model.model_entity.extra_args or {},
+                extra_args or {},
+                provider_entity.requester,
+                provider_entity.base_url,
+            ],
+            sort_keys=True,
+            default=str,
+        )
+        return [
+            hashlib.sha256(f'{fingerprint}\0{normalize_text(text)}'.encode('utf-8')).hexdigest() for text in input_text
+        ]
+
+    def _get_local(self, workspace_uuid: str, cache_key: str, now: float) -> list[float] | None:
+        key = (workspace_uuid, cache_key)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at <= now:
+            del self._entries[key]
+            self.stats.expirations += 1
+            return None
+        self._entries.move_to_end(key)
+        return entry.vector.tolist()
+
+    def _put_local(
+        self,
+        workspace_uuid: str,
+        cache_key: str,
+        embedding_model_uuid: str,
+        vector: array.array,
+        expires_at: float,
+    ) -> None:
+        key = (workspace_uuid, cache_key)
+        self._entries[key] = _Entry(embedding_model_uuid=embedding_model_uuid, vector=vector, expires_at=expires_at)
+        self._entries.move_to_end(key)
+        max_entries = self.max_entries
+        while len(self._entries) > max_entries:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    async def _execute(self, workspace_uuid: str, statement) -> sqlalchemy.Result:
+        tenant_uow = getattr(self.ap.persistence_mgr, 'tenant_uow', None)
+        if callable(tenant_uow):
+            async with tenant_uow(workspace_uuid):
+                return await self.ap.persistence_mgr.execute_async(statement)
+        return await self.ap.persistence_mgr.execute_async(statement)
+
+    async def _get_persistent(self, workspace_uuid: str, cache_keys: list[str]) -> dict[str, tuple[str, bytes, float]]:
+        Entry = persistence_model.EmbeddingCacheEntry
+        ttl_seconds = self.ttl_seconds
+        now = _utcnow()
+        try:
+            result = await self._execute(
+                workspace_uuid,
+                sqlalchemy.select(Entry.cache_key, Entry.embedding_model_uuid, Entry.vector, Entry.created_at).where(
+                    Entry.workspace_uuid == workspace_uuid,
+                    Entry.cache_key.in_(cache_keys),
+                    Entry.created_at > now - datetime.timedelta(seconds=ttl_seconds),
+                ),
+            )
+            rows = result.all()
+        except Exception as exc:
+            self.stats.persistent_errors += 1
+            self.ap.logger.warning(f'Embedding cache read failed for Workspace {workspace_uuid}: {exc}')
+            return {}
+        return {
+            row.cache_key: (
+                row.embedding_model_uuid,
+                row.vector,
+                ttl_seconds - (now - row.created_at).total_seconds(),
+            )
+            for row in rows
+        }
+
+    async def get_many(self, workspace_uuid: str, cache_keys: list[str]) -> list[list[float] | None]:
+        """Return cached vectors in key order, ``None`` where a key missed."""
+
+        now = time.monotonic()
+        vectors = [self._get_local(workspace_uuid, cache_key, now) for cache_key in cache_keys]
+        missing = [cache_key for cache_key, vector in zip(cache_keys, vectors) if vector is None]
+        if missing and self.persistent:
+            stored = await self._get_persistent(workspace_uuid, missing)
+            for index, cache_key in enumerate(cache_keys):
+                if vectors[index] is not None or cache_key not in stored:
+                    continue
+                embedding_model_uuid, data, remaining_seconds = stored[cache_key]
+                vector = _unpack(data)
+                self._put_local(workspace_uuid, cache_key, embedding_model_uuid, vector, now + remaining_seconds)
+                vectors[index] = vector.tolist()
+                self.stats.persistent_hits += 1
+
+        hits = sum(1 for vector in vectors if vector is not None)
+        self.stats.hits += hits
+        self.stats.misses += len(vectors) - hits
+        return vectors
+
+    async def put_many(
+        self,
+        workspace_uuid: str,
+        embedding_model_uuid: str,
+        vectors: dict[str, typing.Sequence[float]],
+    ) -> None:
+        """Cache freshly computed vectors keyed by cache key."""
+
+        if not vectors:
+            return
+        expires_at = time.monotonic() + self.ttl_seconds
+        packed = {cache_key: _pack(vector) for cache_key, vector in vectors.items()}
+        for cache_key, vector in packed.items():
+            self._put_local(workspace_uuid, cache_key, embedding_model_uuid, vector, expires_at)
+        self.stats.stores += len(packed)
+        if not self.persistent:
+            return
+
+        Entry = persistence_model.EmbeddingCacheEntry
+        dialect_name = self.ap.persistence_mgr.get_db_engine().dialect.name
+        insert = {
+            'postgresql': postgresql_dialect.insert,
+            'sqlite': sqlite_dialect.insert,
+        }.get(dialect_name)
+        if insert is None:
+            return
+        created_at = _utcnow()
+        statement = insert(Entry).values(
+            [
+                {
+                    'workspace_uuid': workspace_uuid,
+                    'cache_key': cache_key,
+                    'embedding_model_uuid': embedding_model_uuid,
+                    'vector': vector.tobytes(),
+                    'created_at': created_at,
+                }
+                for cache_key, vector in packed.items()
+            ]
+        )
+        statement = statement.on_conflict_do_update(
+            index_elements=[Entry.workspace_uuid, Entry.cache_key],
+            set_={'vector': statement.excluded.vector, 'created_at': statement.excluded.created_at},
+        )
+        try:
+            await self._execute(workspace_uuid, statement)
+        except Exception as exc:
+            self.stats.persistent_errors += 1
+            self.ap.logger.warning(f'Embedding cache write failed for Workspace {workspace_uuid}: {exc}')
+
+    def invalidate_model(self, workspace_uuid: str, embedding_model_uuid: str) -> int:
+        """Drop in-memory entries of a removed model; persisted rows age out by TTL."""
+
+        stale = [
+            key
+            for key, entry in self._entries.items()
+            if key[0] == workspace_uuid and entry.embedding_model_uuid == embedding_model_uuid
+        ]
+        for key in stale:
+            del self._entries[key]
+        return len(stale)
+
+    async def prune_expired(self, workspace_uuid: str) -> int:
+        """Delete persisted entries older than the TTL for one Workspace."""
+
+        if not self.persistent:
+            return 0
+        Entry = persistence_model.EmbeddingCacheEntry
+        result = await self._execute(
+            workspace_uuid,
+            sqlalchemy.delete(Entry).where(
+                Entry.workspace_uuid == workspace_uuid,
+                Entry.created_at <= _utcnow() - datetime.timedelta(seconds=self.ttl_seconds),
+            ),
+        )
+        return max(result.rowcount or 0, 0)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def snapshot(self) -> dict[str, object]:
+        lookups = self.stats.hits + self.stats.misses
+        return {
+            'entries': len(self._entries),
+            'max_entries': self.max_entries,
+            'hits': self.stats.hits,
+            'persistent_hits': self.stats.persistent_hits,
+            'misses': self.stats.misses,
+            'hit_ratio': round(self.stats.hits / lookups, 4) if lookups else 0.0,
+            'stores': self.stats.stores,
+            'evictions': self.stats.evictions,
+            'expirations': self.stats.expirations,
+            'persistent_errors': self.stats.persistent_errors,
+        }
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import asyncio
 import traceback
-from typing import TypeVar
+from typing import Mapping, TypeVar
 
 import sqlalchemy
 
@@ -19,7 +19,7 @@ from ...entity.errors import provider as provider_errors
 from ...entity.persistence import model as persistence_model
 from ...workspace.entities import WorkspaceExecutionBinding
 from ...workspace.errors import WorkspaceError, WorkspaceInvariantError
-from . import requester, token
+from . import embedding_batcher, embedding_cache, requester, token
 
 
 _CacheKey = tuple[str, str, int, str]
@@ -42,7 +42,11 @@ class ModelManager:
     rerank_model_dict: dict[_CacheKey, requester.RuntimeRerankModel]
 
     requester_components: list[engine.Component]
-    requester_dict: dict[str, type[requester.ProviderAPIRequester]]
+    requester_dict: Mapping[str, type[requester.ProviderAPIRequester]]
+
+    embedding_cache: embedding_cache.EmbeddingCache
+
+    embedding_batcher: embedding_batcher.EmbeddingBatcher
 
     def __init__(self, ap: app.Application):
         self.ap = ap
@@ -57,6 +61,8 @@ class ModelManager:
         self._llm_keys_by_scope: dict[tuple[str, str], set[_CacheKey]] = {}
         self._embedding_keys_by_scope: dict[tuple[str, str], set[_CacheKey]] = {}
         self._rerank_keys_by_scope: dict[tuple[str, str], set[_CacheKey]] = {}
+        self.embedding_cache = embedding_cache.EmbeddingCache(ap)
+        self.embedding_batcher = embedding_batcher.EmbeddingBatcher(ap)
 
     def _cache_index(self, cache: dict) -> dict[tuple[str, str], set[_CacheKey]]:
         if cache is self.provider_dict:
@@ -173,6 +179,7 @@ class ModelManager:
         self._llm_keys_by_scope = {}
         self._embedding_keys_by_scope = {}
         self._rerank_keys_by_scope = {}
+        self.embedding_cache.clear()
         await self._close_runtime_providers(providers)
 
     @staticmethod
@@ -274,7 +281,7 @@ class ModelManager:
     async def initialize(self) -> None:
         self.requester_components = self.ap.discover.get_components_by_kind('LLMAPIRequester')
 
-        requester_dict: dict[str, type[requester.ProviderAPIRequester]] = {}
+        python_requesters: list[engine.Component] = []
         for component in self.requester_components:
             litellm_provider = self._get_litellm_provider_from_manifest(component)
             if litellm_provider:
@@ -283,9 +290,10 @@ class ModelManager:
                     f'(uses litellm_provider={litellm_provider})'
                 )
                 continue
-            requester_dict[component.metadata.name] = component.get_python_component_class()
+            python_requesters.append(component)
 
-        self.requester_dict = requester_dict
+        # Requester modules are imported when a provider using them is first loaded.
+        self.requester_dict = engine.ComponentClassRegistry(python_requesters)
         await self.load_models_from_db()
 
         space_config = self.ap.instance_config.data.get('space', {})
@@ -985,6 +993,7 @@ class ModelManager:
             self.embedding_model_dict,
             self._cache_key(execution_context, model_uuid),
         )
+        self.embedding_cache.invalidate_model(execution_context.workspace_uuid, model_uuid)
 
     async def remove_rerank_model(self, context: TenantContext, model_uuid: str) -> None:
         execution_context = await self.resolve_execution_context(context)
@@ -9,6 +9,8 @@ from ...api.http.context import ExecutionContext
 from ...entity.persistence import model as persistence_model
 from ...workspace.errors import WorkspaceInvariantError
 import langbot_plugin.api.entities.builtin.resource.tool as resource_tool
+from . import embedding_batcher
+from . import embedding_cache
 from . import token
 from . import reasoning
 import langbot_plugin.api.entities.builtin.pipeline.query as pipeline_query
@@ -279,6 +281,21 @@ class RuntimeProvider:
     ) -> typing.List[typing.List[float]]:
         """Bridge method for invoking embedding with monitoring"""
         self._validate_invocation(model, execution_context)
+
+        # Serve repeated query texts from the embedding cache. Only the texts
+        # that miss are sent to the provider and recorded as an embedding call.
+        cache = getattr(getattr(self.requester.ap, 'model_mgr', None), 'embedding_cache', None)
+        cache_keys = None
+        vectors: list[list[float] | None] = []
+        missing = list(range(len(input_text)))
+        if isinstance(cache, embedding_cache.EmbeddingCache) and cache.accepts(input_text):
+            cache_keys = cache.keys_for(model, input_text, extra_args)
+            vectors = await cache.get_many(execution_context.workspace_uuid, cache_keys)
+            missing = [index for index, vector in enumerate(vectors) if vector is None]
+            if not missing:
+                return vectors
+            input_text = [input_text[index] for index in missing]
+
         # Start timing for monitoring
         start_time = time.time()
         prompt_tokens = 0
@@ -287,22 +304,37 @@ class RuntimeProvider:
         error_message = None
 
         try:
-            # Call the underlying requester
-            result = await self.requester.invoke_embedding(
-                model=model,
-                input_text=input_text,
-                extra_args=extra_args,
-            )
 
-            # Handle both old format (list only) and new format (tuple with usage)
-            if isinstance(result, tuple):
-                embeddings, usage_info = result
-                if usage_info:
-                    prompt_tokens = usage_info.get('prompt_tokens', 0)
-                    total_tokens = usage_info.get('total_tokens', 0)
-                return embeddings
+            async def call(texts: list[str]):
+                return await self.requester.invoke_embedding(
+                    model=model,
+                    input_text=texts,
+                    extra_args=extra_args,
+                )
+
+            # Large ingestion requests are split into provider-sized batches
+            # sent concurrently, bounded per embedding model.
+            batcher = getattr(getattr(self.requester.ap, 'model_mgr', None), 'embedding_batcher', None)
+            if isinstance(batcher, embedding_batcher.EmbeddingBatcher):
+                embeddings, usage_info = await batcher.embed(model, input_text, call)
             else:
-                return result
+                # Handle both old format (list only) and new format (tuple with usage)
+                result = await call(input_text)
+                embeddings, usage_info = result if isinstance(result, tuple) else (result, {})
+            if usage_info:
+                prompt_tokens = usage_info.get('prompt_tokens', 0)
+                total_tokens = usage_info.get('total_tokens', 0)
+
+            if cache_keys is None or len(embeddings) != len(missing):
+                return embeddings
+            for index, embedding in zip(missing, embeddings):
+                vectors[index] = embedding
+            await cache.put_many(
+                execution_context.workspace_uuid,
+                model.model_entity.uuid,
+                {cache_keys[index]: vectors[index] for index in missing},
+            )
+            return vectors
 
         except Exception as e:
             status = 'error'
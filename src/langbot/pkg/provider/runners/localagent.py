@@ -1,12 +1,15 @@
 from __future__ import annotations
 
+import asyncio
 import json
 import copy
+import time
 import typing
 from .. import runner
 from ...telemetry import features as telemetry_features
 from ..modelmgr import requester as modelmgr_requester
 from ..modelmgr import reasoning as modelmgr_reasoning
+from ..tools.loaders import native as native_tools
 from ..tools.loaders.native import EXEC_TOOL_NAME
 import langbot_plugin.api.entities.builtin.pipeline.query as pipeline_query
 import langbot_plugin.api.entities.builtin.provider.message as provider_message
@@ -43,6 +46,35 @@ SANDBOX_EXEC_SYSTEM_GUIDANCE = (
 # generously so it never interrupts legitimate multi-step agentic workflows.
 MAX_TOOL_CALL_ROUNDS = 128
 
+# Knowledge bases bound to one pipeline are searched concurrently. The timeout
+# is a per-KB deadline covering lookup, query embedding and vector search; a KB
+# that misses it is skipped and the reply continues with the other results.
+_DEFAULT_KB_RETRIEVAL_CONCURRENCY = 4
+_DEFAULT_KB_RETRIEVAL_TIMEOUT_SECONDS = 15.0
+_HARD_MAX_KB_RETRIEVAL_CONCURRENCY = 32
+
+# Tool calls returned in one model turn run concurrently, at most this many at
+# a time per query. Each call has its own deadline; a call that misses it is
+# answered with an error result so the model can continue.
+_DEFAULT_TOOL_CALL_CONCURRENCY = 4
+_DEFAULT_TOOL_CALL_TIMEOUT_SECONDS = 300.0
+_HARD_MAX_TOOL_CALL_CONCURRENCY = 16
+
+# Sandbox tools share one filesystem per session, so a write followed by a
+# read in the same turn depends on order. They run one at a time, in the
+# order the model listed them.
+_SEQUENTIAL_TOOL_NAMES = frozenset(
+    {
+        native_tools.EXEC_TOOL_NAME,
+        native_tools.READ_TOOL_NAME,
+        native_tools.WRITE_TOOL_NAME,
+        native_tools.EDIT_TOOL_NAME,
+        native_tools.GLOB_TOOL_NAME,
+        native_tools.GREP_TOOL_NAME,
+        SANDBOX_EXEC_TOOL_NAME,
+    }
+)
+
 
 def _model_has_ability(model: modelmgr_requester.RuntimeLLMModel, ability: str) -> bool:
     return ability in (model.model_entity.abilities or [])
@@ -363,6 +395,156 @@ class LocalAgentRunner(runner.RequestRunner):
                 self.ap.logger.warning(f'Model {model.model_entity.name} stream failed: {e}, trying next fallback...')
         raise last_error or RuntimeError('No model candidates available')
 
+    def _kb_retrieval_limits(self) -> tuple[int, float]:
+        instance_config = getattr(self.ap, 'instance_config', None)
+        data = getattr(instance_config, 'data', {})
+        retrieval_config = data.get('system', {}).get('kb_retrieval', {}) if isinstance(data, dict) else {}
+        if not isinstance(retrieval_config, dict):
+            retrieval_config = {}
+
+        concurrency = retrieval_config.get('max_concurrency', _DEFAULT_KB_RETRIEVAL_CONCURRENCY)
+        if isinstance(concurrency, bool) or not isinstance(concurrency, int) or concurrency < 1:
+            concurrency = _DEFAULT_KB_RETRIEVAL_CONCURRENCY
+        timeout = retrieval_config.get('timeout_seconds', _DEFAULT_KB_RETRIEVAL_TIMEOUT_SECONDS)
+        if isinstance(timeout, bool) or not isinstance(timeout, (int, float)) or timeout <= 0:
+            timeout = _DEFAULT_KB_RETRIEVAL_TIMEOUT_SECONDS
+        return min(concurrency, _HARD_MAX_KB_RETRIEVAL_CONCURRENCY), float(timeout)
+
+    async def _retrieve_knowledge_bases(
+        self,
+        query: pipeline_query.Query,
+        execution_context,
+        kb_uuids: list[str],
+        query_text: str,
+    ) -> list[dict]:
+        """Retrieve from every bound knowledge base concurrently.
+
+        Returns one entry per KB in binding order so merged results keep the
+        same order as a sequential retrieval. A KB that is missing, fails or
+        misses its deadline contributes no results instead of failing the query.
+        """
+        concurrency, timeout = self._kb_retrieval_limits()
+        semaphore = asyncio.Semaphore(concurrency)
+        settings = {
+            'bot_uuid': query.bot_uuid or '',
+            'sender_id': str(query.sender_id),
+            'session_name': f'{query.session.launcher_type.value}_{query.session.launcher_id}',
+        }
+
+        async def retrieve_one(kb_uuid: str) -> dict:
+            retrieval = {'engine_plugin_id': None, 'results': [], 'status': 'ok', 'duration_ms': 0}
+
+            async def lookup_and_retrieve() -> None:
+                kb = await self.ap.rag_mgr.get_knowledge_base_by_uuid(execution_context, kb_uuid)
+                if not kb:
+                    self.ap.logger.warning(f'Knowledge base {kb_uuid} not found, skipping')
+                    retrieval['status'] = 'missing'
+                    return
+
+                try:
+                    retrieval['engine_plugin_id'] = kb.get_knowledge_engine_plugin_id() or 'builtin'
+                except Exception:
+                    retrieval['engine_plugin_id'] = 'builtin'
+
+                result = await kb.retrieve(execution_context, query_text, settings=settings)
+                if result:
+                    retrieval['results'] = list(result)
+
+            async with semaphore:
+                started_at = time.perf_counter()
+                try:
+                    await asyncio.wait_for(lookup_and_retrieve(), timeout=timeout)
+                except asyncio.TimeoutError:
+                    retrieval['status'] = 'timeout'
+                    self.ap.logger.warning(f'Knowledge base {kb_uuid} retrieval timed out after {timeout:g}s, skipping')
+                except Exception as e:
+                    retrieval['status'] = 'error'
+                    self.ap.logger.warning(f'Knowledge base {kb_uuid} retrieval failed: {e}, skipping')
+                retrieval['duration_ms'] = round((time.perf_counter() - started_at) * 1000)
+
+            self.ap.logger.debug(
+                f'Knowledge base {kb_uuid} retrieval {retrieval["status"]}: '
+                f'{len(retrieval["results"])} entries in {retrieval["duration_ms"]}ms'
+            )
+            return retrieval
+
+        return list(await asyncio.gather(*(retrieve_one(kb_uuid) for kb_uuid in kb_uuids)))
+
+    def _tool_call_limits(self) -> tuple[int, float]:
+        instance_config = getattr(self.ap, 'instance_config', None)
+        data = getattr(instance_config, 'data', {})
+        tool_call_config = data.get('system', {}).get('tool_calls', {}) if isinstance(data, dict) else {}
+        if not isinstance(tool_call_config, dict):
+            tool_call_config = {}
+
+        concurrency = tool_call_config.get('max_concurrency', _DEFAULT_TOOL_CALL_CONCURRENCY)
+        if isinstance(concurrency, bool) or not isinstance(concurrency, int) or concurrency < 1:
+            concurrency = _DEFAULT_TOOL_CALL_CONCURRENCY
+        timeout = tool_call_config.get('timeout_seconds', _DEFAULT_TOOL_CALL_TIMEOUT_SECONDS)
+        if isinstance(timeout, bool) or not isinstance(timeout, (int, float)) or timeout <= 0:
+            timeout = _DEFAULT_TOOL_CALL_TIMEOUT_SECONDS
+        return min(concurrency, _HARD_MAX_TOOL_CALL_CONCURRENCY), float(timeout)
+
+    async def _execute_tool_calls(
+        self,
+        query: pipeline_query.Query,
+        tool_calls: list[provider_message.ToolCall],
+    ) -> list[dict]:
+        """Execute the tool calls of one model turn concurrently.
+
+        Returns one entry per tool call in the order the model listed them,
+        holding either the tool ``content`` or the ``error`` it raised.
+        """
+        concurrency, timeout = self._tool_call_limits()
+        semaphore = asyncio.Semaphore(concurrency)
+        outcomes = [{'content': None, 'error': None, 'duration_ms': 0} for _ in tool_calls]
+
+        async def execute_one(index: int) -> None:
+            tool_call = tool_calls[index]
+            outcome = outcomes[index]
+            async with semaphore:
+                started_at = time.perf_counter()
+                try:
+                    func = tool_call.function
+                    parameters = json.loads(func.arguments) if func.arguments else {}
+                    func_ret = await asyncio.wait_for(
+                        self.ap.tool_mgr.execute_func_call(func.name, parameters, query=query),
+                        timeout=timeout,
+                    )
+
+                    # Handle return value content
+                    if (
+                        isinstance(func_ret, list)
+                        and len(func_ret) > 0
+                        and isinstance(func_ret[0], provider_message.ContentElement)
+                    ):
+                        outcome['content'] = func_ret
+                    else:
+                        outcome['content'] = json.dumps(func_ret, ensure_ascii=False)
+                except asyncio.TimeoutError:
+                    outcome['error'] = TimeoutError(f'tool call timed out after {timeout:g}s')
+                    self.ap.logger.warning(
+                        f'Tool call {tool_call.function.name} timed out after {timeout:g}s (query_id={query.query_id})'
+                    )
+                except Exception as e:
+                    outcome['error'] = e
+                outcome['duration_ms'] = round((time.perf_counter() - started_at) * 1000)
+
+        async def execute_sequentially(indexes: typing.Iterable[int]) -> None:
+            for index in indexes:
+                await execute_one(index)
+
+        sequential = {
+            index
+            for index, tool_call in enumerate(tool_calls)
+            if getattr(tool_call.function, 'name', None) in _SEQUENTIAL_TOOL_NAMES
+        }
+        units = [execute_one(index) for index in range(len(tool_calls)) if index not in sequential]
+        if sequential:
+            units.append(execute_sequentially(sorted(sequential)))
+        await asyncio.gather(*units)
+        return outcomes
+
     async def run(
         self, query: pipeline_query.Query
     ) -> typing.AsyncGenerator[provider_message.Message | provider_message.MessageChunk, None]:
@@ -398,35 +580,14 @@ class LocalAgentRunner(runner.RequestRunner):
             execution_context = get_query_execution_context(query)
 
             kb_engine_plugins: set[str] = set()
-
-            # Retrieve from each knowledge base
-            for kb_uuid in kb_uuids:
-                kb = await self.ap.rag_mgr.get_knowledge_base_by_uuid(execution_context, kb_uuid)
-
-                if not kb:
-                    self.ap.logger.warning(f'Knowledge base {kb_uuid} not found, skipping')
-                    continue
-
-                try:
-                    engine_plugin_id = kb.get_knowledge_engine_plugin_id() or 'builtin'
-                except Exception:
-                    engine_plugin_id = 'builtin'
-                kb_engine_plugins.add(engine_plugin_id)
-
-                result = await kb.retrieve(
-                    execution_context,
-                    user_message_text,
-                    settings={
-                        'bot_uuid': query.bot_uuid or '',
-                        'sender_id': str(query.sender_id),
-                        'session_name': f'{query.session.launcher_type.value}_{query.session.launcher_id}',
-                    },
-                )
-
-                if result:
-                    all_results.extend(result)
-
-            # Telemetry: knowledge base usage (counts and engine categories only)
+            retrievals = await self._retrieve_knowledge_bases(query, execution_context, kb_uuids, user_message_text)
+            for retrieval in retrievals:
+                if retrieval['engine_plugin_id'] is not None:
+                    kb_engine_plugins.add(retrieval['engine_plugin_id'])
+                all_results.extend(retrieval['results'])
+
+            # Telemetry: knowledge base usage (counts, engine categories and
+            # per-KB latencies in binding order only)
             telemetry_features.set_value(
                 query,
                 'kb',
@@ -434,6 +595,9 @@ class LocalAgentRunner(runner.RequestRunner):
                     'kb_count': len(kb_uuids),
                     'engine_plugins': sorted(kb_engine_plugins),
                     'retrieved_entries': len(all_results),
+                    'retrieval_ms': [retrieval['duration_ms'] for retrieval in retrievals],
+                    'timed_out': sum(1 for retrieval in retrievals if retrieval['status'] == 'timeout'),
+                    'failed': sum(1 for retrieval in retrievals if retrieval['status'] == 'error'),
                 },
             )
 
@@ -592,6 +756,7 @@ class LocalAgentRunner(runner.RequestRunner):
         # Once a model succeeds, commit to it for the tool call loop
         # (no fallback mid-conversation — different models may interpret tool results differently)
         tool_call_round = 0
+        round_timings: list[dict] = []
         while pending_tool_calls:
             tool_call_round += 1
             telemetry_features.set_value(query, 'tool_call_rounds', tool_call_round)
@@ -601,58 +766,51 @@ class LocalAgentRunner(runner.RequestRunner):
                     f'(query_id={query.query_id}); stopping to avoid a non-terminating request.'
                 )
                 break
-            for tool_call in pending_tool_calls:
-                try:
-                    func = tool_call.function
-
-                    if func.arguments:
-                        parameters = json.loads(func.arguments)
-                    else:
-                        parameters = {}
-
-                    func_ret = await self.ap.tool_mgr.execute_func_call(func.name, parameters, query=query)
-
-                    # Handle return value content
-                    tool_content = None
-                    if (
-                        isinstance(func_ret, list)
-                        and len(func_ret) > 0
-                        and isinstance(func_ret[0], provider_message.ContentElement)
-                    ):
-                        tool_content = func_ret
-                    else:
-                        tool_content = json.dumps(func_ret, ensure_ascii=False)
+            round_started_at = time.perf_counter()
+            outcomes = await self._execute_tool_calls(query, pending_tool_calls)
+            round_timings.append(
+                {
+                    'calls': len(outcomes),
+                    'wall_ms': round((time.perf_counter() - round_started_at) * 1000),
+                    'tool_ms': sum(outcome['duration_ms'] for outcome in outcomes),
+                }
+            )
+            telemetry_features.set_value(query, 'tool_call_round_timings', round_timings)
+            self.ap.logger.debug(
+                f'Tool call round {tool_call_round} of query {query.query_id}: {round_timings[-1]["calls"]} calls, '
+                f'{round_timings[-1]["wall_ms"]}ms wall time, {round_timings[-1]["tool_ms"]}ms tool time'
+            )
 
+            for tool_call, outcome in zip(pending_tool_calls, outcomes):
+                if outcome['error'] is None:
                     if is_stream:
                         msg = provider_message.MessageChunk(
                             role='tool',
-                            content=tool_content,
+                            content=outcome['content'],
                             tool_call_id=tool_call.id,
                         )
                     else:
                         msg = provider_message.Message(
                             role='tool',
-                            content=tool_content,
+                            content=outcome['content'],
                             tool_call_id=tool_call.id,
                         )
-
-                    yield msg
-
-                    req_messages.append(msg)
-                except Exception as e:
+                else:
                     if is_stream:
-                        err_msg = provider_message.MessageChunk(
+                        msg = provider_message.MessageChunk(
                             role='tool',
-                            content=f'err: {e}',
+                            content=f'err: {outcome["error"]}',
                             tool_call_id=tool_call.id,
                             is_final=True,
                         )
                     else:
-                        err_msg = provider_message.Message(role='tool', content=f'err: {e}', tool_call_id=tool_call.id)
+                        msg = provider_message.Message(
+                            role='tool', content=f'err: {outcome["error"]}', tool_call_id=tool_call.id
+                        )
 
-                    yield err_msg
+                yield msg
 
-                    req_messages.append(err_msg)
+                req_messages.append(msg)
 
             self.ap.logger.debug(
                 f'localagent req: query={query.query_id} req_messages={req_messages} '
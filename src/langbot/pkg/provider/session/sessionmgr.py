@@ -9,47 +9,21 @@ from langbot_plugin.api.entities.builtin.provider import message as provider_mes
 import langbot_plugin.api.entities.builtin.provider.session as provider_session
 import langbot_plugin.api.entities.builtin.pipeline.query as pipeline_query
 
-from ...api.http.context import ExecutionContext
 from ...core import app
 from ...pipeline.pool import (
     ExecutionContextMismatchError,
-    ExecutionContextRequiredError,
     bind_execution_context,
-    get_query_execution_context,
+    query_session_key,
 )
+from ...pipeline.scheduler import SessionKey
+from . import store as conversation_store
 
-SessionKey = tuple[
-    str,
-    str,
-    int,
-    str,
-    str,
-    int | str,
-]
 SessionExpiryEntry = tuple[float, int, SessionKey]
 
 _SESSION_EXPIRY_HEAP_MIN_LIMIT = 64
 _SESSION_EXPIRY_HEAP_ACTIVE_MULTIPLIER = 4
 
 
-def _query_session_key(query: pipeline_query.Query) -> tuple[SessionKey, ExecutionContext]:
-    execution_context = get_query_execution_context(query)
-    bot_uuid = getattr(query, 'bot_uuid', None)
-    if not isinstance(bot_uuid, str) or not bot_uuid.strip():
-        raise ExecutionContextRequiredError('Query.bot_uuid is required for session lookup')
-
-    execution_context = bind_execution_context(execution_context, bot_uuid=bot_uuid)
-    key: SessionKey = (
-        execution_context.instance_uuid,
-        execution_context.workspace_uuid,
-        execution_context.placement_generation,
-        bot_uuid,
-        query.launcher_type.value,
-        query.launcher_id,
-    )
-    return key, execution_context
-
-
 class SessionManager:
     """会话管理器"""
 
@@ -62,6 +36,7 @@ class SessionManager:
         self._session_keys_by_workspace: dict[str, set[SessionKey]] = {}
         self._session_expiry_heap: list[SessionExpiryEntry] = []
         self._next_access_revision = 0
+        self.store = conversation_store.ConversationStore(ap)
 
     @property
     def session_list(self) -> list[provider_session.Session]:
@@ -270,11 +245,12 @@ class SessionManager:
 
     async def get_session(self, query: pipeline_query.Query) -> provider_session.Session:
         """获取会话"""
-        session_key, execution_context = _query_session_key(query)
+        session_key, execution_context = query_session_key(query)
         now = time.monotonic()
         session = self._session_index.get(session_key)
         if session is not None:
             self._touch_session(session, session_key, now)
+            self.store.stats.hot_hits += 1
             return session
 
         self._prune_sessions(now, execution_context.workspace_uuid)
@@ -320,6 +296,9 @@ class SessionManager:
         object.__setattr__(session, '_execution_context', session_context)
         object.__setattr__(session, '_langbot_session_key', session_key)
         object.__setattr__(session, '_langbot_session_concurrency', session_concurrency)
+        # A chat that is not in the hot tier may still have history in the
+        # conversation store from before a restart or an eviction.
+        object.__setattr__(session, '_langbot_rehydrate_pending', True)
         session._semaphore = asyncio.Semaphore(session_concurrency)
         self._session_index[session_key] = session
         self._session_keys_by_workspace.setdefault(
@@ -339,7 +318,7 @@ class SessionManager:
     ) -> provider_session.Conversation:
         """获取对话或创建对话"""
 
-        session_key, execution_context = _query_session_key(query)
+        session_key, execution_context = query_session_key(query)
         if getattr(session, '_langbot_session_key', None) != session_key:
             raise ExecutionContextMismatchError('Session does not belong to the Query execution scope')
         execution_context = bind_execution_context(
@@ -369,12 +348,36 @@ class SessionManager:
             or session.using_conversation.pipeline_uuid != pipeline_uuid
             or session.using_conversation.bot_uuid != bot_uuid
         ):
+            store_key = (
+                execution_context.workspace_uuid,
+                conversation_store.session_digest(bot_uuid, session_key[4], session_key[5]),
+            )
+            persistent = self.store.persistent
+            stored = None
+            rehydrating = getattr(session, '_langbot_rehydrate_pending', False)
+            if rehydrating:
+                object.__setattr__(session, '_langbot_rehydrate_pending', False)
+                if persistent:
+                    stored = await self.store.load(*store_key)
+            restored = stored is not None and stored.pipeline_uuid == pipeline_uuid and stored.bot_uuid == bot_uuid
+
             conversation = provider_session.Conversation(
                 prompt=prompt,
-                messages=[],
+                messages=stored.messages if restored else [],
                 pipeline_uuid=pipeline_uuid,
                 bot_uuid=bot_uuid,
             )
+            if restored:
+                conversation.uuid = stored.conversation_uuid
+                if stored.update_time is not None:
+                    conversation.update_time = stored.update_time
+            if persistent:
+                object.__setattr__(conversation, '_langbot_store_key', store_key)
+                if not restored and not (rehydrating and stored is None):
+                    # The conversation was reset or the chat moved to another
+                    # pipeline; overwrite the stored history so it is not
+                    # restored after the next eviction.
+                    self.store.mark_dirty(*store_key, conversation)
             session.conversations.append(conversation)
             max_conversations = self._positive_config_int('max_conversations_per_session', 20)
             if len(session.conversations) > max_conversations:
@@ -420,3 +423,7 @@ class SessionManager:
                 if getattr(element, 'file_base64', None) is not None:
                     element.file_base64 = None
         conversation.messages = retained
+
+        store_key = getattr(conversation, '_langbot_store_key', None)
+        if store_key is not None and self.store.persistent:
+            self.store.mark_dirty(*store_key, conversation)
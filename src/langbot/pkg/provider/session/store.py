@@ -0,0 +1,333 @@
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import datetime
+import hashlib
+import json
+import time
+import zlib
+
+import sqlalchemy
+from sqlalchemy.dialects import postgresql as postgresql_dialect
+from sqlalchemy.dialects import sqlite as sqlite_dialect
+
+from langbot_plugin.api.entities.builtin.provider import message as provider_message
+import langbot_plugin.api.entities.builtin.provider.session as provider_session
+
+from ...core import app
+from ...entity.persistence import conversation as persistence_conversation
+
+
+_DEFAULT_TTL_SECONDS = 30 * 86400
+_DEFAULT_WRITE_BEHIND_SECONDS = 2.0
+_MAX_WRITE_BEHIND_SECONDS = 60.0
+_DEFAULT_MAX_PENDING_WRITES = 5000
+
+StoreKey = tuple[str, str]
+"""(workspace_uuid, session_digest)"""
+
+
+def _utcnow() -> datetime.datetime:
+    return datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+
+
+def session_digest(bot_uuid: str, launcher_type: str, launcher_id: int | str) -> str:
+    """Identify a chat within its Workspace across restarts and placement changes."""
+
+    return hashlib.sha256('\x1f'.join((bot_uuid, launcher_type, str(launcher_id))).encode('utf-8')).hexdigest()
+
+
+def pack_messages(messages: list[provider_message.Message]) -> bytes:
+    payload = []
+    for message in messages:
+        data = message.model_dump(mode='json', exclude_none=True)
+        # Streamed replies are kept as chunks; only the Message fields matter.
+        data.pop('is_final', None)
+        data.pop('msg_sequence', None)
+        content = data.get('content')
+        if isinstance(content, list):
+            for element in content:
+                element.pop('image_base64', None)
+                element.pop('file_base64', None)
+        payload.append(data)
+    return zlib.compress(json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+
+
+def unpack_messages(data: bytes) -> list[provider_message.Message]:
+    return [provider_message.Message.model_validate(item) for item in json.loads(zlib.decompress(data))]
+
+
+@dataclasses.dataclass(slots=True)
+class StoredConversation:
+    bot_uuid: str
+    pipeline_uuid: str
+    conversation_uuid: str | None
+    messages: list[provider_message.Message]
+    update_time: datetime.datetime | None
+    """Local time of the last write, comparable with ``Conversation.update_time``"""
+
+
+@dataclasses.dataclass(slots=True)
+class _PendingWrite:
+    bot_uuid: str
+    pipeline_uuid: str
+    conversation: provider_session.Conversation
+
+
+@dataclasses.dataclass(slots=True)
+class ConversationStoreStats:
+    hot_hits: int = 0
+    cold_hits: int = 0
+    cold_misses: int = 0
+    read_errors: int = 0
+    writes: int = 0
+    write_errors: int = 0
+    dropped_writes: int = 0
+    bytes_written: int = 0
+
+
+class ConversationStore:
+    """Cold tier for the conversations cached by SessionManager.
+
+    The session cache is the bounded hot tier. When ``persistent`` is enabled,
+    the conversation a session is using is written behind to the
+    ``conversation_snapshots`` table as one compressed row per chat, at most
+    every ``write_behind_seconds``, so several turns are coalesced into one
+    upsert. A session created after a restart or an idle eviction rehydrates
+    its history from that row on the first ``get_conversation``.
+    """
+
+    ap: app.Application
+
+    def __init__(self, ap: app.Application) -> None:
+        self.ap = ap
+        self._pending: dict[StoreKey, _PendingWrite] = {}
+        self._inflight: dict[StoreKey, _PendingWrite] = {}
+        self._flush_lock = asyncio.Lock()
+        self.stats = ConversationStoreStats()
+        self.last_flush_seconds = 0.0
+
+    def _config(self) -> dict:
+        instance_config = getattr(self.ap, 'instance_config', None)
+        data = getattr(instance_config, 'data', {})
+        config = data.get('system', {}).get('session_retention', {}) if isinstance(data, dict) else {}
+        return config if isinstance(config, dict) else {}
+
+    def _positive_number(self, name: str, default: float, hard_max: float | None = None) -> float:
+        value = self._config().get(name, default)
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or value <= 0:
+            value = default
+        return min(value, hard_max) if hard_max is not None else value
+
+    @property
+    def persistent(self) -> bool:
+        return self._config().get('persistent', False) is True and getattr(self.ap, 'persistence_mgr', None) is not None
+
+    @property
+    def ttl_seconds(self) -> int:
+        return int(self._positive_number('persistent_ttl_seconds', _DEFAULT_TTL_SECONDS))
+
+    @property
+    def write_behind_seconds(self) -> float:
+        return float(
+            self._positive_number('write_behind_seconds', _DEFAULT_WRITE_BEHIND_SECONDS, _MAX_WRITE_BEHIND_SECONDS)
+        )
+
+    async def _execute(self, workspace_uuid: str, statement) -> sqlalchemy.Result:
+        tenant_uow = getattr(self.ap.persistence_mgr, 'tenant_uow', None)
+        if callable(tenant_uow):
+            async with tenant_uow(workspace_uuid):
+                return await self.ap.persistence_mgr.execute_async(statement)
+        return await self.ap.persistence_mgr.execute_async(statement)
+
+    async def load(self, workspace_uuid: str, digest: str) -> StoredConversation | None:
+        """Return the last written conversation of a chat, including writes still queued."""
+
+        key = (workspace_uuid, digest)
+        pending = self._pending.get(key) or self._inflight.get(key)
+        if pending is not None:
+            self.stats.cold_hits += 1
+            return StoredConversation(
+                bot_uuid=pending.bot_uuid,
+                pipeline_uuid=pending.pipeline_uuid,
+                conversation_uuid=pending.conversation.uuid,
+                messages=list(pending.conversation.messages),
+                update_time=pending.conversation.update_time,
+            )
+
+        Snapshot = persistence_conversation.ConversationSnapshot
+        try:
+            result = await self._execute(
+                workspace_uuid,
+                sqlalchemy.select(
+                    Snapshot.bot_uuid,
+                    Snapshot.pipeline_uuid,
+                    Snapshot.conversation_uuid,
+                    Snapshot.messages,
+                    Snapshot.updated_at,
+                ).where(
+                    Snapshot.workspace_uuid == workspace_uuid,
+                    Snapshot.session_digest == digest,
+                    Snapshot.updated_at > _utcnow() - datetime.timedelta(seconds=self.ttl_seconds),
+                ),
+            )
+            row = result.first()
+            messages = unpack_messages(row.messages) if row is not None else []
+        except Exception as exc:
+            self.stats.read_errors += 1
+            self.ap.logger.warning(f'Conversation store read failed for Workspace {workspace_uuid}: {exc}')
+            return None
+        if row is None:
+            self.stats.cold_misses += 1
+            return None
+        self.stats.cold_hits += 1
+        return StoredConversation(
+            bot_uuid=row.bot_uuid,
+            pipeline_uuid=row.pipeline_uuid,
+            conversation_uuid=row.conversation_uuid,
+            messages=messages,
+            update_time=row.updated_at.replace(tzinfo=datetime.timezone.utc).astimezone().replace(tzinfo=None),
+        )
+
+    def mark_dirty(
+        self,
+        workspace_uuid: str,
+        digest: str,
+        conversation: provider_session.Conversation,
+    ) -> None:
+        """Queue the current state of ``conversation`` for the next write-behind flush."""
+
+        key = (workspace_uuid, digest)
+        if key not in self._pending and len(self._pending) >= _DEFAULT_MAX_PENDING_WRITES:
+            self.stats.dropped_writes += 1
+            return
+        self._pending[key] = _PendingWrite(
+            bot_uuid=conversation.bot_uuid or '',
+            pipeline_uuid=conversation.pipeline_uuid or '',
+            conversation=conversation,
+        )
+
+    def _upsert(self, rows: list[dict]):
+        Snapshot = persistence_conversation.ConversationSnapshot
+        dialect_name = self.ap.persistence_mgr.get_db_engine().dialect.name
+        insert = {
+            'postgresql': postgresql_dialect.insert,
+            'sqlite': sqlite_dialect.insert,
+        }.get(dialect_name)
+        if insert is None:
+            raise RuntimeError(f'Conversation store does not support the {dialect_name} dialect')
+        statement = insert(Snapshot).values(rows)
+        return statement.on_conflict_do_update(
+            index_elements=[Snapshot.workspace_uuid, Snapshot.session_digest],
+            set_={
+                name: statement.excluded[name]
+                for name in (
+                    'bot_uuid',
+                    'pipeline_uuid',
+                    'conversation_uuid',
+                    'message_count',
+                    'messages',
+                    'updated_at',
+                )
+            },
+        )
+
+    async def flush(self) -> int:
+        """Write every queued conversation and return the number of rows written."""
+
+        async with self._flush_lock:
+            if not self._pending:
+                return 0
+            started_at = time.perf_counter()
+            self._inflight, self._pending = self._pending, {}
+            rows_by_workspace: dict[str, list[dict]] = {}
+            updated_at = _utcnow()
+            for (workspace_uuid, digest), pending in self._inflight.items():
+                messages = list(pending.conversation.messages)
+                rows_by_workspace.setdefault(workspace_uuid, []).append(
+                    {
+                        'workspace_uuid': workspace_uuid,
+                        'session_digest': digest,
+                        'bot_uuid': pending.bot_uuid,
+                        'pipeline_uuid': pending.pipeline_uuid,
+                        'conversation_uuid': pending.conversation.uuid,
+                        'message_count': len(messages),
+                        'messages': pack_messages(messages),
+                        'updated_at': updated_at,
+                    }
+                )
+
+            written = 0
+            try:
+                for workspace_uuid, rows in rows_by_workspace.items():
+                    try:
+                        await self._execute(workspace_uuid, self._upsert(rows))
+                    except asyncio.CancelledError:
+                        raise
+                    except Exception as exc:
+                        self.stats.write_errors += len(rows)
+                        self.ap.logger.warning(
+                            f'Conversation store dropped {len(rows)} conversation writes '
+                            f'for Workspace {workspace_uuid}: {exc}'
+                        )
+                        continue
+                    written += len(rows)
+                    self.stats.writes += len(rows)
+                    self.stats.bytes_written += sum(len(row['messages']) for row in rows)
+            except asyncio.CancelledError:
+                # Keep unwritten conversations for the shutdown flush; newer
+                # queued states of the same chat take precedence.
+                self._pending = {**self._inflight, **self._pending}
+                raise
+            finally:
+                self._inflight = {}
+                self.last_flush_seconds = time.perf_counter() - started_at
+            return written
+
+    async def run(self) -> None:
+        """Flush queued conversations every ``write_behind_seconds``."""
+
+        while True:
+            await asyncio.sleep(self.write_behind_seconds)
+            try:
+                await self.flush()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                self.ap.logger.warning(f'Conversation store flush failed: {exc}')
+
+    async def close(self) -> None:
+        await self.flush()
+
+    async def prune_expired(self, workspace_uuid: str) -> int:
+        """Delete conversations idle for longer than the TTL in one Workspace."""
+
+        if not self.persistent:
+            return 0
+        Snapshot = persistence_conversation.ConversationSnapshot
+        result = await self._execute(
+            workspace_uuid,
+            sqlalchemy.delete(Snapshot).where(
+                Snapshot.workspace_uuid == workspace_uuid,
+                Snapshot.updated_at <= _utcnow() - datetime.timedelta(seconds=self.ttl_seconds),
+            ),
+        )
+        return max(result.rowcount or 0, 0)
+
+    def snapshot(self) -> dict[str, object]:
+        lookups = self.stats.hot_hits + self.stats.cold_hits + self.stats.cold_misses
+        return {
+            'persistent': self.persistent,
+            'hot_hits': self.stats.hot_hits,
+            'cold_hits': self.stats.cold_hits,
+            'cold_misses': self.stats.cold_misses,
+            'hot_hit_ratio': round(self.stats.hot_hits / lookups, 4) if lookups else 0.0,
+            'pending_writes': len(self._pending),
+            'writes': self.stats.writes,
+            'bytes_written': self.stats.bytes_written,
+            'read_errors': self.stats.read_errors,
+            'write_errors': self.stats.write_errors,
+            'dropped_writes': self.stats.dropped_writes,
+            'last_flush_ms': round(self.last_flush_seconds * 1000, 3),
+        }
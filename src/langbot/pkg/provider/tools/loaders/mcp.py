@@ -247,6 +247,13 @@ class RuntimeMCPSession:
 
     functions: list[resource_tool.LLMTool] = []
 
+    tools_revision: int = 0
+    """Incremented whenever ``functions`` is rebuilt"""
+
+    _tools_by_name: dict[str, resource_tool.LLMTool] = {}
+
+    _tools_index_key: tuple[int, int] | None = None
+
     resources: list[dict] = []
 
     resource_templates: list[dict] = []
@@ -642,6 +649,7 @@ class RuntimeMCPSession:
                     await self.exit_stack.aclose()
                     self.exit_stack = AsyncExitStack()
                 self.functions.clear()
+                self.tools_revision += 1
                 self.resources.clear()
                 self.session = None
             except Exception as e:
@@ -929,6 +937,7 @@ class RuntimeMCPSession:
             return
 
         self.functions.clear()
+        self.tools_revision += 1
         self.resources.clear()
         self.resource_templates.clear()
         self._resource_cache.clear()
@@ -960,6 +969,7 @@ class RuntimeMCPSession:
                     func=func,
                 )
             )
+        self.tools_revision += 1
 
         await self._refresh_resources()
         await self._assert_execution_active()
@@ -1177,6 +1187,17 @@ class RuntimeMCPSession:
     def get_tools(self) -> list[resource_tool.LLMTool]:
         return self.functions
 
+    def get_tool(self, name: str) -> resource_tool.LLMTool | None:
+        """Look up one tool of this server by name."""
+        index_key = (self.tools_revision, len(self.functions))
+        if self._tools_index_key != index_key:
+            tools_by_name: dict[str, resource_tool.LLMTool] = {}
+            for function in self.functions:
+                tools_by_name.setdefault(function.name, function)
+            self._tools_by_name = tools_by_name
+            self._tools_index_key = index_key
+        return self._tools_by_name.get(name)
+
     def get_resources(self) -> list[dict]:
         return self.resources
 
@@ -2257,23 +2278,35 @@ class MCPLoader(loader.ToolLoader):
 
         return items
 
+    async def tool_catalog_revision(self, context: TenantContext) -> frozenset:
+        """Return a marker that changes whenever ``get_tools`` may return different tools."""
+        await self._assert_execution_active(context)
+        return frozenset(
+            (
+                id(session),
+                session.server_uuid,
+                session.tools_revision,
+                len(session.functions),
+                session.enable,
+                session.status,
+                session.session is not None and session.has_resource_support(),
+            )
+            for session in self._sessions_for_context(context)
+        )
+
     async def has_tool(self, context: TenantContext, name: str) -> bool:
         """检查工具是否存在"""
-        await self._assert_execution_active(context)
         if name in (MCP_TOOL_LIST_RESOURCES, MCP_TOOL_READ_RESOURCE):
+            await self._assert_execution_active(context)
             return bool(self._eligible_resource_sessions_for_bound(context, None))
-        for session in self._sessions_for_context(context):
-            for function in session.get_tools():
-                if function.name == name:
-                    return True
-        return False
+        return await self.get_tool(context, name) is not None
 
     async def get_tool(self, context: TenantContext, name: str) -> resource_tool.LLMTool | None:
         await self._assert_execution_active(context)
         for session in self._sessions_for_context(context):
-            for function in session.get_tools():
-                if function.name == name:
-                    return function
+            function = session.get_tool(name)
+            if function is not None:
+                return function
         return None
 
     async def invoke_tool(self, name: str, parameters: dict, query: pipeline_query.Query) -> typing.Any:
@@ -2289,16 +2322,15 @@ class MCPLoader(loader.ToolLoader):
             return await self._invoke_mcp_read_resource(parameters, query)
 
         for session in self._sessions_for_context(execution_context):
-            for function in session.get_tools():
-                if function.name == name:
-                    self.ap.logger.debug(f'Invoking MCP tool: {name} with parameters: {parameters}')
-                    try:
-                        result = await session.invoke_mcp_tool(name, parameters, query=query)
-                        self.ap.logger.debug(f'MCP tool {name} executed successfully')
-                        return result
-                    except Exception as e:
-                        self.ap.logger.error(f'Error invoking MCP tool {name}: {e}\n{traceback.format_exc()}')
-                        raise
+            if session.get_tool(name) is not None:
+                self.ap.logger.debug(f'Invoking MCP tool: {name} with parameters: {parameters}')
+                try:
+                    result = await session.invoke_mcp_tool(name, parameters, query=query)
+                    self.ap.logger.debug(f'MCP tool {name} executed successfully')
+                    return result
+                except Exception as e:
+                    self.ap.logger.error(f'Error invoking MCP tool {name}: {e}\n{traceback.format_exc()}')
+                    raise
 
         raise ValueError(f'Tool not found: {name}')
 
@@ -53,16 +53,10 @@ class PluginToolLoader(loader.ToolLoader):
 
     async def has_tool(self, name: str) -> bool:
         """检查工具是否存在"""
-        for tool in await self.ap.plugin_connector.list_tools():
-            if tool.metadata.name == name:
-                return True
-        return False
+        return await self.get_tool(name) is not None
 
     async def get_tool(self, name: str) -> ComponentManifest | None:
-        for tool in await self.ap.plugin_connector.list_tools():
-            if tool.metadata.name == name:
-                return tool
-        return None
+        return await self.ap.plugin_connector.get_tool(name)
 
     async def invoke_tool(self, name: str, parameters: dict, query: pipeline_query.Query) -> typing.Any:
         try:
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import collections
 import typing
 import time
 import inspect
@@ -11,7 +12,7 @@ from langbot_plugin.api.entities.events import pipeline_query
 from . import loader as tool_loader
 from .errors import ToolNotFoundError
 from ...pipeline.pool import get_query_execution_context
-from ...api.http.service.tenant import TenantContext
+from ...api.http.service.tenant import TenantContext, require_workspace_uuid
 
 if TYPE_CHECKING:
     from ...core import app
@@ -23,6 +24,9 @@ if TYPE_CHECKING:
     )
 
 
+_MAX_TOOL_CATALOGS = 1024
+
+
 class ToolManager:
     """LLM工具管理器"""
 
@@ -35,6 +39,18 @@ class ToolManager:
 
     def __init__(self, ap: app.Application):
         self.ap = ap
+        self._tool_catalogs: collections.OrderedDict[tuple, tuple[tuple, list[resource_tool.LLMTool]]] = (
+            collections.OrderedDict()
+        )
+
+    async def _tool_catalog_revision(self, context: TenantContext) -> tuple | None:
+        """Combine the plugin and MCP revisions; ``None`` when a source cannot report one."""
+
+        plugin_revision = getattr(getattr(self.ap, 'plugin_connector', None), 'tool_catalog_revision', None)
+        mcp_revision = getattr(getattr(self, 'mcp_tool_loader', None), 'tool_catalog_revision', None)
+        if not callable(plugin_revision) or not callable(mcp_revision):
+            return None
+        return plugin_revision(require_workspace_uuid(context)), await mcp_revision(context)
 
     async def _bind_plugin_workspace(self, context: TenantContext) -> None:
         """Select the tenant before any plugin catalog lookup.
@@ -96,10 +112,32 @@ class ToolManager:
         include_skill_authoring: bool = False,
         include_mcp_resource_tools: bool = True,
     ) -> list[resource_tool.LLMTool]:
-        await self._bind_plugin_workspace(context)
-        all_functions: list[resource_tool.LLMTool] = []
+        """Return the tools available to a query.
 
+        The result is cached per Workspace and tool selection, and reused
+        until a plugin changes, an MCP server refreshes its tools or the
+        plugin tool catalog TTL passes.
+        """
+        await self._bind_plugin_workspace(context)
         sandbox_available = await self._workspace_sandbox_available(context)
+
+        revision = await self._tool_catalog_revision(context)
+        cache_key = (
+            require_workspace_uuid(context),
+            getattr(context, 'instance_uuid', None),
+            getattr(context, 'placement_generation', None),
+            tuple(bound_plugins) if bound_plugins is not None else None,
+            tuple(bound_mcp_servers) if bound_mcp_servers is not None else None,
+            sandbox_available,
+            include_skill_authoring,
+            include_mcp_resource_tools,
+        )
+        cached = self._tool_catalogs.get(cache_key) if revision is not None else None
+        if cached is not None and cached[0] == revision:
+            self._tool_catalogs.move_to_end(cache_key)
+            return list(cached[1])
+
+        all_functions: list[resource_tool.LLMTool] = []
         if sandbox_available:
             all_functions.extend(await self.native_tool_loader.get_tools())
         if include_skill_authoring and sandbox_available:
@@ -113,7 +151,12 @@ class ToolManager:
             )
         )
 
-        return all_functions
+        if revision is not None:
+            self._tool_catalogs[cache_key] = (revision, all_functions)
+            self._tool_catalogs.move_to_end(cache_key)
+            while len(self._tool_catalogs) > _MAX_TOOL_CATALOGS:
+                self._tool_catalogs.popitem(last=False)
+        return list(all_functions)
 
     async def get_tool_catalog(
         self,
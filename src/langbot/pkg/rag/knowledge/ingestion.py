@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import collections
+import contextlib
+import time
+import typing
+
+from langbot.pkg.core import taskmgr
+
+
+class IngestionProgress:
+    """Chunks stored for one file, mirrored into its task context."""
+
+    def __init__(self, task_context: taskmgr.TaskContext, clock: typing.Callable[[], float] = time.monotonic):
+        self.task_context = task_context
+        self.clock = clock
+        self.started_at = clock()
+        self.chunks_stored = 0
+        self.upsert_batches = 0
+
+    def record(self, chunks: int) -> None:
+        self.chunks_stored += chunks
+        self.upsert_batches += 1
+        elapsed = max(self.clock() - self.started_at, 1e-9)
+        self.task_context.metadata['ingestion'] = {
+            'chunks_stored': self.chunks_stored,
+            'upsert_batches': self.upsert_batches,
+            'elapsed_seconds': round(elapsed, 3),
+            'chunks_per_second': round(self.chunks_stored / elapsed, 2),
+        }
+        self.task_context.set_current_action(f'Storing chunks ({self.chunks_stored} stored)')
+
+
+class IngestionTracker:
+    """Attribute vector upserts from knowledge engine plugins to the file being ingested.
+
+    Plugins tag each chunk's metadata with the ``file_id`` Core passed to
+    ``ingest`` as ``document_id``, so upserts can be matched to the file task
+    that is waiting on the plugin.
+    """
+
+    def __init__(self) -> None:
+        self._active: dict[tuple[str, str, str], IngestionProgress] = {}
+
+    @contextlib.contextmanager
+    def track(
+        self,
+        workspace_uuid: str,
+        knowledge_base_uuid: str,
+        file_id: str,
+        task_context: taskmgr.TaskContext,
+    ) -> typing.Iterator[IngestionProgress]:
+        key = (workspace_uuid, knowledge_base_uuid, file_id)
+        progress = IngestionProgress(task_context)
+        self._active[key] = progress
+        try:
+            yield progress
+        finally:
+            if self._active.get(key) is progress:
+                del self._active[key]
+
+    def record_upsert(
+        self,
+        workspace_uuid: str,
+        knowledge_base_uuid: str,
+        metadatas: typing.Sequence[dict[str, typing.Any]],
+    ) -> None:
+        if not self._active:
+            return
+        counts = collections.Counter(metadata.get('file_id') for metadata in metadatas if isinstance(metadata, dict))
+        for file_id, chunks in counts.items():
+            progress = self._active.get((workspace_uuid, knowledge_base_uuid, file_id))
+            if progress is not None:
+                progress.record(chunks)
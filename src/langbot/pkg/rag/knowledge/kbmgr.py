@@ -1,12 +1,12 @@
 from __future__ import annotations
 import asyncio
-import io
 import mimetypes
 import os.path
+import tempfile
 import traceback
 import uuid
 import zipfile
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 import sqlalchemy
 from langbot_plugin.api.entities.builtin.rag import context as rag_context
@@ -19,14 +19,34 @@ from langbot.pkg.core.task_boundary import run_in_workspace_uow
 from langbot.pkg.entity.persistence import rag as persistence_rag
 from langbot.pkg.workspace.errors import WorkspaceInvariantError, WorkspaceNotFoundError
 
+from . import ingestion
 from .base import KnowledgeBaseInterface
 
+if TYPE_CHECKING:
+    from langbot.pkg.storage.mgr import StorageObjectStream
+
 
 _MAX_ZIP_ARCHIVE_ENTRIES = 1024
 _MAX_ZIP_DOCUMENTS = 8
 _MAX_ZIP_FILE_BYTES = 10 * 1024 * 1024
 _MAX_ZIP_UNCOMPRESSED_BYTES = 40 * 1024 * 1024
 _MAX_ZIP_COMPRESSION_RATIO = 100
+# Archives larger than this are spooled to a temporary file instead of memory.
+_ZIP_SPOOL_MEMORY_BYTES = 1024 * 1024
+
+
+async def _spool_object(stream: StorageObjectStream) -> tempfile.SpooledTemporaryFile:
+    """Copy a stored object into a seekable spool that moves to disk once it outgrows memory."""
+
+    spool = tempfile.SpooledTemporaryFile(max_size=_ZIP_SPOOL_MEMORY_BYTES)
+    try:
+        async for chunk in stream.iter_chunks():
+            await asyncio.to_thread(spool.write, chunk)
+        spool.seek(0)
+    except BaseException:
+        spool.close()
+        raise
+    return spool
 
 
 class RuntimeKnowledgeBase(KnowledgeBaseInterface):
@@ -148,19 +168,25 @@ class RuntimeKnowledgeBase(KnowledgeBaseInterface):
                 await self._require_plugin_runtime_context(execution_context)
                 parsed_content = await self.ap.plugin_connector.call_parser(parser_plugin_id, parse_context, file_bytes)
 
-            # Call plugin to ingest document
-            result = await self._ingest_document(
-                execution_context,
-                {
-                    'document_id': file.uuid,
-                    'filename': file.file_name,
-                    'extension': file.extension,
-                    'file_size': file_size,
-                    'mime_type': mime_type,
-                },
-                file.file_name,  # storage path
-                parsed_content=parsed_content,
-            )
+            # Call plugin to ingest document; its vector upserts report progress on this task.
+            with self._ingestion_tracker().track(
+                execution_context.workspace_uuid,
+                self.knowledge_base_entity.uuid,
+                file.uuid,
+                task_context,
+            ):
+                result = await self._ingest_document(
+                    execution_context,
+                    {
+                        'document_id': file.uuid,
+                        'filename': file.file_name,
+                        'extension': file.extension,
+                        'file_size': file_size,
+                        'mime_type': mime_type,
+                    },
+                    file.file_name,  # storage path
+                    parsed_content=parsed_content,
+                )
 
             # Check plugin result status
             if result.get('status') == 'failed':
@@ -196,6 +222,10 @@ class RuntimeKnowledgeBase(KnowledgeBaseInterface):
             except (WorkspaceRequiredError, WorkspaceNotFoundError):
                 self.ap.logger.warning(f'Skipping stale RAG upload cleanup for file {file.uuid}')
 
+    def _ingestion_tracker(self) -> ingestion.IngestionTracker:
+        tracker = getattr(getattr(self.ap, 'rag_mgr', None), 'ingestion_tracker', None)
+        return tracker if isinstance(tracker, ingestion.IngestionTracker) else ingestion.IngestionTracker()
+
     async def _set_file_status(
         self,
         execution_context: ExecutionContext,
@@ -304,7 +334,7 @@ class RuntimeKnowledgeBase(KnowledgeBaseInterface):
         self._require_upload_object_key(execution_context, zip_file_id)
         self.ap.logger.info(f'Processing ZIP file: {zip_file_id}')
 
-        zip_bytes = await self.ap.storage_mgr.load_scoped_object_key(
+        zip_object = await self.ap.storage_mgr.open_scoped_object_key(
             execution_context,
             zip_file_id,
             expected_owner_type='upload_document',
@@ -314,8 +344,13 @@ class RuntimeKnowledgeBase(KnowledgeBaseInterface):
         stored_file_tasks = []
 
         try:
+            # An archive can never usefully be larger than the documents it may expand to.
+            if zip_object.size > _MAX_ZIP_UNCOMPRESSED_BYTES:
+                raise ValueError('ZIP archive exceeds the size limit')
+            zip_spool = await _spool_object(zip_object)
+
             # use utf-8 encoding
-            with zipfile.ZipFile(io.BytesIO(zip_bytes), 'r', metadata_encoding='utf-8') as zip_ref:
+            with zip_spool, zipfile.ZipFile(zip_spool, 'r', metadata_encoding='utf-8') as zip_ref:
                 if len(zip_ref.filelist) > _MAX_ZIP_ARCHIVE_ENTRIES:
                     raise ValueError('ZIP archive contains too many entries')
 
@@ -354,21 +389,28 @@ class RuntimeKnowledgeBase(KnowledgeBaseInterface):
                     if len(supported_files) > _MAX_ZIP_DOCUMENTS:
                         raise ValueError('ZIP archive contains too many supported documents')
 
-                for file_info in supported_files:
+                async def iter_entry(file_info: zipfile.ZipInfo):
+                    entry = await asyncio.to_thread(zip_ref.open, file_info)
                     try:
-                        file_content = await asyncio.to_thread(zip_ref.read, file_info)
+                        while chunk := await asyncio.to_thread(entry.read, _ZIP_SPOOL_MEMORY_BYTES):
+                            yield chunk
+                    finally:
+                        entry.close()
 
+                async def store_entry(file_info: zipfile.ZipInfo) -> str | None:
+                    try:
                         base_name = file_info.filename.replace('/', '_').replace('\\', '_')
                         file_stem, file_ext = os.path.splitext(base_name)
                         extension = file_ext.lstrip('.')
 
                         extracted_file_id = file_stem + '_' + str(uuid.uuid4())[:8] + '.' + extension
-                        extracted_object_key = await self.ap.storage_mgr.save_scoped(
+                        extracted_object_key = await self.ap.storage_mgr.save_scoped_stream(
                             execution_context,
                             owner_type='upload_document',
                             owner=f'knowledge-base:{self.knowledge_base_entity.uuid}',
                             key=extracted_file_id,
-                            value=file_content,
+                            chunks=iter_entry(file_info),
+                            max_bytes=_MAX_ZIP_FILE_BYTES,
                         )
 
                         try:
@@ -384,17 +426,29 @@ class RuntimeKnowledgeBase(KnowledgeBaseInterface):
                                 expected_owner_type='upload_document',
                             )
                             raise
-                        stored_file_tasks.append(task_id)
 
                         self.ap.logger.info(
                             f'Extracted and stored file from ZIP: {file_info.filename} -> {extracted_object_key}'
                         )
+                        return task_id
 
                     except taskmgr.TaskCapacityError:
                         raise
                     except Exception as e:
                         self.ap.logger.warning(f'Failed to extract file {file_info.filename} from ZIP: {e}')
-                        continue
+                        return None
+
+                # Entries are streamed, saved and scheduled concurrently; each
+                # one becomes its own ingestion task. Every entry finishes
+                # before the archive is closed, even when one of them fails.
+                task_ids = await asyncio.gather(
+                    *(store_entry(file_info) for file_info in supported_files),
+                    return_exceptions=True,
+                )
+                for task_id in task_ids:
+                    if isinstance(task_id, BaseException):
+                        raise task_id
+                stored_file_tasks = [task_id for task_id in task_ids if task_id is not None]
 
             if not stored_file_tasks:
                 raise Exception('No supported files found in ZIP archive')
@@ -619,9 +673,12 @@ class RAGManager:
 
     knowledge_bases: dict[tuple[str, str], RuntimeKnowledgeBase]
 
+    ingestion_tracker: ingestion.IngestionTracker
+
     def __init__(self, ap: app.Application):
         self.ap = ap
         self.knowledge_bases = {}
+        self.ingestion_tracker = ingestion.IngestionTracker()
         self._scope_generations: dict[tuple[str, str], int] = {}
         self._knowledge_keys_by_scope: dict[
             tuple[str, str],
@@ -14,6 +14,7 @@ from langbot.pkg.workspace.errors import WorkspaceNotFoundError
 
 if TYPE_CHECKING:
     from langbot.pkg.core import app
+    from langbot.pkg.storage.mgr import StorageObjectStream
 
 
 class RAGRuntimeService:
@@ -97,6 +98,9 @@ class RAGRuntimeService:
             metadata=metadatas,
             documents=documents,
         )
+        tracker = getattr(getattr(self.ap, 'rag_mgr', None), 'ingestion_tracker', None)
+        if tracker is not None:
+            tracker.record_upsert(execution_context.workspace_uuid, knowledge_base_uuid, metadatas)
 
     async def vector_search(
         self,
@@ -186,16 +190,12 @@ class RAGRuntimeService:
             offset=offset,
         )
 
-    async def get_file_stream(
+    async def _resolve_knowledge_file(
         self,
         execution_context: ExecutionContext,
         storage_path: str,
-    ) -> bytes:
-        """Handle GET_KNOWLEDEGE_FILE_STREAM action.
-
-        Uses the storage manager abstraction to load file content,
-        regardless of the underlying storage provider.
-        """
+    ) -> str:
+        """Validate ``storage_path`` and return it normalized once it names a file of this Workspace."""
         # Validate storage_path to prevent path traversal
         decoded_path = unquote(storage_path).replace('\\', '/')
         decoded_segments = decoded_path.split('/')
@@ -218,9 +218,39 @@ class RAGRuntimeService:
         )
         if result.first() is None:
             raise WorkspaceNotFoundError('Knowledge file not found')
+        return normalized
+
+    async def get_file_stream(
+        self,
+        execution_context: ExecutionContext,
+        storage_path: str,
+    ) -> bytes:
+        """Handle GET_KNOWLEDEGE_FILE_STREAM action.
+
+        Uses the storage manager abstraction to load file content,
+        regardless of the underlying storage provider.
+        """
+        normalized = await self._resolve_knowledge_file(execution_context, storage_path)
         content_bytes = await self.ap.storage_mgr.load_scoped_object_key(
             execution_context,
             normalized,
             expected_owner_type='upload_document',
         )
         return content_bytes if content_bytes else b''
+
+    async def open_file_stream(
+        self,
+        execution_context: ExecutionContext,
+        storage_path: str,
+    ) -> StorageObjectStream:
+        """Chunked counterpart of :meth:`get_file_stream` for files too large to load whole.
+
+        Validation happens before the reader is returned, so iterating it
+        touches storage only.
+        """
+        normalized = await self._resolve_knowledge_file(execution_context, storage_path)
+        return await self.ap.storage_mgr.open_scoped_object_key(
+            execution_context,
+            normalized,
+            expected_owner_type='upload_document',
+        )
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
+import dataclasses
 import hashlib
 import json
 import re
+import typing
 from pathlib import PurePath
 
 from ..core import app
@@ -15,6 +17,8 @@ from .providers import localstorage
 
 _SAFE_OWNER_TYPE = re.compile(r'^[a-z][a-z0-9_-]{0,63}$')
 _DEFAULT_OBJECT_READ_BYTES = 10 * 1024 * 1024
+_DEFAULT_STREAM_OBJECT_BYTES = 512 * 1024 * 1024
+_HARD_MAX_STREAM_OBJECT_BYTES = 5 * 1024 * 1024 * 1024
 _SCOPED_KEY = re.compile(
     r'^v1/(?P<instance>[a-f0-9]{24})/'
     r'(?P<workspace>[0-9a-fA-F-]{36})/'
@@ -25,6 +29,35 @@ _SCOPED_KEY = re.compile(
 )
 
 
+@dataclasses.dataclass(frozen=True)
+class StorageObjectStream:
+    """A validated object that can be read in chunks without loading it whole."""
+
+    storage_provider: provider.StorageProvider
+    object_key: str
+    size: int
+
+    def iter_chunks(
+        self,
+        *,
+        offset: int = 0,
+        length: int | None = None,
+        chunk_size: int = provider.DEFAULT_STREAM_CHUNK_BYTES,
+    ) -> typing.AsyncIterator[bytes]:
+        return self.storage_provider.iter_chunks(
+            self.object_key,
+            offset=offset,
+            length=length,
+            chunk_size=chunk_size,
+        )
+
+    def local_path(self) -> str | None:
+        """Filesystem path of the object when the provider keeps it on local disk."""
+
+        local_path = getattr(self.storage_provider, 'local_path', None)
+        return local_path(self.object_key) if callable(local_path) else None
+
+
 class StorageMgr:
     """Storage manager"""
 
@@ -48,6 +81,19 @@ class StorageMgr:
             configured = _DEFAULT_OBJECT_READ_BYTES
         return min(max(configured, 1), provider.HARD_MAX_STORAGE_OBJECT_BYTES)
 
+    def _stream_object_limit(self) -> int:
+        config = getattr(getattr(self.ap, 'instance_config', None), 'data', {})
+        try:
+            configured = int(
+                config.get('storage', {}).get(
+                    'max_stream_object_bytes',
+                    _DEFAULT_STREAM_OBJECT_BYTES,
+                )
+            )
+        except (AttributeError, TypeError, ValueError):
+            configured = _DEFAULT_STREAM_OBJECT_BYTES
+        return min(max(configured, 1), _HARD_MAX_STREAM_OBJECT_BYTES)
+
     async def _load_object_bounded(self, object_key: str) -> bytes:
         max_bytes = self._object_read_limit()
         bounded_loader = getattr(self.storage_provider, 'load_bounded', None)
@@ -193,6 +239,38 @@ class StorageMgr:
         await self.storage_provider.save(object_key, value)
         return object_key
 
+    async def save_scoped_stream(
+        self,
+        context: ExecutionContext | RequestContext,
+        *,
+        owner_type: str,
+        owner: str,
+        key: str,
+        chunks: typing.AsyncIterable[bytes],
+        max_bytes: int | None = None,
+        preserve_suffix: bool = True,
+    ) -> str:
+        """Like :meth:`save_scoped`, but writes ``chunks`` as they arrive.
+
+        ``max_bytes`` defaults to ``storage.max_stream_object_bytes`` and can
+        only lower it. :class:`provider.StorageObjectTooLargeError` is raised once
+        the object exceeds it.
+        """
+
+        await self._require_active_execution_scope(context)
+        limit = self._stream_object_limit()
+        if max_bytes is not None:
+            limit = min(limit, max(int(max_bytes), 1))
+        object_key = self.scoped_object_key(
+            context,
+            owner_type=owner_type,
+            owner=owner,
+            key=key,
+            preserve_suffix=preserve_suffix,
+        )
+        await self.storage_provider.save_stream(object_key, chunks, max_bytes=limit)
+        return object_key
+
     async def load_scoped(
         self,
         context: ExecutionContext | RequestContext,
@@ -258,6 +336,34 @@ class StorageMgr:
                 return None
             return await self._load_object_bounded(object_key)
 
+    async def open_public_object(
+        self,
+        object_key: str,
+        *,
+        expected_owner_type: str,
+    ) -> StorageObjectStream | None:
+        """Streaming counterpart of :meth:`resolve_public_object`."""
+
+        match = _SCOPED_KEY.fullmatch(object_key)
+        if match is None or match.group('owner_type') != expected_owner_type:
+            return None
+        if match.group('instance') != self._digest(self.ap.workspace_service.instance_uuid, 24):
+            return None
+        workspace_uuid = match.group('workspace')
+        generation = int(match.group('generation'))
+        with bounded_executor.blocking_work_scope(workspace_uuid):
+            try:
+                await self.ap.workspace_service.get_execution_binding(
+                    workspace_uuid,
+                    expected_generation=generation,
+                )
+            except Exception:
+                return None
+            if not await self.storage_provider.exists(object_key):
+                return None
+            size = await self.storage_provider.size(object_key)
+        return StorageObjectStream(self.storage_provider, object_key, size)
+
     @classmethod
     def require_scoped_object_key(
         cls,
@@ -309,6 +415,24 @@ class StorageMgr:
         )
         return await self._load_object_bounded(object_key)
 
+    async def open_scoped_object_key(
+        self,
+        context: ExecutionContext | RequestContext,
+        object_key: str,
+        *,
+        expected_owner_type: str,
+    ) -> StorageObjectStream:
+        """Validate ``object_key`` against the captured scope and return a chunked reader for it."""
+
+        await self._require_active_execution_scope(context)
+        self.require_scoped_object_key(
+            context,
+            object_key,
+            expected_owner_type=expected_owner_type,
+        )
+        size = await self.storage_provider.size(object_key)
+        return StorageObjectStream(self.storage_provider, object_key, size)
+
     async def size_scoped_object_key(
         self,
         context: ExecutionContext | RequestContext,
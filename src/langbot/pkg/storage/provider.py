@@ -1,11 +1,18 @@
 from __future__ import annotations
 
 import abc
+import typing
 
-from ..core import app
+if typing.TYPE_CHECKING:
+    from ..core import app
 
 
 HARD_MAX_STORAGE_OBJECT_BYTES = 64 * 1024 * 1024
+DEFAULT_STREAM_CHUNK_BYTES = 1024 * 1024
+
+
+class StorageObjectTooLargeError(ValueError):
+    """A streamed object grew past the caller's byte limit; nothing was stored."""
 
 
 def normalize_read_limit(max_bytes: int) -> int:
@@ -18,6 +25,28 @@ def normalize_read_limit(max_bytes: int) -> int:
     return min(max(normalized, 1), HARD_MAX_STORAGE_OBJECT_BYTES)
 
 
+def normalize_stream_limit(max_bytes: int) -> int:
+    """Validate a streamed write limit; streamed objects never sit in memory, so only positivity is enforced."""
+
+    try:
+        normalized = int(max_bytes)
+    except (TypeError, ValueError):
+        normalized = HARD_MAX_STORAGE_OBJECT_BYTES
+    return max(normalized, 1)
+
+
+def normalize_range(offset: int, length: int | None, chunk_size: int) -> tuple[int, int | None, int]:
+    """Validate a range read and clamp the chunk size to the hard object cap."""
+
+    if isinstance(offset, bool) or not isinstance(offset, int) or offset < 0:
+        raise ValueError('Range offset must be a non-negative integer')
+    if length is not None and (isinstance(length, bool) or not isinstance(length, int) or length < 0):
+        raise ValueError('Range length must be a non-negative integer')
+    if isinstance(chunk_size, bool) or not isinstance(chunk_size, int) or chunk_size < 1:
+        chunk_size = DEFAULT_STREAM_CHUNK_BYTES
+    return offset, length, min(chunk_size, HARD_MAX_STORAGE_OBJECT_BYTES)
+
+
 class StorageProvider(abc.ABC):
     ap: app.Application
 
@@ -64,6 +93,55 @@ class StorageProvider(abc.ABC):
             raise ValueError(f'Storage object exceeds the {max_bytes}-byte read limit')
         return value
 
+    async def iter_chunks(
+        self,
+        key: str,
+        *,
+        offset: int = 0,
+        length: int | None = None,
+        chunk_size: int = DEFAULT_STREAM_CHUNK_BYTES,
+    ) -> typing.AsyncIterator[bytes]:
+        """Yield the object, or the ``[offset, offset + length)`` range of it, in chunks.
+
+        Fallback for third-party providers: the object is loaded under the hard
+        read cap and sliced. Built-in providers override this with real range
+        reads so memory stays bounded by ``chunk_size``.
+        """
+
+        offset, length, chunk_size = normalize_range(offset, length, chunk_size)
+        value = await self.load_bounded(key, max_bytes=HARD_MAX_STORAGE_OBJECT_BYTES)
+        end = len(value) if length is None else min(len(value), offset + length)
+        for start in range(offset, end, chunk_size):
+            yield value[start : min(start + chunk_size, end)]
+
+    async def save_stream(
+        self,
+        key: str,
+        chunks: typing.AsyncIterable[bytes],
+        *,
+        max_bytes: int,
+    ) -> int:
+        """Store chunks from ``chunks`` under ``key`` and return the number of bytes written.
+
+        Raises :class:`StorageObjectTooLargeError` once more than ``max_bytes`` arrive; nothing is
+        stored in that case. Fallback for third-party providers, which buffer
+        the object under the hard cap and call :meth:`save`.
+        """
+
+        max_bytes = normalize_read_limit(max_bytes)
+        buffer = bytearray()
+        async for chunk in chunks:
+            buffer.extend(chunk)
+            if len(buffer) > max_bytes:
+                raise StorageObjectTooLargeError(f'Storage object exceeds the {max_bytes}-byte write limit')
+        await self.save(key, bytes(buffer))
+        return len(buffer)
+
+    def local_path(self, key: str) -> str | None:
+        """Return a filesystem path for ``key`` when the provider stores objects on local disk."""
+
+        return None
+
     @abc.abstractmethod
     async def exists(
         self,
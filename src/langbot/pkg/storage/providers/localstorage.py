@@ -2,6 +2,8 @@ from __future__ import annotations
 
 import asyncio
 import os
+import typing
+import uuid
 import aiofiles
 import shutil
 
@@ -30,6 +32,13 @@ def _safe_resolve(base: str, key: str) -> str:
     return resolved
 
 
+def _remove_if_exists(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
 class LocalStorageProvider(provider.StorageProvider):
     def __init__(self, ap: app.Application):
         super().__init__(ap)
@@ -47,6 +56,63 @@ class LocalStorageProvider(provider.StorageProvider):
         async with aiofiles.open(resolved, 'wb') as f:
             await f.write(value)
 
+    async def save_stream(
+        self,
+        key: str,
+        chunks: typing.AsyncIterable[bytes],
+        *,
+        max_bytes: int,
+    ) -> int:
+        """Write chunks to a sibling temporary file and rename it into place once complete."""
+
+        max_bytes = provider.normalize_stream_limit(max_bytes)
+        resolved = await asyncio.to_thread(_safe_resolve, LOCAL_STORAGE_PATH, key)
+        parent = os.path.dirname(resolved)
+        await asyncio.to_thread(os.makedirs, parent, exist_ok=True)
+        partial = f'{resolved}.{uuid.uuid4().hex}.part'
+        written = 0
+        try:
+            async with aiofiles.open(partial, 'wb') as f:
+                async for chunk in chunks:
+                    written += len(chunk)
+                    if written > max_bytes:
+                        raise provider.StorageObjectTooLargeError(
+                            f'Storage object exceeds the {max_bytes}-byte write limit'
+                        )
+                    await f.write(chunk)
+            await asyncio.to_thread(os.replace, partial, resolved)
+        except BaseException:
+            await asyncio.to_thread(_remove_if_exists, partial)
+            raise
+        return written
+
+    async def iter_chunks(
+        self,
+        key: str,
+        *,
+        offset: int = 0,
+        length: int | None = None,
+        chunk_size: int = provider.DEFAULT_STREAM_CHUNK_BYTES,
+    ) -> typing.AsyncIterator[bytes]:
+        offset, length, chunk_size = provider.normalize_range(offset, length, chunk_size)
+        resolved = await asyncio.to_thread(_safe_resolve, LOCAL_STORAGE_PATH, key)
+        remaining = length
+        async with aiofiles.open(resolved, 'rb') as f:
+            if offset:
+                await f.seek(offset)
+            while remaining is None or remaining > 0:
+                chunk = await f.read(chunk_size if remaining is None else min(chunk_size, remaining))
+                if not chunk:
+                    break
+                if remaining is not None:
+                    remaining -= len(chunk)
+                yield chunk
+
+    def local_path(self, key: str) -> str | None:
+        """Expose the on-disk path so HTTP responses can be served with ``sendfile``."""
+
+        return _safe_resolve(LOCAL_STORAGE_PATH, key)
+
     async def load(
         self,
         key: str,
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import asyncio
+import typing
 
 import boto3
 from botocore.exceptions import ClientError
@@ -10,6 +11,10 @@ from ...utils import bounded_executor
 from .. import provider
 
 
+# S3 requires every part except the last to be at least 5 MiB.
+MULTIPART_PART_BYTES = 8 * 1024 * 1024
+
+
 class S3StorageProvider(provider.StorageProvider):
     """S3 object storage provider"""
 
@@ -135,6 +140,113 @@ class S3StorageProvider(provider.StorageProvider):
         finally:
             body.close()
 
+    async def save_stream(
+        self,
+        key: str,
+        chunks: typing.AsyncIterable[bytes],
+        *,
+        max_bytes: int,
+    ) -> int:
+        """Upload chunks as a multipart upload, holding at most one part in memory.
+
+        Objects smaller than one part are sent with a single ``put_object``.
+        A failed or oversized upload is aborted so no partial object remains.
+        """
+
+        max_bytes = provider.normalize_stream_limit(max_bytes)
+        buffer = bytearray()
+        written = 0
+        upload_id: str | None = None
+        parts: list[dict] = []
+        try:
+            async for chunk in chunks:
+                written += len(chunk)
+                if written > max_bytes:
+                    raise provider.StorageObjectTooLargeError(
+                        f'Storage object exceeds the {max_bytes}-byte write limit'
+                    )
+                buffer.extend(chunk)
+                while len(buffer) >= MULTIPART_PART_BYTES:
+                    if upload_id is None:
+                        response = await self._run_io(
+                            self.s3_client.create_multipart_upload, Bucket=self.bucket_name, Key=key
+                        )
+                        upload_id = response['UploadId']
+                    part = bytes(buffer[:MULTIPART_PART_BYTES])
+                    del buffer[:MULTIPART_PART_BYTES]
+                    parts.append(await self._upload_part(key, upload_id, len(parts) + 1, part))
+
+            if upload_id is None:
+                await self.save(key, bytes(buffer))
+                return written
+            if buffer:
+                parts.append(await self._upload_part(key, upload_id, len(parts) + 1, bytes(buffer)))
+            await self._run_io(
+                self.s3_client.complete_multipart_upload,
+                Bucket=self.bucket_name,
+                Key=key,
+                UploadId=upload_id,
+                MultipartUpload={'Parts': parts},
+            )
+            return written
+        except BaseException as e:
+            if upload_id is not None:
+                try:
+                    await self._run_io(
+                        self.s3_client.abort_multipart_upload, Bucket=self.bucket_name, Key=key, UploadId=upload_id
+                    )
+                except Exception as abort_error:
+                    self.ap.logger.warning(f'Failed to abort S3 multipart upload {upload_id}: {abort_error}')
+            if isinstance(e, Exception) and not isinstance(e, provider.StorageObjectTooLargeError):
+                self.ap.logger.error(f'Failed to stream to S3: {e}')
+            raise
+
+    async def _upload_part(self, key: str, upload_id: str, part_number: int, body: bytes) -> dict:
+        response = await self._run_io(
+            self.s3_client.upload_part,
+            Bucket=self.bucket_name,
+            Key=key,
+            UploadId=upload_id,
+            PartNumber=part_number,
+            Body=body,
+        )
+        return {'ETag': response['ETag'], 'PartNumber': part_number}
+
+    async def iter_chunks(
+        self,
+        key: str,
+        *,
+        offset: int = 0,
+        length: int | None = None,
+        chunk_size: int = provider.DEFAULT_STREAM_CHUNK_BYTES,
+    ) -> typing.AsyncIterator[bytes]:
+        """Stream an object, or a byte range of it, with a ranged ``get_object``."""
+
+        offset, length, chunk_size = provider.normalize_range(offset, length, chunk_size)
+        if length == 0:
+            return
+        request = {'Bucket': self.bucket_name, 'Key': key}
+        if offset or length is not None:
+            end = '' if length is None else str(offset + length - 1)
+            request['Range'] = f'bytes={offset}-{end}'
+        try:
+            response = await self._run_io(self.s3_client.get_object, **request)
+        except ClientError as e:
+            # A range starting past the end of the object is an empty read, not an error.
+            if e.response['Error']['Code'] == 'InvalidRange':
+                return
+            self.ap.logger.error(f'Failed to stream from S3: {e}')
+            raise
+        body = response['Body']
+        try:
+            while True:
+                chunk = await self._run_io(body.read, chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+        finally:
+            body.close()
+
     async def exists(
         self,
         key: str,
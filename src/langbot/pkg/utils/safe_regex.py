@@ -1,7 +1,11 @@
 from __future__ import annotations
 
 import asyncio
+import collections
+import heapq
+import threading
 import time
+import typing
 from collections.abc import Sequence
 
 import regex
@@ -13,6 +17,14 @@ MAX_INPUT_CHARS = 1024 * 1024
 MAX_REPLACEMENT_CHARS = 64
 MAX_MASKED_OUTPUT_CHARS = 2 * 1024 * 1024
 DEFAULT_OPERATION_TIMEOUT_SECONDS = 0.05
+MAX_CACHED_PATTERN_SETS = 256
+
+# Characters with a special meaning in a pattern. Patterns without any of
+# them are plain words and are matched without the regex engine.
+_REGEX_METACHARACTERS = frozenset('.^$*+?{}[]\\|()')
+# The plain-word scan steps through the input in Python; it checks the
+# operation deadline after each block of this many characters.
+_SCAN_BLOCK_CHARS = 16 * 1024
 
 
 class SafeRegexError(ValueError):
@@ -60,6 +72,147 @@ def _compile(pattern: str):
         raise SafeRegexError(f'Invalid regex: {exc}') from exc
 
 
+class _LiteralAutomaton:
+    """Aho-Corasick automaton over plain-word patterns.
+
+    Finds every occurrence of every word in one left-to-right pass, so the
+    cost does not grow with the number of words.
+    """
+
+    def __init__(self, words: Sequence[str]):
+        self.words = tuple(dict.fromkeys(words))
+        self._goto: list[dict[str, int]] = [{}]
+        # Length of the longest word ending at each state, following fail links.
+        self._longest: list[int] = [0]
+        for word in self.words:
+            state = 0
+            for char in word:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._longest.append(0)
+                state = next_state
+            self._longest[state] = max(self._longest[state], len(word))
+
+        self._fail = [0] * len(self._goto)
+        queue = collections.deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(char, 0)
+                self._longest[next_state] = max(self._longest[next_state], self._longest[self._fail[next_state]])
+                queue.append(next_state)
+
+    def search(self, value: str) -> bool:
+        return any(word in value for word in self.words)
+
+    def match(self, value: str) -> bool:
+        return value.startswith(self.words)
+
+    def spans(self, value: str, deadline: float) -> list[tuple[int, int]]:
+        """Return the merged ``[start, end)`` ranges covered by any occurrence.
+
+        Text between occurrences is skipped with ``str.find``; only the
+        stretches around them are stepped through the automaton. Raises
+        SafeRegexTimeoutError once ``deadline`` passes.
+        """
+
+        # Next occurrence of each word at or after the scan position, kept as a heap.
+        upcoming = [(found, word) for word in self.words if (found := value.find(word)) >= 0]
+        if not upcoming:
+            return []
+        heapq.heapify(upcoming)
+        goto = self._goto
+        fail = self._fail
+        longest = self._longest
+        spans: list[tuple[int, int]] = []
+        state = 0
+        index = 0
+        next_check = 0
+        length = len(value)
+        while index < length:
+            if not state:
+                # No partial match is alive, so nothing can start before the next occurrence.
+                while upcoming and upcoming[0][0] < index:
+                    word = upcoming[0][1]
+                    found = value.find(word, index)
+                    if found < 0:
+                        heapq.heappop(upcoming)
+                    else:
+                        heapq.heapreplace(upcoming, (found, word))
+                if not upcoming:
+                    break
+                index = upcoming[0][0]
+            if index >= next_check:
+                _remaining_seconds(deadline)
+                next_check = index + _SCAN_BLOCK_CHARS
+            char = value[index]
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            index += 1
+            matched = longest[state]
+            if not matched:
+                continue
+            start = index - matched
+            while spans and start < spans[-1][1]:
+                start = min(start, spans.pop()[0])
+            spans.append((start, index))
+        return spans
+
+
+class _CompiledPatternSet:
+    def __init__(self, patterns: tuple[str, ...]):
+        literals = [pattern for pattern in patterns if pattern and _REGEX_METACHARACTERS.isdisjoint(pattern)]
+        self.automaton = _LiteralAutomaton(literals) if literals else None
+        self.regex_patterns = tuple(pattern for pattern in patterns if pattern not in literals)
+        self._compiled: dict[str, typing.Any] = {}
+
+    def regexes(self) -> typing.Iterator[typing.Any]:
+        """Yield the regex patterns in order, compiling each the first time it is reached.
+
+        An invalid pattern raises SafeRegexError only once the operation gets
+        to it, so a plain word that already matched still decides the result.
+        """
+
+        for pattern in self.regex_patterns:
+            compiled = self._compiled.get(pattern)
+            if compiled is None:
+                compiled = self._compiled[pattern] = _compile(pattern)
+            yield compiled
+
+
+_pattern_set_cache: collections.OrderedDict[tuple[str, ...], _CompiledPatternSet] = collections.OrderedDict()
+_pattern_set_cache_lock = threading.Lock()
+
+
+def _compiled_pattern_set(patterns: tuple[str, ...]) -> _CompiledPatternSet:
+    """Return the compiled form of a pattern set, reusing it across calls.
+
+    The cache is keyed by the patterns themselves, so editing a word list
+    (for example ``sensitive_meta``) simply stops hitting the old entry.
+    """
+
+    with _pattern_set_cache_lock:
+        compiled = _pattern_set_cache.get(patterns)
+        if compiled is not None:
+            _pattern_set_cache.move_to_end(patterns)
+            return compiled
+
+    compiled = _CompiledPatternSet(patterns)
+    with _pattern_set_cache_lock:
+        _pattern_set_cache[patterns] = compiled
+        _pattern_set_cache.move_to_end(patterns)
+        while len(_pattern_set_cache) > MAX_CACHED_PATTERN_SETS:
+            _pattern_set_cache.popitem(last=False)
+    return compiled
+
+
 def _matches_any_sync(
     patterns: Sequence[str],
     value: str,
@@ -72,10 +225,14 @@ def _matches_any_sync(
     if mode not in {'match', 'search'}:
         raise ValueError(f'Unsupported safe regex mode: {mode}')
 
+    compiled_patterns = _compiled_pattern_set(normalized_patterns)
+    automaton = compiled_patterns.automaton
+    if automaton is not None and (automaton.match(value) if mode == 'match' else automaton.search(value)):
+        return True
+
     deadline = time.monotonic() + timeout_seconds
     try:
-        for pattern in normalized_patterns:
-            compiled = _compile(pattern)
+        for compiled in compiled_patterns.regexes():
             matcher = compiled.match if mode == 'match' else compiled.search
             if matcher(
                 value,
@@ -128,10 +285,27 @@ def _mask_patterns_sync(
     if replacement_width * max(1, len(value)) > MAX_MASKED_OUTPUT_CHARS:
         raise SafeRegexLimitError('Regex replacement could exceed the masked output limit')
 
+    compiled_patterns = _compiled_pattern_set(normalized_patterns)
     deadline = time.monotonic() + timeout_seconds
     found = False
     current = value
 
+    # Plain words are masked together in a single pass. Occurrences that
+    # overlap, like 'abc' and 'bcd' in 'abcd', are merged into one range that
+    # is masked completely and gets a single mask_word. Applying the words one
+    # after another used to leave the tail of the later word unmasked.
+    spans = compiled_patterns.automaton.spans(current, deadline) if compiled_patterns.automaton is not None else []
+    if spans:
+        found = True
+        parts = []
+        position = 0
+        for start, end in spans:
+            parts.append(current[position:start])
+            parts.append(mask_word if mask_word else mask * (end - start))
+            position = end
+        parts.append(current[position:])
+        current = ''.join(parts)
+
     def replace(match) -> str:
         nonlocal found
         found = True
@@ -140,8 +314,7 @@ def _mask_patterns_sync(
         return mask * len(match.group(0))
 
     try:
-        for pattern in normalized_patterns:
-            compiled = _compile(pattern)
+        for compiled in compiled_patterns.regexes():
             current = compiled.sub(
                 replace,
                 current,
@@ -163,7 +336,12 @@ async def mask_patterns(
     mask_word: str,
     timeout_seconds: float = DEFAULT_OPERATION_TIMEOUT_SECONDS,
 ) -> tuple[bool, str]:
-    """Apply untrusted masking patterns with bounded CPU and output growth."""
+    """Apply untrusted masking patterns with bounded CPU and output growth.
+
+    Each match is replaced with ``mask_word``, or with ``mask`` once per
+    character when ``mask_word`` is empty. Overlapping plain-word matches
+    count as one match.
+    """
 
     if timeout_seconds <= 0:
         raise ValueError('timeout_seconds must be positive')
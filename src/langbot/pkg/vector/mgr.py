@@ -13,6 +13,22 @@ from ..workspace.errors import WorkspaceNotFoundError
 from .vdb import VectorDatabase, SearchType
 
 
+_DEFAULT_UPSERT_BATCH_ROWS = 1000
+_MAX_UPSERT_BATCH_ROWS = 5000
+
+
+def _non_negative_int(value, default: int) -> int:
+    if isinstance(value, bool) or not isinstance(value, int) or value < 0:
+        return default
+    return value
+
+
+def _ratio(value, default: float) -> float:
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not 0 < value <= 1:
+        return default
+    return float(value)
+
+
 class VectorDBManager:
     ap: app.Application
     vector_db: VectorDatabase = None
@@ -59,6 +75,19 @@ class VectorDBManager:
                 self.vector_db = MilvusVectorDatabase(self.ap, uri=uri, token=token, db_name=db_name)
                 self.ap.logger.info('Initialized Milvus vector database backend.')
 
+            elif vdb_type == 'numpy':
+                from .vdbs.numpy_mmap import NumpyVectorDatabase
+
+                numpy_config = kb_config.get('numpy') or {}
+                self.vector_db = NumpyVectorDatabase(
+                    self.ap,
+                    base_path=numpy_config.get('path') or './data/numpy_vdb',
+                    ivf_min_rows=_non_negative_int(numpy_config.get('ivf_min_rows'), 20000),
+                    nprobe=_non_negative_int(numpy_config.get('nprobe'), 0),
+                    compact_ratio=_ratio(numpy_config.get('compact_ratio'), 0.3),
+                )
+                self.ap.logger.info('Initialized NumPy memory-mapped vector database backend.')
+
             elif vdb_type == 'pgvector':
                 from .vdbs.pgvector_db import PgVectorDatabase
 
@@ -187,7 +216,7 @@ class VectorDBManager:
         """
 
         await self._validate_execution_context(execution_context)
-        async with self.ap.persistence_mgr.tenant_uow(execution_context.workspace_uuid):
+        async with self.ap.persistence_mgr.tenant_uow(execution_context.workspace_uuid, read_only=True):
             result = await self.ap.persistence_mgr.execute_async(
                 sqlalchemy.select(
                     persistence_rag.KnowledgeBase.collection_id,
@@ -303,6 +332,9 @@ class VectorDBManager:
             }
             for item in source_metadata
         ]
+        # Bulk ingestion is written in bounded slices: backends such as Chroma
+        # reject oversized batches, and each slice bounds request memory.
+        batch_rows = self._upsert_batch_rows()
         pgvector = self._pgvector_database()
         if pgvector is not None:
             if not vectors:
@@ -313,22 +345,33 @@ class VectorDBManager:
                 expected_dimension=len(vectors[0]),
                 initialize_dimension=True,
             )
-            await pgvector.add_embeddings(
+            for start in range(0, len(vectors), batch_rows):
+                stop = start + batch_rows
+                await pgvector.add_embeddings(
+                    collection=collection_name,
+                    ids=ids[start:stop],
+                    embeddings_list=vectors[start:stop],
+                    metadatas=scoped_metadata[start:stop],
+                    documents=documents[start:stop] if documents is not None else None,
+                    scope=scope,
+                )
+            return
+        for start in range(0, max(len(vectors), 1), batch_rows):
+            stop = start + batch_rows
+            await self.vector_db.add_embeddings(
                 collection=collection_name,
-                ids=ids,
-                embeddings_list=vectors,
-                metadatas=scoped_metadata,
-                documents=documents,
-                scope=scope,
+                ids=ids[start:stop],
+                embeddings_list=vectors[start:stop],
+                metadatas=scoped_metadata[start:stop],
+                documents=documents[start:stop] if documents is not None else None,
             )
-            return
-        await self.vector_db.add_embeddings(
-            collection=collection_name,
-            ids=ids,
-            embeddings_list=vectors,
-            metadatas=scoped_metadata,
-            documents=documents,
-        )
+
+    def _upsert_batch_rows(self) -> int:
+        vdb_config = getattr(getattr(self.ap, 'instance_config', None), 'data', {}).get('vdb') or {}
+        value = vdb_config.get('upsert_batch_size') if isinstance(vdb_config, dict) else None
+        if isinstance(value, bool) or not isinstance(value, int) or value < 1:
+            return _DEFAULT_UPSERT_BATCH_ROWS
+        return min(value, _MAX_UPSERT_BATCH_ROWS)
 
     async def search(
         self,
@@ -0,0 +1,612 @@
+"""Embedded vector backend built on NumPy memory-mapped files.
+
+Each collection lives in its own directory under ``base_path``:
+
+* ``vectors.npy`` -- unit-normalized float32 rows, opened with
+  ``numpy.lib.format.open_memmap`` so only touched pages are resident.
+  Capacity doubles when full.
+* ``records.jsonl`` -- append-only log of ``add`` entries (row, id, metadata,
+  document) and ``delete`` entries (tombstoned rows). Replayed on open.
+
+Deletes only tombstone rows. Once tombstones exceed ``compact_ratio`` of the
+used rows, both files are rewritten without them as a new generation
+(``vectors.<n>.npy`` and ``records.<n>.jsonl``). The ``CURRENT`` file names the
+generation in use and is replaced atomically once both files are on disk, so a
+crash during compaction leaves the previous pair intact. Without ``CURRENT``
+the collection is at generation 0, which uses the plain file names above.
+Search is an exact
+vectorized cosine top-k; collections with at least ``ivf_min_rows`` live rows
+additionally get an inverted-file partition index (spherical k-means
+centroids) so unfiltered queries only score the rows of the closest
+partitions.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import collections
+import contextlib
+import json
+import os
+import re
+import shutil
+import threading
+from typing import Any
+
+import numpy as np
+
+from langbot.pkg.core import app
+from langbot.pkg.vector.filter_utils import normalize_filter
+from langbot.pkg.vector.vdb import VectorDatabase, runtime_cache_limit
+
+_VECTORS_FILE = 'vectors.npy'
+_RECORDS_FILE = 'records.jsonl'
+_CURRENT_FILE = 'CURRENT'
+_GENERATION_FILE = re.compile(r'^(?:vectors\.(\d+)\.npy|records\.(\d+)\.jsonl)$')
+_COLLECTION_NAME = re.compile(r'^[A-Za-z0-9_][A-Za-z0-9_.-]{0,254}$')
+_INITIAL_CAPACITY = 256
+_ASSIGN_BATCH_ROWS = 8192
+_KMEANS_ITERATIONS = 8
+_KMEANS_SAMPLE_PER_CENTROID = 64
+_MAX_CENTROIDS = 1024
+# Rebuild the partition index once this share of rows was added after the last build.
+_IVF_STALE_RATIO = 0.25
+
+
+def _empty_result() -> dict[str, Any]:
+    return {'ids': [[]], 'metadatas': [[]], 'distances': [[]], 'documents': [[]]}
+
+
+def _match_condition(value: Any, op: str, expected: Any) -> bool:
+    if op == '$eq':
+        return value == expected
+    if op == '$ne':
+        return value != expected
+    if op == '$in':
+        return value in expected
+    if op == '$nin':
+        return value not in expected
+    if value is None:
+        return False
+    try:
+        if op == '$gt':
+            return value > expected
+        if op == '$gte':
+            return value >= expected
+        if op == '$lt':
+            return value < expected
+        return value <= expected
+    except TypeError:
+        return False
+
+
+def _matches(metadata: dict[str, Any], triples: list[tuple[str, str, Any]]) -> bool:
+    return all(_match_condition(metadata.get(field), op, expected) for field, op, expected in triples)
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.maximum(norms, np.float32(1e-12))
+
+
+class _PartitionIndex:
+    """Inverted-file index: rows grouped by their closest k-means centroid."""
+
+    def __init__(self, centroids: np.ndarray, members: list[np.ndarray], built_rows: int):
+        self.centroids = centroids
+        self.members = members
+        self.built_rows = built_rows
+
+    @classmethod
+    def build(cls, vectors: np.ndarray, rows: np.ndarray, built_rows: int) -> _PartitionIndex:
+        rng = np.random.default_rng(0)
+        centroid_count = int(min(max(np.sqrt(len(rows)), 1), _MAX_CENTROIDS))
+        sample_size = min(len(rows), centroid_count * _KMEANS_SAMPLE_PER_CENTROID)
+        sample = np.asarray(vectors[np.sort(rng.choice(rows, size=sample_size, replace=False))])
+        centroids = sample[rng.choice(sample_size, size=centroid_count, replace=False)].copy()
+        for _ in range(_KMEANS_ITERATIONS):
+            labels = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, sample)
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            # Empty partitions keep their previous centroid instead of collapsing to zero.
+            centroids = np.where(norms > 0, sums / np.maximum(norms, np.float32(1e-12)), centroids)
+
+        labels = np.empty(len(rows), dtype=np.int32)
+        for start in range(0, len(rows), _ASSIGN_BATCH_ROWS):
+            batch = rows[start : start + _ASSIGN_BATCH_ROWS]
+            labels[start : start + len(batch)] = np.argmax(np.asarray(vectors[batch]) @ centroids.T, axis=1)
+        order = np.argsort(labels, kind='stable')
+        bounds = np.searchsorted(labels[order], np.arange(centroid_count + 1))
+        members = [rows[order[bounds[i] : bounds[i + 1]]] for i in range(centroid_count)]
+        return cls(centroids.astype(np.float32), members, built_rows)
+
+    def candidates(self, query: np.ndarray, nprobe: int, used_rows: int) -> np.ndarray:
+        probes = min(nprobe, len(self.members))
+        closest = np.argpartition(-(self.centroids @ query), probes - 1)[:probes]
+        parts = [self.members[i] for i in closest]
+        # Rows appended after the build are not partitioned yet and are always scanned.
+        parts.append(np.arange(self.built_rows, used_rows))
+        return np.concatenate(parts)
+
+
+class _Collection:
+    """One on-disk collection. All methods must be called with ``lock`` held."""
+
+    def __init__(self, path: str, ivf_min_rows: int, nprobe: int, compact_ratio: float):
+        self.path = path
+        self.lock = threading.Lock()
+        self.ivf_min_rows = ivf_min_rows
+        self.nprobe = nprobe
+        self.compact_ratio = compact_ratio
+        self.vectors: np.ndarray | None = None
+        self.used = 0
+        self.ids: list[str] = []
+        self.metadatas: list[dict[str, Any]] = []
+        self.documents: list[str | None] = []
+        self.alive = np.zeros(0, dtype=bool)
+        self.id_rows: dict[str, int] = {}
+        self.index: _PartitionIndex | None = None
+        self.generation = 0
+        self.users = 0
+        """Operations in flight; only idle collections are evicted from the runtime cache."""
+        self._load()
+
+    @property
+    def live_count(self) -> int:
+        return len(self.id_rows)
+
+    def _file(self, name: str) -> str:
+        return os.path.join(self.path, name)
+
+    def _vectors_file(self, generation: int | None = None) -> str:
+        generation = self.generation if generation is None else generation
+        return self._file(_VECTORS_FILE if generation == 0 else f'vectors.{generation}.npy')
+
+    def _records_file(self, generation: int | None = None) -> str:
+        generation = self.generation if generation is None else generation
+        return self._file(_RECORDS_FILE if generation == 0 else f'records.{generation}.jsonl')
+
+    def _read_generation(self) -> int:
+        try:
+            with open(self._file(_CURRENT_FILE), encoding='utf-8') as current:
+                return int(current.read().strip())
+        except FileNotFoundError:
+            return 0
+
+    def _remove_stale_generations(self) -> None:
+        """Delete files of generations other than the current one, left by an interrupted compaction."""
+        current = {os.path.basename(self._vectors_file()), os.path.basename(self._records_file())}
+        for name in os.listdir(self.path):
+            stale = name.endswith('.tmp') or (
+                name not in current and (name in (_VECTORS_FILE, _RECORDS_FILE) or _GENERATION_FILE.match(name))
+            )
+            if stale:
+                os.remove(self._file(name))
+
+    def _load(self) -> None:
+        os.makedirs(self.path, exist_ok=True)
+        self.generation = self._read_generation()
+        self._remove_stale_generations()
+        if os.path.exists(self._vectors_file()):
+            self.vectors = np.lib.format.open_memmap(self._vectors_file(), mode='r+')
+            self.alive = np.zeros(self.vectors.shape[0], dtype=bool)
+        if not os.path.exists(self._records_file()):
+            return
+        with open(self._records_file(), 'r+b') as records:
+            lines = records.readlines()
+            valid_bytes = 0
+            for index, line in enumerate(lines):
+                try:
+                    entry = json.loads(line) if line.endswith(b'\n') else None
+                except ValueError:
+                    entry = None
+                if entry is None and index == len(lines) - 1:
+                    # A torn final line from an interrupted append was never acknowledged; drop it so
+                    # later appends start on a clean line.
+                    records.truncate(valid_bytes)
+                    break
+                valid_bytes += len(line)
+                if entry is None:
+                    continue
+                if entry.get('op') != 'delete' and (self.vectors is None or entry['row'] >= self.vectors.shape[0]):
+                    # Vectors are written before their record, so this row was never acknowledged.
+                    continue
+                if entry.get('op') == 'delete':
+                    for row in entry['rows']:
+                        self._tombstone(row)
+                    continue
+                row = entry['row']
+                while len(self.ids) <= row:
+                    self.ids.append('')
+                    self.metadatas.append({})
+                    self.documents.append(None)
+                self._tombstone(self.id_rows.get(entry['id'], -1))
+                self.ids[row] = entry['id']
+                self.metadatas[row] = entry.get('metadata') or {}
+                self.documents[row] = entry.get('document')
+                self.alive[row] = True
+                self.id_rows[entry['id']] = row
+                self.used = max(self.used, row + 1)
+        self._refresh_index()
+
+    def _tombstone(self, row: int) -> bool:
+        if row < 0 or row >= self.used or not self.alive[row]:
+            return False
+        self.alive[row] = False
+        if self.id_rows.get(self.ids[row]) == row:
+            del self.id_rows[self.ids[row]]
+        return True
+
+    def _append_records(self, entries: list[dict[str, Any]]) -> None:
+        with open(self._records_file(), 'a', encoding='utf-8') as records:
+            records.writelines(json.dumps(entry, ensure_ascii=False) + '\n' for entry in entries)
+            records.flush()
+            os.fsync(records.fileno())
+
+    def _ensure_capacity(self, rows: int, dimension: int) -> None:
+        if self.vectors is None:
+            capacity = max(_INITIAL_CAPACITY, rows)
+            self.vectors = np.lib.format.open_memmap(
+                self._vectors_file(), mode='w+', dtype=np.float32, shape=(capacity, dimension)
+            )
+            self.alive = np.zeros(capacity, dtype=bool)
+            return
+        if self.vectors.shape[1] != dimension:
+            raise ValueError(
+                f'Embedding dimension {dimension} does not match collection dimension {self.vectors.shape[1]}'
+            )
+        if rows <= self.vectors.shape[0]:
+            return
+        capacity = self.vectors.shape[0]
+        while capacity < rows:
+            capacity *= 2
+        # Growing keeps every row number, so the record log stays valid either way.
+        staging = self._vectors_file() + '.tmp'
+        self._write_vectors(staging, np.arange(self.used), capacity)
+        self.vectors = None
+        os.replace(staging, self._vectors_file())
+        self.vectors = np.lib.format.open_memmap(self._vectors_file(), mode='r+')
+        self.alive = np.concatenate([self.alive, np.zeros(capacity - len(self.alive), dtype=bool)])
+
+    def _write_vectors(self, path: str, rows: np.ndarray, capacity: int) -> None:
+        dimension = self.vectors.shape[1]
+        target = np.lib.format.open_memmap(path, mode='w+', dtype=np.float32, shape=(capacity, dimension))
+        for start in range(0, len(rows), _ASSIGN_BATCH_ROWS):
+            batch = rows[start : start + _ASSIGN_BATCH_ROWS]
+            target[start : start + len(batch)] = self.vectors[batch]
+        target.flush()
+        del target
+        with open(path, 'rb') as written:
+            os.fsync(written.fileno())
+
+    def add(
+        self,
+        ids: list[str],
+        embeddings: np.ndarray,
+        metadatas: list[dict[str, Any]],
+        documents: list[str] | None,
+    ) -> None:
+        # Chroma upsert semantics: the last entry for a duplicated id wins.
+        latest = {record_id: position for position, record_id in enumerate(ids)}
+        positions = sorted(latest.values())
+        start = self.used
+        self._ensure_capacity(start + len(positions), embeddings.shape[1])
+        self.vectors[start : start + len(positions)] = _normalize_rows(embeddings[positions])
+        self.vectors.flush()
+
+        entries = []
+        for offset, position in enumerate(positions):
+            row = start + offset
+            record_id = ids[position]
+            metadata = metadatas[position] or {}
+            document = documents[position] if documents is not None else None
+            self._tombstone(self.id_rows.get(record_id, -1))
+            self.ids.append(record_id)
+            self.metadatas.append(metadata)
+            self.documents.append(document)
+            self.alive[row] = True
+            self.id_rows[record_id] = row
+            entries.append({'op': 'add', 'row': row, 'id': record_id, 'metadata': metadata, 'document': document})
+        self.used = start + len(positions)
+        self._append_records(entries)
+        self._maybe_compact()
+        self._refresh_index()
+
+    def delete_rows(self, rows: list[int]) -> int:
+        deleted = [row for row in rows if self._tombstone(row)]
+        if deleted:
+            self._append_records([{'op': 'delete', 'rows': deleted}])
+            self._maybe_compact()
+        return len(deleted)
+
+    def matching_rows(self, triples: list[tuple[str, str, Any]]) -> list[int]:
+        return [row for row in self.id_rows.values() if _matches(self.metadatas[row], triples)]
+
+    def _maybe_compact(self) -> None:
+        dead = self.used - self.live_count
+        if self.used and dead and dead >= self.used * self.compact_ratio:
+            self.compact()
+
+    def compact(self) -> None:
+        """Rewrite vectors and records without tombstoned rows as the next generation."""
+        if self.vectors is None:
+            return
+        rows = np.array(sorted(self.id_rows.values()), dtype=np.int64)
+        capacity = max(_INITIAL_CAPACITY, 1 << max(len(rows) - 1, 0).bit_length())
+        previous, generation = self.generation, self.generation + 1
+        self._write_vectors(self._vectors_file(generation), rows, capacity)
+
+        ids = [self.ids[row] for row in rows]
+        metadatas = [self.metadatas[row] for row in rows]
+        documents = [self.documents[row] for row in rows]
+        with open(self._records_file(generation), 'w', encoding='utf-8') as records:
+            for row, record_id in enumerate(ids):
+                entry = {
+                    'op': 'add',
+                    'row': row,
+                    'id': record_id,
+                    'metadata': metadatas[row],
+                    'document': documents[row],
+                }
+                records.write(json.dumps(entry, ensure_ascii=False) + '\n')
+            records.flush()
+            os.fsync(records.fileno())
+        self._switch_generation(generation)
+
+        self.vectors = np.lib.format.open_memmap(self._vectors_file(), mode='r+')
+        self.ids, self.metadatas, self.documents = ids, metadatas, documents
+        self.used = len(ids)
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.alive[: self.used] = True
+        self.id_rows = {record_id: row for row, record_id in enumerate(ids)}
+        # Row numbers changed; the partition index is rebuilt from scratch.
+        self.index = None
+        self._remove_generation(previous)
+
+    def _switch_generation(self, generation: int) -> None:
+        """Atomically make ``generation`` the pair that is loaded on open."""
+        staging = self._file(_CURRENT_FILE + '.tmp')
+        with open(staging, 'w', encoding='utf-8') as current:
+            current.write(f'{generation}\n')
+            current.flush()
+            os.fsync(current.fileno())
+        os.replace(staging, self._file(_CURRENT_FILE))
+        directory = os.open(self.path, os.O_RDONLY)
+        try:
+            os.fsync(directory)
+        finally:
+            os.close(directory)
+        self.generation = generation
+
+    def _remove_generation(self, generation: int) -> None:
+        for path in (self._vectors_file(generation), self._records_file(generation)):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def _refresh_index(self) -> None:
+        if not self.ivf_min_rows or self.live_count < self.ivf_min_rows:
+            self.index = None
+            return
+        if self.index is not None and self.used - self.index.built_rows <= self.index.built_rows * _IVF_STALE_RATIO:
+            return
+        rows = np.flatnonzero(self.alive[: self.used])
+        self.index = _PartitionIndex.build(self.vectors, rows, self.used)
+
+    def search(self, query: np.ndarray, k: int, triples: list[tuple[str, str, Any]]) -> dict[str, Any]:
+        if self.vectors is None or not self.live_count or k <= 0:
+            return _empty_result()
+        if query.shape[0] != self.vectors.shape[1]:
+            raise ValueError(
+                f'Query dimension {query.shape[0]} does not match collection dimension {self.vectors.shape[1]}'
+            )
+        norm = float(np.linalg.norm(query))
+        if norm == 0.0:
+            return _empty_result()
+        query = query / norm
+
+        if triples:
+            candidates = np.array(sorted(self.matching_rows(triples)), dtype=np.int64)
+        elif self.index is not None:
+            nprobe = self.nprobe or max(1, len(self.index.members) // 10)
+            candidates = self.index.candidates(query, nprobe, self.used)
+            candidates = candidates[self.alive[candidates]]
+            if len(candidates) < k:
+                candidates = np.flatnonzero(self.alive[: self.used])
+        else:
+            candidates = None
+
+        if candidates is None:
+            scores = np.asarray(self.vectors[: self.used]) @ query
+            scores[~self.alive[: self.used]] = -np.inf
+            rows = np.arange(self.used)
+            k = min(k, self.live_count)
+        else:
+            if not len(candidates):
+                return _empty_result()
+            scores = np.asarray(self.vectors[candidates]) @ query
+            rows = candidates
+            k = min(k, len(candidates))
+
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind='stable')]
+        best_rows = rows[top].tolist()
+        return {
+            'ids': [[self.ids[row] for row in best_rows]],
+            'metadatas': [[self.metadatas[row] for row in best_rows]],
+            'distances': [[float(1.0 - score) for score in scores[top]]],
+            'documents': [[self.documents[row] for row in best_rows]],
+        }
+
+    def list(self, triples: list[tuple[str, str, Any]], limit: int, offset: int) -> tuple[list[dict[str, Any]], int]:
+        rows = sorted(self.matching_rows(triples))
+        items = [
+            {'id': self.ids[row], 'document': self.documents[row], 'metadata': self.metadatas[row]}
+            for row in rows[offset : offset + limit]
+        ]
+        return items, len(rows)
+
+    def close(self) -> None:
+        if self.vectors is not None:
+            self.vectors.flush()
+        self.vectors = None
+        self.index = None
+
+
+class NumpyVectorDatabase(VectorDatabase):
+    """Dependency-free local backend for small single-node deployments."""
+
+    def __init__(
+        self,
+        ap: app.Application,
+        base_path: str = './data/numpy_vdb',
+        ivf_min_rows: int = 20000,
+        nprobe: int = 0,
+        compact_ratio: float = 0.3,
+    ):
+        self.ap = ap
+        self.base_path = base_path
+        self.ivf_min_rows = ivf_min_rows
+        self.nprobe = nprobe
+        self.compact_ratio = compact_ratio
+        # Least recently used first. A collection stays open while in use, so each path has one instance.
+        self._collections: collections.OrderedDict[str, _Collection] = collections.OrderedDict()
+        self._open_lock = asyncio.Lock()
+        self._runtime_cache_limit = runtime_cache_limit(ap)
+        os.makedirs(base_path, exist_ok=True)
+
+    def _collection_path(self, collection: str) -> str:
+        if not _COLLECTION_NAME.match(collection):
+            raise ValueError(f'Invalid collection name: {collection!r}')
+        return os.path.join(self.base_path, collection)
+
+    async def close(self) -> None:
+        runtime_collections = list(self._collections.values())
+        self._collections.clear()
+        for runtime_collection in runtime_collections:
+            await asyncio.to_thread(self._locked, runtime_collection, runtime_collection.close)
+
+    @staticmethod
+    def _locked(runtime_collection: _Collection, func, *args):
+        with runtime_collection.lock:
+            return func(*args)
+
+    async def get_or_create_collection(self, collection: str) -> _Collection:
+        runtime_collection = self._collections.get(collection)
+        if runtime_collection is not None:
+            self._collections.move_to_end(collection)
+            return runtime_collection
+        path = self._collection_path(collection)
+        async with self._open_lock:
+            runtime_collection = self._collections.get(collection)
+            if runtime_collection is None:
+                runtime_collection = await asyncio.to_thread(
+                    _Collection, path, self.ivf_min_rows, self.nprobe, self.compact_ratio
+                )
+                self._collections[collection] = runtime_collection
+                self.ap.logger.info(f"NumPy vector collection '{collection}' accessed/created.")
+                await self._evict_idle(keep=collection)
+        return runtime_collection
+
+    async def _evict_idle(self, keep: str) -> None:
+        """Close least recently used idle collections while the cache is over its limit.
+
+        Collections with operations in flight stay cached, so the cache can exceed the limit for a while.
+        """
+        evicted = []
+        excess = len(self._collections) - self._runtime_cache_limit
+        for name, runtime_collection in list(self._collections.items()):
+            if len(evicted) >= excess:
+                break
+            if name != keep and runtime_collection.users == 0:
+                evicted.append(self._collections.pop(name))
+        for runtime_collection in evicted:
+            await asyncio.to_thread(self._locked, runtime_collection, runtime_collection.close)
+
+    @contextlib.asynccontextmanager
+    async def _using(self, collection: str):
+        runtime_collection = await self.get_or_create_collection(collection)
+        runtime_collection.users += 1
+        try:
+            yield runtime_collection
+        finally:
+            runtime_collection.users -= 1
+
+    async def add_embeddings(
+        self,
+        collection: str,
+        ids: list[str],
+        embeddings_list: list[list[float]],
+        metadatas: list[dict[str, Any]],
+        documents: list[str] | None = None,
+    ) -> None:
+        if not ids:
+            return
+        embeddings = np.asarray(embeddings_list, dtype=np.float32)
+        if embeddings.ndim != 2 or embeddings.shape[0] != len(ids) or len(metadatas) != len(ids):
+            raise ValueError('ids, embeddings_list and metadatas must have the same length')
+        if documents is not None and len(documents) != len(ids):
+            raise ValueError('documents must have the same length as ids')
+        async with self._using(collection) as runtime_collection:
+            await asyncio.to_thread(
+                self._locked, runtime_collection, runtime_collection.add, ids, embeddings, metadatas, documents
+            )
+        self.ap.logger.info(f"Upserted {len(ids)} embeddings to NumPy vector collection '{collection}'.")
+
+    async def search(
+        self,
+        collection: str,
+        query_embedding: list[float],
+        k: int = 5,
+        search_type: str = 'vector',
+        query_text: str = '',
+        filter: dict[str, Any] | None = None,
+        vector_weight: float | None = None,
+    ) -> dict[str, Any]:
+        triples = normalize_filter(filter)
+        query = np.asarray(query_embedding, dtype=np.float32).reshape(-1)
+        async with self._using(collection) as runtime_collection:
+            results = await asyncio.to_thread(
+                self._locked, runtime_collection, runtime_collection.search, query, k, triples
+            )
+        self.ap.logger.info(f"NumPy vector search in '{collection}' returned {len(results['ids'][0])} results.")
+        return results
+
+    async def delete_by_file_id(self, collection: str, file_id: str) -> None:
+        await self.delete_by_filter(collection, {'file_id': file_id})
+
+    async def delete_by_filter(self, collection: str, filter: dict[str, Any]) -> int:
+        triples = normalize_filter(filter)
+        if not triples:
+            raise ValueError('delete_by_filter requires a non-empty filter')
+
+        def delete(runtime_collection: _Collection) -> int:
+            return runtime_collection.delete_rows(runtime_collection.matching_rows(triples))
+
+        async with self._using(collection) as runtime_collection:
+            deleted = await asyncio.to_thread(self._locked, runtime_collection, delete, runtime_collection)
+        self.ap.logger.info(f"Deleted {deleted} embeddings from NumPy vector collection '{collection}' by filter.")
+        return deleted
+
+    async def list_by_filter(
+        self,
+        collection: str,
+        filter: dict[str, Any] | None = None,
+        limit: int = 20,
+        offset: int = 0,
+    ) -> tuple[list[dict[str, Any]], int]:
+        triples = normalize_filter(filter)
+        async with self._using(collection) as runtime_collection:
+            return await asyncio.to_thread(
+                self._locked, runtime_collection, runtime_collection.list, triples, max(limit, 0), max(offset, 0)
+            )
+
+    async def delete_collection(self, collection: str):
+        path = self._collection_path(collection)
+        runtime_collection = self._collections.pop(collection, None)
+        if runtime_collection is not None:
+            await asyncio.to_thread(self._locked, runtime_collection, runtime_collection.close)
+        await asyncio.to_thread(shutil.rmtree, path, True)
+        self.ap.logger.info(f"NumPy vector collection '{collection}' deleted.")
@@ -633,7 +633,9 @@ class WorkspaceCollaborationService:
             await active_session.flush()
             return target
 
-        return await self._run(operation, session=session)
+        membership = await self._run(operation, session=session)
+        self._invalidate_principals(workspace_uuid)
+        return membership
 
     async def remove_member(
         self,
@@ -659,7 +661,34 @@ class WorkspaceCollaborationService:
             await active_session.flush()
             return target
 
-        return await self._run(operation, session=session)
+        membership = await self._run(operation, session=session)
+        self._invalidate_principals(workspace_uuid)
+        return membership
+
+    def _invalidate_principals(self, workspace_uuid: str) -> None:
+        """Stop reusing authenticated HTTP principals after a membership change.
+
+        Inside a caller's unit of work this waits for the commit, so a request
+        racing the change cannot cache the old membership again before it is
+        visible. A rollback leaves the cache untouched.
+        """
+
+        invalidate = getattr(getattr(self.ap, 'principal_cache', None), 'invalidate', None)
+        if not callable(invalidate):
+            return
+        persistence_mgr = self.ap.persistence_mgr
+        # Inspect the type so dynamic Mock attributes do not turn into a fake gate.
+        gate_factory = getattr(type(persistence_mgr), 'create_after_commit_gate', None)
+        gate = gate_factory(persistence_mgr) if callable(gate_factory) else None
+        if gate is None:
+            invalidate([workspace_uuid])
+            return
+
+        def invalidate_after_commit(committed: asyncio.Future[None]) -> None:
+            if not committed.cancelled():
+                invalidate([workspace_uuid])
+
+        gate.add_done_callback(invalidate_after_commit)
 
     async def _get_invitation_by_token(
         self,
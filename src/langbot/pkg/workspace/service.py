@@ -1,6 +1,9 @@
 from __future__ import annotations
 
+import collections
 import datetime
+import math
+import time
 import uuid
 import typing
 from collections.abc import Awaitable, Callable
@@ -38,6 +41,11 @@ from .repository import WorkspaceRepository
 
 T = TypeVar('T')
 
+# Validated bindings are reused for this long unless a directory projection
+# update invalidates them first.
+_DEFAULT_EXECUTION_BINDING_CACHE_TTL_SECONDS = 5.0
+_MAX_CACHED_EXECUTION_BINDINGS = 4096
+
 if typing.TYPE_CHECKING:
     from ..core.app import Application
 
@@ -62,6 +70,12 @@ class WorkspaceService:
             ]
             | None
         ) = None
+        self._execution_bindings: collections.OrderedDict[
+            tuple[str | None, bool],
+            tuple[WorkspaceExecutionBinding, float],
+        ] = collections.OrderedDict()
+        # Bumped by every invalidation so lookups that raced with one are not cached.
+        self._execution_binding_epoch = 0
 
     @property
     def instance_uuid(self) -> str:
@@ -80,7 +94,7 @@ class WorkspaceService:
 
         tenant_uow = getattr(self.ap.persistence_mgr, 'tenant_uow', None)
         if session is None and callable(tenant_uow):
-            async with tenant_uow(workspace_uuid) as uow:
+            async with tenant_uow(workspace_uuid, read_only=True) as uow:
                 return await self.get_workspace(workspace_uuid, session=uow.session)
 
         async def operation(repository: WorkspaceRepository) -> Workspace:
@@ -114,7 +128,7 @@ class WorkspaceService:
 
         tenant_uow = getattr(self.ap.persistence_mgr, 'tenant_uow', None)
         if session is None and callable(tenant_uow):
-            async with tenant_uow(workspace_uuid) as uow:
+            async with tenant_uow(workspace_uuid, read_only=True) as uow:
                 return await self.get_execution_state(workspace_uuid, session=uow.session)
 
         async def operation(repository: WorkspaceRepository) -> WorkspaceExecutionState:
@@ -215,19 +229,106 @@ class WorkspaceService:
         SaaS Workspaces are projected by a closed control plane, but Core still
         validates the local projection and execution fence. Callers never infer
         a Workspace from source or recency.
+
+        Without an explicit ``session`` a validated binding is reused for
+        ``workspace.execution_binding_cache_ttl_seconds`` or until directory
+        projection updates invalidate it. A cached binding for another
+        generation is always rechecked against the database.
         """
 
         self._require_deployment_admission()
         self._require_directory_projection()
 
+        if session is None:
+            cached = self._cached_execution_binding(workspace_uuid, _require_local)
+            if cached is not None and (
+                expected_generation is None or cached.placement_generation == expected_generation
+            ):
+                return cached
+            epoch = self._execution_binding_epoch
+            binding = await self._load_execution_binding(workspace_uuid, expected_generation, _require_local)
+            if epoch == self._execution_binding_epoch:
+                self._cache_execution_binding(workspace_uuid, _require_local, binding)
+            return binding
+
+        return await self._load_execution_binding(
+            workspace_uuid,
+            expected_generation,
+            _require_local,
+            session=session,
+        )
+
+    def invalidate_execution_bindings(self, workspace_uuids: typing.Iterable[str] | None = None) -> None:
+        """Drop cached bindings after a placement, generation or fence change.
+
+        ``None`` drops every cached binding.
+        """
+
+        self._execution_binding_epoch += 1
+        if workspace_uuids is None:
+            self._execution_bindings.clear()
+            return
+        # Singleton lookups are keyed by ``None`` and may resolve to any of them.
+        stale = set(workspace_uuids) | {None}
+        for key in [key for key in self._execution_bindings if key[0] in stale]:
+            del self._execution_bindings[key]
+
+    def _execution_binding_cache_ttl(self) -> float:
+        data = getattr(getattr(self.ap, 'instance_config', None), 'data', None) or {}
+        value = data.get('workspace', {}).get(
+            'execution_binding_cache_ttl_seconds', _DEFAULT_EXECUTION_BINDING_CACHE_TTL_SECONDS
+        )
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value) or value < 0:
+            return _DEFAULT_EXECUTION_BINDING_CACHE_TTL_SECONDS
+        return float(value)
+
+    def _cached_execution_binding(
+        self,
+        workspace_uuid: str | None,
+        require_local: bool,
+    ) -> WorkspaceExecutionBinding | None:
+        key = (workspace_uuid, require_local)
+        cached = self._execution_bindings.get(key)
+        if cached is None:
+            return None
+        binding, expires_at = cached
+        if time.monotonic() >= expires_at:
+            del self._execution_bindings[key]
+            return None
+        self._execution_bindings.move_to_end(key)
+        return binding
+
+    def _cache_execution_binding(
+        self,
+        workspace_uuid: str | None,
+        require_local: bool,
+        binding: WorkspaceExecutionBinding,
+    ) -> None:
+        ttl = self._execution_binding_cache_ttl()
+        if ttl <= 0:
+            return
+        key = (workspace_uuid, require_local)
+        self._execution_bindings[key] = (binding, time.monotonic() + ttl)
+        self._execution_bindings.move_to_end(key)
+        while len(self._execution_bindings) > _MAX_CACHED_EXECUTION_BINDINGS:
+            self._execution_bindings.popitem(last=False)
+
+    async def _load_execution_binding(
+        self,
+        workspace_uuid: str | None,
+        expected_generation: int | None,
+        _require_local: bool,
+        *,
+        session: AsyncSession | None = None,
+    ) -> WorkspaceExecutionBinding:
         tenant_uow = getattr(self.ap.persistence_mgr, 'tenant_uow', None)
         if session is None and workspace_uuid is not None and callable(tenant_uow):
-            async with tenant_uow(workspace_uuid) as uow:
-                return await self.get_execution_binding(
+            async with tenant_uow(workspace_uuid, read_only=True) as uow:
+                return await self._load_execution_binding(
                     workspace_uuid,
-                    expected_generation=expected_generation,
+                    expected_generation,
+                    _require_local,
                     session=uow.session,
-                    _require_local=_require_local,
                 )
 
         async def operation(repository: WorkspaceRepository) -> WorkspaceExecutionBinding:
@@ -29,9 +29,11 @@ def _authorization(token: str, workspace_uuid: str | None = None) -> dict[str, s
     return headers
 
 
+@pytest.mark.parametrize('sqlite_profile', ['default', 'tuned'])
 async def test_fresh_oss_workspace_http_journey_uses_real_sqlite_persistence(
     tmp_path,
     monkeypatch,
+    sqlite_profile,
 ):
     """Exercise the first-run Workspace journey through real HTTP handlers."""
 
@@ -44,7 +46,7 @@ async def test_fresh_oss_workspace_http_journey_uses_real_sqlite_persistence(
             data={
                 'database': {
                     'use': 'sqlite',
-                    'sqlite': {'path': str(tmp_path / 'langbot.db')},
+                    'sqlite': {'path': str(tmp_path / 'langbot.db'), 'profile': sqlite_profile},
                 },
                 'system': {
                     'jwt': {'secret': 'fresh-oss-workspace-secret', 'expire': 3600},
@@ -211,4 +213,4 @@ async def test_fresh_oss_workspace_http_journey_uses_real_sqlite_persistence(
         )
         assert persisted_wizard_status.scalar_one() == 'completed'
     finally:
-        await persistence.get_db_engine().dispose()
+        await persistence.shutdown()
@@ -119,12 +119,20 @@ def fake_monitoring_app():
     )
     app.monitoring_service.get_feedback_stats = AsyncMock(return_value={'like_count': 10})
     app.monitoring_service.get_feedback_list = AsyncMock(return_value=([{'feedback_id': 'fb-1'}], 12))
-    app.monitoring_service.export_messages = AsyncMock(return_value=[{'id': 'msg-1'}])
-    app.monitoring_service.export_llm_calls = AsyncMock(return_value=[{'id': 'llm-1'}])
-    app.monitoring_service.export_errors = AsyncMock(return_value=[{'id': 'err-1'}])
-    app.monitoring_service.export_sessions = AsyncMock(return_value=[{'session_id': 'sess-1'}])
-    app.monitoring_service.export_feedback = AsyncMock(return_value=[{'id': 'fb-1'}])
-    app.monitoring_service.export_embedding_calls = AsyncMock(return_value=[{'id': 'emb-1'}])
+
+    def export_rows(*rows):
+        async def iterate(*_args, **_kwargs):
+            for row in rows:
+                yield row
+
+        return Mock(side_effect=iterate)
+
+    app.monitoring_service.iter_export_messages = export_rows({'id': 'msg-1'})
+    app.monitoring_service.iter_export_llm_calls = export_rows({'id': 'llm-1'})
+    app.monitoring_service.iter_export_errors = export_rows({'id': 'err-1'})
+    app.monitoring_service.iter_export_sessions = export_rows({'session_id': 'sess-1'})
+    app.monitoring_service.iter_export_feedback = export_rows({'id': 'fb-1'})
+    app.monitoring_service.iter_export_embedding_calls = export_rows({'id': 'emb-1'})
     app.monitoring_service._escape_csv_field = Mock(return_value='escaped')
 
     return app
@@ -333,6 +341,45 @@ class TestMonitoringExportEndpoint:
         assert response.status_code == 200
         assert 'text/csv' in response.content_type
 
+    @pytest.mark.asyncio
+    async def test_export_streams_csv_rows(self, quart_test_client):
+        """CSV exports start with a BOM and header row followed by escaped rows."""
+        response = await quart_test_client.get(
+            '/api/v1/monitoring/export?type=errors', headers={'Authorization': 'Bearer test_token'}
+        )
+
+        assert response.status_code == 200
+        body = (await response.get_data()).decode('utf-8')
+        lines = body.split('\n')
+        assert lines[0].startswith('\ufeffid,timestamp,error_type')
+        assert lines[1].startswith('escaped,')
+
+    @pytest.mark.asyncio
+    async def test_export_ndjson_with_gzip(self, quart_test_client):
+        """format=ndjson yields one JSON object per line, gzip-encoded on request."""
+        import gzip
+        import json
+
+        response = await quart_test_client.get(
+            '/api/v1/monitoring/export?type=sessions&format=ndjson',
+            headers={'Authorization': 'Bearer test_token', 'Accept-Encoding': 'gzip'},
+        )
+
+        assert response.status_code == 200
+        assert response.content_type == 'application/x-ndjson'
+        assert response.headers['Content-Encoding'] == 'gzip'
+        lines = gzip.decompress(await response.get_data()).decode('utf-8').splitlines()
+        assert [json.loads(line)['session_id'] for line in lines] == ['sess-1']
+
+    @pytest.mark.asyncio
+    async def test_export_rejects_unknown_format(self, quart_test_client):
+        """Unsupported export formats are rejected before streaming starts."""
+        response = await quart_test_client.get(
+            '/api/v1/monitoring/export?type=messages&format=xlsx', headers={'Authorization': 'Bearer test_token'}
+        )
+
+        assert response.status_code == 400
+
     @pytest.mark.asyncio
     async def test_export_llm_calls(self, quart_test_client):
         """GET export?type=llm-calls returns CSV."""
@@ -108,7 +108,7 @@ class TestSQLiteMigrationUpgrade:
         await run_alembic_upgrade(sqlite_engine, 'head')
 
         assert await get_alembic_current(sqlite_engine) == _get_script_head()
-        assert _get_script_head() == '0021_merge_reasoning_config'
+        assert _get_script_head() == '0027_monitoring_tool_round_cost'
 
     @pytest.mark.asyncio
     async def test_upgrade_from_reasoning_config_head_to_merged_head(self, sqlite_engine):
@@ -119,7 +119,7 @@ class TestSQLiteMigrationUpgrade:
         await run_alembic_stamp(sqlite_engine, '0018_llm_reasoning_config')
         await run_alembic_upgrade(sqlite_engine, 'head')
 
-        assert await get_alembic_current(sqlite_engine) == '0021_merge_reasoning_config'
+        assert await get_alembic_current(sqlite_engine) == '0027_monitoring_tool_round_cost'
 
     @pytest.mark.asyncio
     async def test_upgrade_from_baseline_to_head(self, sqlite_engine):
@@ -276,6 +276,31 @@ class TestSQLiteMigrationUpgrade:
             ).scalar_one()
             assert json.loads(new_value) == {'level': 'provider_default'}
 
+    @pytest.mark.asyncio
+    async def test_webhook_outbox_keeps_existing_webhooks_inline(self, sqlite_engine):
+        """Upgrade from 0024 keeps calling existing webhooks inline so skip_pipeline keeps working."""
+        async with sqlite_engine.begin() as conn:
+            await conn.exec_driver_sql(
+                'CREATE TABLE webhooks ('
+                'id INTEGER PRIMARY KEY, workspace_uuid VARCHAR(36) NOT NULL, name VARCHAR(255) NOT NULL, '
+                'url VARCHAR(1024) NOT NULL, enabled BOOLEAN NOT NULL)'
+            )
+            await conn.exec_driver_sql(
+                'INSERT INTO webhooks (id, workspace_uuid, name, url, enabled) '
+                "VALUES (1, 'workspace', 'existing', 'https://example.invalid', 1)"
+            )
+
+        await run_alembic_stamp(sqlite_engine, '0024_conversation_snapshots')
+        await run_alembic_upgrade(sqlite_engine, 'head')
+
+        async with sqlite_engine.begin() as conn:
+            await conn.exec_driver_sql(
+                'INSERT INTO webhooks (id, workspace_uuid, name, url, enabled) '
+                "VALUES (2, 'workspace', 'new', 'https://example.invalid', 1)"
+            )
+            rows = (await conn.execute(text('SELECT id, can_skip_pipeline FROM webhooks ORDER BY id'))).all()
+        assert [tuple(row) for row in rows] == [(1, 1), (2, 0)]
+
 
 class TestSQLiteMigrationFreshDatabase:
     """Tests for fresh database workflow."""
@@ -0,0 +1,159 @@
+"""Statement-count regression tests for the standard chat path.
+
+A query runs through the real scheduler entry point, RuntimePipeline and
+monitoring bookkeeping against SQLite. Stage internals and the plugin Runtime
+are stubbed, so the counts cover the per-message work Core does around them.
+Raise an expected count only together with the change that needs it.
+"""
+
+from __future__ import annotations
+
+import logging
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, Mock
+
+import pytest
+import sqlalchemy as sa
+
+from langbot.pkg.api.http.context import ExecutionContext
+from langbot.pkg.api.http.service.bot import BotService
+from langbot.pkg.api.http.service.monitoring import MonitoringService
+from langbot.pkg.entity.persistence import monitoring as persistence_monitoring
+from langbot.pkg.entity.persistence import pipeline as persistence_pipeline
+from langbot.pkg.persistence.mgr import PersistenceManager
+from langbot.pkg.pipeline.controller import Controller
+from langbot.pkg.pipeline.pipelinemgr import RuntimePipeline
+from langbot.pkg.utils import constants
+from langbot.pkg.workspace.service import WorkspaceService
+from tests.factories import text_query
+
+
+pytestmark = [pytest.mark.integration, pytest.mark.asyncio]
+
+INSTANCE_UUID = 'statement-budget-instance'
+PIPELINE_UUID = 'statement-budget-pipeline'
+BOT_UUID = 'statement-budget-bot'
+
+# Bot lookup, monitoring message insert, session activity update and the
+# final status update. Execution-binding checks are served from memory.
+CHAT_PATH_STATEMENTS = 4
+# The first query after start-up also validates the Workspace placement
+# (workspace and execution state) and creates the monitoring session.
+FIRST_CHAT_PATH_STATEMENTS = CHAT_PATH_STATEMENTS + 3
+
+
+@pytest.fixture
+async def chat_app(tmp_path, monkeypatch):
+    monkeypatch.setattr(constants, 'instance_id', INSTANCE_UUID)
+    application = SimpleNamespace(
+        logger=logging.getLogger('statement-budget-test'),
+        instance_config=SimpleNamespace(
+            data={
+                'database': {
+                    'use': 'sqlite',
+                    'sqlite': {'path': str(tmp_path / 'langbot.db')},
+                    'query_statement_budget': {'debug': True, 'max_statements_per_query': CHAT_PATH_STATEMENTS},
+                },
+                'concurrency': {'pipeline': 4},
+            }
+        ),
+    )
+    persistence = PersistenceManager(application)
+    application.persistence_mgr = persistence
+    await persistence.initialize()
+    application.workspace_service = WorkspaceService(application, instance_uuid=INSTANCE_UUID)
+    workspace = await application.workspace_service.ensure_singleton_workspace()
+    application.monitoring_service = MonitoringService(application)
+    application.bot_service = BotService(application)
+    application.plugin_connector = SimpleNamespace(
+        emit_event=AsyncMock(return_value=SimpleNamespace(is_prevented_default=lambda: False))
+    )
+
+    execution_context = ExecutionContext(
+        instance_uuid=INSTANCE_UUID,
+        workspace_uuid=workspace.uuid,
+        placement_generation=1,
+    )
+    pipeline = RuntimePipeline(
+        application,
+        persistence_pipeline.LegacyPipeline(
+            uuid=PIPELINE_UUID,
+            workspace_uuid=workspace.uuid,
+            name='Chat',
+            config={},
+            extensions_preferences={},
+        ),
+        [],
+        execution_context,
+    )
+    query_pool = MagicMock()
+    query_pool.remove_query = AsyncMock(return_value=True)
+    query_pool.__aenter__ = AsyncMock(return_value=query_pool)
+    query_pool.__aexit__ = AsyncMock(return_value=None)
+    query_pool.condition = SimpleNamespace(notify_all=Mock())
+    application.query_pool = query_pool
+    application.sess_mgr = SimpleNamespace(get_session=AsyncMock())
+    application.pipeline_mgr = SimpleNamespace(get_pipeline_by_uuid=AsyncMock(return_value=pipeline))
+    application.execution_context = execution_context
+    try:
+        yield application
+    finally:
+        await persistence.shutdown()
+
+
+def _chat_query(application):
+    context = application.execution_context
+    query = text_query(
+        'hello',
+        bot_uuid=BOT_UUID,
+        pipeline_uuid=PIPELINE_UUID,
+        instance_uuid=context.instance_uuid,
+        workspace_uuid=context.workspace_uuid,
+        placement_generation=context.placement_generation,
+    )
+    object.__setattr__(
+        query,
+        '_execution_context',
+        ExecutionContext(
+            instance_uuid=context.instance_uuid,
+            workspace_uuid=context.workspace_uuid,
+            placement_generation=context.placement_generation,
+            bot_uuid=BOT_UUID,
+            pipeline_uuid=PIPELINE_UUID,
+        ),
+    )
+    return query
+
+
+async def _run_chat_query(application) -> None:
+    session = SimpleNamespace(_semaphore=SimpleNamespace(release=Mock()))
+    await Controller(application)._process_query(_chat_query(application), selected_session=session)
+
+
+async def test_chat_path_statement_count(chat_app):
+    await _run_chat_query(chat_app)
+    await _run_chat_query(chat_app)
+
+    snapshot = chat_app.persistence_mgr.query_statement_stats.snapshot()
+    assert snapshot['queries'] == 2
+    assert snapshot['statements_total'] == FIRST_CHAT_PATH_STATEMENTS + CHAT_PATH_STATEMENTS
+    assert snapshot['over_budget'] == 1
+
+
+async def test_chat_path_cost_is_stored_on_the_monitoring_message(chat_app):
+    await _run_chat_query(chat_app)
+
+    async with chat_app.persistence_mgr.tenant_uow(chat_app.execution_context.workspace_uuid) as uow:
+        messages = (
+            await uow.session.execute(
+                sa.select(persistence_monitoring.MonitoringMessage).where(
+                    persistence_monitoring.MonitoringMessage.role == 'user'
+                )
+            )
+        ).scalars()
+        message = messages.one()
+
+    assert message.status == 'success'
+    # Recorded with the status update, so that update itself is not included.
+    assert message.db_statements == FIRST_CHAT_PATH_STATEMENTS - 1
+    assert message.db_time_ms is not None
@@ -0,0 +1,77 @@
+"""Integration tests for the shared Valkey rate limit backend.
+
+These are SLOW, real-server tests gated on ``TEST_VALKEY_URL``, like the
+Valkey Search tests::
+
+    TEST_VALKEY_URL=valkey://localhost:6380 \\
+        uv run pytest tests/integration/pipeline/test_ratelimit_valkey.py -m slow -q
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import uuid
+from types import SimpleNamespace
+from urllib.parse import urlparse
+
+import pytest
+
+pytestmark = [pytest.mark.integration, pytest.mark.slow]
+
+
+@pytest.fixture
+async def backends():
+    """Two backends sharing one server, as two replicas would."""
+    url = os.environ.get('TEST_VALKEY_URL')
+    if not url:
+        pytest.skip('TEST_VALKEY_URL not set')
+
+    from langbot.pkg.pipeline.ratelimit.backend import VALKEY_AVAILABLE, ValkeyRateLimitBackend
+
+    if not VALKEY_AVAILABLE:
+        pytest.skip('valkey-glide not installed')
+
+    parsed = urlparse(url)
+    config = {
+        'host': parsed.hostname or 'localhost',
+        'port': parsed.port or 6379,
+        'db': int(parsed.path.strip('/') or 0),
+        'key_prefix': f'test:ratelimit:{uuid.uuid4().hex[:12]}:',
+    }
+    logger = SimpleNamespace(info=lambda *a, **k: None, warning=lambda *a, **k: None)
+    ap = SimpleNamespace(logger=logger)
+    replicas = [ValkeyRateLimitBackend(ap, config), ValkeyRateLimitBackend(ap, config)]
+    yield replicas
+    for replica in replicas:
+        await replica.close()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('algorithm', ['fixwin', 'tokenbucket'])
+async def test_replicas_share_one_quota(backends, algorithm):
+    first, second = backends
+
+    results = await asyncio.gather(
+        *(
+            replica.acquire('session', algorithm=algorithm, window_seconds=60, limit=5)
+            for replica in (first, second) * 5
+        )
+    )
+
+    assert sum(1 for retry_after in results if retry_after == 0) == 5
+    assert all(0 < retry_after <= 60 for retry_after in results if retry_after != 0)
+    assert first.fallback_count == second.fallback_count == 0
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_refills_between_windows(backends):
+    backend = backends[0]
+
+    assert await backend.acquire('refill', algorithm='tokenbucket', window_seconds=1, limit=2) == 0
+    assert await backend.acquire('refill', algorithm='tokenbucket', window_seconds=1, limit=2) == 0
+    retry_after = await backend.acquire('refill', algorithm='tokenbucket', window_seconds=1, limit=2)
+    assert 0 < retry_after <= 0.5
+
+    await asyncio.sleep(retry_after + 0.05)
+    assert await backend.acquire('refill', algorithm='tokenbucket', window_seconds=1, limit=2) == 0
@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import time
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import jwt
+import pytest
+import quart
+
+from langbot.pkg.api.http.context import PrincipalContext, PrincipalType, RequestContext, WorkspaceContext
+from langbot.pkg.api.http.controller.group import AuthType, RouterGroup
+from langbot.pkg.api.http.principal_cache import CachedPrincipal, PrincipalCache
+from langbot.pkg.cloud.entitlements import EntitlementResolver, EntitlementSnapshot
+
+
+class _Group(RouterGroup):
+    async def initialize(self) -> None:
+        return None
+
+
+def _request_context(
+    workspace_uuid: str = 'workspace-a',
+    principal_type: PrincipalType = PrincipalType.ACCOUNT,
+    entitlement_revision: int = 0,
+) -> RequestContext:
+    return RequestContext(
+        instance_uuid='instance-a',
+        placement_generation=1,
+        request_id='request-a',
+        auth_type='user-token',
+        principal=PrincipalContext(principal_type, account_uuid='account-a'),
+        workspace=WorkspaceContext(
+            workspace_uuid=workspace_uuid,
+            membership_uuid='membership-a',
+            role='owner',
+            permissions=frozenset(),
+        ),
+        entitlement_revision=entitlement_revision,
+    )
+
+
+def _token(expires_in: int = 3600) -> str:
+    return jwt.encode({'user': 'owner@example.com', 'exp': int(time.time()) + expires_in}, 'secret')
+
+
+def _account_router(cache: PrincipalCache, **app_fields) -> tuple[_Group, SimpleNamespace]:
+    account = SimpleNamespace(uuid='account-a', user='owner@example.com')
+    access = SimpleNamespace(
+        execution=SimpleNamespace(instance_uuid='instance-a', placement_generation=1),
+        workspace=SimpleNamespace(uuid='workspace-a'),
+        membership=SimpleNamespace(uuid='membership-a', role='owner', projection_revision=3),
+    )
+    ap = SimpleNamespace(
+        principal_cache=cache,
+        user_service=SimpleNamespace(get_authenticated_account=AsyncMock(return_value=account)),
+        workspace_collaboration_service=SimpleNamespace(resolve_account_workspace=AsyncMock(return_value=access)),
+        **app_fields,
+    )
+    return _Group(ap, quart.Quart(__name__)), ap
+
+
+def test_entries_expire_and_respect_the_credential_lifetime():
+    cache = PrincipalCache(ttl_seconds=60)
+    key = cache.key('account', 'token-a', 'workspace-a')
+
+    cache.put(key, CachedPrincipal(_request_context()), epoch=cache.epoch, valid_for_seconds=0)
+    assert cache.get(key) is None
+
+    cache.put(key, CachedPrincipal(_request_context()), epoch=cache.epoch, valid_for_seconds=0.01)
+    time.sleep(0.02)
+    assert cache.get(key) is None
+    assert 'token-a' not in repr(key)
+    assert cache.snapshot() == {
+        'entries': 0,
+        'hits': 0,
+        'misses': 2,
+        'stale': 1,
+        'invalidations': 0,
+        'hit_rate': 0.0,
+    }
+
+
+def test_invalidation_is_scoped_and_discards_in_flight_resolutions():
+    cache = PrincipalCache()
+    account_a = cache.key('account', 'token-a', 'workspace-a')
+    account_b = cache.key('account', 'token-a', 'workspace-b')
+    api_key_a = cache.key('api_key', 'lbk_a')
+    cache.put(account_a, CachedPrincipal(_request_context()), epoch=cache.epoch)
+    cache.put(account_b, CachedPrincipal(_request_context('workspace-b')), epoch=cache.epoch)
+    cache.put(api_key_a, CachedPrincipal(_request_context(principal_type=PrincipalType.API_KEY)), epoch=cache.epoch)
+
+    epoch = cache.epoch
+    cache.invalidate(['workspace-a'], principal_type=PrincipalType.API_KEY)
+    assert cache.get(api_key_a) is None
+    assert cache.get(account_a) is not None
+
+    cache.put(api_key_a, CachedPrincipal(_request_context(principal_type=PrincipalType.API_KEY)), epoch=epoch)
+    assert cache.get(api_key_a) is None
+
+    cache.invalidate(['workspace-a'])
+    assert cache.get(account_a) is None
+    assert cache.get(account_b) is not None
+    assert cache.snapshot()['invalidations'] == 2
+
+
+def test_from_config_falls_back_on_invalid_values():
+    cache = PrincipalCache.from_config({'ttl_seconds': 'soon', 'max_entries': 0})
+    assert (cache.ttl_seconds, cache.max_entries) == (5.0, 4096)
+    assert PrincipalCache.from_config({'ttl_seconds': 0}).enabled is False
+
+
+@pytest.mark.asyncio
+async def test_account_principal_is_reused_per_token_and_workspace_selector():
+    cache = PrincipalCache()
+    router, ap = _account_router(cache)
+    token = _token()
+
+    async with router.quart_app.test_request_context('/', headers={'X-Workspace-Id': 'workspace-a'}):
+        _, first_email, first = await router._resolve_account_principal(token, AuthType.USER_TOKEN)
+    async with router.quart_app.test_request_context('/', headers={'X-Workspace-Id': 'workspace-a'}):
+        account, user_email, second = await router._resolve_account_principal(token, AuthType.USER_TOKEN_OR_API_KEY)
+        assert quart.g.request_context is second
+        assert quart.g.workspace_membership.uuid == 'membership-a'
+
+    assert (account.uuid, user_email) == ('account-a', first_email)
+    assert second.workspace == first.workspace
+    assert second.auth_type == AuthType.USER_TOKEN_OR_API_KEY.value
+    assert second.request_id != first.request_id
+    ap.user_service.get_authenticated_account.assert_awaited_once()
+    ap.workspace_collaboration_service.resolve_account_workspace.assert_awaited_once()
+
+    async with router.quart_app.test_request_context('/', headers={'X-Workspace-Id': 'workspace-b'}):
+        await router._resolve_account_principal(token, AuthType.USER_TOKEN)
+    assert ap.workspace_collaboration_service.resolve_account_workspace.await_count == 2
+    assert cache.snapshot()['hits'] == 1
+
+
+@pytest.mark.asyncio
+async def test_api_key_principal_is_reused_until_revoked():
+    cache = PrincipalCache()
+    identity = SimpleNamespace(
+        instance_uuid='instance-a',
+        workspace_uuid='workspace-a',
+        placement_generation=1,
+        api_key_uuid='key-a',
+        permissions=frozenset(),
+        expires_at=None,
+    )
+    ap = SimpleNamespace(
+        principal_cache=cache,
+        apikey_service=SimpleNamespace(authenticate_api_key=AsyncMock(return_value=identity)),
+    )
+    router = _Group(ap, quart.Quart(__name__))
+
+    for _ in range(2):
+        async with router.quart_app.test_request_context('/'):
+            request_context = await router._authenticate_api_key('lbk_a', AuthType.API_KEY)
+    assert request_context.principal.api_key_uuid == 'key-a'
+    ap.apikey_service.authenticate_api_key.assert_awaited_once()
+
+    cache.invalidate(['workspace-a'], principal_type=PrincipalType.API_KEY)
+    async with router.quart_app.test_request_context('/'):
+        await router._authenticate_api_key('lbk_a', AuthType.API_KEY)
+    assert ap.apikey_service.authenticate_api_key.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_cloud_principal_is_dropped_once_a_newer_entitlement_revision_is_seen():
+    snapshots = [
+        EntitlementSnapshot(
+            instance_uuid='instance-a',
+            workspace_uuid='workspace-a',
+            entitlement_revision=revision,
+            status='active',
+            not_before=1,
+            expires_at=4_000_000_000,
+        )
+        for revision in (9, 10, 10)
+    ]
+    provider = SimpleNamespace(get_workspace_entitlement=AsyncMock(side_effect=snapshots))
+    resolver = EntitlementResolver('instance-a', provider)
+    cache = PrincipalCache()
+    router, ap = _account_router(
+        cache,
+        deployment=SimpleNamespace(multi_workspace_enabled=True),
+        entitlement_resolver=resolver,
+    )
+    token = _token()
+
+    async with router.quart_app.test_request_context('/', headers={'X-Workspace-Id': 'workspace-a'}):
+        _, _, first = await router._resolve_account_principal(token, AuthType.USER_TOKEN)
+        await router._resolve_account_principal(token, AuthType.USER_TOKEN)
+    assert first.entitlement_revision == 9
+    ap.user_service.get_authenticated_account.assert_awaited_once()
+
+    await resolver.resolve('workspace-a')
+    async with router.quart_app.test_request_context('/', headers={'X-Workspace-Id': 'workspace-a'}):
+        _, _, refreshed = await router._resolve_account_principal(token, AuthType.USER_TOKEN)
+
+    assert refreshed.entitlement_revision == 10
+    assert ap.user_service.get_authenticated_account.await_count == 2
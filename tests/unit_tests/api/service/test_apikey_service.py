@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import dataclasses
 import datetime
 import hashlib
 import logging
@@ -13,6 +14,7 @@ from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 
 from langbot.pkg.api.http.authz import Permission, PermissionDeniedError
 from langbot.pkg.api.http.context import PrincipalContext, PrincipalType, RequestContext, WorkspaceContext
+from langbot.pkg.api.http.principal_cache import CachedPrincipal, PrincipalCache
 from langbot.pkg.api.http.service.apikey import ApiKeyService
 from langbot.pkg.entity.persistence.apikey import ApiKey
 from langbot.pkg.entity.persistence.base import Base
@@ -409,6 +411,23 @@ class TestApiKeyServiceDeleteApiKey:
         assert stored['status'] == 'revoked'
         assert await service.verify_api_key(created['key']) is False
 
+    async def test_delete_api_key_drops_cached_api_key_principals(self, api_key_context):
+        application, service, context, _engine = api_key_context
+        created = await service.create_api_key(context, 'Cached')
+        application.principal_cache = PrincipalCache()
+        api_key_principal = dataclasses.replace(
+            context, principal=PrincipalContext(PrincipalType.API_KEY, api_key_uuid=created['uuid'])
+        )
+        api_key_entry = PrincipalCache.key('api_key', created['key'])
+        account_entry = PrincipalCache.key('account', 'token', context.workspace_uuid)
+        application.principal_cache.put(api_key_entry, CachedPrincipal(api_key_principal), epoch=0)
+        application.principal_cache.put(account_entry, CachedPrincipal(context), epoch=0)
+
+        await service.delete_api_key(context, created['id'])
+
+        assert application.principal_cache.get(api_key_entry) is None
+        assert application.principal_cache.get(account_entry) is not None
+
     async def test_delete_api_key_nonexistent_id(self, api_key_context):
         _application, service, context, _engine = api_key_context
 
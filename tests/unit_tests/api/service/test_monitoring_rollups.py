@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+import datetime
+from types import SimpleNamespace
+
+import pytest
+import sqlalchemy
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from langbot.pkg.api.http.context import ExecutionContext
+from langbot.pkg.api.http.service.monitoring import MonitoringService
+from langbot.pkg.entity.persistence.base import Base
+from langbot.pkg.entity.persistence.monitoring import (
+    MonitoringEmbeddingCall,
+    MonitoringHourlyRollup,
+    MonitoringLLMCall,
+    MonitoringMessage,
+)
+from langbot.pkg.entity.persistence.workspace import Workspace
+
+
+pytestmark = pytest.mark.asyncio
+
+WORKSPACE_A = '00000000-0000-0000-0000-00000000000a'
+WORKSPACE_B = '00000000-0000-0000-0000-00000000000b'
+FIRST_HOUR = datetime.datetime(2026, 7, 28, 10, 0)
+NOW = FIRST_HOUR + datetime.timedelta(hours=5, minutes=10)
+
+
+def _context(workspace_uuid: str) -> ExecutionContext:
+    return ExecutionContext(
+        instance_uuid='instance',
+        workspace_uuid=workspace_uuid,
+        placement_generation=1,
+    )
+
+
+class _PersistenceManager:
+    def __init__(self, engine):
+        self.engine = engine
+
+    async def execute_async(self, *args, **kwargs):
+        async with self.engine.connect() as connection:
+            result = await connection.execute(*args, **kwargs)
+            await connection.commit()
+            return result
+
+    def get_db_engine(self):
+        return self.engine
+
+
+@pytest.fixture
+async def service(tmp_path):
+    engine = create_async_engine(f'sqlite+aiosqlite:///{tmp_path / "monitoring.db"}')
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+        await connection.execute(
+            sqlalchemy.insert(Workspace),
+            [
+                {
+                    'uuid': workspace_uuid,
+                    'instance_uuid': 'instance',
+                    'name': name,
+                    'slug': name.lower(),
+                    'source': 'cloud_projection',
+                }
+                for workspace_uuid, name in ((WORKSPACE_A, 'A'), (WORKSPACE_B, 'B'))
+            ],
+        )
+    application = SimpleNamespace(
+        persistence_mgr=_PersistenceManager(engine),
+        instance_config=SimpleNamespace(data={'monitoring': {}}),
+    )
+    yield MonitoringService(application)
+    await engine.dispose()
+
+
+async def _seed(service: MonitoringService) -> None:
+    messages = []
+    llm_calls = []
+    embedding_calls = []
+    for workspace_uuid in (WORKSPACE_A, WORKSPACE_B):
+        for hour in range(6):
+            for minute, bot_id, status in ((5, 'bot-1', 'success'), (35, 'bot-2', 'error')):
+                timestamp = FIRST_HOUR + datetime.timedelta(hours=hour, minutes=minute)
+                suffix = f'{workspace_uuid[-1]}-{hour}-{minute}'
+                messages.append(
+                    {
+                        'id': f'message-{suffix}',
+                        'workspace_uuid': workspace_uuid,
+                        'timestamp': timestamp,
+                        'bot_id': bot_id,
+                        'bot_name': bot_id,
+                        'pipeline_id': 'pipeline',
+                        'pipeline_name': 'Pipeline',
+                        'message_content': 'hello',
+                        'session_id': 'session',
+                        'status': status,
+                        'level': 'info',
+                    }
+                )
+                llm_calls.append(
+                    {
+                        'id': f'llm-{suffix}',
+                        'workspace_uuid': workspace_uuid,
+                        'timestamp': timestamp,
+                        'model_name': 'large-model' if hour % 2 else 'small-model',
+                        'input_tokens': hour + 1,
+                        'output_tokens': 2 * hour,
+                        'total_tokens': 3 * hour + 1,
+                        'duration': 100,
+                        'cost': 0.01,
+                        'status': status,
+                        'bot_id': bot_id,
+                        'bot_name': bot_id,
+                        'pipeline_id': 'pipeline',
+                        'pipeline_name': 'Pipeline',
+                        'session_id': 'session',
+                    }
+                )
+                embedding_calls.append(
+                    {
+                        'id': f'embedding-{suffix}',
+                        'workspace_uuid': workspace_uuid,
+                        'timestamp': timestamp,
+                        'model_name': 'embedder',
+                        'prompt_tokens': 4,
+                        'total_tokens': 4,
+                        'duration': 10,
+                        'input_count': 1,
+                        'status': 'success',
+                    }
+                )
+    await service.ap.persistence_mgr.execute_async(sqlalchemy.insert(MonitoringMessage), messages)
+    await service.ap.persistence_mgr.execute_async(sqlalchemy.insert(MonitoringLLMCall), llm_calls)
+    await service.ap.persistence_mgr.execute_async(sqlalchemy.insert(MonitoringEmbeddingCall), embedding_calls)
+
+
+_QUERY_RANGES = [
+    {},
+    {'start_time': FIRST_HOUR + datetime.timedelta(minutes=20)},
+    {'end_time': FIRST_HOUR + datetime.timedelta(hours=3, minutes=5)},
+    {
+        'start_time': FIRST_HOUR + datetime.timedelta(hours=1, minutes=5),
+        'end_time': FIRST_HOUR + datetime.timedelta(hours=4, minutes=5),
+    },
+    {'start_time': FIRST_HOUR + datetime.timedelta(hours=2, minutes=1), 'bot_ids': ['bot-1']},
+]
+
+
+async def _snapshot(service: MonitoringService) -> list:
+    context = _context(WORKSPACE_A)
+    snapshots = []
+    for query_range in _QUERY_RANGES:
+        snapshots.append(await service.get_overview_metrics(context, **query_range))
+        for bucket in ('hour', 'day'):
+            snapshots.append(await service.get_token_statistics(context, bucket=bucket, **query_range))
+    return snapshots
+
+
+async def test_rollup_reads_match_raw_reads(service):
+    await _seed(service)
+    raw = await _snapshot(service)
+
+    written = await service.rollups.compact(WORKSPACE_A, now=NOW)
+
+    assert written > 0
+    assert await service.rollups.get_watermark(WORKSPACE_A) == FIRST_HOUR + datetime.timedelta(hours=4)
+    assert await service.rollups.get_watermark(WORKSPACE_B) is None
+    assert await _snapshot(service) == raw
+
+
+async def test_compaction_is_bounded_settled_and_idempotent(service):
+    service.ap.instance_config.data['monitoring']['rollups'] = {'max_hours_per_run': 2, 'settle_minutes': 30}
+    await _seed(service)
+
+    await service.rollups.compact(WORKSPACE_A, now=NOW)
+    assert await service.rollups.get_watermark(WORKSPACE_A) == FIRST_HOUR + datetime.timedelta(hours=2)
+
+    await service.rollups.compact(WORKSPACE_A, now=NOW)
+    await service.rollups.compact(WORKSPACE_A, now=NOW)
+    # 15:10 minus 30 settle minutes leaves 14:00 as the newest closed hour.
+    assert await service.rollups.get_watermark(WORKSPACE_A) == FIRST_HOUR + datetime.timedelta(hours=4)
+    assert await service.rollups.compact(WORKSPACE_A, now=NOW) == 0
+
+    async with service.ap.persistence_mgr.engine.connect() as connection:
+        rollup_messages = await connection.scalar(
+            sqlalchemy.select(sqlalchemy.func.sum(MonitoringHourlyRollup.record_count)).where(
+                MonitoringHourlyRollup.workspace_uuid == WORKSPACE_A,
+                MonitoringHourlyRollup.source == 'message',
+            )
+        )
+    assert rollup_messages == 8
+
+
+async def test_empty_workspace_publishes_watermark(service):
+    assert await service.compact_rollups(_context(WORKSPACE_A)) == 0
+
+    assert await service.rollups.get_watermark(WORKSPACE_A) is not None
+    overview = await service.get_overview_metrics(_context(WORKSPACE_A))
+    assert overview['total_messages'] == 0
+
+
+async def test_disabled_rollups_read_raw_tables(service):
+    await _seed(service)
+    await service.rollups.compact(WORKSPACE_A, now=NOW)
+    service.ap.instance_config.data['monitoring']['rollups'] = {'enabled': False}
+
+    assert await service.rollups.get_window(WORKSPACE_A, None, None) is None
+    assert await service.compact_rollups(_context(WORKSPACE_A)) == 0
+    overview = await service.get_overview_metrics(_context(WORKSPACE_A))
+    assert overview['total_messages'] == 12
+
+
+async def test_cleanup_prunes_expired_rollup_hours(service):
+    await _seed(service)
+    await service.rollups.compact(WORKSPACE_A, now=NOW)
+
+    deleted = await service.rollups.prune(WORKSPACE_A, FIRST_HOUR + datetime.timedelta(hours=2, minutes=30))
+
+    assert deleted > 0
+    async with service.ap.persistence_mgr.engine.connect() as connection:
+        oldest = await connection.scalar(
+            sqlalchemy.select(sqlalchemy.func.min(MonitoringHourlyRollup.bucket_start)).where(
+                MonitoringHourlyRollup.workspace_uuid == WORKSPACE_A
+            )
+        )
+    assert oldest == FIRST_HOUR + datetime.timedelta(hours=2)
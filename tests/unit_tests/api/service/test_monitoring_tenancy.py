@@ -258,16 +258,63 @@ async def test_monitoring_queries_and_detail_views_are_strictly_bounded(service)
     service.ap.instance_config.data['monitoring']['query_limits'] = {
         'page_rows': 999999,
         'export_rows': 999999,
+        'stream_export_rows': 99999999,
         'detail_rows': 999999,
         'timeseries_buckets': 999999,
         'max_offset': 99999999,
     }
     assert service.normalize_page_window(999999, 99999999) == (5000, 10000000)
     assert service.normalize_export_limit(999999) == 50000
+    assert service.normalize_stream_export_limit(99999999) == 1000000
     assert service._detail_limit() == 10000
     assert service._timeseries_bucket_limit() == 10000
 
 
+async def test_streamed_export_pages_by_keyset_without_gaps_or_duplicates(service):
+    context = _context(WORKSPACE_A)
+    service.ap.instance_config.data['monitoring'] = {'query_limits': {'export_page_rows': 2}}
+    same_second = datetime.datetime(2026, 7, 28, 10, 0)
+    await service.ap.persistence_mgr.execute_async(
+        sqlalchemy.insert(MonitoringMessage),
+        [
+            {
+                'id': f'message-{workspace_uuid[-1]}{index}',
+                'workspace_uuid': workspace_uuid,
+                # Three rows share a timestamp so pages must break ties by ID.
+                'timestamp': same_second + datetime.timedelta(minutes=max(index - 2, 0)),
+                'bot_id': 'bot',
+                'bot_name': 'Bot',
+                'pipeline_id': 'pipeline',
+                'pipeline_name': 'Pipeline',
+                'message_content': 'hello',
+                'session_id': 'session',
+                'status': 'success',
+                'level': 'info',
+            }
+            for workspace_uuid in (WORKSPACE_A, WORKSPACE_B)
+            for index in range(6)
+        ],
+    )
+    executed: list[str] = []
+    execute_async = service.ap.persistence_mgr.execute_async
+
+    async def record_statement(statement, *args, **kwargs):
+        executed.append(type(statement).__name__)
+        return await execute_async(statement, *args, **kwargs)
+
+    service.ap.persistence_mgr.execute_async = record_statement
+
+    streamed = [row['id'] async for row in service.iter_export_messages(context)]
+
+    assert streamed == [f'message-a{index}' for index in (5, 4, 3, 2, 1, 0)]
+    # Three full pages plus the empty page that proves the end was reached.
+    assert executed == ['Select'] * 4
+
+    limited = [row['id'] async for row in service.iter_export_messages(context, limit=3)]
+
+    assert limited == streamed[:3]
+
+
 async def test_token_statistics_aggregate_and_limit_groups_in_database(service):
     context = _context(WORKSPACE_A)
     service.ap.instance_config.data['monitoring'] = {
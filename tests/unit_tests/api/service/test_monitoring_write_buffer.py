@@ -0,0 +1,329 @@
+from __future__ import annotations
+
+import asyncio
+import datetime
+from types import SimpleNamespace
+
+import pytest
+import sqlalchemy
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from langbot.pkg.api.http.context import ExecutionContext
+from langbot.pkg.api.http.service.monitoring import MonitoringService
+from langbot.pkg.entity.persistence.base import Base
+from langbot.pkg.entity.persistence.monitoring import MonitoringLLMCall, MonitoringMessage, MonitoringToolCall
+from langbot.pkg.entity.persistence.workspace import Workspace
+
+
+pytestmark = pytest.mark.asyncio
+
+WORKSPACE_A = '00000000-0000-0000-0000-00000000000a'
+WORKSPACE_B = '00000000-0000-0000-0000-00000000000b'
+
+
+def _context(workspace_uuid: str) -> ExecutionContext:
+    return ExecutionContext(
+        instance_uuid='instance',
+        workspace_uuid=workspace_uuid,
+        placement_generation=1,
+    )
+
+
+class _CountingPersistenceManager:
+    def __init__(self, engine):
+        self.engine = engine
+        self.statements: list[str] = []
+
+    async def execute_async(self, statement, *args, **kwargs):
+        self.statements.append(type(statement).__name__)
+        async with self.engine.connect() as connection:
+            result = await connection.execute(statement, *args, **kwargs)
+            await connection.commit()
+            return result
+
+    def get_db_engine(self):
+        return self.engine
+
+    @staticmethod
+    def serialize_model(model, data, masked_columns=None):
+        return {
+            column.name: (
+                getattr(data, column.name).isoformat()
+                if isinstance(getattr(data, column.name), datetime.datetime)
+                else getattr(data, column.name)
+            )
+            for column in model.__table__.columns
+            if column.name not in (masked_columns or [])
+        }
+
+
+@pytest.fixture
+async def service(tmp_path):
+    engine = create_async_engine(f'sqlite+aiosqlite:///{tmp_path / "monitoring.db"}')
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+        await connection.execute(
+            sqlalchemy.insert(Workspace),
+            [
+                {
+                    'uuid': workspace_uuid,
+                    'instance_uuid': 'instance',
+                    'name': name,
+                    'slug': name.lower(),
+                    'source': 'cloud_projection',
+                }
+                for workspace_uuid, name in ((WORKSPACE_A, 'A'), (WORKSPACE_B, 'B'))
+            ],
+        )
+    application = SimpleNamespace(
+        persistence_mgr=_CountingPersistenceManager(engine),
+        instance_config=SimpleNamespace(
+            data={'monitoring': {'write_buffer': {'max_pending_rows': 4, 'flush_rows': 100}}},
+        ),
+        logger=SimpleNamespace(warning=lambda *_args, **_kwargs: None),
+    )
+    monitoring_service = MonitoringService(application)
+    yield monitoring_service
+    await engine.dispose()
+
+
+async def _record_message(service, context, content='hello'):
+    return await service.record_message(
+        context,
+        bot_id='bot',
+        bot_name='Bot',
+        pipeline_id='pipeline',
+        pipeline_name='Pipeline',
+        message_content=content,
+        session_id='person_1',
+        status='pending',
+    )
+
+
+async def _count(service, model) -> int:
+    async with service.ap.persistence_mgr.engine.connect() as connection:
+        return (await connection.execute(sqlalchemy.select(sqlalchemy.func.count()).select_from(model))).scalar_one()
+
+
+async def test_records_are_written_inline_without_buffer(service):
+    await _record_message(service, _context(WORKSPACE_A))
+
+    assert await _count(service, MonitoringMessage) == 1
+
+
+async def test_buffered_records_are_coalesced_per_table_and_workspace(service):
+    buffer = service.enable_write_buffer()
+    for workspace_uuid in (WORKSPACE_A, WORKSPACE_A, WORKSPACE_B):
+        await _record_message(service, _context(workspace_uuid))
+    await service.record_llm_call(
+        _context(WORKSPACE_A),
+        bot_id='bot',
+        bot_name='Bot',
+        pipeline_id='pipeline',
+        pipeline_name='Pipeline',
+        session_id='person_1',
+        model_name='model',
+        input_tokens=1,
+        output_tokens=2,
+        duration=3,
+    )
+
+    assert service.ap.persistence_mgr.statements == []
+    assert await _count(service, MonitoringMessage) == 0
+
+    assert await buffer.flush() == 4
+
+    assert service.ap.persistence_mgr.statements == ['Insert', 'Insert', 'Insert']
+    assert await _count(service, MonitoringMessage) == 3
+    assert await _count(service, MonitoringLLMCall) == 1
+    snapshot = buffer.snapshot()
+    assert snapshot['pending_rows'] == 0
+    assert snapshot['tables']['monitoring_messages']['flushed'] == 3
+    assert snapshot['tables']['monitoring_messages']['statements'] == 2
+
+
+async def test_status_update_is_folded_into_pending_message(service):
+    buffer = service.enable_write_buffer()
+    context = _context(WORKSPACE_A)
+    message_id = await _record_message(service, context)
+
+    await service.update_message_status(context, message_id, 'success', variables='{"a": 1}')
+    await buffer.flush()
+
+    assert service.ap.persistence_mgr.statements == ['Insert']
+    messages, total = await service.get_messages(context)
+    assert total == 1
+    assert messages[0]['status'] == 'success'
+    assert messages[0]['variables'] == '{"a": 1}'
+
+
+async def test_rows_with_different_keys_share_one_insert(service):
+    buffer = service.enable_write_buffer()
+    row = {
+        'workspace_uuid': WORKSPACE_A,
+        'timestamp': datetime.datetime(2026, 1, 1),
+        'bot_id': 'bot',
+        'bot_name': 'Bot',
+        'pipeline_id': 'pipeline',
+        'pipeline_name': 'Pipeline',
+        'message_content': 'hello',
+        'session_id': 'person_1',
+        'level': 'info',
+    }
+    buffer.enqueue(MonitoringMessage, WORKSPACE_A, {**row, 'id': 'm1', 'status': 'pending'})
+    buffer.enqueue(MonitoringMessage, WORKSPACE_A, {**row, 'id': 'm2', 'status': 'pending', 'role': 'assistant'})
+    with pytest.raises(ValueError, match='Unknown monitoring message columns: nope'):
+        buffer.update_pending_message(WORKSPACE_A, 'm1', {'nope': 1})
+    buffer.update_pending_message(WORKSPACE_A, 'm1', {'status': 'success', 'db_statements': 4})
+
+    assert await buffer.flush() == 2
+
+    async with service.ap.persistence_mgr.engine.connect() as connection:
+        rows = (
+            await connection.execute(
+                sqlalchemy.select(
+                    MonitoringMessage.id,
+                    MonitoringMessage.status,
+                    MonitoringMessage.role,
+                    MonitoringMessage.db_statements,
+                ).order_by(MonitoringMessage.id)
+            )
+        ).all()
+    assert [tuple(row) for row in rows] == [('m1', 'success', 'user', 4), ('m2', 'pending', 'assistant', None)]
+
+
+async def test_status_and_sql_cost_fold_into_any_row_of_a_mixed_batch(service):
+    buffer = service.enable_write_buffer()
+    context = _context(WORKSPACE_A)
+    first_id = await _record_message(service, context, 'first')
+    second_id = await _record_message(service, context, 'second')
+    third_id = await _record_message(service, context, 'third')
+
+    await service.update_message_status(context, first_id, 'success', db_statements=4, db_time_ms=2)
+    await service.update_message_status(context, third_id, 'error', level='error', db_statements=7, db_time_ms=5)
+    assert await buffer.flush() == 3
+
+    snapshot = buffer.snapshot()['tables']['monitoring_messages']
+    assert (snapshot['flushed'], snapshot['failed']) == (3, 0)
+    messages, _ = await service.get_messages(context)
+    stored = {message['id']: message for message in messages}
+    assert (stored[first_id]['status'], stored[first_id]['db_statements'], stored[first_id]['db_time_ms']) == (
+        'success',
+        4,
+        2,
+    )
+    assert (stored[second_id]['status'], stored[second_id]['db_statements']) == ('pending', None)
+    assert (stored[third_id]['status'], stored[third_id]['level'], stored[third_id]['db_statements']) == (
+        'error',
+        'error',
+        7,
+    )
+
+
+async def test_tool_call_round_timings_are_stored_with_the_message(service):
+    from langbot.pkg.pipeline.monitoring_helper import MonitoringHelper
+
+    context = _context(WORKSPACE_A)
+    message_id = await _record_message(service, context)
+    query = SimpleNamespace(
+        variables={
+            '_telemetry_features': {
+                'tool_call_round_timings': [
+                    {'calls': 3, 'wall_ms': 120, 'tool_ms': 330},
+                    {'calls': 1, 'wall_ms': 40, 'tool_ms': 38},
+                ]
+            }
+        }
+    )
+
+    assert MonitoringHelper.tool_round_cost(SimpleNamespace(variables={})) == {}
+    await service.update_message_status(context, message_id, 'success', **MonitoringHelper.tool_round_cost(query))
+
+    (message,), _ = await service.get_messages(context)
+    assert (message['tool_rounds'], message['tool_wall_ms'], message['tool_time_ms']) == (2, 160, 368)
+
+
+async def test_status_update_after_flush_reaches_database(service):
+    buffer = service.enable_write_buffer()
+    context = _context(WORKSPACE_A)
+    message_id = await _record_message(service, context)
+    await buffer.flush()
+
+    await service.update_message_status(context, message_id, 'error', level='error')
+
+    messages, _ = await service.get_messages(context)
+    assert messages[0]['status'] == 'error'
+    assert messages[0]['level'] == 'error'
+
+
+async def test_tool_call_inherits_context_from_pending_message(service):
+    buffer = service.enable_write_buffer()
+    context = _context(WORKSPACE_A)
+    message_id = await _record_message(service, context)
+
+    await service.record_tool_call(
+        context,
+        tool_name='search',
+        tool_source='native',
+        duration=5,
+        message_id=message_id,
+    )
+    await buffer.flush()
+
+    assert service.ap.persistence_mgr.statements == ['Insert', 'Insert']
+    tool_calls, total = await service.get_tool_calls(context)
+    assert total == 1
+    assert tool_calls[0]['pipeline_id'] == 'pipeline'
+    assert tool_calls[0]['session_id'] == 'person_1'
+    assert await _count(service, MonitoringToolCall) == 1
+
+
+async def test_full_buffer_drops_and_counts_rows(service):
+    buffer = service.enable_write_buffer()
+    for _ in range(6):
+        await _record_message(service, _context(WORKSPACE_A))
+
+    assert buffer.pending_rows == 4
+    assert buffer.snapshot()['tables']['monitoring_messages']['dropped'] == 2
+
+    await service.shutdown()
+
+    assert service.write_buffer is None
+    assert await _count(service, MonitoringMessage) == 4
+
+
+async def test_failed_group_is_counted_without_blocking_other_workspaces(service):
+    buffer = service.enable_write_buffer()
+    await _record_message(service, _context('00000000-0000-0000-0000-0000000000ff'))
+    await _record_message(service, _context(WORKSPACE_B))
+
+    original_execute = service.ap.persistence_mgr.execute_async
+
+    async def reject_unknown_workspace(statement, *args, **kwargs):
+        if '0000000000ff' in str(statement.compile(compile_kwargs={'literal_binds': True})):
+            raise sqlalchemy.exc.IntegrityError('insert', {}, Exception('unknown workspace'))
+        return await original_execute(statement, *args, **kwargs)
+
+    service.ap.persistence_mgr.execute_async = reject_unknown_workspace
+
+    assert await buffer.flush() == 1
+    assert buffer.snapshot()['tables']['monitoring_messages']['failed'] == 1
+    assert await _count(service, MonitoringMessage) == 1
+
+
+async def test_run_loop_flushes_on_interval(service):
+    service.ap.instance_config.data['monitoring']['write_buffer']['flush_interval_seconds'] = 0.01
+    buffer = service.enable_write_buffer()
+    run_task = asyncio.create_task(buffer.run())
+    try:
+        await _record_message(service, _context(WORKSPACE_A))
+        for _ in range(100):
+            if buffer.snapshot()['tables']['monitoring_messages']['flushed']:
+                break
+            await asyncio.sleep(0.01)
+    finally:
+        run_task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await run_task
+
+    assert await _count(service, MonitoringMessage) == 1
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import io
 from types import SimpleNamespace
-from unittest.mock import AsyncMock
+from unittest.mock import AsyncMock, Mock
 
 import pytest
 import quart
@@ -29,7 +29,13 @@ async def test_document_upload_uses_dedicated_scoped_owner_type():
             projection_revision=1,
         ),
     )
-    storage_mgr = SimpleNamespace(save_scoped=AsyncMock(return_value='scoped-document-key'))
+    saved_chunks: list[bytes] = []
+
+    async def save_scoped_stream(context, *, chunks, **kwargs):
+        saved_chunks.extend([chunk async for chunk in chunks])
+        return 'scoped-document-key'
+
+    storage_mgr = SimpleNamespace(save_scoped_stream=AsyncMock(side_effect=save_scoped_stream))
     application = SimpleNamespace(
         user_service=SimpleNamespace(get_authenticated_account=AsyncMock(return_value=account)),
         workspace_collaboration_service=SimpleNamespace(resolve_account_workspace=AsyncMock(return_value=access)),
@@ -52,8 +58,48 @@ async def test_document_upload_uses_dedicated_scoped_owner_type():
 
     assert response.status_code == 200
     assert (await response.get_json())['data']['file_id'] == 'scoped-document-key'
-    kwargs = storage_mgr.save_scoped.await_args.kwargs
+    kwargs = storage_mgr.save_scoped_stream.await_args.kwargs
     assert kwargs['owner_type'] == 'upload_document'
     assert kwargs['owner'] == 'account:account-test'
     assert kwargs['key'].endswith('.pdf')
-    assert kwargs['value'] == b'document bytes'
+    assert kwargs['max_bytes'] == 10 * 1024 * 1024
+    assert b''.join(saved_chunks) == b'document bytes'
+
+
+async def test_image_download_streams_requested_byte_range():
+    quart_app = quart.Quart(__name__)
+    account = SimpleNamespace(uuid='account-test', user='test@example.com')
+    access = SimpleNamespace(
+        execution=SimpleNamespace(instance_uuid='instance-test', placement_generation=3),
+        workspace=SimpleNamespace(uuid='00000000-0000-0000-0000-00000000000a'),
+        membership=SimpleNamespace(uuid='membership-test', role='developer', projection_revision=1),
+    )
+    image = SimpleNamespace(
+        size=10,
+        local_path=lambda: None,
+        iter_chunks=Mock(side_effect=lambda offset, length: _chunks(b'0123456789'[offset : offset + length])),
+    )
+    storage_mgr = SimpleNamespace(open_public_object=AsyncMock(return_value=image))
+    application = SimpleNamespace(
+        user_service=SimpleNamespace(get_authenticated_account=AsyncMock(return_value=account)),
+        workspace_collaboration_service=SimpleNamespace(resolve_account_workspace=AsyncMock(return_value=access)),
+        storage_mgr=storage_mgr,
+    )
+    router = FilesRouterGroup(application, quart_app)
+    await router.initialize()
+    client = quart_app.test_client()
+
+    response = await client.get(
+        '/api/v1/files/image/photo.png',
+        headers={'Authorization': 'Bearer test-token', 'Range': 'bytes=2-5'},
+    )
+
+    assert response.status_code == 206
+    assert response.headers['Content-Range'] == 'bytes 2-5/10'
+    assert response.mimetype == 'image/png'
+    assert await response.get_data() == b'2345'
+    image.iter_chunks.assert_called_once_with(offset=2, length=4)
+
+
+async def _chunks(value: bytes):
+    yield value
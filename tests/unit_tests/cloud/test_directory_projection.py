@@ -530,6 +530,8 @@ async def test_event_poll_fetches_workspace_delta_and_records_receipt(projection
             reconcile_execution_projection=reconcile_execution_projection,
         )
     )
+    invalidate_execution_bindings = Mock()
+    application.workspace_service = SimpleNamespace(invalidate_execution_bindings=invalidate_execution_bindings)
     event = DirectoryEvent(
         cursor=2,
         uuid='40000000-0000-0000-0000-000000000001',
@@ -554,6 +556,8 @@ async def test_event_poll_fetches_workspace_delta_and_records_receipt(projection
     service = DirectoryProjectionService(application, provider, INSTANCE_UUID)
     await service.initialize()
     reconcile_execution_projection.reset_mock()
+    invalidate_execution_bindings.assert_called_once_with(None)
+    invalidate_execution_bindings.reset_mock()
 
     await service.sync_once()
 
@@ -574,6 +578,7 @@ async def test_event_poll_fetches_workspace_delta_and_records_receipt(projection
         {WORKSPACE_UUID: 1},
         affected_workspace_uuids={WORKSPACE_UUID},
     )
+    invalidate_execution_bindings.assert_called_once_with({WORKSPACE_UUID})
 
 
 async def test_directory_delta_does_not_skip_unfetched_event_cursors(projection_context):
@@ -74,7 +74,7 @@ async def test_runtime_resource_stats_are_aggregate_and_constant_time() -> None:
     )
     app.task_mgr = SimpleNamespace(get_stats=lambda: {'total': 5, 'completed': 2})
     app.query_pool = SimpleNamespace(
-        queries=[object()],
+        queued_query_count=1,
         cached_queries={},
         active_query_count_by_workspace={'workspace-a': 1},
     )
@@ -141,6 +141,7 @@ async def test_runtime_resource_stats_are_aggregate_and_constant_time() -> None:
         'cached': 0,
         'active_workspaces': 1,
     }
+    assert stats['monitoring_write_buffer'] == {}
     assert stats['models']['providers'] == 1
     assert stats['runtimes']['plugin_installations'] == 1
     assert stats['runtimes']['plugin_runtime_connected'] is True
@@ -33,6 +33,28 @@ async def test_make_app_shuts_down_partially_built_application(monkeypatch):
     app_inst.initialize.assert_not_awaited()
 
 
+@pytest.mark.asyncio
+async def test_make_app_logs_startup_profile_when_enabled(monkeypatch):
+    app_inst = SimpleNamespace(event_loop=None, logger=Mock(), shutdown=AsyncMock(), initialize=AsyncMock())
+
+    class ProbeStage:
+        async def run(self, ap):
+            pass
+
+    monkeypatch.setattr(boot.app, 'Application', lambda: app_inst)
+    monkeypatch.setattr(boot, 'stage_order', ['ProbeStage'])
+    monkeypatch.setitem(boot.stage.preregistered_stages, 'ProbeStage', ProbeStage)
+    boot.startup_profile.enable()
+
+    assert await boot.make_app(SimpleNamespace()) is app_inst
+
+    assert boot.startup_profile.active() is None
+    report = app_inst.logger.info.call_args.args[0]
+    assert report.startswith('Startup profile: ')
+    assert 'stage ProbeStage: ' in report
+    assert 'stage Application.initialize: ' in report
+
+
 @pytest.mark.asyncio
 async def test_main_signal_handler_handles_sigint_before_app_created(monkeypatch):
     captured_handler = {}
@@ -6,8 +6,12 @@ Tests I18nString, Metadata, and Component utilities.
 
 from __future__ import annotations
 
+from unittest.mock import Mock
 
-from langbot.pkg.discover.engine import I18nString, Metadata, Component
+import pytest
+
+from langbot.pkg.core.bootutils import startup_profile
+from langbot.pkg.discover.engine import I18nString, Metadata, Component, ComponentClassRegistry
 
 
 class TestI18nString:
@@ -189,3 +193,57 @@ class TestComponentManifest:
         }
 
         assert Component.is_component_manifest(manifest) is True
+
+
+def _lazy_component(name: str, component_class: type) -> Mock:
+    component = Mock(spec=Component)
+    component.kind = 'MessagePlatformAdapter'
+    component.metadata = Mock()
+    component.metadata.name = name
+    component.get_python_component_class = Mock(return_value=component_class)
+    return component
+
+
+class TestComponentClassRegistry:
+    """Tests for lazily imported component classes."""
+
+    def test_classes_are_imported_on_first_lookup_only(self):
+        """Membership and iteration use the manifests; lookups import once."""
+        telegram_class, discord_class = type('Telegram', (), {}), type('Discord', (), {})
+        telegram = _lazy_component('telegram', telegram_class)
+        discord = _lazy_component('discord', discord_class)
+        registry = ComponentClassRegistry([telegram, discord])
+
+        assert 'discord' in registry
+        assert 'slack' not in registry
+        assert list(registry) == ['telegram', 'discord']
+        assert len(registry) == 2
+        assert registry.name_of(telegram_class) is None
+        telegram.get_python_component_class.assert_not_called()
+
+        assert registry['telegram'] is telegram_class
+        assert registry['telegram'] is telegram_class
+        telegram.get_python_component_class.assert_called_once()
+        discord.get_python_component_class.assert_not_called()
+        assert registry.loaded() == {'telegram': telegram_class}
+        assert registry.name_of(telegram_class) == 'telegram'
+
+        with pytest.raises(KeyError):
+            registry['slack']
+
+    def test_imports_are_recorded_while_startup_is_profiled(self):
+        """A lookup during profiled startup is reported as an import."""
+        registry = ComponentClassRegistry([_lazy_component('telegram', type('Telegram', (), {}))])
+
+        profiler = startup_profile.enable()
+        try:
+            with startup_profile.measure('init', 'PlatformManager'):
+                registry['telegram']
+        finally:
+            startup_profile.finish()
+
+        assert [(record.category, record.name, record.depth) for record in profiler.records] == [
+            ('init', 'PlatformManager', 0),
+            ('import', 'MessagePlatformAdapter/telegram', 1),
+        ]
+        assert 'import MessagePlatformAdapter/telegram' in profiler.report()
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from types import SimpleNamespace
+
+import pytest
+import sqlalchemy as sa
+
+# Persistence manager performs the package's database-manager registration;
+# importing a concrete manager first would enter the historical app/mgr cycle.
+from langbot.pkg.persistence import mgr as persistence_mgr
+from langbot.pkg.api.http.service.monitoring import MonitoringService
+from langbot.pkg.persistence.databases import sqlite
+from langbot.pkg.utils import constants
+
+
+def _application(sqlite_config: dict) -> SimpleNamespace:
+    return SimpleNamespace(
+        logger=logging.getLogger('sqlite-profile-test'),
+        instance_config=SimpleNamespace(data={'database': {'use': 'sqlite', 'sqlite': sqlite_config}}),
+    )
+
+
+@pytest.fixture
+async def tuned_persistence(tmp_path, monkeypatch):
+    monkeypatch.setattr(constants, 'instance_id', 'sqlite-profile-instance')
+    application = _application({'path': str(tmp_path / 'langbot.db'), 'profile': 'tuned', 'reader_pool_size': 2})
+    persistence = persistence_mgr.PersistenceManager(application)
+    application.persistence_mgr = persistence
+    await persistence.initialize()
+    try:
+        yield persistence
+    finally:
+        await persistence.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_default_profile_keeps_the_plain_engine(tmp_path) -> None:
+    manager = sqlite.SQLiteDatabaseManager(_application({'path': str(tmp_path / 'langbot.db')}))
+    await manager.initialize()
+    try:
+        manager.enable_runtime_profile()
+        assert (manager.read_engine, manager.write_queue) == (None, None)
+        assert manager.resource_stats() == {}
+    finally:
+        await manager.engine.dispose()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ('config', 'message'),
+    [
+        ({'profile': 'fast'}, 'database.sqlite.profile'),
+        ({'profile': 'tuned', 'path': ':memory:'}, 'requires a database file path'),
+        ({'profile': 'tuned', 'reader_pool_size': 0}, 'database.sqlite.reader_pool_size'),
+        ({'profile': 'tuned', 'cache_size_kib': True}, 'database.sqlite.cache_size_kib'),
+        ({'profile': 'tuned', 'write_batch_max_statements': 1001}, 'database.sqlite.write_batch_max_statements'),
+    ],
+)
+async def test_tuned_profile_rejects_invalid_options(config, message) -> None:
+    with pytest.raises(ValueError, match=message):
+        await sqlite.SQLiteDatabaseManager(_application(config)).initialize()
+
+
+@pytest.mark.asyncio
+async def test_tuned_profile_uses_wal_and_one_writer_connection(tuned_persistence) -> None:
+    manager = tuned_persistence.db
+    engine = tuned_persistence.get_db_engine()
+
+    async with engine.connect() as conn:
+        pragmas = [
+            (await conn.exec_driver_sql(f'PRAGMA {name}')).scalar()
+            for name in ('journal_mode', 'synchronous', 'cache_size', 'foreign_keys')
+        ]
+    assert pragmas == ['wal', 1, -65536, 1]
+    assert (engine.pool.size(), engine.pool._max_overflow) == (1, 0)
+
+    async with manager.read_engine.connect() as conn:
+        with pytest.raises(sa.exc.OperationalError, match='readonly'):
+            await conn.exec_driver_sql("INSERT INTO metadata (key, value) VALUES ('probe', 'x')")
+
+
+@pytest.mark.asyncio
+async def test_standalone_statements_use_the_write_queue_and_reader_pool(tuned_persistence) -> None:
+    metadata = sa.table('metadata', sa.column('key'), sa.column('value'))
+    committed = tuned_persistence.get_resource_stats()['write_queue_committed']
+
+    await tuned_persistence.execute_async(sa.insert(metadata).values(key='probe', value='queued'))
+    result = await tuned_persistence.execute_async(sa.select(metadata.c.value).where(metadata.c.key == 'probe'))
+
+    assert result.scalar_one() == 'queued'
+    stats = tuned_persistence.get_resource_stats()
+    assert stats['write_queue_committed'] == committed + 1
+    assert stats['reader_pool_size'] == 2
+    assert tuned_persistence.db.read_engine.pool.checkedin() == 1
+
+
+@pytest.mark.asyncio
+async def test_monitoring_cleanup_can_checkpoint_and_vacuum(tuned_persistence) -> None:
+    service = MonitoringService(tuned_persistence.ap)
+    await service._release_sqlite_space()
+
+    async with tuned_persistence.get_db_engine().connect() as conn:
+        assert (await conn.exec_driver_sql('PRAGMA journal_mode')).scalar() == 'wal'
+
+
+@pytest.mark.asyncio
+async def test_read_only_units_of_work_leave_the_writer_connection_free(tuned_persistence) -> None:
+    metadata = sa.table('metadata', sa.column('key'), sa.column('value'))
+    engine = tuned_persistence.get_db_engine()
+
+    async with tuned_persistence.tenant_uow('workspace-a'):
+        await tuned_persistence.execute_async(sa.insert(metadata).values(key='writer', value='held'))
+        assert engine.pool.checkedout() == 1
+
+        async def read() -> list:
+            async with tuned_persistence.tenant_uow('workspace-b', read_only=True):
+                result = await tuned_persistence.execute_async(sa.select(metadata.c.key))
+                return list(result.scalars())
+
+        keys = await asyncio.wait_for(asyncio.create_task(read()), timeout=5)
+
+    assert 'writer' not in keys
+    async with tuned_persistence.tenant_uow('workspace-a', read_only=True):
+        with pytest.raises(persistence_mgr.CrossScopeTransactionError, match='read-only'):
+            async with tuned_persistence.tenant_uow('workspace-a'):
+                pass
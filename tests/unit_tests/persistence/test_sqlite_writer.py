@@ -0,0 +1,90 @@
+"""Unit tests for the batched SQLite write queue."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+import sqlalchemy as sa
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from langbot.pkg.persistence import statement_stats
+from langbot.pkg.persistence.sqlite_writer import SQLiteWriteQueue
+
+
+@pytest.fixture
+async def engine(tmp_path):
+    engine = create_async_engine(f'sqlite+aiosqlite:///{tmp_path / "writer.db"}', pool_size=1, max_overflow=0)
+
+    @sa.event.listens_for(engine.sync_engine, 'connect')
+    def explicit_transactions(dbapi_connection, _connection_record):
+        dbapi_connection.isolation_level = None
+
+    @sa.event.listens_for(engine.sync_engine, 'begin')
+    def begin(conn):
+        conn.exec_driver_sql('BEGIN IMMEDIATE')
+
+    async with engine.begin() as conn:
+        await conn.execute(sa.text('CREATE TABLE items (id INTEGER PRIMARY KEY)'))
+    try:
+        yield engine
+    finally:
+        await engine.dispose()
+
+
+async def _ids(engine) -> list[int]:
+    async with engine.connect() as conn:
+        return list((await conn.execute(sa.text('SELECT id FROM items ORDER BY id'))).scalars())
+
+
+@pytest.mark.asyncio
+async def test_waiting_writes_share_one_transaction_and_fail_independently(engine):
+    queue = SQLiteWriteQueue(engine, max_batch_statements=10)
+    insert = sa.text('INSERT INTO items (id) VALUES (:id) RETURNING id')
+
+    results = await asyncio.gather(
+        *(queue.execute(insert, {'id': item_id}) for item_id in (1, 2, 2, 3)),
+        return_exceptions=True,
+    )
+    await queue.close()
+
+    assert [result.scalar_one() for result in (results[0], results[1], results[3])] == [1, 2, 3]
+    assert isinstance(results[2], sa.exc.IntegrityError)
+    assert await _ids(engine) == [1, 2, 3]
+    snapshot = queue.snapshot()
+    assert snapshot['write_queue_batches'] == 1
+    assert snapshot['write_queue_largest_batch'] == 4
+    assert (snapshot['write_queue_committed'], snapshot['write_queue_failed']) == (3, 1)
+
+
+@pytest.mark.asyncio
+async def test_batches_are_capped_and_lone_failures_roll_back(engine):
+    queue = SQLiteWriteQueue(engine, max_batch_statements=2)
+    insert = sa.text('INSERT INTO items (id) VALUES (:id)')
+
+    await asyncio.gather(*(queue.execute(insert, {'id': item_id}) for item_id in range(5)))
+    with pytest.raises(sa.exc.IntegrityError):
+        await queue.execute(insert, {'id': 0})
+    await queue.close()
+
+    assert await _ids(engine) == [0, 1, 2, 3, 4]
+    assert queue.snapshot()['write_queue_batches'] == 3
+    with pytest.raises(RuntimeError):
+        await queue.execute(insert, {'id': 5})
+
+
+@pytest.mark.asyncio
+async def test_statements_count_towards_the_callers_query(engine):
+    statement_stats.install(engine)
+    queue = SQLiteWriteQueue(engine)
+    stats = statement_stats.QueryStatementStats()
+
+    with stats.track('Query 1') as tally:
+        await asyncio.gather(
+            queue.execute(sa.text('INSERT INTO items (id) VALUES (1)')),
+            queue.execute(sa.text('INSERT INTO items (id) VALUES (2)')),
+        )
+    await queue.close()
+
+    # Savepoints and the commit run on the queue's behalf, not the query's.
+    assert tally.statements == 2
@@ -0,0 +1,89 @@
+"""Unit tests for per-query SQL statement accounting."""
+
+from __future__ import annotations
+
+import logging
+from unittest.mock import Mock
+
+import pytest
+import sqlalchemy as sa
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from langbot.pkg.persistence import statement_stats
+
+
+def test_fingerprint_groups_statements_by_shape():
+    first = statement_stats.fingerprint("SELECT * FROM bots WHERE uuid = 'a' AND id IN (?, ?, ?) LIMIT 10")
+    second = statement_stats.fingerprint("SELECT *  FROM bots\nWHERE uuid = 'b''c' AND id IN (?) LIMIT 20")
+
+    assert first == second == 'SELECT * FROM bots WHERE uuid = ? AND id IN (?) LIMIT ?'
+    assert len(statement_stats.fingerprint('SELECT ' + 'x, ' * 200)) == 160
+
+
+def test_from_config_falls_back_on_invalid_budget():
+    assert statement_stats.QueryStatementStats.from_config({'max_statements_per_query': 'many'}).max_statements == 30
+    assert statement_stats.QueryStatementStats.from_config({'max_statements_per_query': True}).max_statements == 30
+    stats = statement_stats.QueryStatementStats.from_config({'max_statements_per_query': 5, 'debug': 'yes'})
+    assert (stats.max_statements, stats.debug) == (5, False)
+
+
+def test_observe_fills_histograms_and_logs_over_budget_queries_in_debug():
+    logger = Mock(spec=logging.Logger)
+    stats = statement_stats.QueryStatementStats(max_statements=2, debug=True, logger=logger)
+
+    with stats.track('Query 1') as tally:
+        tally.statements = 2
+    with stats.track('Query 2') as tally:
+        tally.statements = 3
+        tally.elapsed_seconds = 0.012
+        tally.fingerprints.update(['SELECT ?', 'SELECT ?', 'UPDATE bots SET name=?'])
+
+    snapshot = stats.snapshot()
+    assert snapshot['queries'] == 2
+    assert snapshot['statements_total'] == 5
+    assert snapshot['sql_time_ms_total'] == 12
+    assert snapshot['over_budget'] == 1
+    assert snapshot['statements_per_query']['le_2'] == 1
+    assert snapshot['statements_per_query']['le_5'] == 1
+    assert snapshot['sql_time_ms_per_query']['le_1'] == 1
+    assert snapshot['sql_time_ms_per_query']['le_25'] == 1
+    logger.warning.assert_called_once()
+    message = logger.warning.call_args.args[0]
+    assert message.startswith('Query 2 issued 3 SQL statements in 12 ms, over the budget of 2')
+    assert '  2x SELECT ?' in message
+
+
+def test_over_budget_queries_are_not_logged_without_debug():
+    logger = Mock(spec=logging.Logger)
+    stats = statement_stats.QueryStatementStats(max_statements=0, logger=logger)
+
+    with stats.track('Query 1') as tally:
+        tally.statements = 1
+
+    assert tally.fingerprints is None
+    assert stats.snapshot()['over_budget'] == 1
+    logger.warning.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_installed_engine_counts_only_statements_inside_track(tmp_path):
+    engine = create_async_engine(f'sqlite+aiosqlite:///{tmp_path / "stats.db"}')
+    statement_stats.install(engine)
+    statement_stats.install(engine)
+    stats = statement_stats.QueryStatementStats(debug=True)
+    try:
+        async with engine.begin() as conn:
+            await conn.execute(sa.text('CREATE TABLE items (id INTEGER PRIMARY KEY)'))
+            with stats.track('Query 1') as tally:
+                assert statement_stats.current_tally() is tally
+                await conn.execute(sa.text('INSERT INTO items (id) VALUES (1)'))
+                await conn.execute(sa.text('INSERT INTO items (id) VALUES (2)'))
+                await conn.execute(sa.text('SELECT count(*) FROM items'))
+            await conn.execute(sa.text('SELECT 1'))
+    finally:
+        await engine.dispose()
+
+    assert statement_stats.current_tally() is None
+    assert tally.statements == 3
+    assert tally.fingerprints['INSERT INTO items (id) VALUES (?)'] == 2
+    assert stats.snapshot()['statements_total'] == 3
@@ -11,7 +11,7 @@ from sqlalchemy.ext.asyncio import create_async_engine
 from langbot.pkg.persistence.mgr import PersistenceManager, PersistenceMode
 from langbot.pkg.persistence.tenant_uow import PersistenceScopeKind
 from langbot.pkg.pipeline.controller import Controller
-from langbot.pkg.pipeline.pool import QueryPool
+from langbot.pkg.pipeline.pool import QueryPool, query_session_key
 from langbot.pkg.workspace.errors import WorkspaceGenerationMismatchError
 
 
@@ -44,6 +44,9 @@ async def test_consumer_schedules_query_after_running_transition(
         wait=AsyncMock(side_effect=wait_for_query.wait),
         notify_all=Mock(),
     )
+    query_pool.next_runnable_query_locked = Mock(
+        side_effect=lambda: query_pool.queries[0] if query_pool.queries else None,
+    )
     query_pool.mark_query_running_locked = Mock(side_effect=query_pool.queries.remove)
     mock_app.query_pool = query_pool
 
@@ -200,7 +203,11 @@ async def test_controller_revalidates_generation_before_running_pipeline(
 @pytest.mark.asyncio
 async def test_controller_schedules_query_without_removing_it_twice(mock_app, sample_query):
     query_pool = QueryPool()
-    query_pool.queries.append(sample_query)
+    session_key, execution_context = query_session_key(sample_query)
+    async with query_pool:
+        query_pool.scheduler.push(
+            sample_query, session_key=session_key, workspace_uuid=execution_context.workspace_uuid
+        )
     mock_app.query_pool = query_pool
     mock_app.sess_mgr.get_session = AsyncMock(return_value=SimpleNamespace(_semaphore=asyncio.Semaphore(1)))
 
@@ -6,12 +6,15 @@ Tests cover:
 - Boundary length handling
 - Empty message handling
 - Multi-message chain truncation
+- Token-budget truncation against the model context length
 """
 
 from __future__ import annotations
 
 import pytest
 from importlib import import_module
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock
 
 from tests.factories import (
     FakeApp,
@@ -19,6 +22,8 @@ from tests.factories import (
 )
 
 import langbot_plugin.api.entities.builtin.provider.message as provider_message
+import langbot_plugin.api.entities.builtin.provider.prompt as provider_prompt
+import langbot_plugin.api.entities.builtin.provider.session as provider_session
 
 
 def get_msgtrun_module():
@@ -319,3 +324,180 @@ class TestRoundTruncatorDirect:
 
         assert result is not None
         assert hasattr(result, 'messages')
+
+
+def get_tokens_module():
+    """Lazy import for token counting helpers."""
+    return import_module('langbot.pkg.pipeline.msgtrun.tokens')
+
+
+def make_token_budget_stage(context_length: int | None = 1000, max_tokens: int = 200, requester=None):
+    """Create a token-budget stage whose model has a heuristic tokenizer."""
+    msgtrun = get_msgtrun_module()
+    app = FakeApp()
+    model = SimpleNamespace(
+        model_entity=SimpleNamespace(
+            name='custom-model',
+            context_length=context_length,
+            extra_args={'max_tokens': max_tokens},
+        ),
+        provider=SimpleNamespace(requester=requester),
+    )
+    app.model_mgr.get_model_by_uuid = AsyncMock(return_value=model)
+    stage = msgtrun.ConversationMessageTruncator(app)
+    return stage
+
+
+def make_token_budget_query(history: list[provider_message.Message]):
+    """Create a query with empty prompt and a 5-token user message."""
+    query = text_query('hi')
+    query.pipeline_config = make_truncate_config(max_round=1)
+    query.pipeline_config['ai']['local-agent']['truncate-method'] = 'token-budget'
+    query.use_llm_model_uuid = 'model-uuid'
+    query.prompt = provider_prompt.Prompt(name='default', messages=[])
+    query.user_message = provider_message.Message(role='user', content='hi')
+    query.session = provider_session.Session(
+        launcher_type=provider_session.LauncherTypes.PERSON,
+        launcher_id=12345,
+        sender_id=12345,
+    )
+    query.messages = list(history)
+    return query
+
+
+def long_message(role: str, tag: str) -> provider_message.Message:
+    """A message of 103 heuristic tokens: 99 for the text and 4 of overhead."""
+    return provider_message.Message(role=role, content=tag.ljust(396, '.'))
+
+
+class TestTokenBudgetTruncator:
+    """Tests for TokenBudgetTruncator."""
+
+    @pytest.mark.asyncio
+    async def test_keeps_newest_rounds_that_fit(self):
+        """1000 context - 200 reply - 5 user message leaves 795 tokens: three 206-token rounds."""
+        stage = make_token_budget_stage()
+        history = []
+        for index in range(5):
+            history += [long_message('user', f'u{index}'), long_message('assistant', f'a{index}')]
+        query = make_token_budget_query(history)
+
+        await stage.initialize(query.pipeline_config)
+        result = await stage.process(query, 'ConversationMessageTruncator')
+
+        assert stage.trun.name == 'token-budget'
+        # max-round=1 is not applied per request; stored history is trimmed after each turn
+        assert result.new_query.messages == history[4:]
+
+    @pytest.mark.asyncio
+    async def test_never_keeps_partial_rounds(self):
+        """A round with an oversized tool result is dropped with its tool call and user message."""
+        stage = make_token_budget_stage()
+        tool_call = provider_message.ToolCall(
+            id='call-1',
+            type='function',
+            function=provider_message.FunctionCall(name='search', arguments='{}'),
+        )
+        history = [
+            long_message('user', 'old'),
+            long_message('assistant', 'old answer'),
+            long_message('user', 'search please'),
+            provider_message.Message(role='assistant', content='', tool_calls=[tool_call]),
+            provider_message.Message(role='tool', content='x' * 2400, tool_call_id='call-1'),
+            long_message('assistant', 'answer'),
+        ]
+        query = make_token_budget_query(history)
+
+        await stage.initialize(query.pipeline_config)
+        result = await stage.process(query, 'ConversationMessageTruncator')
+
+        assert result.new_query.messages == []
+
+    @pytest.mark.asyncio
+    async def test_memoizes_message_counts_on_session(self, monkeypatch):
+        """The second request only counts the messages added since the first."""
+        tokens = get_tokens_module()
+        counted = []
+        count_message = tokens.count_message
+
+        def counting(message, family):
+            counted.append(message)
+            return count_message(message, family)
+
+        monkeypatch.setattr(tokens, 'count_message', counting)
+        stage = make_token_budget_stage()
+        history = [long_message('user', 'u0'), long_message('assistant', 'a0')]
+        query = make_token_budget_query(history)
+        await stage.initialize(query.pipeline_config)
+        await stage.process(query, 'ConversationMessageTruncator')
+
+        counted.clear()
+        second = make_token_budget_query(history + [long_message('user', 'u1'), long_message('assistant', 'a1')])
+        second.session = query.session
+        await stage.process(second, 'ConversationMessageTruncator')
+
+        assert counted == [second.user_message, *second.messages[2:]]
+
+    @pytest.mark.asyncio
+    async def test_context_length_from_requester_or_round_fallback(self):
+        """Unknown context lengths fall back to rounds; requester lookups are cached."""
+        requester = Mock()
+        requester._safe_context_length = Mock(return_value=500)
+        stage = make_token_budget_stage(context_length=None, max_tokens=100, requester=requester)
+        history = []
+        for index in range(3):
+            history += [long_message('user', f'u{index}'), long_message('assistant', f'a{index}')]
+
+        await stage.initialize(make_token_budget_query(history).pipeline_config)
+        for _ in range(2):
+            result = await stage.process(make_token_budget_query(history), 'ConversationMessageTruncator')
+            assert result.new_query.messages == history[4:]
+        requester._safe_context_length.assert_called_once_with('custom-model')
+
+        requester._safe_context_length = Mock(return_value=None)
+        unknown = make_token_budget_stage(context_length=None, requester=requester)
+        await unknown.initialize(make_token_budget_query(history).pipeline_config)
+        result = await unknown.process(make_token_budget_query(history), 'ConversationMessageTruncator')
+        assert result.new_query.messages == history[4:]  # max-round=1
+
+    @pytest.mark.asyncio
+    async def test_tokenizers_load_once_when_the_stage_initializes(self, monkeypatch):
+        """Tokenizers load at initialize; one that fails to load falls back to the heuristic."""
+        tokens = get_tokens_module()
+        loaded = []
+
+        def get_encoding(name):
+            loaded.append(name)
+            if name == 'o200k_base':
+                raise ConnectionError('offline')
+            return SimpleNamespace(encode=lambda text, disallowed_special: text.split())
+
+        monkeypatch.setattr(tokens, '_encodings', {})
+        monkeypatch.setattr(tokens, 'tiktoken', SimpleNamespace(get_encoding=get_encoding))
+        stage = make_token_budget_stage()
+        query = make_token_budget_query([long_message('user', 'u0'), long_message('assistant', 'a0')])
+        await stage.initialize(query.pipeline_config)
+
+        assert loaded == ['o200k_base', 'cl100k_base']
+        model = await stage.ap.model_mgr.get_model_by_uuid(None, 'model-uuid')
+        for name in ('gpt-4o', 'gpt-4'):
+            model.model_entity.name = name
+            await stage.process(make_token_budget_query(query.messages), 'ConversationMessageTruncator')
+        assert loaded == ['o200k_base', 'cl100k_base']
+        assert tokens.count_text('abcdefgh', 'o200k_base') == 2
+        assert tokens.count_text('one two three', 'cl100k_base') == 3
+
+    def test_token_estimates(self):
+        """Known model families use tiktoken encodings; others use the character heuristic."""
+        tokens = get_tokens_module()
+
+        assert tokens.model_family('openai/gpt-4o-mini') == 'o200k_base'
+        assert tokens.model_family('gpt-4-turbo') == 'cl100k_base'
+        assert tokens.model_family('claude-sonnet-4') == tokens.HEURISTIC
+        assert tokens.count_text('abcdefgh', tokens.HEURISTIC) == 2
+        assert tokens.count_text('你好, world', tokens.HEURISTIC) == 4
+        image = provider_message.Message(
+            role='user',
+            content=[provider_message.ContentElement.from_image_url('https://example.com/a.png')],
+        )
+        assert tokens.count_message(image, tokens.HEURISTIC) == 4 + tokens.ATTACHMENT_TOKENS
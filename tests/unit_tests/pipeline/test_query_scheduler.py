@@ -0,0 +1,192 @@
+"""
+Unit tests for the per-session runnable query scheduler.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from langbot.pkg.api.http.context import ExecutionContext
+from langbot.pkg.pipeline.controller import Controller
+from langbot.pkg.pipeline.pool import QueryPool
+from langbot.pkg.pipeline.scheduler import RunnableQueryScheduler
+from langbot.pkg.provider.session.sessionmgr import SessionManager
+from langbot_plugin.api.entities.builtin.provider.session import LauncherTypes
+
+
+def _session_key(workspace_uuid: str, launcher_id: str):
+    return ('instance', workspace_uuid, 1, 'bot', 'person', launcher_id)
+
+
+def _push(scheduler: RunnableQueryScheduler, workspace_uuid: str, launcher_id: str):
+    query = SimpleNamespace(workspace_uuid=workspace_uuid, launcher_id=launcher_id)
+    scheduler.push(
+        query,
+        session_key=_session_key(workspace_uuid, launcher_id),
+        workspace_uuid=workspace_uuid,
+    )
+    return query
+
+
+def _drain(scheduler: RunnableQueryScheduler) -> list:
+    started = []
+    while (query := scheduler.peek()) is not None:
+        assert scheduler.take(query)
+        started.append(query)
+    return started
+
+
+class TestRunnableQueryScheduler:
+    def test_session_queue_is_fifo(self):
+        scheduler = RunnableQueryScheduler()
+        queries = [_push(scheduler, 'workspace-a', 'chat-1') for _ in range(3)]
+
+        assert _drain(scheduler) == queries
+        assert len(scheduler) == 0
+        assert scheduler.ready_session_count == 0
+
+    def test_workspaces_and_sessions_are_round_robin(self):
+        scheduler = RunnableQueryScheduler()
+        a1 = _push(scheduler, 'workspace-a', 'chat-1')
+        a2 = _push(scheduler, 'workspace-a', 'chat-1')
+        a3 = _push(scheduler, 'workspace-a', 'chat-2')
+        b1 = _push(scheduler, 'workspace-b', 'chat-1')
+
+        assert _drain(scheduler) == [a1, b1, a3, a2]
+
+    def test_saturated_session_is_parked_until_release(self):
+        scheduler = RunnableQueryScheduler()
+        busy = _push(scheduler, 'workspace-a', 'chat-1')
+        other = _push(scheduler, 'workspace-a', 'chat-2')
+
+        scheduler.mark_session_saturated(_session_key('workspace-a', 'chat-1'), 'workspace-a')
+
+        assert scheduler.peek() is other
+        assert scheduler.take(other)
+        assert scheduler.peek() is None
+        assert scheduler.saturated_session_count == 1
+
+        scheduler.release_session_slot(_session_key('workspace-a', 'chat-1'), 'workspace-a')
+
+        assert scheduler.peek() is busy
+        assert scheduler.saturated_session_count == 0
+
+    def test_release_of_session_without_queue_is_not_ready(self):
+        scheduler = RunnableQueryScheduler()
+
+        scheduler.release_session_slot(_session_key('workspace-a', 'chat-1'), 'workspace-a')
+
+        assert scheduler.peek() is None
+        assert scheduler.ready_session_count == 0
+
+    def test_pop_oldest_is_scoped_by_workspace(self):
+        scheduler = RunnableQueryScheduler()
+        a1 = _push(scheduler, 'workspace-a', 'chat-1')
+        b1 = _push(scheduler, 'workspace-b', 'chat-1')
+        a2 = _push(scheduler, 'workspace-a', 'chat-2')
+
+        assert scheduler.pop_oldest('workspace-b') is b1
+        assert scheduler.pop_oldest('workspace-b') is None
+        assert scheduler.pop_oldest() is a1
+        assert list(scheduler) == [a2]
+
+    def test_remove_non_head_query_keeps_order(self):
+        scheduler = RunnableQueryScheduler()
+        first = _push(scheduler, 'workspace-a', 'chat-1')
+        middle = _push(scheduler, 'workspace-a', 'chat-1')
+        last = _push(scheduler, 'workspace-a', 'chat-1')
+
+        assert scheduler.remove(middle)
+        assert not scheduler.remove(middle)
+        assert middle not in scheduler
+        assert _drain(scheduler) == [first, last]
+
+    def test_push_rejects_duplicate_query(self):
+        scheduler = RunnableQueryScheduler()
+        query = _push(scheduler, 'workspace-a', 'chat-1')
+
+        with pytest.raises(ValueError):
+            scheduler.push(
+                query,
+                session_key=_session_key('workspace-a', 'chat-1'),
+                workspace_uuid='workspace-a',
+            )
+
+
+class _ScheduledQuery:
+    def __init__(self, **values):
+        self.__dict__.update(values)
+
+
+async def test_consumer_runs_other_sessions_while_one_session_is_busy(mock_app):
+    context = ExecutionContext(
+        instance_uuid='test-instance',
+        workspace_uuid='test-workspace',
+        placement_generation=1,
+    )
+    query_pool = QueryPool(max_queries=10, max_queries_per_workspace=10)
+    mock_app.query_pool = query_pool
+    mock_app.instance_config.data['concurrency']['session'] = 1
+    mock_app.instance_config.data['system'] = {}
+    mock_app.sess_mgr = SessionManager(mock_app)
+
+    with patch('langbot.pkg.pipeline.pool.pipeline_query.Query', side_effect=_ScheduledQuery):
+        queries = [
+            await query_pool.add_query(
+                bot_uuid='bot',
+                launcher_type=LauncherTypes.PERSON,
+                launcher_id=launcher_id,
+                sender_id=launcher_id,
+                message_event=Mock(),
+                message_chain=Mock(),
+                adapter=Mock(),
+                pipeline_uuid='pipeline',
+                execution_context=context,
+            )
+            for launcher_id in ('busy', 'busy', 'idle')
+        ]
+
+    started: list = []
+    release_busy = asyncio.Event()
+    all_started = asyncio.Event()
+
+    async def run_pipeline(query):
+        started.append(query)
+        if len(started) == 3:
+            all_started.set()
+        if query.launcher_id == 'busy':
+            await release_busy.wait()
+
+    mock_app.pipeline_mgr = SimpleNamespace(
+        get_pipeline_by_uuid=AsyncMock(return_value=SimpleNamespace(run=run_pipeline)),
+    )
+    process_tasks = []
+
+    def create_process_task(coro, **_kwargs):
+        process_tasks.append(asyncio.create_task(coro))
+
+    mock_app.task_mgr.create_task = Mock(side_effect=create_process_task)
+    controller = Controller(mock_app)
+    consumer_task = asyncio.create_task(controller.consumer())
+
+    try:
+        for _ in range(20):
+            await asyncio.sleep(0)
+        assert started == [queries[0], queries[2]]
+        assert query_pool.queued_query_count == 1
+
+        release_busy.set()
+        await asyncio.wait_for(all_started.wait(), timeout=2)
+        assert started[2] is queries[1]
+    finally:
+        consumer_task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await consumer_task
+        await asyncio.gather(*process_tasks)
+
+    assert query_pool.queued_query_count == 0
+    assert query_pool.cached_queries == {}
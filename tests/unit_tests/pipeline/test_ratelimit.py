@@ -359,3 +359,163 @@ async def test_release_access(mock_app, sample_query):
     assert result.result_type == entities.ResultType.CONTINUE
     assert result.new_query == sample_query
     mock_algo.release_access.assert_called_once_with(sample_query, 'person', '12345')
+
+
+def get_backend_module():
+    """Lazy import of the rate limit backends"""
+    return import_module('langbot.pkg.pipeline.ratelimit.backend')
+
+
+def rate_limit_config(algorithm: str = 'fixwin', window: int = 60, limit: int = 2, strategy: str = 'drop') -> dict:
+    return {
+        'safety': {
+            'rate-limit': {
+                'algorithm': algorithm,
+                'window-length': window,
+                'limitation': limit,
+                'strategy': strategy,
+            }
+        }
+    }
+
+
+class SharedBackendStub:
+    """Stands in for a shared store, answering each check with the next of ``retry_afters``."""
+
+    def __init__(self, *retry_afters: float):
+        backend = get_backend_module()
+        self.inner = type('Shared', (backend.RateLimitBackend,), {'shared': True, 'acquire': self._acquire})()
+        self.retry_afters = list(retry_afters)
+        self.calls = []
+
+    async def _acquire(self, key, *, algorithm, window_seconds, limit):
+        self.calls.append((key, algorithm, window_seconds, limit))
+        return self.retry_afters.pop(0)
+
+
+class TestRateLimitBackends:
+    @pytest.mark.asyncio
+    async def test_memory_backend_fixed_window_and_token_bucket(self):
+        backend = get_backend_module()
+        memory = backend.MemoryRateLimitBackend()
+
+        with patch.object(backend.time, 'time', return_value=1000.0):
+            assert await memory.acquire('s', algorithm='fixwin', window_seconds=60, limit=2) == 0
+            assert await memory.acquire('s', algorithm='fixwin', window_seconds=60, limit=2) == 0
+            assert await memory.acquire('s', algorithm='fixwin', window_seconds=60, limit=2) == pytest.approx(20.0)
+
+            # A bucket of 2 tokens refilling 2 tokens per 60s: a burst of 2, then one every 30s
+            assert await memory.acquire('s', algorithm='tokenbucket', window_seconds=60, limit=2) == 0
+            assert await memory.acquire('s', algorithm='tokenbucket', window_seconds=60, limit=2) == 0
+            assert await memory.acquire('s', algorithm='tokenbucket', window_seconds=60, limit=2) == pytest.approx(30.0)
+        with patch.object(backend.time, 'time', return_value=1030.0):
+            assert await memory.acquire('s', algorithm='tokenbucket', window_seconds=60, limit=2) == 0
+            assert await memory.acquire('s', algorithm='tokenbucket', window_seconds=60, limit=2) > 0
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize('algorithm', ['fixwin', 'tokenbucket'])
+    async def test_memory_backend_denies_everything_at_limit_zero(self, algorithm):
+        backend = get_backend_module()
+        memory = backend.MemoryRateLimitBackend()
+
+        assert await memory.acquire('s', algorithm=algorithm, window_seconds=60, limit=0) == 60.0
+
+    @pytest.mark.asyncio
+    async def test_memory_backend_evicts_least_recently_used_keys(self):
+        backend = get_backend_module()
+        memory = backend.MemoryRateLimitBackend(max_keys=2)
+
+        for key in ('a', 'b', 'a', 'c'):
+            await memory.acquire(key, algorithm='fixwin', window_seconds=60, limit=5)
+
+        assert [key for _, key in memory._states] == ['a', 'c']
+
+    @pytest.mark.asyncio
+    async def test_create_backend_from_instance_config(self):
+        backend = get_backend_module()
+        ap = Mock()
+        ap.instance_config.data = {}
+        assert isinstance(backend.create_backend(ap), backend.MemoryRateLimitBackend)
+
+        ap.instance_config.data = {'system': {'rate_limit': {'backend': 'valkey', 'valkey': {'port': 6390}}}}
+        valkey = backend.create_backend(ap)
+        assert isinstance(valkey, backend.ValkeyRateLimitBackend)
+        assert valkey.shared
+        assert valkey.storage_key('a:b', 'fixwin').startswith('langbot:ratelimit:fixwin:')
+
+        ap.instance_config.data = {'system': {'rate_limit': {'backend': 'etcd'}}}
+        with pytest.raises(ValueError):
+            backend.create_backend(ap)
+
+    @pytest.mark.asyncio
+    async def test_valkey_backend_falls_back_to_process_limits(self):
+        backend = get_backend_module()
+        ap = Mock()
+        valkey = backend.ValkeyRateLimitBackend(ap, {})
+        valkey._ensure_client = AsyncMock(side_effect=ConnectionError('connection refused'))
+
+        results = [await valkey.acquire('s', algorithm='fixwin', window_seconds=60, limit=1) for _ in range(2)]
+
+        assert results[0] == 0
+        assert results[1] > 0
+        assert valkey.fallback_count == 2
+        assert ap.logger.warning.call_count == 2
+
+
+class TestSharedRateLimiting:
+    @pytest.mark.asyncio
+    async def test_stage_selects_token_bucket(self, sample_query):
+        ratelimit, _, _ = get_modules()
+        app = Mock()
+        sample_query.pipeline_config = rate_limit_config('tokenbucket')
+
+        stage = ratelimit.RateLimit(app)
+        await stage.initialize(sample_query.pipeline_config)
+
+        assert stage.algo.name == 'tokenbucket'
+        results = [
+            await stage.algo.require_access(sample_query, provider_session.LauncherTypes.PERSON, 'tb') for _ in range(3)
+        ]
+        assert results == [True, True, False]
+
+    @pytest.mark.asyncio
+    async def test_fixedwin_delegates_to_shared_backend(self, sample_query):
+        fixedwin = get_fixedwin_module()
+        app = Mock()
+        stub = SharedBackendStub(0.0, 12.5)
+        app.rate_limit_backend = stub.inner
+        sample_query.pipeline_config = rate_limit_config(window=30, limit=5)
+
+        algo = fixedwin.FixedWindowAlgo(app)
+        await algo.initialize()
+
+        assert await algo.require_access(sample_query, 'person', 'shared') is True
+        assert await algo.require_access(sample_query, 'person', 'shared') is False
+        assert not algo.containers
+        key, algorithm, window_seconds, limit = stub.calls[0]
+        assert key.endswith(':person:shared')
+        assert (algorithm, window_seconds, limit) == ('fixwin', 30, 5)
+
+    @pytest.mark.asyncio
+    async def test_wait_strategy_retries_shared_backend(self, sample_query):
+        fixedwin = get_fixedwin_module()
+        app = Mock()
+        stub = SharedBackendStub(0.01, 0.0)
+        app.rate_limit_backend = stub.inner
+        sample_query.pipeline_config = rate_limit_config(strategy='wait')
+
+        algo = fixedwin.FixedWindowAlgo(app)
+        await algo.initialize()
+
+        assert await algo.require_access(sample_query, 'person', 'w') is True
+        assert len(stub.calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_limit_zero_denies_without_waiting(self, sample_query):
+        ratelimit, _, _ = get_modules()
+        sample_query.pipeline_config = rate_limit_config('tokenbucket', limit=0, strategy='wait')
+
+        stage = ratelimit.RateLimit(Mock())
+        await stage.initialize(sample_query.pipeline_config)
+
+        assert await stage.algo.require_access(sample_query, provider_session.LauncherTypes.PERSON, 'zero') is False
@@ -0,0 +1,275 @@
+"""
+Unit tests for the response cache pipeline stages.
+
+Tests cover:
+- Exact and embedding-similarity hits replied through SendResponseBackStage
+- Which replies are stored (final, tool-free, error-free text only)
+- First-message scope and disabled pipelines
+- Per-pipeline and process-wide LRU, TTL expiry and invalidation
+- Backfilling the stages into stored stage lists
+"""
+
+from __future__ import annotations
+
+from importlib import import_module
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+import langbot_plugin.api.entities.builtin.provider.message as provider_message
+import langbot_plugin.api.entities.builtin.provider.session as provider_session
+
+from tests.factories import FakeApp, text_query
+
+
+pytestmark = pytest.mark.asyncio
+
+
+def get_modules():
+    """Lazy import to ensure proper initialization order"""
+    pipelinemgr = import_module('langbot.pkg.pipeline.pipelinemgr')
+    respcache = import_module('langbot.pkg.pipeline.respcache.respcache')
+    cache = import_module('langbot.pkg.pipeline.respcache.cache')
+    entities = import_module('langbot.pkg.pipeline.entities')
+    return pipelinemgr, respcache, cache, entities
+
+
+def make_app(cache_config: dict | None = None, embeddings: dict[str, list[float]] | None = None) -> FakeApp:
+    _, _, cache, _ = get_modules()
+    app = FakeApp()
+    app.instance_config.data['system'] = {'response_cache': cache_config or {}}
+    app.pipeline_mgr = SimpleNamespace()
+    app.pipeline_mgr.response_cache = cache.ResponseCache(app)
+
+    embedded: list[str] = []
+
+    async def invoke_embedding(model, input_text, **kwargs):
+        embedded.extend(input_text)
+        return [embeddings[text] for text in input_text]
+
+    model = SimpleNamespace(provider=SimpleNamespace(invoke_embedding=invoke_embedding))
+    app.model_mgr.get_embedding_model_by_uuid = AsyncMock(return_value=model)
+    app.embedded = embedded
+    return app
+
+
+def make_query(text: str, **response_cache):
+    query = text_query(text)
+    query.pipeline_config['output'].update(
+        {
+            'force-delay': {'min': 0, 'max': 0},
+            'response-cache': {'enabled': True, **response_cache},
+        }
+    )
+    query.user_message = provider_message.Message(
+        role='user',
+        content=[provider_message.ContentElement.from_text(text)],
+    )
+    return query
+
+
+async def run_turn(stage, query, answer: provider_message.Message | provider_message.MessageChunk | None):
+    """Run the lookup stage and, on a miss, a fake AI reply followed by the store stage."""
+    result = await stage.process(query, 'ResponseCacheLookupStage')
+    if result.result_type.name == 'INTERRUPT' or answer is None:
+        return result
+    query.resp_messages.append(answer)
+    await stage.process(query, 'ResponseCacheStoreStage')
+    return result
+
+
+async def test_exact_hit_replies_through_respback():
+    _, respcache, _, entities = get_modules()
+    app = make_app()
+    stage = respcache.ResponseCacheStage(app)
+
+    first = make_query('What are your opening hours?')
+    await run_turn(stage, first, provider_message.Message(role='assistant', content='9 to 5.'))
+
+    second = make_query('  what are your OPENING hours? ')
+    conversation = provider_session.Conversation.model_construct(messages=[])
+    second.session = provider_session.Session(
+        launcher_type=provider_session.LauncherTypes.PERSON,
+        launcher_id=12345,
+        sender_id=12345,
+        using_conversation=conversation,
+    )
+    result = await run_turn(stage, second, None)
+
+    assert result.result_type == entities.ResultType.INTERRUPT
+    assert second.variables['_response_cache_hit'] == 'exact'
+    reply = second.adapter.reply_message.await_args.kwargs['message']
+    assert str(reply) == '9 to 5.'
+    assert [message.role for message in conversation.messages] == ['user', 'assistant']
+    app.sess_mgr.trim_conversation_messages.assert_called_once()
+    stats = app.pipeline_mgr.response_cache.pipeline_stats('test-workspace', 'test-pipeline-uuid')
+    assert stats['entries'] == 1
+    assert stats['exact_hits'] == 1
+    assert stats['hit_ratio'] == 0.5
+
+
+async def test_semantic_hit_above_threshold_reuses_lookup_embedding():
+    _, respcache, _, entities = get_modules()
+    app = make_app(
+        embeddings={
+            'How do I reset my password?': [1.0, 0.0],
+            'How can I reset my password?': [0.99, 0.05],
+            'Where is your office?': [0.0, 1.0],
+        }
+    )
+    stage = respcache.ResponseCacheStage(app)
+    settings = {'embedding-model': 'embedder', 'similarity-threshold': 0.9}
+
+    await run_turn(
+        stage,
+        make_query('How do I reset my password?', **settings),
+        provider_message.Message(role='assistant', content='Use the reset link.'),
+    )
+    similar = make_query('How can I reset my password?', **settings)
+    unrelated = make_query('Where is your office?', **settings)
+
+    assert (await run_turn(stage, similar, None)).result_type == entities.ResultType.INTERRUPT
+    assert similar.variables['_response_cache_hit'] == 'semantic'
+    assert str(similar.adapter.reply_message.await_args.kwargs['message']) == 'Use the reset link.'
+    assert (await run_turn(stage, unrelated, None)).result_type == entities.ResultType.CONTINUE
+    assert app.embedded == ['How do I reset my password?', 'How can I reset my password?', 'Where is your office?']
+    assert app.pipeline_mgr.response_cache.snapshot()['semantic_hits'] == 1
+
+
+async def test_embedding_failure_falls_back_to_exact_matching():
+    _, respcache, _, entities = get_modules()
+    app = make_app()
+    app.model_mgr.get_embedding_model_by_uuid = AsyncMock(side_effect=ValueError('Embedding model gone not found'))
+    stage = respcache.ResponseCacheStage(app)
+
+    query = make_query('hello', **{'embedding-model': 'gone'})
+    await run_turn(stage, query, provider_message.Message(role='assistant', content='Hi!'))
+
+    assert (await run_turn(stage, make_query('hello'), None)).result_type == entities.ResultType.INTERRUPT
+    app.logger.warning.assert_called_once()
+
+
+@pytest.mark.parametrize(
+    'answer,variables',
+    [
+        (
+            provider_message.Message(
+                role='assistant',
+                content='',
+                tool_calls=[
+                    provider_message.ToolCall(
+                        id='call-1',
+                        type='function',
+                        function=provider_message.FunctionCall(name='clock', arguments='{}'),
+                    )
+                ],
+            ),
+            {},
+        ),
+        (provider_message.MessageChunk(role='assistant', content='partial', is_final=False), {}),
+        (provider_message.Message(role='assistant', content='oops'), {'_monitoring_has_error': True}),
+        (
+            provider_message.Message(role='assistant', content='It is 10:42.'),
+            {'_telemetry_features': {'tool_call_rounds': 1}},
+        ),
+        (provider_message.Message(role='command', content='Reset.'), {}),
+    ],
+)
+async def test_only_final_tool_free_replies_are_stored(answer, variables):
+    _, respcache, _, _ = get_modules()
+    app = make_app()
+    stage = respcache.ResponseCacheStage(app)
+
+    query = make_query('What time is it?')
+    query.variables.update(variables)
+    await run_turn(stage, query, answer)
+
+    assert app.pipeline_mgr.response_cache.snapshot()['stores'] == 0
+
+
+async def test_final_stream_chunk_is_stored_once():
+    _, respcache, cache, _ = get_modules()
+    app = make_app()
+    stage = respcache.ResponseCacheStage(app)
+
+    query = make_query('hello')
+    await stage.process(query, 'ResponseCacheLookupStage')
+    for content, is_final in (('Hel', False), ('Hello!', True), ('Hello!', True)):
+        query.resp_messages[:] = [provider_message.MessageChunk(role='assistant', content=content, is_final=is_final)]
+        await stage.process(query, 'ResponseCacheStoreStage')
+
+    response_cache = app.pipeline_mgr.response_cache
+    assert response_cache.snapshot()['stores'] == 1
+    assert response_cache.find_exact('test-workspace', 'test-pipeline-uuid', cache.question_digest('hello')).text == (
+        'Hello!'
+    )
+
+
+async def test_follow_ups_disabled_pipelines_and_attachments_bypass_the_cache():
+    _, respcache, _, entities = get_modules()
+    app = make_app()
+    stage = respcache.ResponseCacheStage(app)
+    await run_turn(stage, make_query('yes'), provider_message.Message(role='assistant', content='Great.'))
+
+    follow_up = make_query('yes')
+    follow_up.messages = [provider_message.Message(role='user', content='Do you want a summary?')]
+    assert (await run_turn(stage, follow_up, None)).result_type == entities.ResultType.CONTINUE
+
+    follow_up.pipeline_config['output']['response-cache']['scope'] = 'all'
+    assert (await run_turn(stage, follow_up, None)).result_type == entities.ResultType.INTERRUPT
+
+    disabled = make_query('yes', enabled=False)
+    assert (await run_turn(stage, disabled, None)).result_type == entities.ResultType.CONTINUE
+
+    image = make_query('yes')
+    image.user_message.content.append(provider_message.ContentElement.from_image_base64('aGVsbG8='))
+    assert (await run_turn(stage, image, None)).result_type == entities.ResultType.CONTINUE
+
+    assert app.pipeline_mgr.response_cache.snapshot()['lookups'] == 2
+
+
+async def test_lru_ttl_and_invalidation(monkeypatch):
+    _, _, cache, _ = get_modules()
+    now = [1000.0]
+    monkeypatch.setattr(cache.time, 'monotonic', lambda: now[0])
+    app = SimpleNamespace(
+        instance_config=SimpleNamespace(
+            data={'system': {'response_cache': {'max_entries': 3, 'max_entries_per_pipeline': 2}}}
+        )
+    )
+    response_cache = cache.ResponseCache(app)
+
+    response_cache.store('ws', 'p1', 'a', 'A', 60)
+    response_cache.store('ws', 'p1', 'b', 'B', 60)
+    assert response_cache.find_exact('ws', 'p1', 'a').text == 'A'
+    response_cache.store('ws', 'p1', 'c', 'C', 60)
+    assert response_cache.find_exact('ws', 'p1', 'b') is None
+
+    response_cache.store('ws', 'p2', 'x', 'X', 600)
+    response_cache.store('ws', 'p2', 'y', 'Y', 600)
+    assert response_cache.find_exact('ws', 'p1', 'a') is None
+    assert response_cache.find_exact('ws', 'p1', 'c').text == 'C'
+
+    now[0] += 61
+    assert response_cache.find_exact('ws', 'p1', 'c') is None
+    assert response_cache.find_exact('other-ws', 'p2', 'x') is None
+    assert response_cache.invalidate_pipeline('ws', 'p2') == 2
+    assert response_cache.find_exact('ws', 'p2', 'x') is None
+
+    snapshot = response_cache.snapshot()
+    assert snapshot['entries'] == 0
+    assert snapshot['evictions'] == 2
+    assert snapshot['expirations'] == 1
+
+
+async def test_stored_stage_lists_get_cache_stages_backfilled():
+    pipelinemgr, _, _, _ = get_modules()
+    service = import_module('langbot.pkg.api.http.service.pipeline')
+    registered = {'ResponseCacheLookupStage', 'ResponseCacheStoreStage'}
+    legacy = [name for name in service.default_stage_order if name not in registered]
+
+    assert pipelinemgr._backfill_stages(legacy, registered) == service.default_stage_order
+    assert pipelinemgr._backfill_stages(service.default_stage_order, registered) == service.default_stage_order
+    assert pipelinemgr._backfill_stages(['CallerStage'], registered) == ['CallerStage']
+    assert pipelinemgr._backfill_stages(legacy, set()) == legacy
@@ -0,0 +1,138 @@
+"""Unit tests for the stream coalescer that paces streamed replies per platform."""
+
+from __future__ import annotations
+
+import asyncio
+
+import langbot_plugin.api.entities.builtin.provider.message as provider_message
+import pytest
+
+from langbot.pkg.pipeline.stream_coalescer import StreamCoalescer, resolve_settings
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _chunk(content: str, **kwargs) -> provider_message.MessageChunk:
+    return provider_message.MessageChunk(role=kwargs.pop('role', 'assistant'), content=content, **kwargs)
+
+
+def test_first_chunk_is_forwarded_and_fast_chunks_are_held_until_the_interval():
+    clock = _Clock()
+    coalescer = StreamCoalescer(interval_seconds=1.0, min_interval_seconds=0.2, max_buffered_chars=100, clock=clock)
+
+    assert [update.content for update in coalescer.push(_chunk('a'))] == ['a']
+    clock.now = 0.3
+    assert coalescer.push(_chunk('ab')) == []
+    clock.now = 0.6
+    assert coalescer.push(_chunk('abc')) == []
+    assert coalescer.due_in() == pytest.approx(0.4)
+    clock.now = 1.0
+    assert [update.content for update in coalescer.push(_chunk('abcd'))] == ['abcd']
+    assert (coalescer.received, coalescer.emitted) == (4, 2)
+
+
+def test_buffered_characters_trigger_an_early_update_after_the_minimum_interval():
+    clock = _Clock()
+    coalescer = StreamCoalescer(interval_seconds=1.0, min_interval_seconds=0.2, max_buffered_chars=10, clock=clock)
+
+    coalescer.push(_chunk('x'))
+    clock.now = 0.1
+    assert coalescer.push(_chunk('x' * 50)) == []
+    clock.now = 0.2
+    assert [update.content for update in coalescer.push(_chunk('x' * 51))] == ['x' * 51]
+
+
+def test_final_tool_call_and_tool_chunks_are_never_held():
+    clock = _Clock()
+    coalescer = StreamCoalescer(interval_seconds=10.0, clock=clock)
+    tool_call = provider_message.ToolCall(
+        id='call-1', type='function', function=provider_message.FunctionCall(name='search', arguments='{}')
+    )
+
+    coalescer.push(_chunk('a'))
+    assert len(coalescer.push(_chunk('ab', tool_calls=[tool_call]))) == 1
+    assert len(coalescer.push(_chunk('{}', role='tool', tool_call_id='call-1'))) == 1
+    assert len(coalescer.push(_chunk('abc'))) == 1
+    assert coalescer.push(_chunk('abcd')) == []
+    assert [update.content for update in coalescer.push(_chunk('abcde', is_final=True))] == ['abcde']
+    assert coalescer.flush() is None
+
+
+def test_flush_returns_the_chunk_held_when_the_stream_ends_without_a_final_chunk():
+    coalescer = StreamCoalescer(interval_seconds=10.0, clock=_Clock())
+
+    coalescer.push(_chunk('a'))
+    coalescer.push(_chunk('ab'))
+
+    assert coalescer.flush().content == 'ab'
+    assert coalescer.flush() is None
+
+
+def test_non_text_and_delta_chunks_are_forwarded_after_the_held_chunk():
+    coalescer = StreamCoalescer(interval_seconds=10.0, clock=_Clock())
+    files = [provider_message.ContentElement.from_text('report.pdf')]
+
+    coalescer.push(_chunk('Hel'))
+    assert coalescer.push(_chunk('Hello')) == []
+    assert [update.content for update in coalescer.push(_chunk(files))] == ['Hello', files]
+    assert [update.content for update in coalescer.push(_chunk(' world'))] == [' world']
+    assert [update.content for update in coalescer.push(_chunk('!'))] == ['!']
+    assert coalescer.flush() is None
+
+
+async def test_pace_delivers_the_held_chunk_while_the_runner_stalls():
+    coalescer = StreamCoalescer(interval_seconds=0.05, min_interval_seconds=0.05)
+    delivered = []
+
+    async def runner():
+        yield _chunk('a')
+        yield _chunk('ab')
+        await asyncio.sleep(0.5)
+        delivered.append('stall over')
+        yield _chunk('abc', is_final=True)
+
+    async for update in coalescer.pace(runner()):
+        delivered.append(update.content)
+
+    assert delivered == ['a', 'ab', 'stall over', 'abc']
+
+
+async def test_pace_closes_the_runner_when_the_caller_stops_early():
+    coalescer = StreamCoalescer(interval_seconds=0.05, min_interval_seconds=0.05)
+    closed = []
+
+    async def runner():
+        try:
+            yield _chunk('a')
+            yield _chunk('ab')
+        finally:
+            closed.append(True)
+
+    updates = coalescer.pace(runner())
+    assert (await anext(updates)).content == 'a'
+    await updates.aclose()
+
+    assert closed == [True]
+
+
+def test_settings_merge_platform_defaults_and_overrides():
+    assert resolve_settings({}, 'telegram')['interval_seconds'] == 1.0
+    assert resolve_settings({}, None)['interval_seconds'] == 0.5
+
+    settings = resolve_settings(
+        {
+            'interval_seconds': 0.3,
+            'max_buffered_chars': 'many',
+            'platforms': {'telegram': {'interval_seconds': 2.0, 'min_interval_seconds': 99}},
+        },
+        'telegram',
+    )
+
+    assert settings == {'interval_seconds': 2.0, 'min_interval_seconds': 2.0, 'max_buffered_chars': 200}
+    assert resolve_settings({'interval_seconds': 0.3}, 'lark')['interval_seconds'] == 0.3
@@ -88,14 +88,10 @@ def test_lark_form_stage_skips_closed_streaming_element_update():
     assert not _lark_should_update_stream_element(
         resume_from=False,
         form_data={'_current_input_field': 'xiala'},
-        msg_seq=1,
-        is_final=True,
     )
     assert _lark_should_update_stream_element(
         resume_from=False,
         form_data=None,
-        msg_seq=1,
-        is_final=True,
     )
 
 
@@ -0,0 +1,269 @@
+"""Unit tests for the durable webhook outbox behind WebhookPusher."""
+
+from __future__ import annotations
+
+import asyncio
+import datetime
+import logging
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+import sqlalchemy
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from langbot.pkg.api.http.context import ExecutionContext
+from langbot.pkg.entity.persistence import webhook as persistence_webhook
+from langbot.pkg.entity.persistence.base import Base
+from langbot.pkg.platform.webhook_outbox import WebhookDeliveryError
+from langbot.pkg.platform.webhook_pusher import WebhookPusher
+
+
+pytestmark = pytest.mark.asyncio
+
+WORKSPACE_UUID = 'workspace-test'
+CONTEXT = ExecutionContext(instance_uuid='instance-a', workspace_uuid=WORKSPACE_UUID, placement_generation=1)
+
+
+class _PersistenceManager:
+    def __init__(self, engine):
+        self.engine = engine
+
+    async def execute_async(self, *args, **kwargs):
+        async with self.engine.connect() as connection:
+            result = await connection.execute(*args, **kwargs)
+            await connection.commit()
+            return result
+
+
+class _Endpoints:
+    """Records POSTs and fails for the URLs listed in ``failing``."""
+
+    def __init__(self, responses: dict[str, dict] | None = None):
+        self.responses = responses or {}
+        self.failing: set[str] = set()
+        self.posts: list[tuple[str, dict]] = []
+
+    async def __call__(self, url: str, payload: dict) -> dict:
+        self.posts.append((url, payload))
+        if url in self.failing:
+            raise WebhookDeliveryError(f'Webhook {url} returned status 503')
+        return self.responses.get(url, {})
+
+
+@pytest.fixture
+async def engine(tmp_path):
+    engine = create_async_engine(f'sqlite+aiosqlite:///{tmp_path / "outbox.db"}')
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+
+async def _pusher(engine, webhooks: list[dict], outbox_config: dict | None = None) -> tuple[WebhookPusher, _Endpoints]:
+    for webhook in webhooks:
+        await _PersistenceManager(engine).execute_async(
+            sqlalchemy.insert(persistence_webhook.Webhook).values(
+                id=webhook['id'],
+                workspace_uuid=WORKSPACE_UUID,
+                name=f'webhook-{webhook["id"]}',
+                url=webhook['url'],
+                enabled=True,
+                can_skip_pipeline=webhook.get('can_skip_pipeline', False),
+            )
+        )
+    application = SimpleNamespace(
+        instance_config=SimpleNamespace(data={'webhooks': {'outbox': outbox_config or {}}}),
+        logger=logging.getLogger(__name__),
+        persistence_mgr=_PersistenceManager(engine),
+        webhook_service=SimpleNamespace(get_enabled_webhooks=AsyncMock(return_value=webhooks)),
+    )
+    pusher = WebhookPusher(application)
+    endpoints = _Endpoints()
+    pusher._push_to_webhook = endpoints
+    return pusher, endpoints
+
+
+async def _queued(engine) -> list:
+    Event = persistence_webhook.WebhookOutboxEvent
+    result = await _PersistenceManager(engine).execute_async(
+        sqlalchemy.select(Event.webhook_id, Event.attempts, Event.last_error).order_by(Event.id)
+    )
+    return result.all()
+
+
+async def _make_due(engine) -> None:
+    Event = persistence_webhook.WebhookOutboxEvent
+    await _PersistenceManager(engine).execute_async(
+        sqlalchemy.update(Event).values(next_attempt_at=datetime.datetime(2000, 1, 1))
+    )
+
+
+async def test_only_webhooks_that_may_skip_the_pipeline_are_called_inline(engine):
+    pusher, endpoints = await _pusher(
+        engine,
+        [
+            {'id': 1, 'url': 'https://inline.invalid', 'can_skip_pipeline': True},
+            {'id': 2, 'url': 'https://queued.invalid', 'can_skip_pipeline': False},
+        ],
+    )
+    endpoints.responses['https://inline.invalid'] = {'skip_pipeline': True}
+
+    assert await pusher._push_event(CONTEXT, {'uuid': 'event-1'}) is True
+    assert endpoints.posts == [('https://inline.invalid', {'uuid': 'event-1'})]
+    assert [row.webhook_id for row in await _queued(engine)] == [2]
+
+    assert await pusher.outbox.deliver_due() == 1
+    assert endpoints.posts[-1] == ('https://queued.invalid', {'uuid': 'event-1'})
+    assert await _queued(engine) == []
+
+
+async def test_webhooks_answering_with_skip_pipeline_are_moved_inline(engine):
+    pusher, endpoints = await _pusher(engine, [{'id': 1, 'url': 'https://gate.invalid'}])
+    endpoints.responses['https://gate.invalid'] = {'skip_pipeline': True}
+
+    # By default a webhook is off the message path.
+    assert await pusher._push_event(CONTEXT, {'uuid': 'event-1'}) is False
+    assert endpoints.posts == []
+    assert await pusher.outbox.deliver_due() == 1
+
+    Webhook = persistence_webhook.Webhook
+    result = await _PersistenceManager(engine).execute_async(sqlalchemy.select(Webhook.can_skip_pipeline))
+    assert result.scalar_one() is True
+
+
+async def test_failed_inline_delivery_is_retried_by_the_outbox(engine):
+    pusher, endpoints = await _pusher(engine, [{'id': 1, 'url': 'https://flaky.invalid', 'can_skip_pipeline': True}])
+    endpoints.failing.add('https://flaky.invalid')
+
+    assert await pusher._push_event(CONTEXT, {'uuid': 'event-1'}) is False
+    (row,) = await _queued(engine)
+    assert row.attempts == 1
+    assert 'status 503' in row.last_error
+
+    # Not due yet: the first retry waits for the backoff.
+    assert await pusher.outbox.deliver_due() == 0
+    endpoints.failing.clear()
+    await _make_due(engine)
+    assert await pusher.outbox.deliver_due() == 1
+    assert await _queued(engine) == []
+
+
+async def test_events_are_dropped_after_max_attempts(engine):
+    pusher, endpoints = await _pusher(
+        engine,
+        [{'id': 1, 'url': 'https://down.invalid', 'can_skip_pipeline': False}],
+        {'max_attempts': 2},
+    )
+    endpoints.failing.add('https://down.invalid')
+    await pusher._push_event(CONTEXT, {'uuid': 'event-1'})
+
+    await pusher.outbox.deliver_due()
+    assert [row.attempts for row in await _queued(engine)] == [1]
+    await _make_due(engine)
+    await pusher.outbox.deliver_due()
+
+    assert await _queued(engine) == []
+    assert pusher.outbox.snapshot()['dead_lettered'] == 1
+
+
+async def test_open_circuit_pauses_a_failing_webhook(engine):
+    pusher, endpoints = await _pusher(
+        engine,
+        [{'id': 1, 'url': 'https://down.invalid', 'can_skip_pipeline': False}],
+        {'circuit_failure_threshold': 2, 'circuit_cooldown_seconds': 60},
+    )
+    endpoints.failing.add('https://down.invalid')
+    for index in range(2):
+        await pusher._push_event(CONTEXT, {'uuid': f'event-{index}'})
+        await pusher.outbox.deliver_due()
+        await _make_due(engine)
+    posts = len(endpoints.posts)
+
+    await pusher._push_event(CONTEXT, {'uuid': 'event-2'})
+    await pusher.outbox.deliver_due()
+
+    assert len(endpoints.posts) == posts
+    assert len(await _queued(engine)) == 3
+    assert pusher.outbox.snapshot()['open_circuits'] == 1
+
+
+async def test_queued_events_for_one_webhook_are_batched(engine):
+    pusher, endpoints = await _pusher(
+        engine,
+        [{'id': 1, 'url': 'https://batch.invalid', 'can_skip_pipeline': False}],
+        {'batch_size': 10},
+    )
+    for index in range(3):
+        await pusher._push_event(CONTEXT, {'uuid': f'event-{index}'})
+
+    assert await pusher.outbox.deliver_due() == 3
+    ((url, payload),) = endpoints.posts
+    assert payload['event_type'] == 'batch'
+    assert [event['uuid'] for event in payload['data']['events']] == ['event-0', 'event-1', 'event-2']
+
+
+async def test_worker_delivers_promptly_after_enqueue(engine):
+    pusher, endpoints = await _pusher(engine, [{'id': 1, 'url': 'https://queued.invalid', 'can_skip_pipeline': False}])
+    pusher.ap.workspace_service = SimpleNamespace(list_active_execution_bindings=AsyncMock(return_value=[]))
+    worker = asyncio.create_task(pusher.outbox.run())
+    try:
+        await pusher._push_event(CONTEXT, {'uuid': 'event-1'})
+        for _ in range(100):
+            if endpoints.posts:
+                break
+            await asyncio.sleep(0.01)
+    finally:
+        worker.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await worker
+
+    assert endpoints.posts == [('https://queued.invalid', {'uuid': 'event-1'})]
+
+
+async def test_slow_webhook_does_not_hold_up_other_webhooks(engine):
+    pusher, endpoints = await _pusher(
+        engine,
+        [
+            {'id': 1, 'url': 'https://slow.invalid', 'can_skip_pipeline': False},
+            {'id': 2, 'url': 'https://fast.invalid', 'can_skip_pipeline': False},
+        ],
+    )
+    pusher.ap.workspace_service = SimpleNamespace(list_active_execution_bindings=AsyncMock(return_value=[]))
+    release = asyncio.Event()
+
+    async def push(url: str, payload: dict) -> dict:
+        if url == 'https://slow.invalid':
+            await release.wait()
+        return await endpoints(url, payload)
+
+    pusher._push_to_webhook = push
+    worker = asyncio.create_task(pusher.outbox.run())
+    try:
+        await pusher._push_event(CONTEXT, {'uuid': 'event-1'})
+        for _ in range(100):
+            if endpoints.posts and pusher.outbox.snapshot()['active_drains'] == 1:
+                break
+            await asyncio.sleep(0.01)
+        assert endpoints.posts == [('https://fast.invalid', {'uuid': 'event-1'})]
+        assert pusher.outbox.snapshot()['active_drains'] == 1
+    finally:
+        release.set()
+        worker.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await worker
+
+
+async def test_expired_claim_cannot_touch_reclaimed_events(engine):
+    pusher, endpoints = await _pusher(engine, [{'id': 1, 'url': 'https://queued.invalid', 'can_skip_pipeline': False}])
+    await pusher._push_event(CONTEXT, {'uuid': 'event-1'})
+    outbox = pusher.outbox
+
+    stale_token, (row,) = await outbox._claim(WORKSPACE_UUID, 1, 10)
+    await _make_due(engine)
+    _, reclaimed = await outbox._claim(WORKSPACE_UUID, 1, 10)
+    await outbox._delete(WORKSPACE_UUID, stale_token, [row.id])
+
+    assert [event.id for event in reclaimed] == [row.id]
+    assert len(await _queued(engine)) == 1
+    assert outbox.snapshot()['lost_leases'] == 1
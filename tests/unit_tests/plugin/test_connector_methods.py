@@ -13,10 +13,11 @@ from contextlib import nullcontext
 from types import SimpleNamespace
 
 import pytest
-from unittest.mock import AsyncMock, Mock
+from unittest.mock import AsyncMock, Mock, patch
 from importlib import import_module
 
 from tests.factories import text_query
+from langbot_plugin.api.entities import events
 from langbot_plugin.entities.io.context import InstallationBinding
 
 from langbot.pkg.api.http.context import ExecutionContext
@@ -76,6 +77,13 @@ def configure_handler(connector, runtime_handler):
     return runtime_handler
 
 
+def _plugin(author: str, name: str, *kinds: str) -> dict:
+    return {
+        'manifest': {'manifest': {'metadata': {'author': author, 'name': name}}},
+        'components': [{'manifest': {'manifest': {'kind': kind}}} for kind in kinds],
+    }
+
+
 class TestListPlugins:
     """Tests for list_plugins method."""
 
@@ -207,12 +215,13 @@ class TestPluginDiagnostics:
 
         async def emit_event_response(event_context, include_plugins=None):
             return {
-                'event_context': event_context,
+                'event_context': {**event_context, 'is_prevent_default': True},
                 'emitted_plugins': [],
                 'response_sources': response_sources,
             }
 
         configure_handler(connector, AsyncMock())
+        connector.handler.list_plugins = AsyncMock(return_value=[_plugin('tester', 'demo', 'EventListener')])
         connector.handler.emit_event = AsyncMock(side_effect=emit_event_response)
 
         fake_event_ctx = Mock()
@@ -257,6 +266,7 @@ class TestPluginDiagnostics:
             }
 
         configure_handler(connector, AsyncMock())
+        connector.handler.list_plugins = AsyncMock(return_value=[_plugin('tester', 'demo', 'EventListener')])
         connector.handler.emit_event = AsyncMock(side_effect=emit_event_response)
 
         fake_event_ctx = Mock()
@@ -563,6 +573,147 @@ class TestRetrieveKnowledge:
         assert result == {'results': []}
 
 
+def _raw_tool(name: str, owner: str = 'author/plugin') -> dict:
+    return {
+        'owner': owner,
+        'rel_path': f'components/tools/{name}.yaml',
+        'manifest': {
+            'apiVersion': 'v1',
+            'kind': 'Tool',
+            'metadata': {'name': name, 'label': {'en_US': name}, 'description': {'en_US': name}},
+            'spec': {'llm_prompt': name, 'parameters': {'type': 'object', 'properties': {}}},
+        },
+    }
+
+
+class TestListTools:
+    """Tests for the cached plugin tool catalog."""
+
+    @pytest.mark.asyncio
+    async def test_reuses_catalog_until_plugins_change(self):
+        connector = create_mock_connector()
+        runtime_handler = configure_handler(connector, AsyncMock())
+        runtime_handler.list_tools = AsyncMock(return_value=[_raw_tool('search')])
+
+        first = await connector.list_tools()
+        second = await connector.list_tools()
+        tool = await connector.get_tool('search')
+
+        assert [item.metadata.name for item in first] == ['search']
+        assert [item.metadata.name for item in second] == ['search']
+        assert tool.metadata.name == 'search'
+        assert await connector.get_tool('missing') is None
+        runtime_handler.list_tools.assert_awaited_once()
+
+        connector._invalidate_tool_catalog(TEST_EXECUTION_CONTEXT.workspace_uuid)
+        runtime_handler.list_tools.return_value = [_raw_tool('search'), _raw_tool('fetch')]
+
+        assert [item.metadata.name for item in await connector.list_tools()] == ['search', 'fetch']
+        assert runtime_handler.list_tools.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_catalog_is_keyed_by_bound_plugins(self):
+        connector = create_mock_connector()
+        runtime_handler = configure_handler(connector, AsyncMock())
+        runtime_handler.list_tools = AsyncMock(return_value=[_raw_tool('search')])
+
+        await connector.list_tools()
+        await connector.list_tools(['author/plugin'])
+        await connector.list_tools(['author/plugin'])
+
+        assert runtime_handler.list_tools.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_zero_ttl_disables_catalog_cache(self):
+        connector = create_mock_connector()
+        connector.ap.instance_config.data['plugin']['tool_catalog_ttl_seconds'] = 0
+        runtime_handler = configure_handler(connector, AsyncMock())
+        runtime_handler.list_tools = AsyncMock(return_value=[_raw_tool('search')])
+
+        await connector.list_tools()
+        await connector.list_tools()
+
+        assert runtime_handler.list_tools.await_count == 2
+
+
+class TestEmitEventListenerIndex:
+    """Tests for skipping Runtime round-trips when no plugin listens for events."""
+
+    @staticmethod
+    def _event():
+        query = text_query('hello')
+        return events.PersonNormalMessageReceived(
+            launcher_type='person',
+            launcher_id=query.launcher_id,
+            sender_id=query.sender_id,
+            text_message='hello',
+            message_event=query.message_event,
+            message_chain=query.message_chain,
+            query=query,
+        )
+
+    @pytest.mark.asyncio
+    async def test_events_without_listeners_stay_local(self):
+        connector = create_mock_connector()
+        runtime_handler = configure_handler(connector, AsyncMock())
+        runtime_handler.list_plugins = AsyncMock(return_value=[_plugin('author', 'tools', 'Tool')])
+
+        first = await connector.emit_event(self._event())
+        second = await connector.emit_event(self._event())
+
+        runtime_handler.emit_event.assert_not_awaited()
+        runtime_handler.list_plugins.assert_awaited_once()
+        assert first._emitted_plugins == [] and second._response_sources == []
+
+        connector._invalidate_tool_catalog(TEST_EXECUTION_CONTEXT.workspace_uuid)
+        runtime_handler.list_plugins.return_value = [_plugin('author', 'tools', 'Tool', 'EventListener')]
+        runtime_handler.emit_event = AsyncMock(
+            side_effect=lambda event_context, include_plugins=None: {'event_context': event_context}
+        )
+
+        await connector.emit_event(self._event())
+
+        runtime_handler.emit_event.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_bound_plugins_must_include_a_listener(self):
+        connector = create_mock_connector()
+        runtime_handler = configure_handler(connector, AsyncMock())
+        runtime_handler.list_plugins = AsyncMock(return_value=[_plugin('author', 'listener', 'EventListener')])
+        runtime_handler.emit_event = AsyncMock(
+            side_effect=lambda event_context, include_plugins=None: {
+                'event_context': event_context,
+                'emitted_plugins': [{'manifest': {'metadata': {'author': 'author', 'name': 'listener'}}}],
+            }
+        )
+        connector_module = get_connector_module()
+
+        await connector.emit_event(self._event(), bound_plugins=['author/other'])
+        runtime_handler.emit_event.assert_not_awaited()
+
+        event = self._event()
+        with patch.object(connector_module.context.EventContext, 'model_validate') as model_validate:
+            event_ctx = await connector.emit_event(event, bound_plugins=['author/listener'])
+
+        model_validate.assert_not_called()
+        assert event_ctx.event is event
+        assert event_ctx._emitted_plugins == [{'manifest': {'metadata': {'author': 'author', 'name': 'listener'}}}]
+        assert runtime_handler.emit_event.await_args.kwargs['include_plugins'] == ['author/listener']
+
+    @pytest.mark.asyncio
+    async def test_unlisted_installations_still_receive_events(self):
+        connector = create_mock_connector()
+        runtime_handler = configure_handler(connector, AsyncMock())
+        runtime_handler.list_plugins = AsyncMock(side_effect=RuntimeError('old runtime'))
+        runtime_handler.emit_event = AsyncMock(
+            side_effect=lambda event_context, include_plugins=None: {'event_context': event_context}
+        )
+
+        await connector.emit_event(self._event())
+
+        runtime_handler.emit_event.assert_awaited_once()
+
+
 class TestDisabledPluginEarlyReturns:
     """Tests for early returns when plugin system is disabled."""
 
@@ -7,10 +7,11 @@ from types import SimpleNamespace
 from unittest.mock import AsyncMock, Mock
 
 import pytest
-from langbot_plugin.entities.io.actions.enums import PluginToRuntimeAction, RuntimeToLangBotAction
+from langbot_plugin.entities.io.actions.enums import CommonAction, PluginToRuntimeAction, RuntimeToLangBotAction
 from langbot_plugin.entities.io.context import ActionContext, InstallationBinding
 
 from langbot.pkg.api.http.context import ExecutionContext
+from langbot.pkg.plugin import transfer
 from langbot.pkg.storage.mgr import StorageMgr
 
 
@@ -770,3 +771,115 @@ class TestHandlerQueryLookup:
 
         assert response.code == 0
         assert response.data == {'bot_uuid': 'test-bot-uuid'}
+
+
+class TestPayloadTransfer:
+    """Tests for streamed FILE_CHUNK transfers and per-action transfer metrics."""
+
+    @staticmethod
+    def make_app() -> Mock:
+        app = Mock()
+        app.instance_config.data = {'plugin': {'binary_storage': {'max_value_bytes': 1024 * 1024}}}
+        app.persistence_mgr.get_db_engine.return_value = SimpleNamespace(dialect=SimpleNamespace(name='sqlite'))
+        app.persistence_mgr.execute_async = AsyncMock(return_value=make_result())
+        return app
+
+    @staticmethod
+    def record_chunks(runtime_handler) -> list[dict]:
+        sent: list[dict] = []
+
+        async def call_action(action, data, **kwargs):
+            assert action == CommonAction.FILE_CHUNK
+            sent.append(data)
+            return {}
+
+        runtime_handler.call_action = AsyncMock(side_effect=call_action)
+        return sent
+
+    @staticmethod
+    async def stream(*values: bytes):
+        for value in values:
+            yield value
+
+    @pytest.mark.asyncio
+    async def test_fixed_chunks_recut_arbitrary_chunk_boundaries(self):
+        pieces = [bytes(piece) async for piece in transfer.fixed_chunks(self.stream(b'ab', b'cdefg', b'', b'hi'), 3)]
+
+        assert pieces == [b'abc', b'def', b'ghi']
+
+    @pytest.mark.asyncio
+    async def test_streamed_file_is_sent_as_protocol_chunks_and_counted(self):
+        runtime_handler = make_handler(self.make_app())
+        sent = self.record_chunks(runtime_handler)
+        payload = bytes(range(256)) * ((transfer.FILE_CHUNK_LENGTH * 2 + 100) // 256 + 1)
+
+        file_key = await runtime_handler.send_file_stream(
+            self.stream(payload[:1000], payload[1000:]),
+            len(payload),
+            'pdf',
+            action='test-action',
+        )
+
+        assert file_key.endswith('.pdf')
+        assert [chunk['chunk_index'] for chunk in sent] == list(range(sent[0]['chunk_amount']))
+        assert b''.join(base64.b64decode(chunk['chunk_base64']) for chunk in sent) == payload
+        assert all(chunk['chunk_size'] <= transfer.FILE_CHUNK_LENGTH for chunk in sent)
+        assert runtime_handler.transfer_stats.snapshot()['test-action']['bytes_sent'] == len(payload)
+
+        with pytest.raises(ValueError, match='smaller than announced'):
+            await runtime_handler.send_file_stream(self.stream(b'abc'), 4, '')
+
+    @pytest.mark.asyncio
+    async def test_large_binary_storage_values_use_file_keys_when_accepted(self):
+        app = self.make_app()
+        runtime_handler = make_handler(app)
+        sent = self.record_chunks(runtime_handler)
+        value = b'v' * (transfer.INLINE_PAYLOAD_MAX_BYTES + 1)
+        app.persistence_mgr.execute_async.return_value = make_result(SimpleNamespace(value=value))
+        request = {'key': 'test-key', 'owner_type': 'plugin', 'owner': 'ignored'}
+
+        inline = await runtime_handler.actions[RuntimeToLangBotAction.GET_BINARY_STORAGE.value](request)
+        streamed = await runtime_handler.actions[RuntimeToLangBotAction.GET_BINARY_STORAGE.value](
+            {**request, 'accept_file_key': True}
+        )
+
+        assert base64.b64decode(inline.data['value_base64']) == value
+        assert streamed.data['value_file_key'] == sent[0]['file_key']
+        assert b''.join(base64.b64decode(chunk['chunk_base64']) for chunk in sent) == value
+        stats = runtime_handler.transfer_stats.snapshot()[RuntimeToLangBotAction.GET_BINARY_STORAGE.value]
+        assert stats['transfers'] == 2
+        assert stats['bytes_sent'] == 2 * len(value)
+
+    @pytest.mark.asyncio
+    async def test_binary_storage_value_can_arrive_as_transferred_file(self):
+        app = self.make_app()
+        runtime_handler = make_handler(app)
+        runtime_handler.read_local_file = AsyncMock(return_value=b'transferred bytes')
+        runtime_handler.delete_local_file = AsyncMock()
+
+        response = await runtime_handler.actions[RuntimeToLangBotAction.SET_BINARY_STORAGE.value](
+            {'key': 'test-key', 'owner_type': 'plugin', 'owner': 'ignored', 'value_file_key': 'abc123'}
+        )
+
+        assert response.code == 0
+        runtime_handler.delete_local_file.assert_awaited_once_with('abc123')
+        stats = runtime_handler.transfer_stats.snapshot()[RuntimeToLangBotAction.SET_BINARY_STORAGE.value]
+        assert stats['bytes_received'] == len(b'transferred bytes')
+
+    @pytest.mark.asyncio
+    async def test_knowledge_file_is_streamed_from_storage(self):
+        app = self.make_app()
+        chunks = Mock(return_value=self.stream(b'first-', b'second'))
+        app.rag_runtime_service = SimpleNamespace(
+            open_file_stream=AsyncMock(return_value=SimpleNamespace(size=12, iter_chunks=chunks))
+        )
+        runtime_handler = make_handler(app)
+        sent = self.record_chunks(runtime_handler)
+
+        response = await runtime_handler.actions[PluginToRuntimeAction.GET_KNOWLEDEGE_FILE_STREAM.value](
+            {'storage_path': 'doc.pdf'}
+        )
+
+        assert response.data['file_key'] == sent[0]['file_key']
+        assert base64.b64decode(sent[0]['chunk_base64']) == b'first-second'
+        chunks.assert_called_once_with()
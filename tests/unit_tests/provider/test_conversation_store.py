@@ -0,0 +1,194 @@
+"""Unit tests for the persistent conversation store behind SessionManager."""
+
+from __future__ import annotations
+
+import datetime
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+import pytest
+import sqlalchemy
+from sqlalchemy.ext.asyncio import create_async_engine
+
+import langbot_plugin.api.entities.builtin.provider.message as provider_message
+import langbot_plugin.api.entities.builtin.provider.session as provider_session
+
+from langbot.pkg.api.http.context import ExecutionContext
+from langbot.pkg.entity.persistence import conversation as persistence_conversation
+from langbot.pkg.entity.persistence.base import Base
+from langbot.pkg.provider.session import sessionmgr, store
+
+
+pytestmark = pytest.mark.asyncio
+
+WORKSPACE_UUID = 'workspace-test'
+BOT_UUID = 'bot-123'
+
+
+class _PersistenceManager:
+    def __init__(self, engine):
+        self.engine = engine
+
+    async def execute_async(self, *args, **kwargs):
+        async with self.engine.connect() as connection:
+            result = await connection.execute(*args, **kwargs)
+            await connection.commit()
+            return result
+
+    def get_db_engine(self):
+        return self.engine
+
+
+def _query(*, instance_uuid='instance-a', placement_generation=1):
+    return SimpleNamespace(
+        launcher_type=provider_session.LauncherTypes.PERSON,
+        launcher_id='launcher-1',
+        sender_id='sender-1',
+        bot_uuid=BOT_UUID,
+        _execution_context=ExecutionContext(
+            instance_uuid=instance_uuid,
+            workspace_uuid=WORKSPACE_UUID,
+            placement_generation=placement_generation,
+            bot_uuid=BOT_UUID,
+        ),
+    )
+
+
+async def _turn(manager, query, text, *, pipeline_uuid='pipeline-1'):
+    session = await manager.get_session(query)
+    conversation = await manager.get_conversation(query, session, [], pipeline_uuid, BOT_UUID)
+    conversation.messages.append(provider_message.Message(role='user', content=text))
+    conversation.messages.append(provider_message.Message(role='assistant', content=f'echo {text}'))
+    manager.trim_conversation_messages(conversation, max_rounds=10)
+    return conversation
+
+
+@pytest.fixture
+async def app(tmp_path):
+    engine = create_async_engine(f'sqlite+aiosqlite:///{tmp_path / "conversations.db"}')
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    application = Mock()
+    application.instance_config.data = {
+        'concurrency': {'session': 5},
+        'system': {'session_retention': {'persistent': True}},
+    }
+    application.persistence_mgr = _PersistenceManager(engine)
+    yield application
+    await engine.dispose()
+
+
+async def _stored_rows(app):
+    result = await app.persistence_mgr.execute_async(
+        sqlalchemy.select(persistence_conversation.ConversationSnapshot.message_count)
+    )
+    return result.all()
+
+
+async def test_new_session_rehydrates_history_after_restart(app):
+    manager = sessionmgr.SessionManager(app)
+    await _turn(manager, _query(), 'first')
+    await _turn(manager, _query(), 'second')
+
+    # Both turns are coalesced into one row per chat.
+    assert await manager.store.flush() == 1
+    assert [row.message_count for row in await _stored_rows(app)] == [4]
+
+    restarted = sessionmgr.SessionManager(app)
+    query = _query(instance_uuid='instance-b', placement_generation=2)
+    session = await restarted.get_session(query)
+    conversation = await restarted.get_conversation(query, session, [], 'pipeline-1', BOT_UUID)
+
+    assert [message.content for message in conversation.messages] == ['first', 'echo first', 'second', 'echo second']
+    snapshot = restarted.store.snapshot()
+    assert snapshot['cold_hits'] == 1
+    assert snapshot['pending_writes'] == 0
+
+
+async def test_rehydrates_from_queued_write_before_flush(app):
+    manager = sessionmgr.SessionManager(app)
+    original = await _turn(manager, _query(), 'hello')
+    original_session = await manager.get_session(_query())
+    manager._remove_session(original_session)
+
+    query = _query()
+    session = await manager.get_session(query)
+    conversation = await manager.get_conversation(query, session, [], 'pipeline-1', BOT_UUID)
+
+    assert session is not original_session
+    assert conversation.uuid == original.uuid
+    assert [message.content for message in conversation.messages] == ['hello', 'echo hello']
+    assert await _stored_rows(app) == []
+
+
+async def test_other_pipeline_does_not_restore_and_replaces_history(app):
+    manager = sessionmgr.SessionManager(app)
+    await _turn(manager, _query(), 'hello')
+    await manager.store.flush()
+
+    restarted = sessionmgr.SessionManager(app)
+    query = _query()
+    session = await restarted.get_session(query)
+    conversation = await restarted.get_conversation(query, session, [], 'pipeline-2', BOT_UUID)
+    await restarted.store.flush()
+
+    assert conversation.messages == []
+    assert [row.message_count for row in await _stored_rows(app)] == [0]
+
+
+async def test_reset_in_live_session_overwrites_history(app):
+    manager = sessionmgr.SessionManager(app)
+    await _turn(manager, _query(), 'hello')
+    session = await manager.get_session(_query())
+    session.using_conversation = None
+    await manager.get_conversation(_query(), session, [], 'pipeline-1', BOT_UUID)
+    await manager.store.flush()
+
+    restarted = sessionmgr.SessionManager(app)
+    query = _query()
+    conversation = await restarted.get_conversation(
+        query, await restarted.get_session(query), [], 'pipeline-1', BOT_UUID
+    )
+
+    assert conversation.messages == []
+
+
+async def test_binary_payloads_are_not_persisted():
+    packed = store.pack_messages(
+        [
+            provider_message.Message(
+                role='user',
+                content=[
+                    provider_message.ContentElement.from_text('look'),
+                    provider_message.ContentElement.from_image_base64('x' * 100000),
+                ],
+            )
+        ]
+    )
+
+    assert len(packed) < 1000
+    (message,) = store.unpack_messages(packed)
+    assert message.content[0].text == 'look'
+    assert message.content[1].image_base64 is None
+
+
+async def test_disabled_store_does_not_queue_writes(app):
+    app.instance_config.data['system']['session_retention']['persistent'] = False
+    manager = sessionmgr.SessionManager(app)
+    await _turn(manager, _query(), 'hello')
+
+    assert manager.store.snapshot()['pending_writes'] == 0
+    assert await manager.store.flush() == 0
+
+
+async def test_prune_expired_deletes_idle_conversations(app):
+    manager = sessionmgr.SessionManager(app)
+    await _turn(manager, _query(), 'hello')
+    await manager.store.flush()
+    Snapshot = persistence_conversation.ConversationSnapshot
+    await app.persistence_mgr.execute_async(
+        sqlalchemy.update(Snapshot).values(updated_at=datetime.datetime(2000, 1, 1))
+    )
+
+    assert await manager.store.prune_expired(WORKSPACE_UUID) == 1
+    assert await _stored_rows(app) == []
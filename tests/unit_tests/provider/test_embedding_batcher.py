@@ -0,0 +1,76 @@
+"""Unit tests for provider-sized, concurrency-bounded embedding batches."""
+
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from langbot.pkg.provider.modelmgr import embedding_batcher
+from tests.unit_tests.provider.conftest import TEST_EXECUTION_CONTEXT
+
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.fixture
+def batched_provider(mock_app_for_modelmgr, runtime_provider):
+    app = mock_app_for_modelmgr
+    app.instance_config.data['system'] = {'embedding_batching': {'batch_size': 3, 'max_concurrency': 2}}
+    app.model_mgr = SimpleNamespace(embedding_batcher=embedding_batcher.EmbeddingBatcher(app))
+
+    calls: list[list[str]] = []
+    state = {'in_flight': 0, 'peak': 0}
+
+    async def invoke_embedding(model, input_text, extra_args={}):
+        calls.append(list(input_text))
+        state['in_flight'] += 1
+        state['peak'] = max(state['peak'], state['in_flight'])
+        await asyncio.sleep(0.01)
+        state['in_flight'] -= 1
+        usage = {'prompt_tokens': len(input_text), 'total_tokens': len(input_text)}
+        return [[float(len(text))] for text in input_text], usage
+
+    runtime_provider.requester.invoke_embedding = invoke_embedding
+    runtime_provider.calls = calls
+    runtime_provider.state = state
+    return runtime_provider
+
+
+async def test_large_requests_are_split_and_reassembled_in_order(batched_provider, runtime_embedding_model):
+    texts = ['a' * length for length in range(1, 9)]
+
+    vectors = await batched_provider.invoke_embedding(
+        runtime_embedding_model, texts, execution_context=TEST_EXECUTION_CONTEXT
+    )
+
+    assert vectors == [[float(length)] for length in range(1, 9)]
+    assert [len(batch) for batch in batched_provider.calls] == [3, 3, 2]
+    assert batched_provider.state['peak'] == 2
+    record_embedding_call = batched_provider.requester.ap.monitoring_service.record_embedding_call
+    assert record_embedding_call.await_count == 1
+    assert record_embedding_call.await_args.kwargs['prompt_tokens'] == 8
+
+
+async def test_requester_batch_size_overrides_the_default(mock_app_for_modelmgr, runtime_embedding_model):
+    requester_name = runtime_embedding_model.provider.provider_entity.requester
+    mock_app_for_modelmgr.instance_config.data['system'] = {
+        'embedding_batching': {'batch_size': 50, 'requester_batch_sizes': {requester_name: 10}}
+    }
+    batcher = embedding_batcher.EmbeddingBatcher(mock_app_for_modelmgr)
+
+    assert batcher.batch_size(runtime_embedding_model) == 10
+    mock_app_for_modelmgr.instance_config.data['system'] = {'embedding_batching': {'batch_size': True}}
+    assert batcher.batch_size(runtime_embedding_model) == 64
+
+
+async def test_mismatched_batch_results_are_rejected(mock_app_for_modelmgr, runtime_embedding_model):
+    mock_app_for_modelmgr.instance_config.data['system'] = {'embedding_batching': {'batch_size': 1}}
+    batcher = embedding_batcher.EmbeddingBatcher(mock_app_for_modelmgr)
+
+    async def call(texts):
+        return []
+
+    with pytest.raises(ValueError):
+        await batcher.embed(runtime_embedding_model, ['a', 'b'], call)
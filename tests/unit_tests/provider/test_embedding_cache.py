@@ -0,0 +1,160 @@
+"""Unit tests for the query embedding cache used by RuntimeProvider.invoke_embedding."""
+
+from __future__ import annotations
+
+import datetime
+from types import SimpleNamespace
+
+import pytest
+import sqlalchemy
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from langbot.pkg.entity.persistence import model as persistence_model
+from langbot.pkg.entity.persistence.base import Base
+from langbot.pkg.provider.modelmgr import embedding_cache
+from tests.unit_tests.provider.conftest import TEST_EXECUTION_CONTEXT, TEST_WORKSPACE_UUID
+
+
+pytestmark = pytest.mark.asyncio
+
+
+class _PersistenceManager:
+    def __init__(self, engine):
+        self.engine = engine
+
+    async def execute_async(self, *args, **kwargs):
+        async with self.engine.connect() as connection:
+            result = await connection.execute(*args, **kwargs)
+            await connection.commit()
+            return result
+
+    def get_db_engine(self):
+        return self.engine
+
+
+@pytest.fixture
+def cached_provider(mock_app_for_modelmgr, runtime_provider):
+    app = mock_app_for_modelmgr
+    app.instance_config.data['system'] = {'embedding_cache': {}}
+    app.model_mgr = SimpleNamespace(embedding_cache=embedding_cache.EmbeddingCache(app))
+
+    calls: list[list[str]] = []
+
+    async def invoke_embedding(model, input_text, extra_args={}):
+        calls.append(list(input_text))
+        return [[float(len(text)), 0.5] for text in input_text], {'prompt_tokens': 1, 'total_tokens': 1}
+
+    runtime_provider.requester.invoke_embedding = invoke_embedding
+    runtime_provider.calls = calls
+    return runtime_provider
+
+
+async def _embed(provider, model, texts):
+    return await provider.invoke_embedding(model, texts, execution_context=TEST_EXECUTION_CONTEXT)
+
+
+async def test_repeated_query_skips_provider_and_monitoring(cached_provider, runtime_embedding_model):
+    first = await _embed(cached_provider, runtime_embedding_model, ['What are your opening hours?'])
+    second = await _embed(cached_provider, runtime_embedding_model, ['  What are your   opening hours?\n'])
+
+    assert second == first == [[28.0, 0.5]]
+    assert cached_provider.calls == [['What are your opening hours?']]
+    record_embedding_call = cached_provider.requester.ap.monitoring_service.record_embedding_call
+    assert record_embedding_call.await_count == 1
+    snapshot = cached_provider.requester.ap.model_mgr.embedding_cache.snapshot()
+    assert snapshot['hits'] == 1
+    assert snapshot['misses'] == 1
+    assert snapshot['entries'] == 1
+
+
+async def test_partial_hit_only_embeds_missing_texts(cached_provider, runtime_embedding_model):
+    await _embed(cached_provider, runtime_embedding_model, ['b'])
+
+    result = await _embed(cached_provider, runtime_embedding_model, ['aa', 'b', 'cccc'])
+
+    assert result == [[2.0, 0.5], [1.0, 0.5], [4.0, 0.5]]
+    assert cached_provider.calls == [['b'], ['aa', 'cccc']]
+    record_embedding_call = cached_provider.requester.ap.monitoring_service.record_embedding_call
+    assert record_embedding_call.await_args.kwargs['input_count'] == 2
+
+
+async def test_ingestion_batches_and_disabled_cache_bypass(cached_provider, runtime_embedding_model):
+    chunks = [f'chunk {index}' for index in range(5)]
+    await _embed(cached_provider, runtime_embedding_model, chunks)
+    await _embed(cached_provider, runtime_embedding_model, chunks)
+
+    cache = cached_provider.requester.ap.model_mgr.embedding_cache
+    assert len(cached_provider.calls) == 2
+    assert cache.snapshot()['entries'] == 0
+
+    cached_provider.requester.ap.instance_config.data['system']['embedding_cache']['enabled'] = False
+    await _embed(cached_provider, runtime_embedding_model, ['hello'])
+    await _embed(cached_provider, runtime_embedding_model, ['hello'])
+    assert len(cached_provider.calls) == 4
+
+
+async def test_keys_depend_on_model_settings_and_workspace(cached_provider, runtime_embedding_model):
+    cache = cached_provider.requester.ap.model_mgr.embedding_cache
+    [key] = cache.keys_for(runtime_embedding_model, ['hello'])
+
+    assert cache.keys_for(runtime_embedding_model, [' hello ']) == [key]
+    assert cache.keys_for(runtime_embedding_model, ['hello'], {'dimensions': 256}) != [key]
+    runtime_embedding_model.model_entity.extra_args = {'encoding_format': 'base64'}
+    assert cache.keys_for(runtime_embedding_model, ['hello']) != [key]
+
+    await cache.put_many(TEST_WORKSPACE_UUID, 'model', {key: [1.0]})
+    assert await cache.get_many('other-workspace', [key]) == [None]
+    assert await cache.get_many(TEST_WORKSPACE_UUID, [key]) == [[1.0]]
+    assert cache.invalidate_model(TEST_WORKSPACE_UUID, 'model') == 1
+    assert await cache.get_many(TEST_WORKSPACE_UUID, [key]) == [None]
+
+
+async def test_lru_eviction_and_ttl_expiry(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(embedding_cache.time, 'monotonic', lambda: now[0])
+    app = SimpleNamespace(
+        instance_config=SimpleNamespace(
+            data={'system': {'embedding_cache': {'max_entries': 2, 'ttl_seconds': 60}}},
+        ),
+    )
+    cache = embedding_cache.EmbeddingCache(app)
+
+    await cache.put_many('workspace', 'model', {'a': [1.0], 'b': [2.0]})
+    assert await cache.get_many('workspace', ['a']) == [[1.0]]
+    await cache.put_many('workspace', 'model', {'c': [3.0]})
+
+    assert await cache.get_many('workspace', ['a', 'b', 'c']) == [[1.0], None, [3.0]]
+    now[0] += 61
+    assert await cache.get_many('workspace', ['a', 'c']) == [None, None]
+    snapshot = cache.snapshot()
+    assert snapshot['evictions'] == 1
+    assert snapshot['expirations'] == 2
+    assert snapshot['entries'] == 0
+
+
+async def test_persistent_entries_survive_restart_and_are_pruned(tmp_path):
+    engine = create_async_engine(f'sqlite+aiosqlite:///{tmp_path / "cache.db"}')
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    app = SimpleNamespace(
+        persistence_mgr=_PersistenceManager(engine),
+        instance_config=SimpleNamespace(data={'system': {'embedding_cache': {'persistent': True}}}),
+        logger=SimpleNamespace(warning=lambda *_args, **_kwargs: None),
+    )
+    try:
+        await embedding_cache.EmbeddingCache(app).put_many('workspace', 'model', {'a': [0.1, -2.5]})
+        await embedding_cache.EmbeddingCache(app).put_many('workspace', 'model', {'a': [0.1, -2.5], 'b': [1.0]})
+
+        restarted = embedding_cache.EmbeddingCache(app)
+        assert await restarted.get_many('workspace', ['a', 'c']) == [[0.1, -2.5], None]
+        assert await restarted.get_many('workspace', ['a']) == [[0.1, -2.5]]
+        assert restarted.snapshot()['persistent_hits'] == 1
+
+        Entry = persistence_model.EmbeddingCacheEntry
+        await app.persistence_mgr.execute_async(
+            sqlalchemy.update(Entry).where(Entry.cache_key == 'b').values(created_at=datetime.datetime(2020, 1, 1))
+        )
+        assert await embedding_cache.EmbeddingCache(app).get_many('workspace', ['b']) == [None]
+        assert await restarted.prune_expired('workspace') == 1
+    finally:
+        await engine.dispose()
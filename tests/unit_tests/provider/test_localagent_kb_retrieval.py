@@ -0,0 +1,125 @@
+"""Unit tests for LocalAgentRunner._retrieve_knowledge_bases.
+
+Bound knowledge bases are searched concurrently under a concurrency limit.
+Results are merged in binding order, and a KB that is missing, raises or
+misses its deadline is skipped without failing the reply.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+import pytest
+
+import langbot_plugin.api.entities.builtin.provider.session as provider_session
+
+from langbot.pkg.provider.runners.localagent import LocalAgentRunner
+
+
+pytestmark = pytest.mark.asyncio
+
+
+class _KnowledgeBase:
+    def __init__(self, name: str, *, delay: float = 0, error: Exception | None = None, tracker=None):
+        self.name = name
+        self.delay = delay
+        self.error = error
+        self.tracker = tracker
+
+    def get_knowledge_engine_plugin_id(self):
+        return f'engine/{self.name}'
+
+    async def retrieve(self, execution_context, query_text, settings):
+        if self.tracker is not None:
+            self.tracker['active'] += 1
+            self.tracker['peak'] = max(self.tracker['peak'], self.tracker['active'])
+        try:
+            await asyncio.sleep(self.delay)
+            if self.error is not None:
+                raise self.error
+            return [f'{self.name}:{query_text}']
+        finally:
+            if self.tracker is not None:
+                self.tracker['active'] -= 1
+
+
+def _make_runner(knowledge_bases: dict, kb_retrieval: dict | None = None) -> LocalAgentRunner:
+    async def get_knowledge_base_by_uuid(execution_context, kb_uuid):
+        return knowledge_bases.get(kb_uuid)
+
+    runner = LocalAgentRunner.__new__(LocalAgentRunner)
+    runner.ap = SimpleNamespace(
+        logger=Mock(),
+        rag_mgr=SimpleNamespace(get_knowledge_base_by_uuid=get_knowledge_base_by_uuid),
+        instance_config=SimpleNamespace(data={'system': {'kb_retrieval': kb_retrieval or {}}}),
+    )
+    return runner
+
+
+def _make_query():
+    return SimpleNamespace(
+        bot_uuid='bot-uuid',
+        sender_id=12345,
+        session=SimpleNamespace(launcher_type=provider_session.LauncherTypes.PERSON, launcher_id=12345),
+    )
+
+
+async def test_retrieval_runs_concurrently_and_keeps_binding_order():
+    tracker = {'active': 0, 'peak': 0}
+    knowledge_bases = {
+        f'kb-{index}': _KnowledgeBase(f'kb-{index}', delay=0.05 * (3 - index), tracker=tracker) for index in range(3)
+    }
+    runner = _make_runner(knowledge_bases)
+
+    retrievals = await runner._retrieve_knowledge_bases(_make_query(), None, list(knowledge_bases), 'hello')
+
+    assert tracker['peak'] == 3
+    assert [entry for retrieval in retrievals for entry in retrieval['results']] == [
+        'kb-0:hello',
+        'kb-1:hello',
+        'kb-2:hello',
+    ]
+    assert [retrieval['engine_plugin_id'] for retrieval in retrievals] == ['engine/kb-0', 'engine/kb-1', 'engine/kb-2']
+
+
+async def test_retrieval_respects_concurrency_limit():
+    tracker = {'active': 0, 'peak': 0}
+    knowledge_bases = {f'kb-{index}': _KnowledgeBase(f'kb-{index}', delay=0.01, tracker=tracker) for index in range(5)}
+    runner = _make_runner(knowledge_bases, {'max_concurrency': 2})
+
+    retrievals = await runner._retrieve_knowledge_bases(_make_query(), None, list(knowledge_bases), 'hello')
+
+    assert tracker['peak'] == 2
+    assert all(retrieval['status'] == 'ok' for retrieval in retrievals)
+
+
+async def test_slow_missing_and_failing_knowledge_bases_are_skipped():
+    knowledge_bases = {
+        'fast': _KnowledgeBase('fast'),
+        'slow': _KnowledgeBase('slow', delay=5),
+        'broken': _KnowledgeBase('broken', error=RuntimeError('engine down')),
+    }
+    runner = _make_runner(knowledge_bases, {'timeout_seconds': 0.05})
+
+    retrievals = await asyncio.wait_for(
+        runner._retrieve_knowledge_bases(_make_query(), None, ['slow', 'missing', 'broken', 'fast'], 'hello'),
+        timeout=1,
+    )
+
+    assert [retrieval['status'] for retrieval in retrievals] == ['timeout', 'missing', 'error', 'ok']
+    assert [entry for retrieval in retrievals for entry in retrieval['results']] == ['fast:hello']
+    assert retrievals[0]['duration_ms'] >= 50
+    assert runner.ap.logger.warning.call_count == 3
+
+
+async def test_invalid_retrieval_limits_fall_back_to_defaults():
+    runner = _make_runner({}, {'max_concurrency': True, 'timeout_seconds': -1})
+    assert runner._kb_retrieval_limits() == (4, 15.0)
+
+    runner = _make_runner({}, {'max_concurrency': 1000, 'timeout_seconds': 2})
+    assert runner._kb_retrieval_limits() == (32, 2.0)
+
+    runner.ap = SimpleNamespace(logger=Mock())
+    assert runner._kb_retrieval_limits() == (4, 15.0)
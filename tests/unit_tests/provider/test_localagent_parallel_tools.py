@@ -0,0 +1,108 @@
+"""Unit tests for LocalAgentRunner._execute_tool_calls.
+
+Tool calls returned in one model turn run concurrently under a concurrency
+limit and a per-call deadline. Results keep the order of the tool calls, and
+sandbox tools still run one at a time in model order.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+import pytest
+
+import langbot_plugin.api.entities.builtin.provider.message as provider_message
+
+from langbot.pkg.provider.runners.localagent import LocalAgentRunner
+
+
+pytestmark = pytest.mark.asyncio
+
+
+def _tool_call(call_id: str, name: str, **arguments) -> provider_message.ToolCall:
+    return provider_message.ToolCall(
+        id=call_id,
+        type='function',
+        function=provider_message.FunctionCall(name=name, arguments=json.dumps(arguments)),
+    )
+
+
+class _ToolManager:
+    def __init__(self, delays: dict[str, float], errors: dict[str, Exception] | None = None):
+        self.delays = delays
+        self.errors = errors or {}
+        self.active = 0
+        self.peak = 0
+        self.started: list[str] = []
+
+    async def execute_func_call(self, name, parameters, query):
+        self.started.append(name)
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.delays.get(name, 0))
+            if name in self.errors:
+                raise self.errors[name]
+            return {'tool': name, **parameters}
+        finally:
+            self.active -= 1
+
+
+def _make_runner(tool_mgr: _ToolManager, tool_calls: dict | None = None) -> LocalAgentRunner:
+    runner = LocalAgentRunner.__new__(LocalAgentRunner)
+    runner.ap = SimpleNamespace(
+        logger=Mock(),
+        tool_mgr=tool_mgr,
+        instance_config=SimpleNamespace(data={'system': {'tool_calls': tool_calls or {}}}),
+    )
+    return runner
+
+
+async def test_tool_calls_run_concurrently_and_keep_call_order():
+    tool_mgr = _ToolManager({'slow': 0.15, 'medium': 0.1, 'fast': 0.05})
+    runner = _make_runner(tool_mgr)
+    calls = [_tool_call('call-1', 'slow'), _tool_call('call-2', 'medium', q=2), _tool_call('call-3', 'fast')]
+
+    outcomes = await runner._execute_tool_calls(SimpleNamespace(query_id='q'), calls)
+
+    assert tool_mgr.peak == 3
+    assert [json.loads(outcome['content'])['tool'] for outcome in outcomes] == ['slow', 'medium', 'fast']
+    assert json.loads(outcomes[1]['content'])['q'] == 2
+    assert all(outcome['error'] is None for outcome in outcomes)
+
+
+async def test_concurrency_limit_and_timeout_are_configurable():
+    tool_mgr = _ToolManager({'a': 0.02, 'b': 0.02, 'hang': 5})
+    runner = _make_runner(tool_mgr, {'max_concurrency': 2, 'timeout_seconds': 0.1})
+    calls = [_tool_call('call-1', 'a'), _tool_call('call-2', 'hang'), _tool_call('call-3', 'b')]
+
+    outcomes = await runner._execute_tool_calls(SimpleNamespace(query_id='q'), calls)
+
+    assert tool_mgr.peak == 2
+    assert outcomes[0]['error'] is None and outcomes[2]['error'] is None
+    assert 'timed out after 0.1s' in str(outcomes[1]['error'])
+
+
+async def test_failing_call_does_not_affect_others():
+    tool_mgr = _ToolManager({}, errors={'broken': RuntimeError('boom')})
+    runner = _make_runner(tool_mgr)
+    calls = [_tool_call('call-1', 'broken'), _tool_call('call-2', 'ok')]
+
+    outcomes = await runner._execute_tool_calls(SimpleNamespace(query_id='q'), calls)
+
+    assert str(outcomes[0]['error']) == 'boom'
+    assert json.loads(outcomes[1]['content']) == {'tool': 'ok'}
+
+
+async def test_sandbox_tools_run_one_at_a_time_in_model_order():
+    tool_mgr = _ToolManager({'write': 0.05, 'read': 0.01, 'web': 0.05})
+    runner = _make_runner(tool_mgr)
+    calls = [_tool_call('call-1', 'write'), _tool_call('call-2', 'web'), _tool_call('call-3', 'read')]
+
+    await runner._execute_tool_calls(SimpleNamespace(query_id='q'), calls)
+
+    assert tool_mgr.peak == 2
+    assert tool_mgr.started.index('write') < tool_mgr.started.index('read')
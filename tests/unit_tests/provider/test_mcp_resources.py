@@ -400,6 +400,27 @@ def test_resource_uri_allowed_supports_listed_templates_conservatively():
     assert session.resource_uri_allowed('https://example.com/secret') is False
 
 
+@pytest.mark.asyncio
+async def test_mcp_tool_lookup_follows_tool_refreshes():
+    loader = MCPLoader(_app())
+    session = _connected_session()
+    _register_session(loader, session)
+    tool = SimpleNamespace(name='search')
+    session.functions = [tool]
+
+    revision = await loader.tool_catalog_revision(TEST_EXECUTION_CONTEXT)
+
+    assert await loader.get_tool(TEST_EXECUTION_CONTEXT, 'search') is tool
+    assert await loader.has_tool(TEST_EXECUTION_CONTEXT, 'search') is True
+    assert await loader.has_tool(TEST_EXECUTION_CONTEXT, MCP_TOOL_LIST_RESOURCES) is True
+
+    session.functions.clear()
+    session.tools_revision += 1
+
+    assert await loader.tool_catalog_revision(TEST_EXECUTION_CONTEXT) != revision
+    assert await loader.has_tool(TEST_EXECUTION_CONTEXT, 'search') is False
+
+
 @pytest.mark.asyncio
 async def test_mcp_loader_can_hide_synthetic_resource_tools():
     loader = MCPLoader(_app())
@@ -102,6 +102,46 @@ async def test_tool_manager_includes_skill_authoring_tools_when_requested():
     assert [tool.name for tool in tools] == ['exec', 'activate', 'plugin_tool', 'mcp_tool']
 
 
+class RevisionedStubLoader(StubLoader):
+    def __init__(self, tools: list[resource_tool.LLMTool] | None = None):
+        super().__init__(tools)
+        self.revision = 0
+        self.get_tools_calls = 0
+
+    async def get_tools(self, *_args, **_kwargs):
+        self.get_tools_calls += 1
+        return self._tools
+
+    async def tool_catalog_revision(self, _context):
+        return self.revision
+
+
+@pytest.mark.asyncio
+async def test_tool_manager_reuses_tool_list_until_a_source_changes():
+    plugin_connector = SimpleNamespace(revision=0)
+    plugin_connector.tool_catalog_revision = lambda _workspace_uuid: plugin_connector.revision
+    manager = ToolManager(SimpleNamespace(plugin_connector=plugin_connector))
+    manager.native_tool_loader = StubLoader([make_tool('exec')])
+    manager.skill_tool_loader = StubLoader([])
+    manager.plugin_tool_loader = RevisionedStubLoader([make_tool('plugin_tool')])
+    manager.mcp_tool_loader = RevisionedStubLoader([make_tool('mcp_tool')])
+
+    first = await manager.get_all_tools(_CONTEXT)
+    first.clear()
+    second = await manager.get_all_tools(_CONTEXT)
+    await manager.get_all_tools(_CONTEXT, bound_mcp_servers=['srv-1'])
+
+    assert [tool.name for tool in second] == ['exec', 'plugin_tool', 'mcp_tool']
+    assert manager.plugin_tool_loader.get_tools_calls == 2
+
+    manager.mcp_tool_loader.revision += 1
+    await manager.get_all_tools(_CONTEXT)
+    plugin_connector.revision += 1
+    await manager.get_all_tools(_CONTEXT)
+
+    assert manager.plugin_tool_loader.get_tools_calls == 4
+
+
 @pytest.mark.asyncio
 async def test_tool_manager_catalog_labels_tool_sources():
     manager = ToolManager(SimpleNamespace())
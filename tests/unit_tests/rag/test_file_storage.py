@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import contextvars
 import io
 import zipfile
@@ -56,6 +57,18 @@ def _make_app() -> Mock:
     storage_mgr.storage_provider.save = AsyncMock()
     storage_mgr.storage_provider.size = AsyncMock(return_value=123)
     storage_mgr.storage_provider.delete = AsyncMock()
+
+    # Stream through the byte-level mocks so tests can keep asserting on load_bounded/save.
+    async def iter_chunks(key, **kwargs):
+        yield await storage_mgr.storage_provider.load_bounded(key, max_bytes=kwargs.get('chunk_size'))
+
+    async def save_stream(key, chunks, *, max_bytes):
+        value = b''.join([chunk async for chunk in chunks])
+        await storage_mgr.storage_provider.save(key, value)
+        return len(value)
+
+    storage_mgr.storage_provider.iter_chunks = iter_chunks
+    storage_mgr.storage_provider.save_stream = save_stream
     app.storage_mgr = storage_mgr
     app.persistence_mgr = Mock()
     app.persistence_mgr.execute_async = AsyncMock(return_value=SimpleNamespace(rowcount=1))
@@ -208,6 +221,30 @@ class TestStoreZipFile:
         assert forwarded_keys == saved_names
         kb.ap.storage_mgr.storage_provider.delete.assert_awaited_once_with(zip_key)
 
+    @pytest.mark.asyncio
+    async def test_store_zip_file_finishes_every_entry_before_raising_capacity_errors(self):
+        kb = _make_kb()
+        kb.ap.storage_mgr.storage_provider.load_bounded = AsyncMock(
+            return_value=_make_zip_bytes({'doc1.txt': b'one', 'doc2.txt': b'two', 'doc3.txt': b'three'})
+        )
+        finished = []
+
+        async def store_file(_context, object_key, **_kwargs):
+            if not finished:
+                finished.append(object_key)
+                raise TaskCapacityError('capacity')
+            await asyncio.sleep(0.01)
+            finished.append(object_key)
+            return 'task'
+
+        kb.store_file = AsyncMock(side_effect=store_file)
+
+        with pytest.raises(TaskCapacityError, match='capacity'):
+            await kb._store_zip_file(CONTEXT, _upload_key('archive.zip'))
+
+        assert len(finished) == 3
+        kb.ap.storage_mgr.storage_provider.delete.assert_any_await(_upload_key('archive.zip'))
+
     @pytest.mark.asyncio
     async def test_store_zip_file_raises_when_no_supported_files(self):
         kb = _make_kb()
@@ -8,6 +8,8 @@ from unittest.mock import AsyncMock
 import pytest
 
 from langbot.pkg.api.http.context import ExecutionContext
+from langbot.pkg.core.taskmgr import TaskContext
+from langbot.pkg.rag.knowledge.ingestion import IngestionTracker
 from langbot.pkg.rag.service.runtime import RAGRuntimeService
 from langbot.pkg.workspace.errors import WorkspaceNotFoundError
 
@@ -54,6 +56,28 @@ def _app(*, kb_uuid='kb-a', file_exists=True):
     )
 
 
+@pytest.mark.asyncio
+async def test_vector_upsert_reports_progress_to_the_tracked_file_task():
+    app = _app()
+    app.rag_mgr = SimpleNamespace(ingestion_tracker=IngestionTracker())
+    service = RAGRuntimeService(app)
+    task_context = TaskContext.new()
+
+    with app.rag_mgr.ingestion_tracker.track(WORKSPACE_UUID, 'kb-a', 'file-a', task_context):
+        await service.vector_upsert(
+            CONTEXT,
+            'logical-collection',
+            [[0.1], [0.2], [0.3]],
+            ['chunk-a', 'chunk-b', 'chunk-c'],
+            metadata=[{'file_id': 'file-a'}, {'file_id': 'file-a'}, {'file_id': 'file-b'}],
+        )
+
+    assert task_context.metadata['ingestion']['chunks_stored'] == 2
+    assert task_context.metadata['ingestion']['upsert_batches'] == 1
+    assert task_context.current_action == 'Storing chunks (2 stored)'
+    assert app.rag_mgr.ingestion_tracker._active == {}
+
+
 @pytest.mark.asyncio
 async def test_vector_upsert_resolves_canonical_kb_and_forwards_trusted_context():
     app = _app()
@@ -45,7 +45,7 @@ class _PersistenceManager:
             return result
 
     @asynccontextmanager
-    async def tenant_uow(self, _workspace_uuid):
+    async def tenant_uow(self, _workspace_uuid, *, read_only=False):
         # This lightweight fixture does not emulate PostgreSQL RLS; production
         # persistence tests cover the transaction-bound unit of work itself.
         async with AsyncSession(self.engine, expire_on_commit=False) as session, session.begin():
@@ -0,0 +1,145 @@
+"""Unit tests for chunked storage reads and writes."""
+
+from __future__ import annotations
+
+import os
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from langbot.pkg.api.http.authz import WorkspaceRequiredError
+from langbot.pkg.api.http.context import ExecutionContext
+from langbot.pkg.storage.mgr import StorageMgr
+from langbot.pkg.storage.provider import StorageObjectTooLargeError
+from langbot.pkg.storage.providers import s3storage
+from langbot.pkg.storage.providers.localstorage import LocalStorageProvider
+
+
+pytestmark = pytest.mark.asyncio
+
+WORKSPACE_A = '00000000-0000-0000-0000-00000000000a'
+CONTEXT = ExecutionContext(instance_uuid='instance', workspace_uuid=WORKSPACE_A, placement_generation=7)
+
+
+async def _chunks(*values: bytes):
+    for value in values:
+        yield value
+
+
+async def _collect(iterator) -> bytes:
+    return b''.join([chunk async for chunk in iterator])
+
+
+@pytest.fixture
+def local_provider(tmp_path):
+    storage_path = str(tmp_path / 'storage')
+    with patch('langbot.pkg.storage.providers.localstorage.LOCAL_STORAGE_PATH', storage_path):
+        yield LocalStorageProvider(Mock())
+
+
+@pytest.fixture
+def s3_provider():
+    from moto import mock_aws
+
+    app = Mock()
+    app.instance_config.data = {
+        'storage': {
+            's3': {
+                'access_key_id': 'testing',
+                'secret_access_key': 'testing',
+                'region': 'us-east-1',
+                'bucket': 'test-langbot-storage',
+            }
+        }
+    }
+    with mock_aws():
+        yield s3storage.S3StorageProvider(app)
+
+
+async def test_local_stream_round_trip_with_ranges(local_provider):
+    written = await local_provider.save_stream('nested/doc.bin', _chunks(b'0123', b'4567', b'89'), max_bytes=10)
+
+    assert written == 10
+    assert await _collect(local_provider.iter_chunks('nested/doc.bin', chunk_size=3)) == b'0123456789'
+    assert [chunk async for chunk in local_provider.iter_chunks('nested/doc.bin', chunk_size=3)][0] == b'012'
+    assert await _collect(local_provider.iter_chunks('nested/doc.bin', offset=2, length=5)) == b'23456'
+    assert await _collect(local_provider.iter_chunks('nested/doc.bin', offset=8, length=10)) == b'89'
+    assert os.path.isfile(local_provider.local_path('nested/doc.bin'))
+
+
+async def test_local_oversized_stream_leaves_no_object(local_provider):
+    await local_provider.save('doc.bin', b'old')
+
+    with pytest.raises(StorageObjectTooLargeError):
+        await local_provider.save_stream('doc.bin', _chunks(b'1234', b'5678'), max_bytes=6)
+
+    assert await local_provider.load('doc.bin') == b'old'
+    assert os.listdir(os.path.dirname(local_provider.local_path('doc.bin'))) == ['doc.bin']
+
+
+async def test_s3_large_streams_use_multipart_upload_and_ranged_reads(s3_provider):
+    await s3_provider.initialize()
+    part = s3storage.MULTIPART_PART_BYTES
+    payload = os.urandom(part + 1024)
+
+    written = await s3_provider.save_stream(
+        'large.bin', _chunks(payload[: part // 2], payload[part // 2 :]), max_bytes=len(payload)
+    )
+
+    assert written == len(payload)
+    assert await s3_provider.size('large.bin') == len(payload)
+    assert (
+        await _collect(s3_provider.iter_chunks('large.bin', offset=part - 10, length=20))
+        == payload[part - 10 : part + 10]
+    )
+    assert await _collect(s3_provider.iter_chunks('large.bin', offset=len(payload) + 1)) == b''
+
+    await s3_provider.save_stream('small.bin', _chunks(b'abc', b'def'), max_bytes=6)
+    assert await s3_provider.load('small.bin') == b'abcdef'
+
+
+async def test_s3_oversized_stream_aborts_the_multipart_upload(s3_provider):
+    await s3_provider.initialize()
+    part = bytes(s3storage.MULTIPART_PART_BYTES)
+
+    with pytest.raises(StorageObjectTooLargeError):
+        await s3_provider.save_stream('large.bin', _chunks(part, b'x'), max_bytes=len(part))
+
+    assert not await s3_provider.exists('large.bin')
+    uploads = s3_provider.s3_client.list_multipart_uploads(Bucket=s3_provider.bucket_name)
+    assert uploads.get('Uploads', []) == []
+
+
+async def test_scoped_stream_is_validated_against_the_execution_scope(local_provider):
+    app = SimpleNamespace(
+        instance_config=SimpleNamespace(data={'storage': {'max_stream_object_bytes': 8}}),
+        workspace_service=SimpleNamespace(
+            instance_uuid='instance',
+            get_execution_binding=AsyncMock(
+                return_value=SimpleNamespace(
+                    instance_uuid='instance', workspace_uuid=WORKSPACE_A, placement_generation=7
+                )
+            ),
+        ),
+    )
+    manager = StorageMgr(app)
+    manager.storage_provider = local_provider
+
+    object_key = await manager.save_scoped_stream(
+        CONTEXT, owner_type='upload_document', owner='account:a', key='doc.txt', chunks=_chunks(b'abc', b'def')
+    )
+    stream = await manager.open_scoped_object_key(CONTEXT, object_key, expected_owner_type='upload_document')
+    assert stream.size == 6
+    assert await _collect(stream.iter_chunks(offset=1)) == b'bcdef'
+
+    with pytest.raises(WorkspaceRequiredError):
+        await manager.open_scoped_object_key(
+            ExecutionContext(instance_uuid='instance', workspace_uuid=WORKSPACE_A, placement_generation=8),
+            object_key,
+            expected_owner_type='upload_document',
+        )
+    with pytest.raises(StorageObjectTooLargeError):
+        await manager.save_scoped_stream(
+            CONTEXT, owner_type='upload_document', owner='account:a', key='big.txt', chunks=_chunks(b'x' * 9)
+        )
@@ -71,3 +71,88 @@ async def test_mask_patterns_bounds_replacement_growth_and_masks_matches():
             mask='0123456789',
             mask_word='',
         )
+
+
+@pytest.mark.asyncio
+async def test_plain_words_are_masked_in_one_pass_alongside_regex_patterns():
+    found, masked = await safe_regex.mask_patterns(
+        ['ab', 'bc', '坏词', r'secret-\d+'],
+        'abc, 坏词坏词 and secret-7 but not a-b',
+        mask='*',
+        mask_word='',
+    )
+    assert found is True
+    assert masked == '***, **** and ******** but not a-b'
+
+    found, masked = await safe_regex.mask_patterns(['ab', 'bc'], 'abc abab', mask='*', mask_word='[x]')
+    assert found is True
+    assert masked == '[x] [x][x]'
+
+    assert await safe_regex.mask_patterns(['ab'], 'a-b', mask='*', mask_word='') == (False, 'a-b')
+
+
+@pytest.mark.asyncio
+async def test_plain_word_masking_skips_to_occurrences_and_honours_the_timeout():
+    value = 'x' * 100_000 + 'abcab' + 'y' * 100_000 + 'bca'
+    found, masked = await safe_regex.mask_patterns(['ab', 'bca', 'zz'], value, mask='*', mask_word='')
+    assert found is True
+    assert masked == 'x' * 100_000 + '*****' + 'y' * 100_000 + '***'
+
+    # Back-to-back occurrences keep the scan stepping through every character.
+    with pytest.raises(safe_regex.SafeRegexTimeoutError):
+        await safe_regex.mask_patterns(
+            ['ab', 'ba'],
+            'ab' * (safe_regex.MAX_INPUT_CHARS // 2),
+            mask='*',
+            mask_word='',
+            timeout_seconds=0.001,
+        )
+
+
+@pytest.mark.asyncio
+async def test_plain_words_match_without_the_regex_engine():
+    assert await safe_regex.matches_any(['hello', r'^\d+$'], 'say hello') is True
+    assert await safe_regex.matches_any(['hello'], 'say hello', mode='match') is False
+    assert await safe_regex.matches_any(['say', 'x'], 'say hello', mode='match') is True
+    assert await safe_regex.matches_any(['hello', r'^\d+$'], '42') is True
+    assert await safe_regex.matches_any(['hello'], 'goodbye') is False
+
+
+@pytest.mark.asyncio
+async def test_compiled_pattern_sets_are_cached_by_content(monkeypatch):
+    compiled: list[str] = []
+    original = safe_regex._compile
+
+    def counting_compile(pattern):
+        compiled.append(pattern)
+        return original(pattern)
+
+    monkeypatch.setattr(safe_regex, '_compile', counting_compile)
+    monkeypatch.setattr(safe_regex, '_pattern_set_cache', safe_regex.collections.OrderedDict())
+    patterns = ['word', r'secret-\d+']
+
+    for _ in range(3):
+        await safe_regex.mask_patterns(patterns, 'a word', mask='*', mask_word='')
+        await safe_regex.matches_any(patterns, 'a word')
+    assert compiled == [r'secret-\d+']
+
+    await safe_regex.mask_patterns([*patterns, r'key-\w+'], 'a word', mask='*', mask_word='')
+    assert compiled == [r'secret-\d+', r'secret-\d+', r'key-\w+']
+
+
+@pytest.mark.asyncio
+async def test_invalid_regex_only_fails_once_it_is_reached():
+    assert await safe_regex.matches_any(['hello', '(unclosed'], 'say hello') is True
+    with pytest.raises(safe_regex.SafeRegexError):
+        await safe_regex.matches_any(['hello', '(unclosed'], 'goodbye')
+    with pytest.raises(safe_regex.SafeRegexError):
+        await safe_regex.mask_patterns(['hello', '(unclosed'], 'say hello', mask='*', mask_word='')
+
+
+@pytest.mark.asyncio
+async def test_overlapping_plain_words_are_masked_as_one_range():
+    assert await safe_regex.mask_patterns(['abc', 'bcd'], 'abcd', mask='*', mask_word='') == (True, '****')
+    assert await safe_regex.mask_patterns(['abc', 'bcd'], 'abcd abc', mask='*', mask_word='[x]') == (
+        True,
+        '[x] [x]',
+    )
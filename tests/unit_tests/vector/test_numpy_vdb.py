@@ -0,0 +1,193 @@
+"""Tests for the NumPy memory-mapped vector backend."""
+
+from __future__ import annotations
+
+import logging
+import os
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from langbot.pkg.vector.vdbs import numpy_mmap
+from langbot.pkg.vector.vdbs.numpy_mmap import NumpyVectorDatabase
+
+
+pytestmark = pytest.mark.asyncio
+
+
+def _database(path, **kwargs) -> NumpyVectorDatabase:
+    application = SimpleNamespace(
+        instance_config=SimpleNamespace(data={'vdb': {}}),
+        logger=logging.getLogger(__name__),
+    )
+    return NumpyVectorDatabase(application, base_path=str(path), **kwargs)
+
+
+async def _seed(database: NumpyVectorDatabase) -> None:
+    await database.add_embeddings(
+        'kb',
+        ids=['a', 'b', 'c'],
+        embeddings_list=[[1.0, 0.0], [0.6, 0.8], [0.0, 2.0]],
+        metadatas=[{'file_id': 'f1', 'page': 1}, {'file_id': 'f1', 'page': 2}, {'file_id': 'f2', 'page': 3}],
+        documents=['alpha', 'beta', 'gamma'],
+    )
+
+
+async def test_search_ranks_by_cosine_distance(tmp_path):
+    database = _database(tmp_path)
+    await _seed(database)
+
+    results = await database.search('kb', [1.0, 0.0], k=2)
+
+    assert results['ids'] == [['a', 'b']]
+    assert results['documents'] == [['alpha', 'beta']]
+    assert results['distances'][0] == pytest.approx([0.0, 0.4])
+    filtered = await database.search('kb', [1.0, 0.0], k=5, filter={'page': {'$gte': 2}})
+    assert filtered['ids'] == [['b', 'c']]
+
+
+async def test_upsert_replaces_existing_ids(tmp_path):
+    database = _database(tmp_path)
+    await _seed(database)
+
+    await database.add_embeddings('kb', ['a'], [[0.0, 1.0]], [{'file_id': 'f3'}], ['updated'])
+
+    results = await database.search('kb', [0.0, 1.0], k=5)
+    assert sorted(results['ids'][0]) == ['a', 'b', 'c']
+    items, total = await database.list_by_filter('kb', {'file_id': 'f3'})
+    assert total == 1
+    assert items == [{'id': 'a', 'document': 'updated', 'metadata': {'file_id': 'f3'}}]
+
+
+async def test_deletes_tombstone_then_compact_and_survive_reopen(tmp_path):
+    database = _database(tmp_path, compact_ratio=0.5)
+    await _seed(database)
+
+    assert await database.delete_by_filter('kb', {'page': {'$in': [3]}}) == 1
+    assert os.path.getsize(tmp_path / 'kb' / 'records.jsonl') > 0
+    assert (await database.search('kb', [0.0, 1.0], k=5))['ids'] == [['b', 'a']]
+    await database.delete_by_file_id('kb', 'f1')
+    await database.add_embeddings('kb', ['d'], [[0.0, 1.0]], [{'file_id': 'f4'}])
+    await database.close()
+
+    reopened = _database(tmp_path)
+    assert (await reopened.search('kb', [0.0, 1.0], k=5))['ids'] == [['d']]
+    # Deleting 3 of 3 rows compacted into generation 1 and removed generation 0.
+    assert sorted(os.listdir(tmp_path / 'kb')) == ['CURRENT', 'records.1.jsonl', 'vectors.1.npy']
+    with open(tmp_path / 'kb' / 'records.1.jsonl', encoding='utf-8') as records:
+        assert len(records.readlines()) == 1
+
+
+async def test_list_by_filter_pages_in_insertion_order(tmp_path):
+    database = _database(tmp_path)
+    await _seed(database)
+
+    items, total = await database.list_by_filter('kb', limit=2, offset=1)
+
+    assert total == 3
+    assert [item['id'] for item in items] == ['b', 'c']
+
+
+async def test_partition_index_serves_large_collections(tmp_path):
+    rng = np.random.default_rng(7)
+    vectors = rng.normal(size=(2000, 16)).astype(np.float32)
+    database = _database(tmp_path, ivf_min_rows=1000, nprobe=8)
+    await database.add_embeddings(
+        'kb', [str(i) for i in range(2000)], vectors.tolist(), [{'file_id': 'f'} for _ in range(2000)]
+    )
+    runtime_collection = await database.get_or_create_collection('kb')
+    assert runtime_collection.index is not None
+
+    normalized = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    hits = 0
+    for query in vectors[:20]:
+        expected = set(np.argsort(-(normalized @ (query / np.linalg.norm(query))))[:10].astype(str))
+        results = await database.search('kb', query.tolist(), k=10)
+        hits += len(expected & set(results['ids'][0]))
+    assert hits / 200 >= 0.8
+
+
+async def test_rejects_mismatched_dimensions_and_unsafe_names(tmp_path):
+    database = _database(tmp_path)
+    await _seed(database)
+
+    with pytest.raises(ValueError):
+        await database.add_embeddings('kb', ['x'], [[1.0, 0.0, 0.0]], [{}])
+    with pytest.raises(ValueError):
+        await database.get_or_create_collection('../escape')
+
+    await database.delete_collection('kb')
+    assert not (tmp_path / 'kb').exists()
+    assert (await database.search('kb', [1.0, 0.0]))['ids'] == [[]]
+
+
+async def test_torn_log_tail_is_dropped_on_reopen(tmp_path):
+    database = _database(tmp_path)
+    await _seed(database)
+    await database.close()
+    with open(tmp_path / 'kb' / 'records.jsonl', 'a', encoding='utf-8') as records:
+        records.write('{"op": "add", "row": 3')
+
+    reopened = _database(tmp_path)
+    await reopened.add_embeddings('kb', ['d'], [[1.0, 1.0]], [{}])
+    await reopened.close()
+
+    items, total = await _database(tmp_path).list_by_filter('kb')
+    assert total == 4
+    assert items[-1]['id'] == 'd'
+
+
+async def _seed_rows(database: NumpyVectorDatabase, count: int) -> np.ndarray:
+    vectors = np.random.default_rng(3).normal(size=(count, 4)).astype(np.float32)
+    await database.add_embeddings(
+        'kb', [str(i) for i in range(count)], vectors.tolist(), [{'page': i} for i in range(count)]
+    )
+    return vectors
+
+
+@pytest.mark.parametrize('crash_at', ['_switch_generation', '_remove_generation'])
+async def test_crash_during_compaction_keeps_a_consistent_generation(tmp_path, monkeypatch, crash_at):
+    database = _database(tmp_path, compact_ratio=0.3)
+    # 300 rows outgrow the initial capacity, so rows past 256 live in the grown vectors file.
+    vectors = await _seed_rows(database, 300)
+
+    def crash(*args):
+        raise OSError('simulated crash')
+
+    monkeypatch.setattr(numpy_mmap._Collection, crash_at, crash)
+    with pytest.raises(OSError):
+        await database.delete_by_filter('kb', {'page': {'$lt': 100}})
+    monkeypatch.undo()
+
+    reopened = _database(tmp_path)
+    items, total = await reopened.list_by_filter('kb', limit=300)
+    assert total == 200
+    assert [item['id'] for item in items] == [str(i) for i in range(100, 300)]
+    for row in (100, 255, 256, 299):
+        assert (await reopened.search('kb', vectors[row].tolist(), k=1))['ids'] == [[str(row)]]
+    # Only the generation named by CURRENT survives the reopen.
+    expected = (
+        ['records.jsonl', 'vectors.npy']
+        if crash_at == '_switch_generation'
+        else ['CURRENT', 'records.1.jsonl', 'vectors.1.npy']
+    )
+    assert sorted(os.listdir(tmp_path / 'kb')) == expected
+
+
+async def test_idle_collections_are_closed_when_evicted(tmp_path):
+    database = _database(tmp_path)
+    database._runtime_cache_limit = 1
+    await _seed(database)
+    first = await database.get_or_create_collection('kb')
+
+    first.users += 1
+    await database.add_embeddings('other', ['x'], [[1.0, 0.0]], [{}])
+    # A collection in use is never evicted, so its path keeps a single instance.
+    assert list(database._collections) == ['kb', 'other']
+    first.users -= 1
+
+    await database.add_embeddings('third', ['y'], [[1.0, 0.0]], [{}])
+    assert list(database._collections) == ['third']
+    assert first.vectors is None
+    assert (await database.search('kb', [1.0, 0.0], k=1))['ids'] == [['a']]
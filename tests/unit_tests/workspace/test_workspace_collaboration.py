@@ -221,6 +221,39 @@ async def test_last_owner_cannot_be_demoted(collaboration_context):
         )
 
 
+async def test_member_changes_invalidate_principals_once_the_transaction_commits(collaboration_context):
+    service, _, session_factory, _, workspace, owner_membership = collaboration_context
+    created = await service.create_invitation(workspace.uuid, owner_membership, 'second@example.com', 'admin')
+    second = await _add_account(session_factory, 'second@example.com')
+    await service.accept_invitation(created.token, second.uuid)
+    gates: list[asyncio.Future[None]] = []
+    invalidated: list[str] = []
+
+    class CommitGates:
+        def __init__(self, engine):
+            self.engine = engine
+
+        def get_db_engine(self):
+            return self.engine
+
+        def create_after_commit_gate(self):
+            gates.append(asyncio.get_running_loop().create_future())
+            return gates[-1]
+
+    service.ap.persistence_mgr = CommitGates(service.ap.persistence_mgr.get_db_engine())
+    service.ap.principal_cache = SimpleNamespace(invalidate=invalidated.extend)
+    async with session_factory() as session:
+        async with session.begin():
+            await service.update_member_role(workspace.uuid, second.uuid, 'viewer', owner_membership, session=session)
+            await service.remove_member(workspace.uuid, second.uuid, owner_membership, session=session)
+            assert invalidated == []
+
+    gates[0].set_result(None)
+    gates[1].cancel()
+    await asyncio.sleep(0)
+    assert invalidated == [workspace.uuid]
+
+
 async def test_workspace_selector_requires_membership(collaboration_context):
     service, _, session_factory, _, workspace, _ = collaboration_context
     outsider = await _add_account(session_factory, 'outsider@example.com')
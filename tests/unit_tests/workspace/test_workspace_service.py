@@ -291,3 +291,41 @@ async def test_startup_binding_snapshot_avoids_repeated_discovery():
     service.release_startup_execution_bindings()
     assert await service.list_active_execution_bindings() == [binding]
     assert service._discover_active_execution_bindings.await_count == 2
+
+
+async def test_execution_binding_cache_avoids_repeated_reads_until_invalidated(workspace_test_context):
+    service, session_factory = workspace_test_context
+    workspace = await service.ensure_singleton_workspace()
+    first = await service.get_execution_binding(workspace.uuid, expected_generation=1)
+
+    async with session_factory.begin() as session:
+        execution_state = await session.get(WorkspaceExecutionState, workspace.uuid)
+        execution_state.active_generation = 2
+
+    assert await service.get_execution_binding(workspace.uuid, expected_generation=1) is first
+    # A cached binding for another generation is never trusted to reject or admit.
+    assert (await service.get_execution_binding(workspace.uuid, expected_generation=2)).placement_generation == 2
+    with pytest.raises(WorkspaceGenerationMismatchError):
+        await service.get_execution_binding(workspace.uuid, expected_generation=1)
+
+    async with session_factory.begin() as session:
+        execution_state = await session.get(WorkspaceExecutionState, workspace.uuid)
+        execution_state.write_fenced = True
+
+    service.invalidate_execution_bindings([workspace.uuid])
+    with pytest.raises(WorkspaceExecutionUnavailableError):
+        await service.get_execution_binding(workspace.uuid)
+
+
+async def test_execution_binding_cache_can_be_disabled(workspace_test_context):
+    service, session_factory = workspace_test_context
+    service.ap.instance_config = SimpleNamespace(data={'workspace': {'execution_binding_cache_ttl_seconds': 0}})
+    workspace = await service.ensure_singleton_workspace()
+    await service.get_execution_binding(workspace.uuid)
+
+    async with session_factory.begin() as session:
+        execution_state = await session.get(WorkspaceExecutionState, workspace.uuid)
+        execution_state.write_fenced = True
+
+    with pytest.raises(WorkspaceExecutionUnavailableError):
+        await service.get_execution_binding(workspace.uuid)